@@ -16,6 +16,11 @@ SUPPORTED_TEXT_EXTENSIONS = [".txt", ".log", ".csv", ".json", ".xml"]
 
 # Compression settings
 MAX_DICTIONARY_SIZE = 65536  # Maximum dictionary size (can be adjusted)
+DICTIONARY_FULL_POLICY = "freeze"  # What LZ78 does when the dictionary is full: freeze, reset or lru
+INDEX_CODING = "symbol"  # How indices are stored: text, symbol (Huffman) or phased (binary sized to the dictionary)
+LITERAL_CODING = "huffman"  # How literal characters are stored: raw, huffman or context (order-1 Huffman)
+ENTROPY_CODER = "huffman"  # Entropy coder of indices and literals: huffman (static), range or adaptive_huffman (adaptive, slower)
+PRESET_DICTIONARY = None  # Path of a .lz78dict file trained on similar files (see preset_dictionary), or None
 ENCODING = "utf-8"
 
 # UI settings
@@ -0,0 +1,325 @@
+"""
+Command Line Interface - Compress and decompress .lz78 files without a display
+
+Only src.model (and config.py for the default settings) is imported, never
+PyQt5, so it starts in milliseconds and runs on servers without Qt.
+
+Usage, from the project root:
+    python -m src.cli compress archivo.txt [-o archivo.lz78] [--workers 4]
+    python -m src.cli decompress archivo.lz78 [-o archivo.txt]
+    python -m src.cli info archivo.lz78 [...]
+    python -m src.cli test archivo.lz78 [...]
+    python -m src.cli bench archivo.txt [...]
+    python -m src.cli batch carpeta carpeta_lz78 [--include '*.log'] [--workers 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from config import (MAX_DICTIONARY_SIZE, DICTIONARY_FULL_POLICY, INDEX_CODING, LITERAL_CODING, ENTROPY_CODER,
+                    PRESET_DICTIONARY, COMPRESSED_FILE_EXTENSION)
+from .model.lz78_compressor import DICTIONARY_POLICIES
+from .model.index_coding import INDEX_CODINGS
+from .model.literal_coding import LITERAL_CODINGS
+from .model.entropy_coding import ENTROPY_CODERS
+from .model.file_handler_binary_huffman import FileHandlerBinaryHuffman, FLAG_INDEPENDENT_BLOCKS
+from .model.preset_dictionary import PresetDictionary
+from .model.lz78_stream import compress_file, decompress_file, DEFAULT_BLOCK_PAIRS
+from .model.lz78_parallel import compress_file_parallel, decompress_file_parallel, DEFAULT_BLOCK_CHARS
+from .model.lz78_batch import compress_tree, SUPPORTED_EXTENSIONS, SUMMARY_FILENAME, DEFAULT_MAX_IN_FLIGHT_BYTES
+
+
+def format_bytes(b: int) -> str:
+    """Format a byte count like the statistics of the main window."""
+    if b < 1024:
+        return f"{b} bytes"
+    elif b < 1024 * 1024:
+        return f"{b / 1024:.2f} KB"
+    else:
+        return f"{b / (1024 * 1024):.2f} MB"
+
+
+def load_preset_dictionary(path: Optional[str]) -> Optional[PresetDictionary]:
+    """Load the preset dictionary given on the command line (or in config.py)."""
+    return PresetDictionary.load(path) if path else None
+
+
+def check_output(path: str, force: bool):
+    """Refuse to overwrite an existing file unless --force was given."""
+    if os.path.exists(path) and not force:
+        raise ValueError(f"El archivo de salida ya existe: {path} (usa --force para sobrescribirlo)")
+
+
+def default_output(source: str, original_filename: str) -> str:
+    """
+    Output path of decompress without -o: the original file name next to the source.
+    
+    The name comes from the (untrusted) header, so only its last component
+    is used and names that would not be a file there are refused.
+    """
+    name = Path(original_filename.replace('\\', '/')).name
+    if name in ('', '.', '..'):
+        raise ValueError(f"Nombre de archivo original no válido: {original_filename!r} (usa -o)")
+    return str(Path(source).parent / name)
+
+
+def compression_settings(args) -> dict:
+    """Keyword arguments of compress_file/compress_file_parallel from the options."""
+    return {
+        'max_dictionary_size': args.max_dictionary_size or None,
+        'dictionary_policy': args.policy,
+        'index_coding': args.index_coding,
+        'literal_coding': args.literal_coding,
+        'entropy_coder': getattr(args, 'entropy_coder', ENTROPY_CODER),
+        'preset_dictionary': load_preset_dictionary(args.preset_dictionary)
+    }
+
+
+def command_compress(args) -> int:
+    """Compress a text file into a .lz78 file."""
+    output = args.output or str(Path(args.source).with_suffix(COMPRESSED_FILE_EXTENSION))
+    if not output.endswith(COMPRESSED_FILE_EXTENSION):
+        output += COMPRESSED_FILE_EXTENSION
+    check_output(output, args.force)
+    
+    start = time.perf_counter()
+    if args.workers:
+        # Bloques independientes: se comprimen en paralelo y admiten acceso aleatorio
+        stats = compress_file_parallel(args.source, output, block_chars=args.block_chars, workers=args.workers,
+                                       filter_bits=args.filter_bits, **compression_settings(args))
+    else:
+        stats = compress_file(args.source, output, block_pairs=args.block_pairs, **compression_settings(args))
+    elapsed = time.perf_counter() - start
+    
+    print(f"{args.source} -> {output}")
+    print(f"  {format_bytes(stats['original_size'])} -> {format_bytes(stats['compressed_size'])} "
+          f"({stats['compression_ratio']:.2f}%), {stats['blocks']} bloques "
+          f"({stats['stored_blocks']} sin comprimir), {elapsed:.2f} s")
+    return 0
+
+
+def command_decompress(args) -> int:
+    """Decompress a .lz78 file into a text file."""
+    header = FileHandlerBinaryHuffman.read_header(args.source)
+    output = args.output or default_output(args.source, header['original_filename'])
+    check_output(output, args.force)
+    preset_dictionary = load_preset_dictionary(args.preset_dictionary)
+    
+    start = time.perf_counter()
+    if args.workers and header['flags'] & FLAG_INDEPENDENT_BLOCKS:
+        stats = decompress_file_parallel(args.source, output, args.workers, preset_dictionary)
+    else:
+        stats = decompress_file(args.source, output, preset_dictionary)
+    elapsed = time.perf_counter() - start
+    
+    print(f"{args.source} -> {output}")
+    print(f"  {format_bytes(stats['compressed_size'])} -> {format_bytes(stats['decompressed_size'])}, "
+          f"{elapsed:.2f} s")
+    return 0
+
+
+def command_info(args) -> int:
+    """Show the header and blocks of .lz78 files."""
+    for path in args.files:
+        info = FileHandlerBinaryHuffman.get_file_info(path)
+        print(path)
+        print(f"  Versión del formato:   {info['version']}")
+        print(f"  Archivo original:      {info['original_filename']}")
+        print(f"  Tamaño comprimido:     {format_bytes(info['compressed_size'])}")
+        if info.get('original_size') is not None:
+            ratio = info['compressed_size'] / info['original_size'] * 100 if info['original_size'] else 0
+            print(f"  Tamaño original:       {format_bytes(info['original_size'])} ({ratio:.2f}%)")
+        if info.get('lines') is not None:
+            print(f"  Líneas:                {info['lines']:,}")
+        size = info['max_dictionary_size']
+        print(f"  Diccionario:           {size if size else 'sin límite'} frases, política {info['dictionary_policy']}")
+        print(f"  Codificación:          índices {info['index_coding']}, literales {info['literal_coding']}, "
+              f"codificador {info['entropy_coder']}")
+        if info['dictionary_id'] is not None:
+            print(f"  Diccionario previo:    {info['dictionary_id']:08x}")
+        if info['blocks'] is not None:
+            kind = "independientes" if info['flags'] & FLAG_INDEPENDENT_BLOCKS else "con diccionario compartido"
+            print(f"  Bloques:               {info['blocks']} {kind} ({info['stored_blocks']} sin comprimir)")
+        if info['checksum'] is not None:
+            print(f"  CRC-32 del texto:      {info['checksum']:08x}")
+    return 0
+
+
+def command_test(args) -> int:
+    """
+    Decode .lz78 files without writing them, to check that they are intact.
+    
+    The decoded text is checked against the CRC-32 stored in the file;
+    version 2 files, which have none, are only checked for decoding errors.
+    """
+    preset_dictionary = load_preset_dictionary(args.preset_dictionary)
+    failures = 0
+    for path in args.files:
+        try:
+            info = FileHandlerBinaryHuffman.get_file_info(path)
+            stats = decompress_file(path, os.devnull, preset_dictionary)
+            if info.get('original_size') is not None and stats['decompressed_size'] != info['original_size']:
+                raise ValueError(f"decoded {stats['decompressed_size']} bytes, "
+                                 f"the block index expects {info['original_size']}")
+            print(f"OK: {path} ({format_bytes(stats['decompressed_size'])})")
+        except (FileNotFoundError, ValueError) as e:
+            failures += 1
+            print(f"ERROR: {path}: {e}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def command_bench(args) -> int:
+    """Compress and decompress text files with each entropy coder and compare."""
+    settings = compression_settings(args)
+    print(f"{'Archivo':<28}{'Codificador':<18}{'Original':>12}{'Comprimido':>12}{'Ratio':>9}"
+          f"{'Compresión':>12}{'Descompresión':>15}")
+    print("-" * 106)
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        compressed = os.path.join(tmp_dir, "bench" + COMPRESSED_FILE_EXTENSION)
+        decompressed = os.path.join(tmp_dir, "bench.txt")
+        for path in args.files:
+            for entropy_coder in args.entropy_coders:
+                settings['entropy_coder'] = entropy_coder
+                start = time.perf_counter()
+                try:
+                    stats = compress_file(path, compressed, block_pairs=args.block_pairs, **settings)
+                except ValueError as e:
+                    # Combinación de codificaciones no admitida
+                    print(f"{Path(path).name:<28}{entropy_coder:<18}{e}")
+                    continue
+                compress_time = time.perf_counter() - start
+                
+                start = time.perf_counter()
+                decompress_file(compressed, decompressed, settings['preset_dictionary'])
+                decompress_time = time.perf_counter() - start
+                
+                # Verificar la descompresión exacta
+                with open(path, 'rb') as original, open(decompressed, 'rb') as result:
+                    exact = original.read() == result.read()
+                failures += not exact
+                print(f"{Path(path).name:<28}{entropy_coder:<18}{stats['original_size']:>12,}"
+                      f"{stats['compressed_size']:>12,}{stats['compression_ratio']:>8.2f}%"
+                      f"{compress_time:>11.2f}s{decompress_time:>14.2f}s{'' if exact else '  ERROR'}")
+    return 1 if failures else 0
+
+
+def command_batch(args) -> int:
+    """Compress the text files of a directory tree into a mirrored tree of .lz78 files."""
+    summary = compress_tree(args.source, args.target, args.include, workers=args.workers or None,
+                            max_in_flight_bytes=args.max_in_flight_mb << 20, check_hash=args.hash,
+                            force=args.force, summary_path=args.summary, **compression_settings(args))
+    
+    for relative in summary['compressed']:
+        stats = summary['files'][relative]
+        ratio = stats['compressed_size'] / stats['original_size'] * 100 if stats['original_size'] else 0
+        print(f"{relative}: {format_bytes(stats['original_size'])} -> {format_bytes(stats['compressed_size'])} "
+              f"({ratio:.2f}%)")
+    for relative, error in summary['failed'].items():
+        print(f"ERROR: {relative}: {error}")
+    
+    totals = summary['totals']
+    print(f"{len(summary['compressed'])} comprimidos, {len(summary['skipped'])} al día, "
+          f"{len(summary['failed'])} con errores en {totals['time']:.2f} s")
+    print(f"  {totals['files']} archivos: {format_bytes(totals['original_size'])} -> "
+          f"{format_bytes(totals['compressed_size'])} ({totals['compression_ratio']:.2f}%)")
+    return 1 if summary['failed'] else 0
+
+
+def add_compression_options(parser: argparse.ArgumentParser, block_pairs: bool = True):
+    """Options shared by compress, bench and batch (defaults from config.py)."""
+    parser.add_argument("--max-dictionary-size", type=int, default=MAX_DICTIONARY_SIZE,
+                        help=f"frases del diccionario, 0 = sin límite (por defecto {MAX_DICTIONARY_SIZE})")
+    parser.add_argument("--policy", choices=DICTIONARY_POLICIES, default=DICTIONARY_FULL_POLICY,
+                        help="qué hacer con el diccionario lleno")
+    parser.add_argument("--index-coding", choices=INDEX_CODINGS, default=INDEX_CODING)
+    parser.add_argument("--literal-coding", choices=LITERAL_CODINGS, default=LITERAL_CODING)
+    if block_pairs:
+        parser.add_argument("--block-pairs", type=int, default=DEFAULT_BLOCK_PAIRS,
+                            help="pares (índice, carácter) por bloque")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the parser of the command line."""
+    parser = argparse.ArgumentParser(prog="python -m src.cli",
+                                     description="Compresor LZ78 + Huffman sin interfaz gráfica")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    compress = commands.add_parser("compress", help="comprimir un archivo de texto")
+    compress.add_argument("source", help="archivo de texto UTF-8")
+    compress.add_argument("-o", "--output", help="archivo .lz78 (por defecto junto al original)")
+    compress.add_argument("-f", "--force", action="store_true", help="sobrescribir la salida si existe")
+    add_compression_options(compress)
+    compress.add_argument("--entropy-coder", choices=ENTROPY_CODERS, default=ENTROPY_CODER)
+    compress.add_argument("--preset-dictionary", default=PRESET_DICTIONARY, help="archivo .lz78dict")
+    compress.add_argument("--workers", type=int, default=0,
+                          help="procesos para comprimir por bloques independientes (0 = un solo flujo)")
+    compress.add_argument("--block-chars", type=int, default=DEFAULT_BLOCK_CHARS,
+                          help="caracteres por bloque independiente (con --workers)")
+    compress.add_argument("--filter-bits", type=int, default=0,
+                          help="bits de los filtros de búsqueda por secuencia (con --workers)")
+    compress.set_defaults(handler=command_compress)
+    
+    decompress = commands.add_parser("decompress", help="descomprimir un archivo .lz78")
+    decompress.add_argument("source", help="archivo .lz78")
+    decompress.add_argument("-o", "--output", help="archivo de texto (por defecto el nombre original)")
+    decompress.add_argument("-f", "--force", action="store_true", help="sobrescribir la salida si existe")
+    decompress.add_argument("--preset-dictionary", default=PRESET_DICTIONARY, help="archivo .lz78dict")
+    decompress.add_argument("--workers", type=int, default=0,
+                            help="procesos para archivos con bloques independientes")
+    decompress.set_defaults(handler=command_decompress)
+    
+    info = commands.add_parser("info", help="mostrar el encabezado y los bloques de archivos .lz78")
+    info.add_argument("files", nargs="+")
+    info.set_defaults(handler=command_info)
+    
+    test = commands.add_parser("test", help="comprobar que archivos .lz78 se descomprimen sin errores")
+    test.add_argument("files", nargs="+")
+    test.add_argument("--preset-dictionary", default=PRESET_DICTIONARY, help="archivo .lz78dict")
+    test.set_defaults(handler=command_test)
+    
+    bench = commands.add_parser("bench", help="comparar codificadores con archivos de texto")
+    bench.add_argument("files", nargs="+")
+    add_compression_options(bench)
+    bench.add_argument("--entropy-coders", nargs="+", choices=ENTROPY_CODERS, default=list(ENTROPY_CODERS))
+    bench.add_argument("--preset-dictionary", default=PRESET_DICTIONARY, help="archivo .lz78dict")
+    bench.set_defaults(handler=command_bench)
+    
+    batch = commands.add_parser("batch", help="comprimir los archivos de texto de una carpeta y sus subcarpetas")
+    batch.add_argument("source", help="carpeta de entrada")
+    batch.add_argument("target", help="carpeta de los archivos .lz78 (misma estructura que la entrada)")
+    batch.add_argument("--include", action="append", metavar="PATRÓN",
+                       help="patrón glob de los archivos a comprimir, se puede repetir "
+                            f"(por defecto {' '.join(SUPPORTED_EXTENSIONS)})")
+    add_compression_options(batch, block_pairs=False)
+    batch.add_argument("--entropy-coder", choices=ENTROPY_CODERS, default=ENTROPY_CODER)
+    batch.add_argument("--preset-dictionary", default=PRESET_DICTIONARY, help="archivo .lz78dict")
+    batch.add_argument("--workers", type=int, default=0, help="procesos (0 = uno por CPU)")
+    batch.add_argument("--max-in-flight-mb", type=int, default=DEFAULT_MAX_IN_FLIGHT_BYTES >> 20,
+                       help="MB de archivos de entrada comprimiéndose a la vez")
+    batch.add_argument("--hash", action="store_true",
+                       help="decidir si un archivo cambió por su SHA-256 y no por la fecha de modificación")
+    batch.add_argument("-f", "--force", action="store_true", help="comprimir también los archivos al día")
+    batch.add_argument("--summary", help=f"resumen JSON (por defecto {SUMMARY_FILENAME} en la carpeta de salida)")
+    batch.set_defaults(handler=command_batch)
+    
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line; returns the exit code."""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (FileNotFoundError, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
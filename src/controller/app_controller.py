@@ -3,12 +3,17 @@ Application Controller - Coordinates Model and View
 """
 
 from PyQt5.QtWidgets import QFileDialog
-from typing import Optional
+from PyQt5.QtCore import QThreadPool
+from typing import Optional, Callable
 from pathlib import Path
 
+from config import (MAX_DICTIONARY_SIZE, DICTIONARY_FULL_POLICY, INDEX_CODING, LITERAL_CODING, ENTROPY_CODER,
+                    PRESET_DICTIONARY)
 from ..model import FileHandler
 from ..model.lz78_huffman_compressor import LZ78HuffmanCompressor
 from ..model.file_handler_binary_huffman import FileHandlerBinaryHuffman
+from ..model.preset_dictionary import PresetDictionary
+from .compression_worker import CompressionWorker
 
 
 class AppController:
@@ -16,11 +21,21 @@ class AppController:
     Main application controller.
     Handles communication between Model and View.
     Uses LZ78 + Huffman hybrid compression.
+    
+    Compression and decompression run in a CompressionWorker on a
+    QThreadPool thread, so the window keeps responding; the view shows
+    their progress and can cancel them.
     """
     
     def __init__(self, view):
         self.view = view
-        self.compressor = LZ78HuffmanCompressor()
+        # Preset dictionary used to compress, and to decompress the files that need it
+        self.preset_dictionary = PresetDictionary.load(PRESET_DICTIONARY) if PRESET_DICTIONARY else None
+        self.compressor = LZ78HuffmanCompressor(MAX_DICTIONARY_SIZE, DICTIONARY_FULL_POLICY,
+                                                INDEX_CODING, LITERAL_CODING, ENTROPY_CODER,
+                                                self.preset_dictionary)
+        # Decompression replays the dictionary settings stored in each .lz78 header
+        self.decompressor = LZ78HuffmanCompressor()
         self.file_handler = FileHandler()
         self.file_handler_binary = FileHandlerBinaryHuffman()
         
@@ -30,9 +45,14 @@ class AppController:
         self.compressed_data: Optional[list] = None
         self.dictionary: Optional[dict] = None
         self.huffman_codes: Optional[dict] = None
-        self.encoded_indices: Optional[str] = None
+        self.encoded_indices = None  # Packed Huffman bits (BitWriter)
         self.decompressed_text: Optional[str] = None
         
+        # Background operation (only one at a time)
+        self.thread_pool = QThreadPool.globalInstance()
+        self.worker: Optional[CompressionWorker] = None
+        self.disabled_buttons: list = []
+        
         # Connect signals
         self.connect_signals()
     
@@ -49,6 +69,77 @@ class AppController:
         # Decompression
         self.view.btn_decompress.clicked.connect(self.decompress_file)
         self.view.btn_save_decompressed.clicked.connect(self.save_decompressed_file)
+        
+        # Background operations
+        self.view.btn_cancel.clicked.connect(self.cancel_operation)
+    
+    def start_operation(self, task: Callable, message: str, total_bytes: int, total_phrases: int,
+                        on_finished: Callable, error_title: str):
+        """
+        Run a compression or decompression task in a background worker.
+        
+        Args:
+            task: Function called with a progress callback, returns the result
+            message: Status bar message shown while it runs
+            total_bytes: Bytes the task consumes (0 if unknown), for the progress bar
+            total_phrases: Phrases the task decodes, used when total_bytes is 0
+            on_finished: Called with the result on the GUI thread
+            error_title: Title of the error dialog if the task fails
+        """
+        # Desactivar los botones mientras el trabajador usa el estado del controlador
+        self.disabled_buttons = [
+            button for button in (self.view.btn_load_text, self.view.btn_load_compressed,
+                                  self.view.btn_compress, self.view.btn_save_compressed,
+                                  self.view.btn_decompress, self.view.btn_save_decompressed)
+            if button.isEnabled()
+        ]
+        for button in self.disabled_buttons:
+            button.setEnabled(False)
+        
+        def on_progress(processed_bytes: int, phrases: int):
+            if total_bytes:
+                percent = processed_bytes * 100 // total_bytes
+            else:
+                percent = phrases * 100 // max(total_phrases, 1)
+            self.view.show_progress(
+                f"{message} {processed_bytes / 1024:,.0f} KB, {phrases:,} frases", min(percent, 100)
+            )
+        
+        def on_failed(error: str, details: str):
+            self.finish_operation()
+            print(f"Error detallado:\n{details}")
+            self.view.show_error(error_title, f"{error}\n\nDetalles en consola.")
+        
+        def on_result(result):
+            self.finish_operation()
+            on_finished(result)
+        
+        self.worker = CompressionWorker(task)
+        self.worker.signals.progress.connect(on_progress)
+        self.worker.signals.finished.connect(on_result)
+        self.worker.signals.failed.connect(on_failed)
+        self.worker.signals.cancelled.connect(self.on_operation_cancelled)
+        self.view.show_progress(message, 0)
+        self.thread_pool.start(self.worker)
+    
+    def finish_operation(self):
+        """Restore the view once the background operation ends."""
+        self.worker = None
+        self.view.hide_progress()
+        for button in self.disabled_buttons:
+            button.setEnabled(True)
+        self.disabled_buttons = []
+    
+    def cancel_operation(self):
+        """Cancel the running compression or decompression."""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.view.btn_cancel.setEnabled(False)
+    
+    def on_operation_cancelled(self):
+        """Called when the worker stops after cancel_operation."""
+        self.finish_operation()
+        self.view.show_success("Operación cancelada")
     
     def load_text_file(self):
         """Load a text file for compression. Supports multiple text-based formats."""
@@ -79,7 +170,7 @@ class AppController:
             self.current_file_path = file_path
             
             # Update view
-            self.view.text_original.setPlainText(self.current_text)
+            self.view.text_original.open_file(file_path)
             self.view.file_path_label.setText(Path(file_path).name)
             self.view.btn_compress.setEnabled(True)
             
@@ -112,7 +203,13 @@ class AppController:
         try:
             # Load compressed file (LZ78 + Huffman hybrid)
             self.compressed_data, self.dictionary, self.huffman_codes, self.encoded_indices, original_filename = \
-                self.file_handler_binary.load_compressed_file(file_path)
+                self.file_handler_binary.load_compressed_file(file_path, self.preset_dictionary)
+            header = self.file_handler_binary.read_header(file_path)
+            self.decompressor = LZ78HuffmanCompressor(
+                header['max_dictionary_size'], header['dictionary_policy'], header['index_coding'],
+                header['literal_coding'], header['entropy_coder'],
+                self.preset_dictionary if header['dictionary_id'] is not None else None
+            )
             
             self.current_file_path = file_path
             
@@ -129,6 +226,8 @@ class AppController:
             self.view.text_compressed.setPlainText(compressed_display)
             self.view.file_path_label.setText(Path(file_path).name)
             self.view.btn_decompress.setEnabled(True)
+            # Los pares cargados ya no corresponden a current_text
+            self.view.btn_save_compressed.setEnabled(False)
             
             # Update dictionary display
             self.view.update_dictionary_display(self.dictionary)
@@ -146,47 +245,51 @@ class AppController:
             self.view.show_error("Error", f"Error inesperado: {str(e)}")
     
     def compress_file(self):
-        """Compress the loaded text file."""
+        """Compress the loaded text file in a background worker."""
         if not self.current_text:
             self.view.show_error("Sin Archivo", "Por favor carga un archivo de texto primero.")
             return
         
-        try:
+        text = self.current_text
+        compressor = self.compressor
+        filename = Path(self.current_file_path).name if self.current_file_path else 'temp.txt'
+        
+        def task(progress):
             # Perform hybrid compression (LZ78 + Huffman)
-            self.compressed_data, self.dictionary, self.huffman_codes, self.encoded_indices = \
-                self.compressor.compress(self.current_text)
-            
-            # Display compressed data
-            compressed_display = "Datos Comprimidos (Índice, Carácter):\n\n"
-            for idx, (index, char) in enumerate(self.compressed_data[:100]):  # Show first 100
-                compressed_display += f"({index}, '{char}') "
-                if (idx + 1) % 10 == 0:
-                    compressed_display += "\n"
-            
-            if len(self.compressed_data) > 100:
-                compressed_display += f"\n\n... ({len(self.compressed_data) - 100} entradas más)"
-            
-            self.view.text_compressed.setPlainText(compressed_display)
-            
-            # Update dictionary display
-            self.view.update_dictionary_display(self.dictionary)
-            
-            # Calculate and display statistics (hybrid compression)
-            filename = Path(self.current_file_path).name if self.current_file_path else 'temp.txt'
-            stats = self.compressor.get_statistics(
-                self.current_text, filename,
-                self.compressed_data, self.dictionary,
-                self.huffman_codes, self.encoded_indices
-            )
-            self.view.update_statistics(stats)
-            
-            # Enable save button
-            self.view.btn_save_compressed.setEnabled(True)
-            
-            self.view.show_success("¡Archivo comprimido exitosamente!")
-            
-        except Exception as e:
-            self.view.show_error("Error de Compresión", f"Error durante la compresión: {str(e)}")
+            result = compressor.compress(text, progress)
+            # Calculate statistics (hybrid compression)
+            stats = compressor.get_statistics(text, filename, *result)
+            return result, stats
+        
+        self.start_operation(task, "Comprimiendo...", len(text.encode('utf-8')), 0,
+                             self.on_compress_finished, "Error de Compresión")
+    
+    def on_compress_finished(self, result):
+        """Show the result of compress_file."""
+        (self.compressed_data, self.dictionary, self.huffman_codes, self.encoded_indices), stats = result
+        self.decompressor = self.compressor
+        
+        # Display compressed data
+        compressed_display = "Datos Comprimidos (Índice, Carácter):\n\n"
+        for idx, (index, char) in enumerate(self.compressed_data[:100]):  # Show first 100
+            compressed_display += f"({index}, '{char}') "
+            if (idx + 1) % 10 == 0:
+                compressed_display += "\n"
+        
+        if len(self.compressed_data) > 100:
+            compressed_display += f"\n\n... ({len(self.compressed_data) - 100} entradas más)"
+        
+        self.view.text_compressed.setPlainText(compressed_display)
+        
+        # Update dictionary display
+        self.view.update_dictionary_display(self.dictionary)
+        
+        self.view.update_statistics(stats)
+        
+        # Enable save button
+        self.view.btn_save_compressed.setEnabled(True)
+        
+        self.view.show_success("¡Archivo comprimido exitosamente!")
     
     def save_compressed_file(self):
         """Save compressed data to a .lz78 file."""
@@ -218,7 +321,14 @@ class AppController:
                 self.dictionary,
                 self.huffman_codes,
                 self.encoded_indices,
-                original_filename
+                original_filename,
+                self.compressor.max_dictionary_size,
+                self.compressor.dictionary_policy,
+                self.compressor.index_coding,
+                self.compressor.literal_coding,
+                self.compressor.entropy_coder,
+                self.compressor.preset_dictionary,
+                self.current_text
             )
             
             self.view.show_success(f"Archivo comprimido guardado: {Path(file_path).name}")
@@ -227,42 +337,44 @@ class AppController:
             self.view.show_error("Error al Guardar", f"Error al guardar archivo comprimido: {str(e)}")
     
     def decompress_file(self):
-        """Decompress the loaded .lz78 file."""
+        """Decompress the loaded .lz78 file in a background worker."""
         if not self.compressed_data or not self.dictionary:
             self.view.show_error("Sin Datos", "Por favor carga un archivo comprimido primero.")
             return
         
-        try:
+        decompressor = self.decompressor
+        compressed_data = self.compressed_data
+        dictionary = self.dictionary
+        huffman_codes = self.huffman_codes
+        encoded_indices = self.encoded_indices
+        filename = Path(self.current_file_path).stem + '.txt' if self.current_file_path else 'temp.txt'
+        
+        def task(progress):
             # Perform hybrid decompression (Huffman + LZ78)
-            self.decompressed_text = self.compressor.decompress(
-                self.compressed_data,
-                self.dictionary,
-                self.huffman_codes,
-                self.encoded_indices
-            )
-            
-            # Display decompressed text
-            self.view.text_decompressed.setPlainText(self.decompressed_text)
-            
-            # Enable save button
-            self.view.btn_save_decompressed.setEnabled(True)
-            
+            text = decompressor.decompress(compressed_data, dictionary, huffman_codes, encoded_indices, progress)
             # Update statistics with correct parameters
-            filename = Path(self.current_file_path).stem + '.txt' if self.current_file_path else 'temp.txt'
-            stats = self.compressor.get_statistics(
-                self.decompressed_text, filename,
-                self.compressed_data, self.dictionary,
-                self.huffman_codes, self.encoded_indices
-            )
-            self.view.update_statistics(stats)
-            
-            self.view.show_success("¡Archivo descomprimido exitosamente!")
-            
-        except Exception as e:
-            import traceback
-            error_details = traceback.format_exc()
-            print(f"Error de descompresión detallado:\n{error_details}")
-            self.view.show_error("Error de Descompresión", f"Error durante la descompresión: {str(e)}\n\nDetalles en consola.")
+            stats = decompressor.get_statistics(text, filename, compressed_data, dictionary,
+                                                huffman_codes, encoded_indices)
+            # El visor pagina los bytes UTF-8 del texto
+            return text, text.encode('utf-8'), stats
+        
+        # El tamaño de salida no se conoce: el progreso se mide en frases
+        self.start_operation(task, "Descomprimiendo...", 0, len(compressed_data),
+                             self.on_decompress_finished, "Error de Descompresión")
+    
+    def on_decompress_finished(self, result):
+        """Show the result of decompress_file."""
+        self.decompressed_text, decompressed_bytes, stats = result
+        
+        # Display decompressed text
+        self.view.text_decompressed.set_data(decompressed_bytes)
+        
+        # Enable save button
+        self.view.btn_save_decompressed.setEnabled(True)
+        
+        self.view.update_statistics(stats)
+        
+        self.view.show_success("¡Archivo descomprimido exitosamente!")
     
     def save_decompressed_file(self):
         """Save decompressed text to a file."""
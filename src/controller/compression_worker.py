@@ -0,0 +1,74 @@
+"""
+Compression Worker - Runs compression and decompression off the GUI thread
+"""
+
+import threading
+import traceback
+from typing import Callable, Any
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class OperationCancelled(Exception):
+    """Raised from the progress callback to abort a cancelled operation."""
+
+
+class WorkerSignals(QObject):
+    """
+    Signals of a CompressionWorker.
+    
+    They are emitted from the worker thread and delivered on the GUI
+    thread, where the controller updates the view.
+    """
+    
+    progress = pyqtSignal(int, int)  # UTF-8 bytes consumed or written, phrases emitted or decoded
+    finished = pyqtSignal(object)    # Result of the task
+    failed = pyqtSignal(str, str)    # Error message, traceback
+    cancelled = pyqtSignal()
+
+
+class CompressionWorker(QRunnable):
+    """
+    Runs a compression or decompression task in a QThreadPool thread.
+    
+    The task is called with a progress callback, to pass on to
+    LZ78HuffmanCompressor.compress/decompress (or any model function with
+    the same callback): every call emits the progress signal and, once
+    cancel() has been called, raises OperationCancelled so the task stops
+    at the next progress step.
+    """
+    
+    def __init__(self, task: Callable[[Callable[[int, int], None]], Any]):
+        super().__init__()
+        self.task = task
+        self.signals = WorkerSignals()
+        self._cancel_event = threading.Event()
+    
+    def cancel(self):
+        """Ask the task to stop at its next progress step."""
+        self._cancel_event.set()
+    
+    def is_cancelled(self) -> bool:
+        """Return True once cancel() has been called."""
+        return self._cancel_event.is_set()
+    
+    def report_progress(self, processed_bytes: int, phrases: int):
+        """Progress callback given to the task."""
+        if self._cancel_event.is_set():
+            raise OperationCancelled()
+        self.signals.progress.emit(processed_bytes, phrases)
+    
+    def run(self):
+        """Run the task and emit finished, failed or cancelled."""
+        try:
+            result = self.task(self.report_progress)
+        except OperationCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e), traceback.format_exc())
+        else:
+            # Una cancelación tras el último paso de progreso descarta el resultado
+            if self._cancel_event.is_set():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
@@ -13,10 +13,27 @@ Encode(message: str) -> Tuple[Dict[str, int], HuffmanNode, Dict[str, str], str]
     Executes the Huffman encoding process: counts character frequencies,
     builds the binary tree, generates symbol codes, and returns the encoded message.
 
-Decode(encodedMessage: str, codesDict: Dict[str, str]) -> str
+LengthLimitLoss(freqDict: Dict[Any, int], codesDict: Dict[Any, str]) -> Tuple[int, float]
+    Extra bits (and %) of a length-limited code, as built by
+    Encode(message, maxLength=15), over unrestricted Huffman.
+
+CanonicalCodes(codeLengths: Dict[Any, int]) -> Dict[Any, str]
+    Rebuilds canonical Huffman codes from code lengths alone
+    (Encode(message, canonical=True) produces such codes).
+
+EncodeBits(message: Iterable, codesDict: Dict[str, str]) -> BitWriter
+    Encodes a message with the given codes into a packed bit buffer.
+
+Decode(encodedMessage: Union[str, BitReader, BitWriter], codesDict: Dict[str, str]) -> str
     Decodes a Huffman-encoded binary message back into its original text
     using the provided code dictionary.
 
+TableDecode(encodedMessage: Union[str, BitReader, BitWriter], codesDict: Dict[str, str]) -> str
+    Same as Decode, using multi-bit lookup tables (DecodeTable) for speed.
+
+BitWriter / BitReader
+    Packed bit-level writer and reader used for the encoded messages.
+
 Metrics(freqDict: Dict[str, int], codesDict: Dict[str, str]) -> Dict[str, float]
     Calculates and returns the entropy, average code length, and efficiency
     of the Huffman code.
@@ -29,9 +46,10 @@ Load(filename: str) -> Tuple[Dict[str, str], str]
     from a .txt file previously generated with Save().
 """
 
-from .encoder.encoder import Encode
-from .decoder.decoder import Decode as Decode
+from .encoder.encoder import Encode, EncodeBits, CanonicalCodes, CodeLengths, LengthLimitLoss
+from .decoder.decoder import Decode as Decode, TableDecode, DecodeTable
+from .bitio.bitio import BitWriter, BitReader
 from .metrics.metrics import Metrics
 from .file.filemanager import SaveToTxt as Save, LoadFromTxt as Load
 
-__all__ = ["Encode", "Decode", "Metrics", "Save", "Load"]
+__all__ = ["Encode", "EncodeBits", "CanonicalCodes", "CodeLengths", "LengthLimitLoss", "Decode", "TableDecode", "DecodeTable", "BitWriter", "BitReader", "Metrics", "Save", "Load"]
@@ -0,0 +1,236 @@
+"""
+bitio.py
+--------
+
+This module provides packed bit-level writing and reading for Huffman
+encoded streams. Bits are kept in a bytearray (most significant bit
+first) and in an integer accumulator, never as '0'/'1' strings.
+
+Classes
+-------
+BitWriter
+    Appends codes of any length to a packed bit buffer.
+
+BitReader
+    Reads codes of any length from packed bytes.
+"""
+
+from itertools import chain
+from typing import Dict, Iterator, Tuple
+
+# Bits of every byte value, most significant first
+BYTE_BITS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple((byte >> shift) & 1 for shift in range(7, -1, -1)) for byte in range(256)
+)
+
+
+class BitWriter:
+    """
+    Packed bit buffer, written most significant bit first.
+
+    Bits are gathered in an integer accumulator and moved to a bytearray,
+    as whole bytes, once at least 32 are pending. len() returns the
+    number of bits written.
+    """
+
+    def __init__(self):
+        self.buffer: bytearray = bytearray()
+        self.accumulator: int = 0
+        self.pending: int = 0
+
+    def __len__(self) -> int:
+        return len(self.buffer) * 8 + self.pending
+
+    def Write(self, value: int, length: int) -> None:
+        """
+        Appends the `length` lowest bits of `value`.
+
+        Parameters
+        ----------
+        value : int
+            Bits to write, as an integer (value < 2 ** length).
+        length : int
+            Number of bits.
+        """
+        self.accumulator = (self.accumulator << length) | value
+        self.pending += length
+        if self.pending >= 32:
+            remainder = self.pending & 7
+            self.buffer += (self.accumulator >> remainder).to_bytes(self.pending >> 3, "big")
+            self.accumulator &= (1 << remainder) - 1
+            self.pending = remainder
+
+    def WriteBytes(self, data: bytes, bitCount: int) -> None:
+        """
+        Appends the first `bitCount` bits of packed `data`.
+
+        Parameters
+        ----------
+        data : bytes
+            Packed bits, most significant bit first.
+        bitCount : int
+            Number of valid bits in `data`.
+        """
+        byteCount = bitCount >> 3
+        if self.pending == 0:
+            self.buffer += data[:byteCount]
+        else:
+            chunkSize = 4096
+            for start in range(0, byteCount, chunkSize):
+                chunk = data[start:min(start + chunkSize, byteCount)]
+                self.Write(int.from_bytes(chunk, "big"), len(chunk) * 8)
+        remainder = bitCount & 7
+        if remainder:
+            self.Write(data[byteCount] >> (8 - remainder), remainder)
+
+    def WriteReader(self, reader: "BitReader") -> None:
+        """
+        Appends the remaining bits of a BitReader, consuming them.
+        """
+        head = min((8 - (reader.position & 7)) & 7, reader.Remaining())
+        if head:
+            self.Write(reader.Read(head), head)
+        remaining = reader.Remaining()
+        self.WriteBytes(reader.data[reader.position >> 3:], remaining)
+        reader.position = reader.bitCount
+
+    def ToBytes(self) -> bytes:
+        """
+        Returns the packed bits, the last byte padded with zeros.
+        """
+        if not self.pending:
+            return bytes(self.buffer)
+        byteCount = (self.pending + 7) >> 3
+        lastBytes = self.accumulator << (byteCount * 8 - self.pending)
+        return bytes(self.buffer) + lastBytes.to_bytes(byteCount, "big")
+
+    @classmethod
+    def FromBytes(cls, data: bytes, bitCount: int) -> "BitWriter":
+        """
+        Wraps already packed bits (for instance, read from a file).
+
+        Parameters
+        ----------
+        data : bytes
+            Packed bits, most significant bit first.
+        bitCount : int
+            Number of valid bits in `data`.
+
+        Returns
+        -------
+        BitWriter
+            Buffer holding exactly `bitCount` bits.
+        """
+        writer = cls()
+        writer.WriteBytes(data, bitCount)
+        return writer
+
+    @classmethod
+    def FromString(cls, bits: str) -> "BitWriter":
+        """
+        Packs a '0'/'1' string (as produced by the text format of Save).
+        """
+        writer = cls()
+        for start in range(0, len(bits), 32):
+            chunk = bits[start:start + 32]
+            writer.Write(int(chunk, 2), len(chunk))
+        return writer
+
+
+class BitReader:
+    """
+    Reads bits from packed bytes, most significant bit first.
+
+    Only the first `bitCount` bits of the data are readable; reading
+    past them raises EOFError.
+    """
+
+    def __init__(self, data: bytes, bitCount: int = None):
+        self.data: bytes = bytes(data)
+        self.bitCount: int = len(self.data) * 8 if bitCount is None else bitCount
+        self.position: int = 0
+
+    @classmethod
+    def FromWriter(cls, writer: BitWriter) -> "BitReader":
+        """
+        Reader over the bits of a BitWriter.
+        """
+        return cls(writer.ToBytes(), len(writer))
+
+    def Remaining(self) -> int:
+        """
+        Returns the number of bits left to read.
+        """
+        return self.bitCount - self.position
+
+    def Peek(self, length: int) -> int:
+        """
+        Returns the next `length` bits without consuming them. Bits past
+        the end of the stream are read as zeros.
+        """
+        start = self.position >> 3
+        end = (self.position + length + 7) >> 3
+        chunk = self.data[start:end]
+        window = int.from_bytes(chunk, "big") << ((end - start - len(chunk)) * 8)
+        shift = (end - start) * 8 - (self.position & 7) - length
+        return (window >> shift) & ((1 << length) - 1)
+
+    def Skip(self, length: int) -> None:
+        """
+        Consumes `length` bits.
+        """
+        if length > self.Remaining():
+            raise EOFError("Not enough bits left in the stream")
+        self.position += length
+
+    def Read(self, length: int) -> int:
+        """
+        Reads `length` bits as an integer.
+
+        Raises
+        ------
+        EOFError
+            If fewer than `length` bits are left.
+        """
+        value = self.Peek(length)
+        self.Skip(length)
+        return value
+
+    def IterBits(self) -> Iterator[int]:
+        """
+        Returns an iterator over the remaining bits (as 0/1 integers) and
+        consumes them. Whole bytes are expanded with the BYTE_BITS table.
+        """
+        position = self.position
+        end = self.bitCount
+        self.position = end
+        data = self.data
+
+        # Bits sueltos hasta el siguiente límite de byte
+        headEnd = min(end, (position + 7) & ~7)
+        head = [(data[bit >> 3] >> (7 - (bit & 7))) & 1 for bit in range(position, headEnd)]
+
+        firstByte = headEnd >> 3
+        lastByte = end >> 3 if end > headEnd else firstByte
+        middle = chain.from_iterable(map(BYTE_BITS.__getitem__, data[firstByte:lastByte]))
+
+        tailStart = max(headEnd, lastByte * 8)
+        tail = [(data[bit >> 3] >> (7 - (bit & 7))) & 1 for bit in range(tailStart, end)]
+        return chain(head, middle, tail)
+
+
+def CodesToInts(codesDict: Dict) -> Dict:
+    """
+    Converts '0'/'1' code strings to (value, length) pairs for BitWriter.Write.
+
+    Parameters
+    ----------
+    codesDict : Dict
+        Huffman dictionary mapping each symbol to its binary code string.
+
+    Returns
+    -------
+    Dict
+        Dictionary mapping each symbol to (code value, code length).
+    """
+    return {symbol: (int(code, 2), len(code)) for symbol, code in codesDict.items()}
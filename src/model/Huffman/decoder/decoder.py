@@ -6,22 +6,44 @@ This module provides the Huffman decoding functionality.
 
 Functions
 ---------
-Decode(encodedMessage: str, codesDict: Dict[str, str]) -> str
-    Decodes a binary Huffman-encoded string into its original text
-    using the provided Huffman code dictionary.
+Decode(encodedMessage: Union[str, BitReader, BitWriter], codesDict: Dict[str, str]) -> str
+    Decodes a Huffman-encoded message (packed bits or a binary string)
+    into its original text using the provided Huffman code dictionary.
+
+TableDecode(encodedMessage: Union[str, BitReader, BitWriter], codesDict: Dict[str, str]) -> str
+    Same result as Decode, using multi-bit lookup tables (DecodeTable):
+    one table lookup per symbol instead of one dictionary lookup per bit.
 """
 
-from typing import Dict
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    from ..bitio.bitio import BitReader, BitWriter
+except ImportError:
+    # Imported as a top-level package (Huffman directory on sys.path)
+    from bitio.bitio import BitReader, BitWriter
 
 
-def Decode(encodedMessage: str, codesDict: Dict[str, str]) -> str:
+def ToBitReader(encodedMessage: Union[str, BitReader, BitWriter]) -> BitReader:
+    """
+    Returns a BitReader over an encoded message given as a BitReader,
+    a BitWriter or a '0'/'1' string (text format of Save/Load).
     """
-    Decodes a binary Huffman-encoded string into its original text.
+    if isinstance(encodedMessage, str):
+        return BitReader.FromWriter(BitWriter.FromString(encodedMessage))
+    if hasattr(encodedMessage, "ToBytes"):
+        return BitReader.FromWriter(encodedMessage)
+    return encodedMessage
+
+
+def Decode(encodedMessage: Union[str, BitReader, BitWriter], codesDict: Dict[str, str]) -> str:
+    """
+    Decodes a Huffman-encoded message into its original text.
 
     Parameters
     ----------
-    encodedMessage : str
-        The binary string representing the encoded message.
+    encodedMessage : Union[str, BitReader, BitWriter]
+        The packed encoded bits, or the binary string representing them.
     codesDict : Dict[str, str]
         The Huffman dictionary mapping each symbol to its binary code.
 
@@ -30,17 +52,301 @@ def Decode(encodedMessage: str, codesDict: Dict[str, str]) -> str:
     str
         The decoded original message.
     """
-    # Invert dictionary: binary code → symbol
-    inverseDict: Dict[str, str] = {code: symbol for symbol, code in codesDict.items()}
+    return "".join(DecodeSymbols(encodedMessage, codesDict))
+
+
+def DecodeSymbols(encodedMessage: Union[str, BitReader, BitWriter], codesDict: Dict) -> List:
+    """
+    Decodes a Huffman-encoded message into its list of symbols.
+    Symbols can be of any type (characters, integers...).
 
-    decodedText: str = ""
-    buffer: str = ""
+    Parameters
+    ----------
+    encodedMessage : Union[str, BitReader, BitWriter]
+        The packed encoded bits, or the binary string representing them.
+    codesDict : Dict
+        The Huffman dictionary mapping each symbol to its binary code.
+
+    Returns
+    -------
+    List
+        The decoded symbols, in order.
+    """
+    # Invert dictionary: (code length, code value) → symbol
+    inverseDict: Dict[Tuple[int, int], object] = {
+        (len(code), int(code, 2)): symbol for symbol, code in codesDict.items()
+    }
+
+    decodedSymbols: List = []
+    value: int = 0
+    length: int = 0
 
     # Read bit by bit and match to symbols
-    for bit in encodedMessage:
-        buffer += bit
-        if buffer in inverseDict:
-            decodedText += inverseDict[buffer]
-            buffer = ""
+    for bit in ToBitReader(encodedMessage).IterBits():
+        value = (value << 1) | bit
+        length += 1
+        symbol = inverseDict.get((length, value))
+        if symbol is not None:
+            decodedSymbols.append(symbol)
+            value = 0
+            length = 0
+
+    return decodedSymbols
+
+
+DEFAULT_PRIMARY_BITS: int = 12
+MAX_SUBTABLE_BITS: int = 8
+
+
+class DecodeTable:
+    """
+    Multi-bit lookup tables for Huffman decoding.
+
+    The primary table is indexed by the next `primaryBits` bits of the
+    stream. Each entry is a tuple (symbol, codeLength, None) for codes of
+    at most `primaryBits` bits (repeated for every value of the bits that
+    follow the code), or (None, 0, subtable) for the prefixes of longer
+    codes, where subtable = (subtableBits, entries) is indexed by the
+    next `subtableBits` bits after the prefix. Subtables have the same
+    entries, so codes longer than a subtable go on to a deeper one; every
+    subtable has at most 2 ** MAX_SUBTABLE_BITS entries, so codes of any
+    length can be decoded. Unused entries (incomplete codes) are None.
+
+    Attributes
+    ----------
+    primaryBits : int
+        Bits used to index the primary table.
+    maxLength : int
+        Length of the longest code.
+    primary : List
+        Primary table (2 ** primaryBits entries).
+    """
+
+    def __init__(self, codesDict: Dict, primaryBits: int = DEFAULT_PRIMARY_BITS):
+        self.maxLength: int = max((len(code) for code in codesDict.values()), default=0)
+        self.primaryBits: int = max(1, min(primaryBits, self.maxLength))
+        self.runs: Optional[List[Tuple]] = None
+        self.runLengths: Optional[List[int]] = None
+
+        codes = [(symbol, len(code), int(code, 2)) for symbol, code in codesDict.items()]
+        self.primary: List = self.BuildTable(codes, 0, self.primaryBits)
+
+    def BuildTable(self, codes: List[Tuple[object, int, int]], consumed: int, tableBits: int) -> List:
+        """
+        Builds the table of the codes that share their first `consumed` bits.
+
+        Parameters
+        ----------
+        codes : List[Tuple[object, int, int]]
+            (symbol, codeLength, codeValue) of every code of the table.
+        consumed : int
+            Bits of the codes already used by the tables above.
+        tableBits : int
+            Bits used to index this table.
+
+        Returns
+        -------
+        List
+            The 2 ** tableBits entries of the table.
+        """
+        entries: List = [None] * (1 << tableBits)
+        longCodes: Dict[int, List[Tuple[object, int, int]]] = {}
+        for symbol, length, value in codes:
+            suffixLength = length - consumed
+            suffix = value & ((1 << suffixLength) - 1)
+            if suffixLength <= tableBits:
+                fill = tableBits - suffixLength
+                first = suffix << fill
+                for index in range(first, first + (1 << fill)):
+                    entries[index] = (symbol, length, None)
+            else:
+                prefix = suffix >> (suffixLength - tableBits)
+                longCodes.setdefault(prefix, []).append((symbol, length, value))
+
+        # Subtablas: una por cada prefijo de códigos largos, de a lo sumo MAX_SUBTABLE_BITS bits
+        for prefix, group in longCodes.items():
+            subtableBits = min(MAX_SUBTABLE_BITS, max(length for _, length, _ in group) - consumed - tableBits)
+            entries[prefix] = (None, 0, (subtableBits, self.BuildTable(group, consumed + tableBits, subtableBits)))
+        return entries
+
+    def DecodeInto(self, reader: BitReader, decodedSymbols: List, partial: bool = False) -> None:
+        """
+        Decodes the remaining bits of a reader, appending the symbols.
+
+        The bits are consumed through a small integer window refilled
+        eight bytes at a time. Each lookup in the primary table decodes
+        every code that fits whole in its `primaryBits` bits; codes longer
+        than that go through one or more subtables.
+
+        Parameters
+        ----------
+        reader : BitReader
+            Encoded bits; its position is moved past the decoded codes.
+        decodedSymbols : List
+            List where the decoded symbols are appended.
+        partial : bool
+            If True, an incomplete code at the end of the bits is left
+            unread (its bits stay in the reader) instead of being an error.
 
-    return decodedText
+        Raises
+        ------
+        ValueError
+            If the bits do not form a sequence of valid codes.
+        """
+        if self.maxLength == 0:
+            if reader.Remaining() and not partial:
+                raise ValueError("Invalid Huffman code in the encoded message")
+            return
+        if self.runs is None:
+            self.runs, self.runLengths = self.SymbolRuns()
+        runs = self.runs
+        runLengths = self.runLengths
+        tableBits = self.primaryBits
+        tableMask = (1 << tableBits) - 1
+        maxLength = self.maxLength
+        lookup = self.Lookup
+
+        # Ceros de relleno al final: la ventana siempre tiene maxLength bits
+        data = reader.data + bytes(maxLength // 8 + 16)
+        remaining = reader.Remaining()
+        bytePosition = reader.position >> 3
+        available = 8 - (reader.position & 7)
+        window = data[bytePosition] & ((1 << available) - 1)
+        bytePosition += 1
+        append = decodedSymbols.append
+        extend = decodedSymbols.extend
+
+        while remaining > 0:
+            while available < maxLength:
+                window = ((window & ((1 << available) - 1)) << 64) | int.from_bytes(data[bytePosition:bytePosition + 8], "big")
+                available += 64
+                bytePosition += 8
+
+            index = (window >> (available - tableBits)) & tableMask
+            length = runLengths[index]
+            if length and length <= remaining:
+                extend(runs[index])
+            else:
+                # Código largo (tabla secundaria) o final del mensaje: de a un símbolo
+                found = lookup(window, available)
+                if found is None or found[1] > remaining:
+                    if partial and remaining < maxLength:
+                        break
+                    raise ValueError("Invalid Huffman code in the encoded message")
+                symbol, length = found
+                append(symbol)
+            available -= length
+            remaining -= length
+
+        reader.position = reader.bitCount - remaining
+
+    def SymbolRuns(self) -> Tuple[List[Tuple], List[int]]:
+        """
+        Lists, for every primary entry, the codes that fit whole in its bits.
+
+        Returns
+        -------
+        Tuple[List[Tuple], List[int]]
+            (runs, runLengths): runs[i] is the tuple of symbols decoded
+            from the bits i, one after another, and runLengths[i] the bits
+            they use (0 if the first code is long or invalid).
+        """
+        runs: List[Tuple] = []
+        runLengths: List[int] = []
+        mask = (1 << self.primaryBits) - 1
+        for bits in range(1 << self.primaryBits):
+            symbols = []
+            used = 0
+            while used < self.primaryBits:
+                entry = self.primary[((bits << used) & mask)]
+                if entry is None or entry[2] is not None or used + entry[1] > self.primaryBits:
+                    break
+                symbols.append(entry[0])
+                used += entry[1]
+            runs.append(tuple(symbols))
+            runLengths.append(used)
+        return runs, runLengths
+
+    def Lookup(self, window: int, available: int) -> Optional[Tuple[object, int]]:
+        """
+        Finds the code at the start of a bit window.
+
+        Parameters
+        ----------
+        window : int
+            Next bits of the stream (the `available` lowest bits of the integer).
+        available : int
+            Number of bits in the window (at least maxLength).
+
+        Returns
+        -------
+        Optional[Tuple[object, int]]
+            (symbol, codeLength), or None if the bits are not a valid code.
+        """
+        tableBits = self.primaryBits
+        entries = self.primary
+        while True:
+            available -= tableBits
+            entry = entries[(window >> available) & ((1 << tableBits) - 1)]
+            if entry is None:
+                return None
+            if entry[2] is None:
+                return entry[0], entry[1]
+            tableBits, entries = entry[2]
+
+
+def TableDecodeSymbols(encodedMessage: Union[str, BitReader, BitWriter], codesDict: Dict,
+                       primaryBits: int = DEFAULT_PRIMARY_BITS) -> List:
+    """
+    Decodes a Huffman-encoded message into its list of symbols using
+    multi-bit lookup tables (see DecodeTable.DecodeInto).
+
+    Parameters
+    ----------
+    encodedMessage : Union[str, BitReader, BitWriter]
+        The packed encoded bits, or the binary string representing them.
+    codesDict : Dict
+        The Huffman dictionary mapping each symbol to its binary code.
+    primaryBits : int
+        Bits used to index the primary table.
+
+    Returns
+    -------
+    List
+        The decoded symbols, in order.
+
+    Raises
+    ------
+    ValueError
+        If the bits do not form a sequence of valid codes.
+    """
+    reader = ToBitReader(encodedMessage)
+    decodedSymbols: List = []
+    if not codesDict or reader.Remaining() == 0:
+        return decodedSymbols
+
+    DecodeTable(codesDict, primaryBits).DecodeInto(reader, decodedSymbols)
+    return decodedSymbols
+
+
+def TableDecode(encodedMessage: Union[str, BitReader, BitWriter], codesDict: Dict[str, str],
+                primaryBits: int = DEFAULT_PRIMARY_BITS) -> str:
+    """
+    Decodes a Huffman-encoded message into its original text using
+    multi-bit lookup tables. Same result as Decode, much faster.
+
+    Parameters
+    ----------
+    encodedMessage : Union[str, BitReader, BitWriter]
+        The packed encoded bits, or the binary string representing them.
+    codesDict : Dict[str, str]
+        The Huffman dictionary mapping each symbol to its binary code.
+    primaryBits : int
+        Bits used to index the primary table.
+
+    Returns
+    -------
+    str
+        The decoded original message.
+    """
+    return "".join(TableDecodeSymbols(encodedMessage, codesDict, primaryBits))
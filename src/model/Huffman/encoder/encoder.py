@@ -1,7 +1,12 @@
-from typing import Dict, Tuple, Any, List, Optional
+from typing import Dict, Tuple, Any, List, Optional, Iterable
 import heapq
 
 from .HuffmanNode import HuffmanNode
+try:
+    from ..bitio.bitio import BitWriter, CodesToInts
+except ImportError:
+    # Imported as a top-level package (Huffman directory on sys.path)
+    from bitio.bitio import BitWriter, CodesToInts
 
 def CountCharacters(text: str) -> Dict[str, int]:
     """
@@ -49,13 +54,20 @@ def BuildHuffmanTree(freqDict: Dict[str, int]) -> Optional[HuffmanNode]:
     return nodes[0]  # root node
 
 
-def GenerateHuffmanCodes(root: HuffmanNode) -> Dict[str, str]:
+def GenerateHuffmanCodes(root: HuffmanNode, canonical: bool = False) -> Dict[str, str]:
     """
     Traverses the Huffman tree and generates binary codes for each character.
     Left = '0', Right = '1'.
+    A tree with a single symbol gets the code '0' so every symbol costs at least one bit.
+    With canonical=True the codes are reassigned in canonical order (see
+    CanonicalCodes): same lengths, but fully determined by them.
     """
     codes: Dict[str, str] = {}
 
+    if root is not None and root.char is not None:
+        codes[root.char] = "0"
+        return codes
+
     def Traverse(node: Optional[HuffmanNode], currentCode: str):
         if node is None:
             return
@@ -66,23 +78,166 @@ def GenerateHuffmanCodes(root: HuffmanNode) -> Dict[str, str]:
         Traverse(node.right, currentCode + "1")
 
     Traverse(root, "")
+    if canonical:
+        return CanonicalCodes(CodeLengths(codes))
     return codes
 
 
-def Encode(text: str) -> Tuple[Dict[str, int], HuffmanNode, Dict[str, str]]:
+def CodeLengths(codesDict: Dict[Any, str]) -> Dict[Any, int]:
+    """
+    Returns the length in bits of every code of a Huffman dictionary.
+    """
+    return {symbol: len(code) for symbol, code in codesDict.items()}
+
+
+def CanonicalCodes(codeLengths: Dict[Any, int]) -> Dict[Any, str]:
+    """
+    Builds the canonical Huffman codes for the given code lengths.
+
+    Symbols are sorted by code length and then by symbol; each one gets
+    the next binary number of its length. Only the lengths are needed to
+    rebuild the codes, so they are all a file has to store.
+
+    Parameters
+    ----------
+    codeLengths : Dict[Any, int]
+        Code length of every symbol (symbols of one comparable type).
+
+    Returns
+    -------
+    Dict[Any, str]
+        Dictionary mapping each symbol to its binary code string, in
+        canonical order.
+
+    Raises
+    ------
+    ValueError
+        If the lengths do not describe a prefix code.
+    """
+    codes: Dict[Any, str] = {}
+    code = 0
+    previousLength = 0
+    for symbol, length in sorted(codeLengths.items(), key=lambda item: (item[1], item[0])):
+        if length < 1:
+            raise ValueError(f"Invalid code length for symbol {symbol!r}: {length}")
+        code <<= length - previousLength
+        if code >= 1 << length:
+            raise ValueError("Code lengths do not describe a prefix code")
+        codes[symbol] = format(code, f"0{length}b")
+        code += 1
+        previousLength = length
+    return codes
+
+
+def LimitCodeLengths(freqDict: Dict[Any, int], maxLength: int) -> Dict[Any, int]:
+    """
+    Computes optimal code lengths no longer than `maxLength` bits with the
+    package-merge algorithm.
+
+    Each symbol is a coin of width 2^-l for every level l = 1..maxLength.
+    Starting from the deepest level, the cheapest coins are paired into
+    packages that join the coins of the level above; the 2n - 2 cheapest
+    items of the top level are kept, and the code length of a symbol is
+    the number of kept items that contain it.
+
+    Parameters
+    ----------
+    freqDict : Dict[Any, int]
+        Frequency of every symbol.
+    maxLength : int
+        Maximum code length, in bits.
+
+    Returns
+    -------
+    Dict[Any, int]
+        Code length of every symbol (build the codes with CanonicalCodes).
+
+    Raises
+    ------
+    ValueError
+        If 2 ** maxLength is smaller than the number of symbols.
+    """
+    symbols = list(freqDict)
+    if len(symbols) > (1 << maxLength) or maxLength < 1:
+        raise ValueError(f"{len(symbols)} symbols do not fit in codes of at most {maxLength} bits")
+    if len(symbols) == 1:
+        return {symbols[0]: 1}
+
+    # Cada elemento es (peso, símbolos que contiene)
+    coins = sorted(((freq, (symbol,)) for symbol, freq in freqDict.items()), key=lambda item: item[0])
+    items = coins
+    for _ in range(maxLength - 1):
+        packages = [(first[0] + second[0], first[1] + second[1])
+                    for first, second in zip(items[0::2], items[1::2])]
+        items = sorted(coins + packages, key=lambda item: item[0])
+
+    lengths: Dict[Any, int] = {symbol: 0 for symbol in symbols}
+    for _, contained in items[:2 * len(symbols) - 2]:
+        for symbol in contained:
+            lengths[symbol] += 1
+    return lengths
+
+
+def BuildCodes(freqDict: Dict[Any, int], canonical: bool = False,
+               maxLength: Optional[int] = None) -> Tuple[Optional[HuffmanNode], Dict[Any, str]]:
+    """
+    Builds the Huffman tree and the codes for a frequency dictionary.
+
+    If `maxLength` is given and the tree is deeper, the code lengths are
+    recomputed with LimitCodeLengths; those codes are always canonical
+    and no longer match the (unrestricted) tree that is returned.
+    Returns a tuple: (tree root, codes dictionary)
+    """
+    treeRoot = BuildHuffmanTree(freqDict)
+    codesDict = GenerateHuffmanCodes(treeRoot, canonical)
+    if maxLength is not None and max(map(len, codesDict.values()), default=0) > maxLength:
+        codesDict = CanonicalCodes(LimitCodeLengths(freqDict, maxLength))
+    return treeRoot, codesDict
+
+
+def LengthLimitLoss(freqDict: Dict[Any, int], codesDict: Dict[Any, str]) -> Tuple[int, float]:
+    """
+    Compares a (length-limited) code with unrestricted Huffman coding.
+    Returns a tuple: (extra bits for the whole message, extra size in %)
+    """
+    optimalCodes = GenerateHuffmanCodes(BuildHuffmanTree(freqDict))
+    optimalBits = sum(freq * len(optimalCodes[symbol]) for symbol, freq in freqDict.items())
+    codeBits = sum(freq * len(codesDict[symbol]) for symbol, freq in freqDict.items())
+    extraBits = codeBits - optimalBits
+    return extraBits, (extraBits / optimalBits * 100) if optimalBits else 0.0
+
+
+def Encode(text: str, canonical: bool = False,
+           maxLength: Optional[int] = None) -> Tuple[Dict[str, int], HuffmanNode, Dict[str, str]]:
     """
     Main function that executes the 3 Huffman steps:
     1. Count characters
     2. Build tree
-    3. Generate codes
+    3. Generate codes (canonical codes if canonical=True, no longer than
+       maxLength bits if given; see BuildCodes and LengthLimitLoss)
     Returns a tuple: (frequency dictionary, tree root, codes dictionary)
     """
     freqDict = CountCharacters(text)
-    treeRoot = BuildHuffmanTree(freqDict)
-    codesDict = GenerateHuffmanCodes(treeRoot)
+    treeRoot, codesDict = BuildCodes(freqDict, canonical, maxLength)
     return freqDict, treeRoot, codesDict
 
 
+def EncodeBits(message: Iterable, codesDict: Dict[str, str], writer: Optional[BitWriter] = None) -> BitWriter:
+    """
+    Encodes a message with the given Huffman codes into a packed bit buffer.
+    Codes are written as integers, so the encoded message is never held as a
+    '0'/'1' string.
+    Returns the BitWriter (a new one unless `writer` is given).
+    """
+    if writer is None:
+        writer = BitWriter()
+    codes = CodesToInts(codesDict)
+    write = writer.Write
+    for symbol in message:
+        value, length = codes[symbol]
+        write(value, length)
+    return writer
+
 
 # Example test with message "CASA"
 if __name__ == "__main__":
@@ -90,4 +245,5 @@ if __name__ == "__main__":
     freq, tree, codes = Encode(text)
 
     print("Frequency Dictionary:", freq)
-    print("Generated Huffman Codes:", codes)
\ No newline at end of file
+    print("Generated Huffman Codes:", codes)
+    print("Encoded bits:", len(EncodeBits(text, codes)))
\ No newline at end of file
@@ -0,0 +1,238 @@
+"""
+Adaptive Huffman coder
+One-pass Huffman coding (algorithm FGK, with Vitter's handling of the
+sibling of the 0-node): the code tree is updated after every symbol, so
+nothing has to be counted in advance and no code table is stored
+"""
+
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from .entropy_coding import AdaptiveEncoder, AdaptiveDecoder, ESCAPE
+from .index_coding import phased_parameters, BitWriter
+
+
+class AdaptiveHuffmanTree:
+    """
+    Huffman tree that follows the counts of the symbols coded so far.
+    
+    The tree starts with only the 0-node (NYT, "not yet transmitted"),
+    whose code is the escape of a new symbol; add() splits it into a new
+    0-node and the leaf of the symbol. Nodes are kept in `order` by
+    non-increasing weight with siblings next to each other (sibling
+    property), so before a weight is incremented the node is swapped with
+    the first node of its weight and the tree stays a Huffman tree.
+    """
+    
+    def __init__(self):
+        self.parents: List[int] = [-1]
+        self.lefts: List[int] = [-1]     # -1: hoja
+        self.rights: List[int] = [-1]
+        self.weights: List[int] = [0]
+        self.symbols: List[Optional[Hashable]] = [ESCAPE]
+        self.order: List[int] = [0]      # Nodos de mayor a menor peso; la raíz primero
+        self.positions: List[int] = [0]  # Posición de cada nodo en `order`
+        self.leaves: Dict[Hashable, int] = {}
+        self.root = 0
+        self.nyt = 0
+    
+    def code(self, node: int) -> Tuple[int, int]:
+        """Code of a node as (value, length), root to node."""
+        parents = self.parents
+        rights = self.rights
+        value = 0
+        length = 0
+        parent = parents[node]
+        while parent != -1:
+            if rights[parent] == node:
+                value |= 1 << length
+            length += 1
+            node = parent
+            parent = parents[node]
+        return value, length
+    
+    def add(self, symbol: Hashable) -> None:
+        """Register a symbol coded after an escape (splits the 0-node)."""
+        nyt = self.nyt
+        leaf = len(self.parents)
+        new_nyt = leaf + 1
+        self.parents += [nyt, nyt]
+        self.lefts += [-1, -1]
+        self.rights += [-1, -1]
+        self.weights += [0, 0]
+        self.symbols += [symbol, ESCAPE]
+        self.positions += [len(self.order), len(self.order) + 1]
+        self.order += [leaf, new_nyt]
+        self.lefts[nyt] = new_nyt
+        self.rights[nyt] = leaf
+        self.leaves[symbol] = leaf
+        self.nyt = new_nyt
+        self.update(leaf)
+    
+    def _block_leader(self, node: int) -> int:
+        """First node in `order` with the weight of `node`."""
+        weights = self.weights
+        order = self.order
+        weight = weights[node]
+        # Búsqueda binaria: antes de `node` el orden está intacto (solo cambian sus descendientes)
+        low, high = 0, self.positions[node]
+        while low < high:
+            middle = (low + high) >> 1
+            if weights[order[middle]] > weight:
+                low = middle + 1
+            else:
+                high = middle
+        return order[low]
+    
+    def _swap(self, a: int, b: int) -> None:
+        """Exchange two nodes (and their subtrees); neither is an ancestor of the other."""
+        parents = self.parents
+        parent_a = parents[a]
+        parent_b = parents[b]
+        a_is_left = self.lefts[parent_a] == a
+        b_is_left = self.lefts[parent_b] == b
+        if a_is_left:
+            self.lefts[parent_a] = b
+        else:
+            self.rights[parent_a] = b
+        if b_is_left:
+            self.lefts[parent_b] = a
+        else:
+            self.rights[parent_b] = a
+        parents[a] = parent_b
+        parents[b] = parent_a
+        
+        positions = self.positions
+        position_a = positions[a]
+        position_b = positions[b]
+        self.order[position_a] = b
+        self.order[position_b] = a
+        positions[a] = position_b
+        positions[b] = position_a
+    
+    def update(self, leaf: int) -> None:
+        """Count one more occurrence of the symbol of `leaf`."""
+        node = leaf
+        parent = self.parents[node]
+        weights = self.weights
+        if parent != -1 and self.parents[self.nyt] == parent:
+            # Hermana del nodo 0: su padre tiene su mismo peso y es el único
+            # nodo interno de ese peso, así que se intercambia con la primera
+            # hoja del bloque
+            leader = self._block_leader(node)
+            if leader == parent:
+                leader = self.order[self.positions[parent] + 1]
+            if leader != node:
+                self._swap(node, leader)
+            weights[node] += 1
+            node = self.parents[node]
+        
+        while node != -1:
+            leader = self._block_leader(node)
+            if leader != node:
+                self._swap(node, leader)
+            weights[node] += 1
+            node = self.parents[node]
+
+
+class AdaptiveHuffmanEncoder(AdaptiveEncoder):
+    """
+    Adaptive Huffman encoder.
+    
+    Codes are packed into a BitWriter as soon as the symbol is known, but
+    the bytes are only returned by finish(): every section of a block is
+    stored after its length, so output is per block, as with the other
+    coders. Uniform values use a phased-in binary code and raw bits are
+    written as they are.
+    """
+    
+    def __init__(self):
+        self.writer = BitWriter()
+    
+    def new_model(self) -> AdaptiveHuffmanTree:
+        return AdaptiveHuffmanTree()
+    
+    def encode(self, model: AdaptiveHuffmanTree, symbol: Hashable) -> bool:
+        leaf = model.leaves.get(symbol)
+        if leaf is None:
+            self.writer.Write(*model.code(model.nyt))
+            return False
+        self.writer.Write(*model.code(leaf))
+        model.update(leaf)
+        return True
+    
+    def encode_uniform(self, value: int, count: int) -> None:
+        bits, short = phased_parameters(count)
+        if value < short:
+            self.writer.Write(value, bits)
+        else:
+            self.writer.Write(value + short, bits + 1)
+    
+    def encode_bits(self, value: int, bits: int) -> None:
+        self.writer.Write(value, bits)
+    
+    def finish(self) -> bytes:
+        return self.writer.ToBytes()
+
+
+class AdaptiveHuffmanDecoder(AdaptiveDecoder):
+    """
+    Decoder for the bits written by AdaptiveHuffmanEncoder.
+    
+    Bytes are pulled on demand with `read(size) -> bytes`, READ_SIZE at a
+    time; missing bits at the end of the data are read as zeros.
+    """
+    
+    READ_SIZE = 4096
+    
+    def __init__(self, read: Callable[[int], bytes]):
+        self.read = read
+        self.buffer = b''
+        self.buffer_pos = 0
+        self.current = 0
+        self.bits_left = 0
+    
+    def new_model(self) -> AdaptiveHuffmanTree:
+        return AdaptiveHuffmanTree()
+    
+    def _next_byte(self) -> int:
+        if self.buffer_pos >= len(self.buffer):
+            self.buffer = self.read(self.READ_SIZE) or bytes(1)
+            self.buffer_pos = 0
+        byte = self.buffer[self.buffer_pos]
+        self.buffer_pos += 1
+        return byte
+    
+    def decode(self, model: AdaptiveHuffmanTree) -> Optional[Hashable]:
+        lefts = model.lefts
+        rights = model.rights
+        node = model.root
+        # Bajar desde la raíz bit a bit hasta una hoja
+        while lefts[node] != -1:
+            if not self.bits_left:
+                self.current = self._next_byte()
+                self.bits_left = 8
+            self.bits_left -= 1
+            node = rights[node] if (self.current >> self.bits_left) & 1 else lefts[node]
+        if node == model.nyt:
+            return ESCAPE
+        model.update(node)
+        return model.symbols[node]
+    
+    def decode_uniform(self, count: int) -> int:
+        bits, short = phased_parameters(count)
+        value = self.decode_bits(bits)
+        if value < short:
+            return value
+        return ((value << 1) | self.decode_bits(1)) - short
+    
+    def decode_bits(self, bits: int) -> int:
+        value = 0
+        while bits:
+            if not self.bits_left:
+                self.current = self._next_byte()
+                self.bits_left = 8
+            take = min(bits, self.bits_left)
+            self.bits_left -= take
+            value = (value << take) | ((self.current >> self.bits_left) & ((1 << take) - 1))
+            bits -= take
+        return value
@@ -0,0 +1,126 @@
+"""
+N-gram Bloom filters of compressed blocks
+Every block of an indexed .lz78 file can store a Bloom filter of the short
+byte sequences of its text, so a search can skip the blocks that cannot
+contain the pattern without decoding them
+"""
+
+import zlib
+from typing import Iterable, Set
+
+FILTER_NGRAM = 4            # Longest byte sequence stored in the filters
+FILTER_HASHES = 2           # Bits set per byte sequence
+DEFAULT_FILTER_BITS = 4     # Filter bits per distinct byte sequence of a block
+
+# Prefijos de las secuencias del principio y del final del bloque (nunca
+# aparecen en UTF-8, así que no se confunden con el texto)
+START_TAG = b'\xfe'
+END_TAG = b'\xff'
+
+
+def block_ngrams(data: bytes) -> Set[bytes]:
+    """
+    Distinct byte sequences of 1 to FILTER_NGRAM bytes of a text.
+    
+    Args:
+        data: UTF-8 text of a block
+    
+    Returns:
+        Set with every substring of `data` up to FILTER_NGRAM bytes long
+    """
+    grams = set()
+    if len(data) < FILTER_NGRAM:
+        for length in range(1, len(data) + 1):
+            grams.update(data[i:i + length] for i in range(len(data) - length + 1))
+        return grams
+    
+    # Las secuencias cortas son prefijos de las largas, salvo al final del texto
+    longest = {data[i:i + FILTER_NGRAM] for i in range(len(data) - FILTER_NGRAM + 1)}
+    grams.update(longest)
+    for length in range(1, FILTER_NGRAM):
+        grams.update(gram[:length] for gram in longest)
+        grams.update(data[i:i + length] for i in range(len(data) - FILTER_NGRAM + 1, len(data) - length + 1))
+    return grams
+
+
+def pattern_ngrams(piece: bytes) -> Iterable[bytes]:
+    """Sequences that a block containing `piece` must have in its filter."""
+    if len(piece) <= FILTER_NGRAM:
+        return [piece]
+    return {piece[i:i + FILTER_NGRAM] for i in range(len(piece) - FILTER_NGRAM + 1)}
+
+
+class BlockFilter:
+    """
+    Bloom filter of the byte sequences of one block.
+    
+    Each sequence sets FILTER_HASHES bits chosen by double hashing of a
+    CRC-32 and an Adler-32 value, so the filters written by one process
+    can be read by any other. The first and last FILTER_NGRAM bytes of the
+    block are also stored, tagged, for occurrences that cross a block
+    boundary. The checks can give false positives (the block is decoded
+    for nothing) but never false negatives.
+    """
+    
+    def __init__(self, bits: bytes):
+        self.bits = bits
+        self.size = len(bits) * 8
+    
+    @classmethod
+    def from_text(cls, data: bytes, bits_per_ngram: int = DEFAULT_FILTER_BITS) -> 'BlockFilter':
+        """
+        Build the filter of a block.
+        
+        Args:
+            data: UTF-8 text of the block
+            bits_per_ngram: Filter bits per distinct byte sequence
+        
+        Returns:
+            Filter with every sequence of block_ngrams(data) and the
+            sequences at both ends of the block
+        """
+        grams = block_ngrams(data)
+        for length in range(1, min(len(data), FILTER_NGRAM) + 1):
+            grams.add(START_TAG + data[:length])
+            grams.add(END_TAG + data[-length:])
+        size = max(8, (len(grams) * bits_per_ngram + 7) // 8 * 8)
+        bits = bytearray(size // 8)
+        for gram in grams:
+            for position in cls._positions(gram, size):
+                bits[position >> 3] |= 1 << (position & 7)
+        return cls(bytes(bits))
+    
+    @staticmethod
+    def _positions(gram: bytes, size: int) -> Iterable[int]:
+        """Bits of the filter set by one byte sequence."""
+        first = zlib.crc32(gram)
+        step = zlib.adler32(gram) | 1
+        return [(first + i * step) % size for i in range(FILTER_HASHES)]
+    
+    def _has(self, gram: bytes) -> bool:
+        """Whether all the bits of a sequence are set."""
+        bits = self.bits
+        for position in self._positions(gram, self.size):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+    
+    def might_contain(self, piece: bytes) -> bool:
+        """
+        Whether the block can contain `piece`.
+        
+        Args:
+            piece: Non-empty bytes
+        
+        Returns:
+            False only if the block does not contain `piece`
+        """
+        return all(self._has(gram) for gram in pattern_ngrams(piece))
+    
+    def might_start_with(self, piece: bytes) -> bool:
+        """Whether the block can start with `piece` (non-empty bytes)."""
+        return self._has(START_TAG + piece[:FILTER_NGRAM]) and self.might_contain(piece)
+    
+    def might_end_with(self, piece: bytes) -> bool:
+        """Whether the block can end with `piece` (non-empty bytes)."""
+        return self._has(END_TAG + piece[-FILTER_NGRAM:]) and self.might_contain(piece)
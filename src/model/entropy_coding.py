@@ -0,0 +1,288 @@
+"""
+Entropy coders for LZ78 + Huffman
+Common interface of the adaptive entropy coders, and the coding of the
+LZ78 pairs (indices and literals) with any of them
+"""
+
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from .index_coding import (LiveDictionarySize, index_to_symbol, symbol_base,
+                           INDEX_CODING_TEXT, INDEX_CODING_PHASED)
+from .literal_coding import LiteralContexts, LITERAL_CODING_RAW, LITERAL_CODING_CONTEXT
+
+# Entropy coders. The position in ENTROPY_CODERS is the code stored in the
+# .lz78 header.
+ENTROPY_CODER_HUFFMAN = 'huffman'  # Static two-pass Huffman, code tables in every block
+ENTROPY_CODER_RANGE = 'range'      # Adaptive range coder (range_coder.py), no code tables
+ENTROPY_CODER_ADAPTIVE_HUFFMAN = 'adaptive_huffman'  # One-pass Huffman (adaptive_huffman.py), no code tables
+ENTROPY_CODERS = (ENTROPY_CODER_HUFFMAN, ENTROPY_CODER_RANGE, ENTROPY_CODER_ADAPTIVE_HUFFMAN)
+
+# Símbolo devuelto por AdaptiveDecoder.decode() para un símbolo nuevo
+ESCAPE = None
+
+BUCKET_SYMBOL_BITS = 6  # Bits de un símbolo de cubeta nuevo (índices de hasta 32 bits)
+
+
+class AdaptiveEncoder(ABC):
+    """
+    Interface of the adaptive entropy encoders.
+    
+    Symbols are coded with adaptive models created by new_model(): a
+    model learns the symbols as they are coded, so nothing has to be
+    counted in advance and no code table is stored. A symbol not seen yet
+    by a model is coded as an escape; the caller then codes it some other
+    way and registers it with model.add(symbol). Every AdaptiveEncoder
+    has a matching AdaptiveDecoder that reads its output.
+    """
+    
+    @abstractmethod
+    def new_model(self):
+        """Create an empty adaptive model (only the escape symbol)."""
+    
+    @abstractmethod
+    def encode(self, model, symbol: Hashable) -> bool:
+        """
+        Code a symbol with a model and update the model.
+        
+        Returns:
+            False if the symbol was new to the model (an escape was coded)
+        """
+    
+    @abstractmethod
+    def encode_uniform(self, value: int, count: int) -> None:
+        """Code a value in [0, count) with all the values equally likely."""
+    
+    @abstractmethod
+    def encode_bits(self, value: int, bits: int) -> None:
+        """Code the `bits` low bits of a value, as they are."""
+    
+    @abstractmethod
+    def finish(self) -> bytes:
+        """Flush the encoder and return all its output."""
+
+
+class AdaptiveDecoder(ABC):
+    """
+    Interface of the adaptive entropy decoders (see AdaptiveEncoder).
+    
+    Decoders are created with `read(size) -> bytes`, which returns the
+    next bytes of the encoder output.
+    """
+    
+    @abstractmethod
+    def new_model(self):
+        """Create an empty adaptive model (only the escape symbol)."""
+    
+    @abstractmethod
+    def decode(self, model) -> Optional[Hashable]:
+        """Decode a symbol with a model and update it; ESCAPE for a new symbol."""
+    
+    @abstractmethod
+    def decode_uniform(self, count: int) -> int:
+        """Decode a value written by encode_uniform()."""
+    
+    @abstractmethod
+    def decode_bits(self, bits: int) -> int:
+        """Decode a value written by encode_bits()."""
+
+
+def adaptive_coder(entropy_coder: str) -> Tuple[type, type]:
+    """
+    Encoder and decoder classes of an adaptive entropy coder.
+    
+    Raises:
+        ValueError: If the entropy coder is unknown or not adaptive
+    """
+    from .range_coder import RangeEncoder, RangeDecoder
+    from .adaptive_huffman import AdaptiveHuffmanEncoder, AdaptiveHuffmanDecoder
+    
+    coders = {ENTROPY_CODER_RANGE: (RangeEncoder, RangeDecoder),
+              ENTROPY_CODER_ADAPTIVE_HUFFMAN: (AdaptiveHuffmanEncoder, AdaptiveHuffmanDecoder)}
+    if entropy_coder not in coders:
+        raise ValueError(f"Not an adaptive entropy coder: {entropy_coder}")
+    return coders[entropy_coder]
+
+
+def check_codings(entropy_coder: str, index_coding: str) -> None:
+    """
+    Check that an index coding can be used with an entropy coder.
+    
+    Raises:
+        ValueError: If the entropy coder is unknown, or it is adaptive and
+            the index coding is INDEX_CODING_TEXT (Huffman only)
+    """
+    if entropy_coder not in ENTROPY_CODERS:
+        raise ValueError(f"Unknown entropy coder: {entropy_coder}")
+    if entropy_coder != ENTROPY_CODER_HUFFMAN and index_coding == INDEX_CODING_TEXT:
+        raise ValueError(f"Index coding '{index_coding}' needs the Huffman entropy coder")
+
+
+def _encode_raw_char(encoder: AdaptiveEncoder, char: str) -> None:
+    for byte in char.encode('utf-8'):
+        encoder.encode_bits(byte, 8)
+
+
+def _decode_raw_char(decoder: AdaptiveDecoder) -> str:
+    lead = decoder.decode_bits(8)
+    # El primer byte UTF-8 indica cuántos bytes siguen
+    length = 1 if lead < 0x80 else 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+    data = bytes([lead] + [decoder.decode_bits(8) for _ in range(length - 1)])
+    return data.decode('utf-8')
+
+
+def encode_pairs(pairs: List[Tuple[int, str]], entropy_coder: str,
+                 index_coding: str, literal_coding: str,
+                 live_size: Optional[LiveDictionarySize] = None,
+                 contexts: Optional[LiteralContexts] = None) -> Tuple[bytes, bytes]:
+    """
+    Code the indices and the literals of a block with an adaptive coder.
+    
+    The models start empty in every block. Indices are coded as
+    bucket symbols + raw extra bits (INDEX_CODING_SYMBOL) or uniformly
+    among the phrases of the live dictionary (INDEX_CODING_PHASED).
+    Literals are coded as UTF-8 bytes (LITERAL_CODING_RAW), with an
+    order-0 model (LITERAL_CODING_HUFFMAN) or with a model per order-1
+    context that escapes to the order-0 model (LITERAL_CODING_CONTEXT);
+    a character new to the order-0 model is coded as UTF-8 bytes.
+    
+    Args:
+        pairs: (index, char) pairs of the block
+        entropy_coder: Adaptive entropy coder (one of ENTROPY_CODERS)
+        index_coding: INDEX_CODING_SYMBOL or INDEX_CODING_PHASED
+        literal_coding: One of literal_coding.LITERAL_CODINGS
+        live_size: Dictionary size of the file, shared by all its blocks
+            (phased coding; default: empty unbounded dictionary)
+        contexts: Literal contexts of the file, shared by all its blocks
+            (required with LITERAL_CODING_CONTEXT)
+    
+    Returns:
+        Tuple of (encoded indices, encoded literals)
+    """
+    encoder_class, _ = adaptive_coder(entropy_coder)
+    check_codings(entropy_coder, index_coding)
+    if literal_coding == LITERAL_CODING_CONTEXT and contexts is None:
+        raise ValueError("Context literal coding needs the literal contexts of the file")
+    if live_size is None:
+        live_size = LiveDictionarySize()
+    
+    index_encoder: AdaptiveEncoder = encoder_class()
+    literal_encoder: AdaptiveEncoder = encoder_class()
+    index_model = index_encoder.new_model()
+    literal_model = literal_encoder.new_model()
+    context_models: Dict[str, object] = {}
+    phased = index_coding == INDEX_CODING_PHASED
+    
+    for index, char in pairs:
+        if phased:
+            size = live_size.size
+            if index > size or index < 0:
+                raise ValueError(f"Index {index} is not in a dictionary of {size} phrases")
+            index_encoder.encode_uniform(index, size + 1)
+            live_size.advance()
+        else:
+            symbol, extra_bits, extra_value = index_to_symbol(index)
+            if not index_encoder.encode(index_model, symbol):
+                index_encoder.encode_bits(symbol, BUCKET_SYMBOL_BITS)
+                index_model.add(symbol)
+            index_encoder.encode_bits(extra_value, extra_bits)
+        
+        if literal_coding == LITERAL_CODING_RAW:
+            _encode_raw_char(literal_encoder, char)
+            continue
+        if literal_coding == LITERAL_CODING_CONTEXT:
+            context = contexts.context(index)
+            contexts.update(index, char)
+            model = context_models.get(context)
+            if model is None:
+                model = context_models[context] = literal_encoder.new_model()
+            if literal_encoder.encode(model, char):
+                continue
+            model.add(char)
+        # Orden 0 y, si el carácter es nuevo, sus bytes UTF-8
+        if not literal_encoder.encode(literal_model, char):
+            _encode_raw_char(literal_encoder, char)
+            literal_model.add(char)
+    
+    return index_encoder.finish(), literal_encoder.finish()
+
+
+class PairDecoder:
+    """
+    Sequential decoder for the indices and literals written by encode_pairs.
+    
+    Both streams are pulled on demand with their own `read(size) ->
+    bytes`, so a block never has to be loaded whole.
+    """
+    
+    def __init__(self, entropy_coder: str, index_read: Callable[[int], bytes],
+                 literal_read: Callable[[int], bytes],
+                 index_coding: str, literal_coding: str,
+                 live_size: Optional[LiveDictionarySize] = None,
+                 contexts: Optional[LiteralContexts] = None):
+        _, decoder_class = adaptive_coder(entropy_coder)
+        check_codings(entropy_coder, index_coding)
+        if literal_coding == LITERAL_CODING_CONTEXT and contexts is None:
+            raise ValueError("Context literal coding needs the literal contexts of the file")
+        
+        self.index_decoder: AdaptiveDecoder = decoder_class(index_read)
+        self.literal_decoder: AdaptiveDecoder = decoder_class(literal_read)
+        self.index_model = self.index_decoder.new_model()
+        self.literal_model = self.literal_decoder.new_model()
+        self.context_models: Dict[str, object] = {}
+        self.phased = index_coding == INDEX_CODING_PHASED
+        self.literal_coding = literal_coding
+        self.live_size = live_size if live_size is not None else LiveDictionarySize()
+        self.contexts = contexts
+    
+    def _decode_index(self) -> int:
+        decoder = self.index_decoder
+        if self.phased:
+            index = decoder.decode_uniform(self.live_size.size + 1)
+            self.live_size.advance()
+            return index
+        
+        symbol = decoder.decode(self.index_model)
+        if symbol is ESCAPE:
+            symbol = decoder.decode_bits(BUCKET_SYMBOL_BITS)
+            self.index_model.add(symbol)
+        base, extra_bits = symbol_base(symbol)
+        return base + decoder.decode_bits(extra_bits)
+    
+    def _decode_literal(self, index: int) -> str:
+        decoder = self.literal_decoder
+        if self.literal_coding == LITERAL_CODING_RAW:
+            return _decode_raw_char(decoder)
+        
+        model = None
+        if self.literal_coding == LITERAL_CODING_CONTEXT:
+            context = self.contexts.context(index)
+            model = self.context_models.get(context)
+            if model is None:
+                model = self.context_models[context] = decoder.new_model()
+            char = decoder.decode(model)
+            if char is not ESCAPE:
+                self.contexts.update(index, char)
+                return char
+        
+        char = decoder.decode(self.literal_model)
+        if char is ESCAPE:
+            char = _decode_raw_char(decoder)
+            self.literal_model.add(char)
+        if model is not None:
+            model.add(char)
+            self.contexts.update(index, char)
+        return char
+    
+    def decode(self, count: int) -> List[Tuple[int, str]]:
+        """
+        Decode the next `count` pairs.
+        
+        Raises:
+            ValueError: If the data is corrupted (invalid UTF-8 literal)
+        """
+        pairs = []
+        for _ in range(count):
+            index = self._decode_index()
+            pairs.append((index, self._decode_literal(index)))
+        return pairs
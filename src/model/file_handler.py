@@ -72,7 +72,7 @@ class FileHandler:
         data = {
             'original_filename': original_filename,
             'compressed_data': compressed_data,
-            'dictionary': dictionary,
+            'dictionary': dict(dictionary),
             'version': '1.0'
         }
         
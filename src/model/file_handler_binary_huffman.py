@@ -3,126 +3,1432 @@ Binary File Handler for LZ78 + Huffman hybrid compression
 Optimized binary format with Huffman encoding support
 """
 
+import io
+import math
 import struct
-import pickle
+import zlib
+from collections import Counter
 from pathlib import Path
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Optional, BinaryIO, Iterator, NamedTuple
+
+from .lz78_compressor import LZ78Compressor, PhraseTrie, DICTIONARY_POLICIES, POLICY_FREEZE
+from .index_coding import (IndexDecoder, LiveDictionarySize, encode_indices, decode_indices, INDEX_CODINGS,
+                           INDEX_CODING_TEXT, INDEX_CODING_SYMBOL, INDEX_CODING_PHASED)
+from .literal_coding import (LiteralContexts, LiteralDecoder, encode_literals, FALLBACK_TABLE,
+                             LITERAL_CODINGS, LITERAL_CODING_RAW, LITERAL_CODING_HUFFMAN,
+                             LITERAL_CODING_CONTEXT)
+from .entropy_coding import (PairDecoder, encode_pairs, check_codings, ENTROPY_CODERS,
+                             ENTROPY_CODER_HUFFMAN)
+from .preset_dictionary import PresetDictionary
+
+# Import Huffman functions with absolute paths
+import sys
+import os
+huffman_path = os.path.join(os.path.dirname(__file__), 'Huffman')
+if huffman_path not in sys.path:
+    sys.path.insert(0, huffman_path)
+
+from bitio.bitio import BitReader, BitWriter
+from encoder.encoder import CanonicalCodes, CodeLengths
+
+PAIR_BATCH_SIZE = 4096  # Pairs yielded at a time by iter_pairs
+
+# Header flags
+FLAG_INDEPENDENT_BLOCKS = 0x01  # Every block has its own dictionary; block index after the end block
+FLAG_BLOCK_FILTERS = 0x02       # Block index with an n-gram filter per block
+FLAG_PRESET_DICTIONARY = 0x04   # The dictionary starts from a preset dictionary
+
+
+class PairBatch(NamedTuple):
+    """
+    Decoded pairs of (part of) a block, as yielded by the iter_* methods.
+    
+    A coded block (FileHandlerBinaryHuffman.BLOCK_LZ78_HUFFMAN) has its
+    (index, char) pairs in `pairs`. A stored block (BLOCK_STORED) has its
+    text in `text` instead: its pairs are parsed again by the LZ78 decoder
+    from its own dictionary (see LZ78StreamDecompressor.decode_batch).
+    """
+    block_type: int
+    pairs: Optional[List[Tuple[int, str]]] = None
+    text: Optional[str] = None
+
+
+class _SectionReader:
+    """
+    Buffered reader over one section of a seekable file.
+    
+    Several readers can share the same file object: each one keeps its
+    own position and seeks before refilling its buffer.
+    """
+    
+    CHUNK_SIZE = 1 << 16
+    
+    def __init__(self, f: BinaryIO, offset: int):
+        self.f = f
+        self.position = offset
+        self.buffer = b''
+        self.buffer_pos = 0
+    
+    def read(self, size: int) -> bytes:
+        """Read exactly `size` bytes (fewer only at end of file)."""
+        end = self.buffer_pos + size
+        if end > len(self.buffer):
+            self.f.seek(self.position + len(self.buffer) - self.buffer_pos)
+            self.buffer = self.buffer[self.buffer_pos:] + self.f.read(max(size, self.CHUNK_SIZE))
+            self.buffer_pos = 0
+            end = size
+        data = self.buffer[self.buffer_pos:end]
+        self.buffer_pos = end
+        self.position += len(data)
+        return data
+    
+    def read_char(self) -> str:
+        """Read one character stored as 1-byte length + UTF-8 bytes."""
+        length = self.read(1)
+        if not length:
+            raise ValueError("Truncated file: incomplete characters")
+        return self.read(length[0]).decode('utf-8')
 
 
 class FileHandlerBinaryHuffman:
     """
     Handles file operations for LZ78 + Huffman hybrid compression.
-    Format version 2 includes Huffman-encoded indices.
+    
+    Files are always written in the current format version (VERSION, see
+    save_compressed_file); version 2 files, which have a single body and
+    no header settings, can still be read. The history of the format is
+    in the README.
     """
     
     LZ78_EXTENSION = '.lz78'
     MAGIC_NUMBER = b'LZ7H'  # LZ78 + Huffman signature
-    VERSION = 2
+    VERSION = 3
+    SUPPORTED_VERSIONS = (2, 3)
+    SUPPORTED_FLAGS = FLAG_INDEPENDENT_BLOCKS | FLAG_BLOCK_FILTERS | FLAG_PRESET_DICTIONARY
+    
+    INDEX_MAGIC = b'LZ7X'  # Block index trailer signature
+    
+    # Block types
+    BLOCK_END = 0
+    BLOCK_LZ78_HUFFMAN = 1
+    BLOCK_STORED = 2
+    END_SIZE = 1 + 4  # End block type + checksum
     
     @staticmethod
     def save_compressed_file(file_path: str, 
                             compressed_data: List[Tuple[int, str]], 
                             lz78_dictionary: Dict[str, int],
                             huffman_codes: Dict[str, str],
-                            encoded_indices: str,
-                            original_filename: str) -> None:
+                            encoded_indices: BitWriter,
+                            original_filename: str,
+                            max_dictionary_size: Optional[int] = None,
+                            dictionary_policy: str = POLICY_FREEZE,
+                            index_coding: str = INDEX_CODING_SYMBOL,
+                            literal_coding: str = LITERAL_CODING_HUFFMAN,
+                            entropy_coder: str = ENTROPY_CODER_HUFFMAN,
+                            preset_dictionary: Optional[PresetDictionary] = None,
+                            text: Optional[str] = None) -> Dict[str, int]:
         """
         Save hybrid compressed data to binary .lz78 file.
         
         OPTIMIZACIÓN: NO guardamos el diccionario LZ78 completo.
         Se puede reconstruir durante la descompresión.
         
-        Binary format (version 2 - optimized):
+        Binary format (version 3):
         - Magic number (4 bytes): 'LZ7H' (LZ78 + Huffman)
-        - Version (1 byte): 2
+        - Version (1 byte): 3
         - Original filename length (2 bytes): uint16
         - Original filename (variable): UTF-8 encoded
-        - Huffman codes count (4 bytes): uint32
-        - Huffman codes: For each code:
-            - Symbol length (2 bytes): uint16
-            - Symbol (variable): UTF-8 encoded
-            - Code length (2 bytes): uint16
-            - Code (variable): UTF-8 encoded binary string
-        - Encoded indices bit count (4 bytes): uint32
-        - Encoded indices (variable): Packed bits
-        - Characters count (4 bytes): uint32
-        - Characters: For each character:
-            - Char length (1 byte): uint8
-            - Char (variable): UTF-8 encoded
+        - Dictionary policy (1 byte): 0 = freeze, 1 = reset, 2 = lru
+        - Max dictionary size (4 bytes): uint32, 0 = unbounded
+        - Index coding (1 byte): 0 = Huffman over decimal index text,
+          1 = Huffman over index bucket symbols + extra bits,
+          2 = phased-in binary codes sized to the live dictionary
+        - Literal coding (1 byte): 0 = raw UTF-8, 1 = Huffman,
+          2 = Huffman with order-1 contexts
+        - Entropy coder (1 byte): 0 = static Huffman, 1 = adaptive range coder,
+          2 = adaptive Huffman
+        - Flags (1 byte): FLAG_INDEPENDENT_BLOCKS, FLAG_BLOCK_FILTERS,
+          FLAG_PRESET_DICTIONARY or 0
+        - Preset dictionary ID (4 bytes): uint32, only with FLAG_PRESET_DICTIONARY
+        - Blocks: For each block:
+            - Block type (1 byte): 1 = LZ78 + Huffman, 2 = stored, 0 = end of stream
+            - Payload length (4 bytes): uint32 (absent in the end block)
+            - Payload: block body (see _write_body), or the text of a
+              stored block (see write_stored_block)
+        - Checksum (4 bytes): uint32, CRC-32 of the UTF-8 text of the
+          whole file, right after the end block (see write_end)
+        - Block index, only with FLAG_INDEPENDENT_BLOCKS (see write_block_index)
+        
+        The LZ78 dictionary is shared by all the blocks of a file, so a
+        block boundary may fall anywhere in the (index, char) stream,
+        unless FLAG_INDEPENDENT_BLOCKS is set: then every block starts with
+        an empty dictionary (see lz78_parallel). This method writes all
+        the pairs as a single block; given the text they come from, the
+        block is stored if coding it does not make it smaller.
         
         Args:
             file_path: Path where to save the compressed file
             compressed_data: List of (index, character) tuples from LZ78
             lz78_dictionary: LZ78 phrase dictionary (NOT SAVED - can be reconstructed)
             huffman_codes: Huffman codes for indices
-            encoded_indices: Binary string of Huffman-encoded indices
+            encoded_indices: Packed Huffman-encoded indices
             original_filename: Original file name
+            max_dictionary_size: Dictionary size limit used by LZ78 (None = unbounded)
+            dictionary_policy: Dictionary-full policy used by LZ78
+            index_coding: Index coding used by encode_indices
+            literal_coding: Literal coding (see literal_coding.LITERAL_CODINGS)
+            entropy_coder: Entropy coder (see entropy_coding.ENTROPY_CODERS);
+                adaptive coders ignore huffman_codes and encoded_indices
+            preset_dictionary: Preset dictionary the LZ78 dictionary started from
+            text: Original text of the pairs (None = always code the block;
+                the text for the checksum is then decoded from the pairs)
+        
+        Returns:
+            Bytes written per section, as get_section_sizes returns them
+            (so the statistics of the file need not code the block again)
         """
         # Ensure .lz78 extension
         if not file_path.endswith(FileHandlerBinaryHuffman.LZ78_EXTENSION):
             file_path += FileHandlerBinaryHuffman.LZ78_EXTENSION
         
         try:
+            if text is None:
+                text = LZ78Compressor(max_dictionary_size, dictionary_policy,
+                                      preset_dictionary.pairs if preset_dictionary else ()
+                                      ).decompress(compressed_data, {})
+                data = None
+            else:
+                data = text.encode('utf-8')
+            
             with open(file_path, 'wb') as f:
-                # Write magic number (LZ7H = LZ78 + Huffman)
-                f.write(FileHandlerBinaryHuffman.MAGIC_NUMBER)
-                
-                # Write version (2)
-                f.write(struct.pack('B', FileHandlerBinaryHuffman.VERSION))
-                
-                # Write original filename
-                filename_bytes = original_filename.encode('utf-8')
-                f.write(struct.pack('H', len(filename_bytes)))
-                f.write(filename_bytes)
+                sizes = {'header': FileHandlerBinaryHuffman.END_SIZE}
+                FileHandlerBinaryHuffman.write_stream_header(
+                    f, original_filename, max_dictionary_size, dictionary_policy, index_coding,
+                    literal_coding, entropy_coder,
+                    dictionary_id=preset_dictionary.dictionary_id if preset_dictionary else None
+                )
                 
                 # *** NO GUARDAMOS EL DICCIONARIO LZ78 - se reconstruye en descompresión ***
                 
-                # Write Huffman codes dictionary
-                f.write(struct.pack('I', len(huffman_codes)))
-                for symbol, code in huffman_codes.items():
-                    symbol_bytes = symbol.encode('utf-8')
-                    code_bytes = code.encode('utf-8')
-                    f.write(struct.pack('H', len(symbol_bytes)))
-                    f.write(symbol_bytes)
-                    f.write(struct.pack('H', len(code_bytes)))
-                    f.write(code_bytes)
-                
-                # Write Huffman-encoded indices
-                bit_count = len(encoded_indices)
-                f.write(struct.pack('I', bit_count))
-                
-                # Pack bits into bytes
-                byte_array = bytearray()
-                for i in range(0, bit_count, 8):
-                    byte_chunk = encoded_indices[i:i+8]
-                    # Pad with zeros if necessary
-                    byte_chunk = byte_chunk.ljust(8, '0')
-                    byte_value = int(byte_chunk, 2)
-                    byte_array.append(byte_value)
-                f.write(bytes(byte_array))
-                
-                # Write characters from compressed_data
-                f.write(struct.pack('I', len(compressed_data)))
-                for _, char in compressed_data:
-                    char_bytes = char.encode('utf-8')
-                    f.write(struct.pack('B', len(char_bytes)))
-                    f.write(char_bytes)
-                    
+                preset = preset_dictionary.pairs if preset_dictionary else ()
+                contexts = None
+                if literal_coding == LITERAL_CODING_CONTEXT:
+                    contexts = LiteralContexts(max_dictionary_size, dictionary_policy, preset)
+                live_size = LiveDictionarySize(max_dictionary_size, dictionary_policy, preset)
+                sizes['header'] += f.tell()
+                block_sizes = FileHandlerBinaryHuffman.write_block_sections(
+                    f, compressed_data, huffman_codes, encoded_indices, index_coding, literal_coding,
+                    contexts, entropy_coder, live_size, data
+                )
+                sizes['header'] += block_sizes.pop('header')
+                sizes.update(block_sizes)
+                FileHandlerBinaryHuffman.write_end(f, zlib.crc32(text.encode('utf-8') if data is None else data))
+            return sizes
+        
         except Exception as e:
             raise ValueError(f"Error saving hybrid compressed file: {str(e)}")
     
     @staticmethod
-    def load_compressed_file(file_path: str) -> Tuple[List[Tuple[int, str]], Dict[str, int], Dict[str, str], str, str]:
+    def write_stream_header(f: BinaryIO, original_filename: str,
+                            max_dictionary_size: Optional[int] = None,
+                            dictionary_policy: str = POLICY_FREEZE,
+                            index_coding: str = INDEX_CODING_SYMBOL,
+                            literal_coding: str = LITERAL_CODING_HUFFMAN,
+                            entropy_coder: str = ENTROPY_CODER_HUFFMAN,
+                            flags: int = 0,
+                            dictionary_id: Optional[int] = None) -> None:
         """
-        Load a hybrid binary .lz78 compressed file.
+        Write the file header (current version).
+        
+        Args:
+            f: Binary file opened for writing
+            original_filename: Original file name
+            max_dictionary_size: Dictionary size limit used by LZ78 (None = unbounded)
+            dictionary_policy: Dictionary-full policy used by LZ78
+            index_coding: Index coding of the blocks (one of INDEX_CODINGS)
+            literal_coding: Literal coding of the blocks (one of LITERAL_CODINGS)
+            entropy_coder: Entropy coder of the blocks (one of ENTROPY_CODERS)
+            flags: Header flags (FLAG_INDEPENDENT_BLOCKS, FLAG_BLOCK_FILTERS)
+            dictionary_id: ID of the preset dictionary of the file, if any
+                (sets FLAG_PRESET_DICTIONARY)
+        """
+        if flags & ~FileHandlerBinaryHuffman.SUPPORTED_FLAGS:
+            raise ValueError(f"Unknown header flags: {flags:#x}")
+        if flags & FLAG_BLOCK_FILTERS and not flags & FLAG_INDEPENDENT_BLOCKS:
+            raise ValueError("Block filters require independent blocks")
+        if index_coding not in INDEX_CODINGS:
+            raise ValueError(f"Unknown index coding: {index_coding}")
+        if literal_coding not in LITERAL_CODINGS:
+            raise ValueError(f"Unknown literal coding: {literal_coding}")
+        check_codings(entropy_coder, index_coding)
+        if dictionary_id is not None:
+            flags |= FLAG_PRESET_DICTIONARY
+        
+        # Write magic number (LZ7H = LZ78 + Huffman)
+        f.write(FileHandlerBinaryHuffman.MAGIC_NUMBER)
+        
+        # Write version
+        f.write(struct.pack('B', FileHandlerBinaryHuffman.VERSION))
+        
+        # Write original filename
+        filename_bytes = original_filename.encode('utf-8')
+        f.write(struct.pack('H', len(filename_bytes)))
+        f.write(filename_bytes)
+        
+        # Write dictionary limit so the decoder replays the same policy
+        f.write(struct.pack('B', DICTIONARY_POLICIES.index(dictionary_policy)))
+        f.write(struct.pack('I', max_dictionary_size or 0))
+        
+        # Write stream codings and flags
+        f.write(struct.pack('BBBB', INDEX_CODINGS.index(index_coding),
+                            LITERAL_CODINGS.index(literal_coding),
+                            ENTROPY_CODERS.index(entropy_coder), flags))
+        if dictionary_id is not None:
+            f.write(struct.pack('I', dictionary_id))
+    
+    @staticmethod
+    def write_block(f: BinaryIO,
+                    compressed_data: List[Tuple[int, str]],
+                    huffman_codes: Optional[Dict] = None,
+                    encoded_indices: Optional[BitWriter] = None,
+                    index_coding: str = INDEX_CODING_SYMBOL,
+                    literal_coding: str = LITERAL_CODING_HUFFMAN,
+                    contexts: Optional[LiteralContexts] = None,
+                    entropy_coder: str = ENTROPY_CODER_HUFFMAN,
+                    live_size: Optional[LiveDictionarySize] = None,
+                    data: Optional[bytes] = None) -> Tuple[Optional[int], int]:
+        """
+        Write one block of (index, char) pairs.
+        
+        This is where a block is chosen to be coded or stored. Given the
+        text of the pairs, the block is written as a stored block instead,
+        without coding it, if estimate_block_size does not find it smaller
+        than its text, or after coding it, if the coded payload is not
+        smaller than the stored one. Either way the literal contexts and
+        the dictionary size are advanced once.
+        
+        Args:
+            f: Binary file opened for writing, positioned after the header
+            compressed_data: Pairs of this block
+            huffman_codes: Huffman codes for the indices of this block
+                (None = encode the indices here, only if the block is coded)
+            encoded_indices: Packed Huffman-encoded indices of this block
+                (None together with huffman_codes)
+            index_coding: Index coding of the file (as written in its header)
+            literal_coding: Literal coding of the file (as written in its header)
+            contexts: Literal contexts of the file, shared by all its blocks
+                (required with LITERAL_CODING_CONTEXT)
+            entropy_coder: Entropy coder of the file (as written in its header)
+            live_size: Dictionary size of the file, shared by all its blocks
+                (used with INDEX_CODING_PHASED)
+            data: UTF-8 text of the pairs (None = never store the block)
+        
+        Returns:
+            Tuple of (block type written, BLOCK_LZ78_HUFFMAN or BLOCK_STORED,
+            and number of bytes written); (None, 0) if there were no pairs
+        """
+        sizes = FileHandlerBinaryHuffman.write_block_sections(
+            f, compressed_data, huffman_codes, encoded_indices, index_coding, literal_coding,
+            contexts, entropy_coder, live_size, data
+        )
+        if not compressed_data:
+            return None, 0
+        block_type = FileHandlerBinaryHuffman.BLOCK_STORED if sizes['stored'] else \
+            FileHandlerBinaryHuffman.BLOCK_LZ78_HUFFMAN
+        return block_type, sum(sizes.values())
+    
+    @staticmethod
+    def write_block_sections(f: BinaryIO,
+                             compressed_data: List[Tuple[int, str]],
+                             huffman_codes: Optional[Dict] = None,
+                             encoded_indices: Optional[BitWriter] = None,
+                             index_coding: str = INDEX_CODING_SYMBOL,
+                             literal_coding: str = LITERAL_CODING_HUFFMAN,
+                             contexts: Optional[LiteralContexts] = None,
+                             entropy_coder: str = ENTROPY_CODER_HUFFMAN,
+                             live_size: Optional[LiveDictionarySize] = None,
+                             data: Optional[bytes] = None) -> Dict[str, int]:
+        """
+        Write one block of (index, char) pairs, like write_block.
+        
+        Returns:
+            Bytes written per section: header (block type and payload
+            length), index_table, indices, literal_table, literals and
+            stored (pair count and text of a stored block); all 0 if there
+            were no pairs
+        """
+        sizes = {'header': 0, 'index_table': 0, 'indices': 0, 'literal_table': 0, 'literals': 0, 'stored': 0}
+        if not compressed_data:
+            return sizes
+        
+        sizes['header'] = 1 + 4
+        if data is not None and FileHandlerBinaryHuffman.estimate_block_size(
+                compressed_data, literal_coding, entropy_coder) >= len(data):
+            # No merece la pena codificar el bloque
+            FileHandlerBinaryHuffman.write_stored_block(f, compressed_data, data, contexts, live_size)
+            sizes['stored'] = 4 + len(data)
+            return sizes
+        
+        if huffman_codes is None:
+            huffman_codes, encoded_indices = {}, BitWriter()
+            if entropy_coder == ENTROPY_CODER_HUFFMAN:
+                huffman_codes, encoded_indices = encode_indices([index for index, _ in compressed_data],
+                                                                index_coding, live_size)
+        
+        payload = io.BytesIO()
+        sizes.update(FileHandlerBinaryHuffman._write_body(payload, compressed_data, huffman_codes,
+                                                          encoded_indices, index_coding, literal_coding,
+                                                          contexts, entropy_coder, live_size))
+        payload_bytes = payload.getvalue()
+        if data is not None and len(payload_bytes) >= 4 + len(data):
+            # Codificar expande el bloque: se guarda el texto (el estado ya avanzó)
+            FileHandlerBinaryHuffman.write_stored_block(f, compressed_data, data)
+            sizes.update(index_table=0, indices=0, literal_table=0, literals=0, stored=4 + len(data))
+            return sizes
+        
+        f.write(struct.pack('B', FileHandlerBinaryHuffman.BLOCK_LZ78_HUFFMAN))
+        f.write(struct.pack('I', len(payload_bytes)))
+        f.write(payload_bytes)
+        return sizes
+    
+    @staticmethod
+    def write_stored_block(f: BinaryIO,
+                           compressed_data: List[Tuple[int, str]],
+                           data: bytes,
+                           contexts: Optional[LiteralContexts] = None,
+                           live_size: Optional[LiveDictionarySize] = None) -> int:
+        """
+        Write one block of (index, char) pairs as its text.
+        
+        Stored block payload:
+        - Pair count (4 bytes): uint32
+        - Text (variable): UTF-8 encoded, the rest of the payload
+        
+        The pairs themselves are not written: the decoder parses the text
+        again from its own dictionary (see PhraseTrie.parse), which gives
+        the same pairs, so the dictionary goes on across the block as if
+        it had been coded. The literal contexts and the dictionary size
+        are advanced as coding the block would.
+        
+        Args:
+            f: Binary file opened for writing, positioned after the header
+            compressed_data: Pairs of this block
+            data: UTF-8 text of the pairs
+            contexts: Literal contexts of the file, if it uses them
+            live_size: Dictionary size of the file
+        
+        Returns:
+            Number of bytes written (see stored_block_size)
+        """
+        if contexts is not None:
+            contexts.contexts(compressed_data)
+        if live_size is not None:
+            for _ in compressed_data:
+                live_size.advance()
+        
+        f.write(struct.pack('B', FileHandlerBinaryHuffman.BLOCK_STORED))
+        f.write(struct.pack('I', 4 + len(data)))
+        f.write(struct.pack('I', len(compressed_data)))
+        f.write(data)
+        return FileHandlerBinaryHuffman.stored_block_size(data)
+    
+    @staticmethod
+    def stored_block_size(data: bytes) -> int:
+        """Bytes of a stored block of this text: block type, payload length, pair count and text."""
+        return 1 + 4 + 4 + len(data)
+    
+    @staticmethod
+    def estimate_block_size(compressed_data: List[Tuple[int, str]],
+                            literal_coding: str = LITERAL_CODING_HUFFMAN,
+                            entropy_coder: str = ENTROPY_CODER_HUFFMAN) -> int:
+        """
+        Cheap estimate of the coded payload of a block, in bytes.
+        
+        Every index counts its bit length (about what a bucket code plus
+        its extra bits, or a phased-in code, takes). Raw literals count
+        their UTF-8 bytes (plus the length byte of static Huffman). The
+        Huffman literal codings count the order-0 entropy of the literals
+        of the block, and every distinct literal its entry in the code
+        table; with an adaptive coder, its first occurrence is an escape
+        followed by its UTF-8 bytes instead. The estimate is on the low
+        side: a block that does not look smaller than its text can be
+        stored without coding it, and write_block still catches the
+        blocks that only expand once coded.
+        
+        Args:
+            compressed_data: Pairs of the block
+            literal_coding: Literal coding of the file
+            entropy_coder: Entropy coder of the file
+        """
+        index_bits = sum(index.bit_length() for index, _ in compressed_data)
+        literal_counts = Counter(char for _, char in compressed_data)
+        char_bytes = {char: len(char.encode('utf-8')) for char in literal_counts}
+        static = entropy_coder == ENTROPY_CODER_HUFFMAN
+        if literal_coding == LITERAL_CODING_RAW:
+            literal_bytes = sum(count * (char_bytes[char] + static) for char, count in literal_counts.items())
+            return index_bits // 8 + literal_bytes
+        
+        # Con un codificador adaptativo la primera aparición se paga con el escape
+        pair_count = len(compressed_data)
+        literal_bits = sum((count - (not static)) * math.log2(pair_count / count)
+                           for count in literal_counts.values())
+        table_bytes = sum(char_bytes.values()) + 2 * len(char_bytes) * static
+        return int(index_bits + literal_bits) // 8 + table_bytes
+    
+    @staticmethod
+    def write_end(f: BinaryIO, checksum: int) -> None:
+        """
+        Write the end-of-stream block and the checksum of the file.
+        
+        Args:
+            f: Binary file opened for writing, positioned after the last block
+            checksum: CRC-32 (zlib.crc32) of the UTF-8 text of the whole file
+        """
+        f.write(struct.pack('B', FileHandlerBinaryHuffman.BLOCK_END))
+        f.write(struct.pack('I', checksum))
+    
+    @staticmethod
+    def read_checksum(f: BinaryIO, version: int = VERSION) -> Optional[int]:
+        """
+        Read the checksum written by write_end.
+        
+        Args:
+            f: Binary file positioned right after the end block type
+            version: Format version of the file
+        
+        Returns:
+            CRC-32 of the text of the file, or None for version 2 files
+        
+        Raises:
+            ValueError: If the checksum is missing
+        """
+        if version < 3:
+            return None
+        checksum = f.read(4)
+        if len(checksum) != 4:
+            raise ValueError("Truncated file: missing checksum")
+        return struct.unpack('I', checksum)[0]
+    
+    @staticmethod
+    def check_checksum(checksum: Optional[int], actual: int) -> None:
+        """
+        Compare the checksum of a file (or block) with the CRC-32 of its decoded text.
+        
+        Raises:
+            ValueError: If they differ (files without checksum are not checked)
+        """
+        if checksum is not None and checksum != actual:
+            raise ValueError(f"Corrupted file: CRC-32 of the text is {actual:08x}, expected {checksum:08x}")
+    
+    @staticmethod
+    def write_block_index(f: BinaryIO, entries: List[Dict[str, int]],
+                          flags: int = FLAG_INDEPENDENT_BLOCKS) -> int:
+        """
+        Write the block index of a file with FLAG_INDEPENDENT_BLOCKS.
+        
+        The index goes right after the end block:
+        - Block count (4 bytes): uint32
+        - For each block:
+            - Offset (8 bytes): uint64, position of its block type byte
+            - Payload length (4 bytes): uint32
+            - Original size (8 bytes): uint64, UTF-8 bytes of its text
+            - Lines (8 bytes): uint64, '\\n' characters in its text
+            - Checksum (4 bytes): uint32, CRC-32 of its text
+            - With FLAG_BLOCK_FILTERS: filter length (4 bytes, uint32) +
+              Bloom filter bits (see block_filter.BlockFilter)
+        - Index offset (8 bytes): uint64, position of the block count
+        - Index magic (4 bytes): 'LZ7X'
+        
+        Args:
+            f: Binary file opened for writing, positioned after the end block
+            entries: Dictionaries with offset, compressed_size (payload
+                length), original_size, lines and crc32 of every block, in
+                file order, plus its filter (bytes) with FLAG_BLOCK_FILTERS
+            flags: Header flags of the file
+        
+        Returns:
+            Number of bytes written
+        """
+        index_offset = f.tell()
+        f.write(struct.pack('I', len(entries)))
+        for entry in entries:
+            f.write(struct.pack('Q', entry['offset']))
+            f.write(struct.pack('I', entry['compressed_size']))
+            f.write(struct.pack('Q', entry['original_size']))
+            f.write(struct.pack('Q', entry['lines']))
+            f.write(struct.pack('I', entry['crc32']))
+            if flags & FLAG_BLOCK_FILTERS:
+                f.write(struct.pack('I', len(entry['filter'])))
+                f.write(entry['filter'])
+        f.write(struct.pack('Q', index_offset))
+        f.write(FileHandlerBinaryHuffman.INDEX_MAGIC)
+        return f.tell() - index_offset
+    
+    @staticmethod
+    def read_block_index(f: BinaryIO, flags: int = FLAG_INDEPENDENT_BLOCKS) -> List[Dict[str, int]]:
+        """
+        Read the block index written by write_block_index.
+        
+        Args:
+            f: Seekable binary file of a .lz78 file with FLAG_INDEPENDENT_BLOCKS
+            flags: Header flags of the file
+        
+        Returns:
+            Dictionaries with offset, compressed_size, original_size,
+            original_offset (UTF-8 bytes before the block), lines,
+            first_line (lines before the block) and crc32 (of its text) of
+            every block, plus its filter (bytes) with FLAG_BLOCK_FILTERS
+        
+        Raises:
+            ValueError: If the file has no valid block index
+        """
+        f.seek(-12, os.SEEK_END)
+        index_offset = struct.unpack('Q', f.read(8))[0]
+        if f.read(4) != FileHandlerBinaryHuffman.INDEX_MAGIC:
+            raise ValueError("Invalid file format: missing block index")
+        
+        f.seek(index_offset)
+        entries = []
+        original_offset = 0
+        first_line = 0
+        for _ in range(struct.unpack('I', f.read(4))[0]):
+            offset = struct.unpack('Q', f.read(8))[0]
+            compressed_size = struct.unpack('I', f.read(4))[0]
+            original_size = struct.unpack('Q', f.read(8))[0]
+            lines = struct.unpack('Q', f.read(8))[0]
+            entry = {
+                'offset': offset,
+                'compressed_size': compressed_size,
+                'original_size': original_size,
+                'original_offset': original_offset,
+                'lines': lines,
+                'first_line': first_line,
+                'crc32': struct.unpack('I', f.read(4))[0]
+            }
+            if flags & FLAG_BLOCK_FILTERS:
+                entry['filter'] = f.read(struct.unpack('I', f.read(4))[0])
+            entries.append(entry)
+            original_offset += original_size
+            first_line += lines
+        return entries
+    
+    @staticmethod
+    def _write_body(f: BinaryIO,
+                    compressed_data: List[Tuple[int, str]],
+                    huffman_codes: Dict,
+                    encoded_indices: BitWriter,
+                    index_coding: str = INDEX_CODING_TEXT,
+                    literal_coding: str = LITERAL_CODING_RAW,
+                    contexts: Optional[LiteralContexts] = None,
+                    entropy_coder: str = ENTROPY_CODER_HUFFMAN,
+                    live_size: Optional[LiveDictionarySize] = None) -> Dict[str, int]:
+        """
+        Write Huffman codes, encoded indices and characters of a block.
+        
+        Body format:
+        - Huffman codes: see _write_codes (absent with INDEX_CODING_PHASED)
+        - Encoded indices bit count (4 bytes): uint32
+        - Encoded indices (variable): Packed bits
+        - Characters count (4 bytes): uint32
+        - Characters, with LITERAL_CODING_RAW: for each character:
+            - Char length (1 byte): uint8
+            - Char (variable): UTF-8 encoded
+        - Characters, with the Huffman literal codings:
+            - Context tables count (2 bytes): uint16
+            - Shared table: see _write_codes (text symbols)
+            - For each context table:
+                - Context length (1 byte): uint8
+                - Context (variable): UTF-8 encoded
+                - Table: see _write_codes (text symbols)
+            - Encoded characters bit count (4 bytes): uint32
+            - Encoded characters (variable): Packed bits
+        
+        Body format with an adaptive entropy coder (see
+        entropy_coding.encode_pairs), without code tables:
+        - Characters count (4 bytes): uint32
+        - Encoded indices length (4 bytes): uint32
+        - Encoded indices (variable): coder output
+        - Encoded characters length (4 bytes): uint32
+        - Encoded characters (variable): coder output
+        
+        Returns:
+            Bytes written per section: index_table, indices, literal_table
+            and literals
+        """
+        start = f.tell()
+        
+        if entropy_coder != ENTROPY_CODER_HUFFMAN:
+            encoded_indices, encoded_literals = encode_pairs(compressed_data, entropy_coder, index_coding,
+                                                             literal_coding, live_size, contexts)
+            f.write(struct.pack('I', len(compressed_data)))
+            f.write(struct.pack('I', len(encoded_indices)))
+            f.write(encoded_indices)
+            f.write(struct.pack('I', len(encoded_literals)))
+            f.write(encoded_literals)
+            return {
+                'index_table': 0,
+                'indices': 4 + len(encoded_indices),
+                'literal_table': 4,
+                'literals': 4 + len(encoded_literals)
+            }
+        
+        # Write Huffman codes dictionary
+        FileHandlerBinaryHuffman._write_codes(f, huffman_codes, index_coding)
+        index_table_end = f.tell()
+        
+        # Write Huffman-encoded indices
+        bit_count = len(encoded_indices)
+        f.write(struct.pack('I', bit_count))
+        
+        # Bits already packed by BitWriter (last byte padded with zeros)
+        f.write(encoded_indices.ToBytes())
+        indices_end = f.tell()
+        
+        # Write characters from compressed_data
+        f.write(struct.pack('I', len(compressed_data)))
+        if literal_coding == LITERAL_CODING_RAW:
+            literal_table_end = f.tell()
+            for _, char in compressed_data:
+                char_bytes = char.encode('utf-8')
+                f.write(struct.pack('B', len(char_bytes)))
+                f.write(char_bytes)
+        else:
+            literal_contexts = None
+            if literal_coding == LITERAL_CODING_CONTEXT:
+                if contexts is None:
+                    raise ValueError("Context literal coding needs the literal contexts of the file")
+                literal_contexts = contexts.contexts(compressed_data)
+            tables, encoded_literals = encode_literals([char for _, char in compressed_data],
+                                                       literal_coding, literal_contexts)
+            
+            # Las tablas de literales tienen símbolos de texto, como las de INDEX_CODING_TEXT
+            f.write(struct.pack('H', len(tables) - (FALLBACK_TABLE in tables)))
+            FileHandlerBinaryHuffman._write_codes(f, tables.get(FALLBACK_TABLE, {}), INDEX_CODING_TEXT)
+            for context, codes in tables.items():
+                if context is FALLBACK_TABLE:
+                    continue
+                context_bytes = context.encode('utf-8')
+                f.write(struct.pack('B', len(context_bytes)))
+                f.write(context_bytes)
+                FileHandlerBinaryHuffman._write_codes(f, codes, INDEX_CODING_TEXT)
+            literal_table_end = f.tell()
+            
+            f.write(struct.pack('I', len(encoded_literals)))
+            f.write(encoded_literals.ToBytes())
+        end = f.tell()
+        
+        return {
+            'index_table': index_table_end - start,
+            'indices': indices_end - index_table_end,
+            'literal_table': literal_table_end - indices_end,
+            'literals': end - literal_table_end
+        }
+    
+    @staticmethod
+    def _write_codes(f: BinaryIO, huffman_codes: Dict, index_coding: str) -> None:
+        """
+        Write the Huffman code table of a body.
+        
+        Format, codes must be canonical:
+        - Huffman codes count (2 bytes): uint16
+        - For each symbol, in canonical order:
+            - Symbol: with INDEX_CODING_TEXT, length (1 byte) + UTF-8
+              bytes; with INDEX_CODING_SYMBOL, the bucket symbol (1 byte)
+            - Code length (1 byte): uint8, in bits
+        
+        INDEX_CODING_PHASED has no code table: nothing is written.
+        Version 2 tables, which held every code, are only read (see
+        _read_codes).
+        
+        Raises:
+            ValueError: If the codes are not canonical
+        """
+        if index_coding == INDEX_CODING_PHASED:
+            return
+        code_lengths = CodeLengths(huffman_codes)
+        canonical_codes = CanonicalCodes(code_lengths)
+        if canonical_codes != huffman_codes:
+            raise ValueError("Huffman codes must be canonical to be stored as code lengths")
+        if max(code_lengths.values(), default=0) > 255:
+            raise ValueError("Huffman code too long to be stored")
+            
+        f.write(struct.pack('H', len(canonical_codes)))
+        for symbol in canonical_codes:
+            if index_coding == INDEX_CODING_TEXT:
+                symbol_bytes = symbol.encode('utf-8')
+                f.write(struct.pack('B', len(symbol_bytes)))
+                f.write(symbol_bytes)
+            else:
+                f.write(struct.pack('B', symbol))
+            f.write(struct.pack('B', code_lengths[symbol]))
+    
+    @staticmethod
+    def _read_codes(f: BinaryIO, index_coding: str, version: int = VERSION) -> Dict:
+        """
+        Read a Huffman code table written by _write_codes.
+        
+        The tables only hold code lengths: the canonical codes are rebuilt
+        from them. Version 2 tables hold every code:
+        - Huffman codes count (4 bytes): uint32
+        - For each code: symbol length (2 bytes, uint16) + symbol (UTF-8)
+          + code length (2 bytes, uint16) + code (UTF-8 binary string)
+        """
+        if index_coding == INDEX_CODING_PHASED:
+            return {}
+        if version >= 3:
+            code_lengths = {}
+            for _ in range(struct.unpack('H', f.read(2))[0]):
+                if index_coding == INDEX_CODING_TEXT:
+                    symbol = f.read(f.read(1)[0]).decode('utf-8')
+                else:
+                    symbol = f.read(1)[0]
+                code_lengths[symbol] = f.read(1)[0]
+            return CanonicalCodes(code_lengths)
+        
+        huffman_size = struct.unpack('I', f.read(4))[0]
+        huffman_codes = {}
+        for _ in range(huffman_size):
+            symbol_length = struct.unpack('H', f.read(2))[0]
+            symbol = f.read(symbol_length).decode('utf-8')
+            code_length = struct.unpack('H', f.read(2))[0]
+            code = f.read(code_length).decode('utf-8')
+            huffman_codes[symbol] = code
+        return huffman_codes
+    
+    @staticmethod
+    def _codes_size(huffman_codes: Dict, index_coding: str) -> int:
+        """Size in bytes of the code table written by _write_codes."""
+        if index_coding == INDEX_CODING_PHASED:
+            return 0
+        size = 2
+        for symbol in huffman_codes:
+            if index_coding == INDEX_CODING_TEXT:
+                size += 1 + len(symbol.encode('utf-8'))
+            else:
+                size += 1
+            size += 1
+        return size
+    
+    @staticmethod
+    def _read_header(f: BinaryIO, preset_dictionary: Optional[PresetDictionary] = None) -> Dict:
+        """
+        Read the file header (magic number, version, filename, dictionary settings).
+        
+        Version 2 files have no settings after the filename: they were
+        written with an unbounded dictionary and their indices are always
+        coded as decimal text, with raw literals.
+        
+        The header also gets 'preset': the pairs of the preset dictionary
+        the file needs (empty if it needs none), or None if the file needs
+        one that was not given; decoding such a file fails (see _preset).
+        
+        Raises:
+            ValueError: If the header is invalid or preset_dictionary is
+                not the one the file was compressed with
+        """
+        magic = f.read(4)
+        if magic != FileHandlerBinaryHuffman.MAGIC_NUMBER:
+            raise ValueError("Invalid file format: incorrect magic number")
+        
+        version = struct.unpack('B', f.read(1))[0]
+        if version not in FileHandlerBinaryHuffman.SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported format version: {version}")
+        
+        filename_length = struct.unpack('H', f.read(2))[0]
+        original_filename = f.read(filename_length).decode('utf-8')
+        
+        dictionary_policy = POLICY_FREEZE
+        max_dictionary_size = None
+        index_coding = INDEX_CODING_TEXT
+        literal_coding = LITERAL_CODING_RAW
+        entropy_coder = ENTROPY_CODER_HUFFMAN
+        flags = 0
+        if version >= 3:
+            policy_code = struct.unpack('B', f.read(1))[0]
+            if policy_code >= len(DICTIONARY_POLICIES):
+                raise ValueError(f"Unknown dictionary policy code: {policy_code}")
+            dictionary_policy = DICTIONARY_POLICIES[policy_code]
+            max_dictionary_size = struct.unpack('I', f.read(4))[0] or None
+        
+            index_code, literal_code, entropy_code, flags = struct.unpack('BBBB', f.read(4))
+            if index_code >= len(INDEX_CODINGS):
+                raise ValueError(f"Unknown index coding code: {index_code}")
+            index_coding = INDEX_CODINGS[index_code]
+            if literal_code >= len(LITERAL_CODINGS):
+                raise ValueError(f"Unknown literal coding code: {literal_code}")
+            literal_coding = LITERAL_CODINGS[literal_code]
+            if entropy_code >= len(ENTROPY_CODERS):
+                raise ValueError(f"Unknown entropy coder code: {entropy_code}")
+            entropy_coder = ENTROPY_CODERS[entropy_code]
+            if flags & ~FileHandlerBinaryHuffman.SUPPORTED_FLAGS \
+                    or (flags & FLAG_BLOCK_FILTERS and not flags & FLAG_INDEPENDENT_BLOCKS):
+                raise ValueError(f"Unknown header flags: {flags:#x}")
+        
+        dictionary_id = None
+        preset = ()
+        if flags & FLAG_PRESET_DICTIONARY:
+            dictionary_id = struct.unpack('I', f.read(4))[0]
+            preset = None
+            if preset_dictionary is not None:
+                if preset_dictionary.dictionary_id != dictionary_id:
+                    raise ValueError(f"Wrong preset dictionary: the file needs dictionary {dictionary_id:08x}, "
+                                     f"not {preset_dictionary.dictionary_id:08x}")
+                preset = preset_dictionary.pairs
+        
+        return {
+            'version': version,
+            'original_filename': original_filename,
+            'dictionary_policy': dictionary_policy,
+            'max_dictionary_size': max_dictionary_size,
+            'index_coding': index_coding,
+            'literal_coding': literal_coding,
+            'entropy_coder': entropy_coder,
+            'flags': flags,
+            'dictionary_id': dictionary_id,
+            'preset': preset
+        }
+    
+    @staticmethod
+    def _preset(header: Dict) -> List[Tuple[int, str]]:
+        """
+        Pairs of the preset dictionary of a file (empty if it has none).
+        
+        Raises:
+            ValueError: If the file needs a preset dictionary that was not given
+        """
+        if header['preset'] is None:
+            raise ValueError(f"The file needs preset dictionary {header['dictionary_id']:08x}")
+        return header['preset']
+    
+    @staticmethod
+    def read_header(file_path: str) -> Dict:
+        """
+        Read only the header of a hybrid .lz78 file.
         
         Args:
             file_path: Path to the .lz78 file
+        
+        Returns:
+            Dictionary with version, original_filename, dictionary_policy,
+            max_dictionary_size (None = unbounded), index_coding,
+            literal_coding, entropy_coder, flags and dictionary_id
+            (None without a preset dictionary)
+        
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If file format is incorrect
+        """
+        if not Path(file_path).exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        try:
+            with open(file_path, 'rb') as f:
+                return FileHandlerBinaryHuffman._read_header(f)
+        except struct.error as e:
+            raise ValueError(f"Invalid file format: corrupted header ({str(e)})")
+    
+    @staticmethod
+    def get_file_info(file_path: str) -> Dict:
+        """
+        Describe a hybrid .lz78 file without decoding it.
+        
+        Only the header and the block framing (or the block index) are
+        read, so it is fast for files of any size.
+        
+        Args:
+            file_path: Path to the .lz78 file
+        
+        Returns:
+            The header fields of read_header plus compressed_size, blocks,
+            stored_blocks and checksum (CRC-32 of the text), all None for
+            version 2 files, which have a single body, and, for files with
+            a block index, original_size and lines
+        
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If file format is incorrect
+        """
+        if not Path(file_path).exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        try:
+            with open(file_path, 'rb') as f:
+                info = FileHandlerBinaryHuffman._read_header(f)
+                del info['preset']
+                info['compressed_size'] = Path(file_path).stat().st_size
+                info['blocks'] = info['stored_blocks'] = info['checksum'] = None
+                if info['version'] >= 3:
+                    info['blocks'] = info['stored_blocks'] = 0
+                    for offset in FileHandlerBinaryHuffman.iter_block_offsets(f):
+                        f.seek(offset)
+                        info['blocks'] += 1
+                        info['stored_blocks'] += f.read(1)[0] == FileHandlerBinaryHuffman.BLOCK_STORED
+                    info['checksum'] = FileHandlerBinaryHuffman.read_checksum(f, info['version'])
+                if info['flags'] & FLAG_INDEPENDENT_BLOCKS:
+                    entries = FileHandlerBinaryHuffman.read_block_index(f, info['flags'])
+                    info['original_size'] = sum(entry['original_size'] for entry in entries)
+                    info['lines'] = sum(entry['lines'] for entry in entries)
+                return info
+        except (struct.error, EOFError) as e:
+            raise ValueError(f"Invalid file format: corrupted file ({str(e)})")
+    
+    @staticmethod
+    def _read_literal_tables(f: BinaryIO) -> Dict:
+        """Read the literal code tables of a body (Huffman literal codings)."""
+        context_count = struct.unpack('H', f.read(2))[0]
+        tables = {}
+        fallback = FileHandlerBinaryHuffman._read_codes(f, INDEX_CODING_TEXT)
+        if fallback:
+            tables[FALLBACK_TABLE] = fallback
+        for _ in range(context_count):
+            context = f.read(f.read(1)[0]).decode('utf-8')
+            tables[context] = FileHandlerBinaryHuffman._read_codes(f, INDEX_CODING_TEXT)
+        return tables
+    
+    @staticmethod
+    def _read_body(f: BinaryIO, index_coding: str = INDEX_CODING_TEXT,
+                   version: int = VERSION,
+                   literal_coding: str = LITERAL_CODING_RAW,
+                   contexts: Optional[LiteralContexts] = None,
+                   live_size: Optional[LiveDictionarySize] = None,
+                   entropy_coder: str = ENTROPY_CODER_HUFFMAN) -> Tuple[List[Tuple[int, str]], Dict, BitWriter]:
+        """
+        Read a body written by _write_body and decode its indices and characters.
+        
+        Args:
+            f: Binary file positioned at the start of the body
+            index_coding: Index coding of the file
+            version: Format version of the file
+            literal_coding: Literal coding of the file
+            contexts: Literal contexts of the file, shared by all its blocks
+                (required with LITERAL_CODING_CONTEXT)
+            live_size: Dictionary size of the file, shared by all its blocks
+                (required with INDEX_CODING_PHASED)
+            entropy_coder: Entropy coder of the file
+        
+        Returns:
+            Tuple of (compressed_data, huffman_codes, encoded_indices); the
+            adaptive coders have no codes and no packed index bits
+        """
+        if entropy_coder != ENTROPY_CODER_HUFFMAN:
+            pair_count = struct.unpack('I', f.read(4))[0]
+            encoded_indices = f.read(struct.unpack('I', f.read(4))[0])
+            encoded_literals = f.read(struct.unpack('I', f.read(4))[0])
+            decoder = PairDecoder(entropy_coder, io.BytesIO(encoded_indices).read,
+                                  io.BytesIO(encoded_literals).read, index_coding, literal_coding,
+                                  live_size, contexts)
+            return decoder.decode(pair_count), {}, BitWriter()
+        
+        # Read Huffman codes
+        huffman_codes = FileHandlerBinaryHuffman._read_codes(f, index_coding, version)
+        
+        # Read Huffman-encoded indices
+        bit_count = struct.unpack('I', f.read(4))[0]
+        byte_count = (bit_count + 7) // 8
+        byte_data = f.read(byte_count)
+        
+        # Keep the bits packed
+        encoded_indices = BitWriter.FromBytes(byte_data, bit_count)
+        
+        # Read characters count (the phased indices need it to be decoded)
+        char_count = struct.unpack('I', f.read(4))[0]
+        
+        # Decode Huffman indices
+        indices = decode_indices(encoded_indices, huffman_codes, index_coding, live_size, char_count)
+        
+        # Read characters
+        characters = []
+        if literal_coding == LITERAL_CODING_RAW:
+            for _ in range(char_count):
+                char_length = struct.unpack('B', f.read(1))[0]
+                char = f.read(char_length).decode('utf-8')
+                characters.append(char)
+        else:
+            if char_count != len(indices):
+                raise ValueError("Corrupted file: index and character counts differ")
+            tables = FileHandlerBinaryHuffman._read_literal_tables(f)
+            literal_bits = struct.unpack('I', f.read(4))[0]
+            literal_data = f.read((literal_bits + 7) // 8)
+            decoder = LiteralDecoder(tables, io.BytesIO(literal_data).read, literal_bits)
+            if literal_coding == LITERAL_CODING_CONTEXT:
+                for index in indices:
+                    char = decoder.decode(contexts.context(index))
+                    contexts.update(index, char)
+                    characters.append(char)
+            else:
+                characters = [decoder.decode() for _ in indices]
+        
+        # Reconstruct compressed_data tuples
+        compressed_data = list(zip(indices, characters))
+        
+        return compressed_data, huffman_codes, encoded_indices
+    
+    @staticmethod
+    def _literal_contexts(header: Dict) -> Optional[LiteralContexts]:
+        """Literal contexts to decode a file, if its literal coding uses them."""
+        if header['literal_coding'] != LITERAL_CODING_CONTEXT:
+            return None
+        return LiteralContexts(header['max_dictionary_size'], header['dictionary_policy'],
+                               FileHandlerBinaryHuffman._preset(header))
+    
+    @staticmethod
+    def _live_size(header: Dict) -> Optional[LiveDictionarySize]:
+        """Dictionary size tracker to decode a file, if its index coding uses it."""
+        if header['index_coding'] != INDEX_CODING_PHASED:
+            return None
+        return LiveDictionarySize(header['max_dictionary_size'], header['dictionary_policy'],
+                                  FileHandlerBinaryHuffman._preset(header))
+    
+    @staticmethod
+    def _check_block_type(block_type: int) -> None:
+        """Raise ValueError unless `block_type` is a coded or a stored block."""
+        if block_type in (FileHandlerBinaryHuffman.BLOCK_LZ78_HUFFMAN, FileHandlerBinaryHuffman.BLOCK_STORED):
+            return
+        raise ValueError(f"Unknown block type: {block_type}")
+    
+    @staticmethod
+    def _parse_stored(trie: PhraseTrie, text: str) -> List[Tuple[int, str]]:
+        """Pairs of the text of a stored block, added to `trie` as they are parsed."""
+        pairs = []
+        for index, char in trie.parse(text):
+            trie.add(index, char)
+            pairs.append((index, char))
+        return pairs
+    
+    @staticmethod
+    def _read_stored_body(payload: bytes,
+                          contexts: Optional[LiteralContexts] = None,
+                          live_size: Optional[LiveDictionarySize] = None) -> str:
+        """
+        Read the payload written by write_stored_block.
+        
+        The literal contexts and the dictionary size of the file are
+        advanced past the pairs of the block, so the next blocks decode
+        as if it had been coded.
+        
+        Returns:
+            Text of the block (its pairs are parsed by the LZ78 decoder,
+            see LZ78StreamDecompressor.decode_stored)
+        """
+        pair_count = struct.unpack('I', payload[:4])[0]
+        text = payload[4:].decode('utf-8')
+        if contexts is not None:
+            if len(FileHandlerBinaryHuffman._parse_stored(contexts.trie, text)) != pair_count:
+                raise ValueError("Corrupted file: stored block pair count differs")
+        if live_size is not None:
+            for _ in range(pair_count):
+                live_size.advance()
+        return text
+    
+    @staticmethod
+    def iter_blocks(f: BinaryIO, header: Dict) -> Iterator[Tuple[PairBatch, Dict, BitWriter]]:
+        """
+        Iterate over the blocks of an open file, after its header.
+        
+        Version 2 files are seen as a single block. With
+        FLAG_INDEPENDENT_BLOCKS, the pairs of every block refer to a
+        dictionary of their own.
+        
+        Args:
+            f: Binary file positioned right after the header
+            header: Header returned by _read_header
+        
+        Yields:
+            Tuple of (block, huffman_codes, encoded_indices) per block,
+            where block is the PairBatch of all its pairs; a stored block
+            (see _read_stored_body) has no codes. Once exhausted, the file
+            is positioned at the checksum of the text (see read_checksum),
+            which the caller checks once it has decoded the pairs.
+        """
+        if header['version'] == 2:
+            compressed_data, huffman_codes, encoded_indices = FileHandlerBinaryHuffman._read_body(
+                f, header['index_coding'], header['version'])
+            block = PairBatch(FileHandlerBinaryHuffman.BLOCK_LZ78_HUFFMAN, compressed_data)
+            yield block, huffman_codes, encoded_indices
+            return
+        
+        literal_coding = header['literal_coding']
+        entropy_coder = header['entropy_coder']
+        independent = header['flags'] & FLAG_INDEPENDENT_BLOCKS
+        contexts = FileHandlerBinaryHuffman._literal_contexts(header)
+        live_size = FileHandlerBinaryHuffman._live_size(header)
+        
+        while True:
+            block_type_bytes = f.read(1)
+            if not block_type_bytes:
+                raise ValueError("Truncated file: missing end of stream")
+            block_type = block_type_bytes[0]
+            
+            if block_type == FileHandlerBinaryHuffman.BLOCK_END:
+                return
+            FileHandlerBinaryHuffman._check_block_type(block_type)
+            if independent:
+                contexts = FileHandlerBinaryHuffman._literal_contexts(header)
+                live_size = FileHandlerBinaryHuffman._live_size(header)
             
+            payload_length = struct.unpack('I', f.read(4))[0]
+            payload = f.read(payload_length)
+            if len(payload) != payload_length:
+                raise ValueError("Truncated file: incomplete block")
+            if block_type == FileHandlerBinaryHuffman.BLOCK_STORED:
+                text = FileHandlerBinaryHuffman._read_stored_body(payload, contexts, live_size)
+                yield PairBatch(block_type, text=text), {}, BitWriter()
+                continue
+            compressed_data, huffman_codes, encoded_indices = FileHandlerBinaryHuffman._read_body(
+                io.BytesIO(payload), header['index_coding'], header['version'], literal_coding, contexts,
+                live_size, entropy_coder
+            )
+            yield PairBatch(block_type, compressed_data), huffman_codes, encoded_indices
+    
+    @staticmethod
+    def iter_pairs(f: BinaryIO, header: Dict,
+                   batch_size: int = PAIR_BATCH_SIZE) -> Iterator[PairBatch]:
+        """
+        Iterate over the (index, char) pairs of an open file, decoding them incrementally.
+        
+        Unlike iter_blocks, a block is never loaded whole: its encoded
+        indices and its characters are read in small chunks and decoded as
+        they are consumed, so memory does not depend on the block size.
+        The file must be seekable. With FLAG_INDEPENDENT_BLOCKS, batches do
+        not show where a block (and its dictionary) starts: use
+        iter_block_offsets and iter_block_pairs instead.
+        
+        Args:
+            f: Binary file positioned right after the header
+            header: Header returned by _read_header
+            batch_size: Maximum number of pairs yielded at a time
+        
+        Yields:
+            PairBatch of at most batch_size pairs, in file order; a stored
+            block is yielded whole as its text (see _read_stored_body).
+            Once exhausted, the file is positioned at the checksum of the
+            text, as with iter_blocks.
+        """
+        if header['version'] == 2:
+            yield from FileHandlerBinaryHuffman._iter_body_pairs(f, batch_size, header['index_coding'],
+                                                                 header['version'])
+            return
+        
+        literal_coding = header['literal_coding']
+        entropy_coder = header['entropy_coder']
+        independent = header['flags'] & FLAG_INDEPENDENT_BLOCKS
+        contexts = FileHandlerBinaryHuffman._literal_contexts(header)
+        live_size = FileHandlerBinaryHuffman._live_size(header)
+        
+        while True:
+            block_type_bytes = f.read(1)
+            if not block_type_bytes:
+                raise ValueError("Truncated file: missing end of stream")
+            block_type = block_type_bytes[0]
+            
+            if block_type == FileHandlerBinaryHuffman.BLOCK_END:
+                return
+            FileHandlerBinaryHuffman._check_block_type(block_type)
+            if independent:
+                contexts = FileHandlerBinaryHuffman._literal_contexts(header)
+                live_size = FileHandlerBinaryHuffman._live_size(header)
+            
+            payload_length = struct.unpack('I', f.read(4))[0]
+            if block_type == FileHandlerBinaryHuffman.BLOCK_STORED:
+                text = FileHandlerBinaryHuffman._read_stored_body(f.read(payload_length), contexts, live_size)
+                yield PairBatch(block_type, text=text)
+                continue
+            block_end = f.tell() + payload_length
+            yield from FileHandlerBinaryHuffman._iter_body_pairs(f, batch_size, header['index_coding'],
+                                                                 header['version'], literal_coding, contexts,
+                                                                 live_size, entropy_coder)
+            f.seek(block_end)
+    
+    @staticmethod
+    def iter_block_offsets(f: BinaryIO) -> Iterator[int]:
+        """
+        Iterate over the offsets of the blocks of an open file (not version 2).
+        
+        Only the block framing is read: every payload is skipped.
+        
+        Args:
+            f: Binary file positioned right after the header
+        
+        Yields:
+            Position of the block type byte of every LZ78 or stored block;
+            once exhausted, the file is positioned at the checksum of the
+            text (see read_checksum)
+        """
+        while True:
+            offset = f.tell()
+            block_type_bytes = f.read(1)
+            if not block_type_bytes:
+                raise ValueError("Truncated file: missing end of stream")
+            block_type = block_type_bytes[0]
+            
+            if block_type == FileHandlerBinaryHuffman.BLOCK_END:
+                return
+            FileHandlerBinaryHuffman._check_block_type(block_type)
+            
+            payload_length = struct.unpack('I', f.read(4))[0]
+            yield offset
+            f.seek(offset + 1 + 4 + payload_length)
+    
+    @staticmethod
+    def iter_block_pairs(f: BinaryIO, header: Dict, offset: int,
+                         batch_size: int = PAIR_BATCH_SIZE) -> Iterator[PairBatch]:
+        """
+        Decode only the block at `offset` of a file with FLAG_INDEPENDENT_BLOCKS.
+        
+        Its pairs refer to a dictionary of their own, which starts empty.
+        
+        Args:
+            f: Seekable binary file
+            header: Header returned by _read_header
+            offset: Position of the block type byte (see iter_block_offsets
+                and read_block_index)
+            batch_size: Maximum number of pairs yielded at a time
+        
+        Yields:
+            PairBatch of the pairs of the block, in order, or of the text
+            of a stored block
+        """
+        if not header['flags'] & FLAG_INDEPENDENT_BLOCKS:
+            raise ValueError("The blocks of this file depend on the previous blocks")
+        
+        f.seek(offset)
+        block_type_bytes = f.read(1)
+        if not block_type_bytes or block_type_bytes[0] == FileHandlerBinaryHuffman.BLOCK_END:
+            raise ValueError(f"No block at offset {offset}")
+        FileHandlerBinaryHuffman._check_block_type(block_type_bytes[0])
+        payload_length = struct.unpack('I', f.read(4))[0]
+        if block_type_bytes[0] == FileHandlerBinaryHuffman.BLOCK_STORED:
+            # El bloque empieza con su propio diccionario: nada que mantener al día
+            text = FileHandlerBinaryHuffman._read_stored_body(f.read(payload_length))
+            yield PairBatch(FileHandlerBinaryHuffman.BLOCK_STORED, text=text)
+            return
+        yield from FileHandlerBinaryHuffman._iter_body_pairs(
+            f, batch_size, header['index_coding'], header['version'], header['literal_coding'],
+            FileHandlerBinaryHuffman._literal_contexts(header), FileHandlerBinaryHuffman._live_size(header),
+            header['entropy_coder']
+        )
+    
+    @staticmethod
+    def _iter_body_pairs(f: BinaryIO, batch_size: int, index_coding: str,
+                         version: int = VERSION,
+                         literal_coding: str = LITERAL_CODING_RAW,
+                         contexts: Optional[LiteralContexts] = None,
+                         live_size: Optional[LiveDictionarySize] = None,
+                         entropy_coder: str = ENTROPY_CODER_HUFFMAN) -> Iterator[PairBatch]:
+        """
+        Decode a body written by _write_body in batches of pairs.
+        
+        The encoded indices and the characters are two separate sections
+        of the body; each one is read through its own _SectionReader.
+        Leaves the file positioned at the end of the body.
+        """
+        if entropy_coder != ENTROPY_CODER_HUFFMAN:
+            pair_count = struct.unpack('I', f.read(4))[0]
+            index_length = struct.unpack('I', f.read(4))[0]
+            index_reader = _SectionReader(f, f.tell())
+            index_end = index_reader.position + index_length
+            literal_reader = _SectionReader(f, index_end)
+            literal_length = struct.unpack('I', literal_reader.read(4))[0]
+            body_end = literal_reader.position + literal_length
+            
+            # Cada decodificador lee solo su sección
+            decoder = PairDecoder(entropy_coder,
+                                  lambda size: index_reader.read(min(size, index_end - index_reader.position)),
+                                  lambda size: literal_reader.read(min(size, body_end - literal_reader.position)),
+                                  index_coding, literal_coding, live_size, contexts)
+            emitted = 0
+            while emitted < pair_count:
+                batch = decoder.decode(min(batch_size, pair_count - emitted))
+                emitted += len(batch)
+                yield PairBatch(FileHandlerBinaryHuffman.BLOCK_LZ78_HUFFMAN, batch)
+            f.seek(body_end)
+            return
+        
+        # Read Huffman codes (small: a few dozen symbols at most)
+        huffman_codes = FileHandlerBinaryHuffman._read_codes(f, index_coding, version)
+        
+        bit_count = struct.unpack('I', f.read(4))[0]
+        bits_offset = f.tell()
+        chars_offset = bits_offset + (bit_count + 7) // 8
+        
+        chars = _SectionReader(f, chars_offset)
+        char_count = struct.unpack('I', chars.read(4))[0]
+        bits = _SectionReader(f, bits_offset)
+        decoder = IndexDecoder(huffman_codes, index_coding, live_size, char_count)
+        
+        literals = None
+        if literal_coding != LITERAL_CODING_RAW:
+            tables = FileHandlerBinaryHuffman._read_literal_tables(chars)
+            literal_bits = struct.unpack('I', chars.read(4))[0]
+            body_end = chars.position + (literal_bits + 7) // 8
+            literals = LiteralDecoder(tables, chars.read, literal_bits)
+        
+        batch = []
+        remaining_bits = bit_count
+        emitted = 0
+        
+        # Al menos una vuelta: los índices por fases de un bloque pueden ocupar 0 bits
+        decoding = True
+        while decoding:
+            # Trozos pequeños: cada uno produce a lo sumo 8 índices por byte
+            chunk = bits.read(min(PAIR_BATCH_SIZE, (remaining_bits + 7) // 8))
+            if not chunk and remaining_bits:
+                raise ValueError("Truncated file: incomplete encoded indices")
+            chunk_bits = min(len(chunk) * 8, remaining_bits)
+            remaining_bits -= chunk_bits
+            
+            indices = decoder.decode(BitReader(chunk, chunk_bits))
+            if remaining_bits == 0:
+                indices.extend(decoder.finish())
+                decoding = False
+            if literals is None:
+                for index in indices:
+                    batch.append((index, chars.read_char()))
+            elif contexts is None:
+                for index in indices:
+                    batch.append((index, literals.decode()))
+            else:
+                for index in indices:
+                    char = literals.decode(contexts.context(index))
+                    contexts.update(index, char)
+                    batch.append((index, char))
+            
+            if len(batch) >= batch_size:
+                emitted += len(batch)
+                yield PairBatch(FileHandlerBinaryHuffman.BLOCK_LZ78_HUFFMAN, batch)
+                batch = []
+        
+        emitted += len(batch)
+        if batch:
+            yield PairBatch(FileHandlerBinaryHuffman.BLOCK_LZ78_HUFFMAN, batch)
+        
+        if emitted != char_count:
+            raise ValueError("Corrupted file: index and character counts differ")
+        f.seek(chars.position if literals is None else body_end)
+    
+    @staticmethod
+    def load_compressed_file(file_path: str, preset_dictionary: Optional[PresetDictionary] = None
+                             ) -> Tuple[List[Tuple[int, str]], Dict[str, int], Dict, BitWriter, str]:
+        """
+        Load a hybrid binary .lz78 compressed file.
+        
+        For files with several blocks, the pairs of all blocks are
+        concatenated, encoded_indices holds the bits of all blocks and
+        huffman_codes merges the code tables (only useful for display and
+        statistics; decompression does not need them). The pairs of
+        stored blocks are parsed again from their text. The text of the
+        pairs is checked against the checksum of the file (version 2
+        files have none).
+        
+        Args:
+            file_path: Path to the .lz78 file
+            preset_dictionary: Preset dictionary of the file, if it has one
+        
         Returns:
             Tuple of (compressed_data, lz78_dictionary, huffman_codes, encoded_indices, original_filename)
             Note: lz78_dictionary will be reconstructed, not loaded
-            
+        
         Raises:
             FileNotFoundError: If file doesn't exist
             ValueError: If file format is incorrect
@@ -134,100 +1440,51 @@ class FileHandlerBinaryHuffman:
         
         try:
             with open(file_path, 'rb') as f:
-                # Read and verify magic number
-                magic = f.read(4)
-                if magic != FileHandlerBinaryHuffman.MAGIC_NUMBER:
-                    raise ValueError("Invalid file format: incorrect magic number")
-                
-                # Read version
-                version = struct.unpack('B', f.read(1))[0]
-                if version != 2:
-                    raise ValueError(f"Unsupported format version: {version}")
-                
-                # Read original filename
-                filename_length = struct.unpack('H', f.read(2))[0]
-                original_filename = f.read(filename_length).decode('utf-8')
+                header = FileHandlerBinaryHuffman._read_header(f, preset_dictionary)
+                original_filename = header['original_filename']
+                if header['flags'] & FLAG_INDEPENDENT_BLOCKS:
+                    # Cada bloque tiene su propio diccionario: los pares no forman un único flujo LZ78
+                    raise ValueError("Blocks compressed independently; use lz78_stream.decompress_file")
                 
                 # *** NO LEEMOS DICCIONARIO LZ78 - se reconstruye ***
                 
-                # Read Huffman codes
-                huffman_size = struct.unpack('I', f.read(4))[0]
+                compressed_data = []
                 huffman_codes = {}
-                for _ in range(huffman_size):
-                    symbol_length = struct.unpack('H', f.read(2))[0]
-                    symbol = f.read(symbol_length).decode('utf-8')
-                    code_length = struct.unpack('H', f.read(2))[0]
-                    code = f.read(code_length).decode('utf-8')
-                    huffman_codes[symbol] = code
-                
-                # Read Huffman-encoded indices
-                bit_count = struct.unpack('I', f.read(4))[0]
-                byte_count = (bit_count + 7) // 8
-                byte_data = f.read(byte_count)
-                
-                # Unpack bytes into bit string
-                encoded_indices = ''
-                for byte in byte_data:
-                    encoded_indices += format(byte, '08b')
-                # Trim to actual bit count
-                encoded_indices = encoded_indices[:bit_count]
-                
-                # Read characters
-                char_count = struct.unpack('I', f.read(4))[0]
-                characters = []
-                for _ in range(char_count):
-                    char_length = struct.unpack('B', f.read(1))[0]
-                    char = f.read(char_length).decode('utf-8')
-                    characters.append(char)
-                
-                # Decode Huffman indices
-                import sys
-                import os
-                huffman_path = os.path.join(os.path.dirname(__file__), 'Huffman')
-                if huffman_path not in sys.path:
-                    sys.path.insert(0, huffman_path)
-                from decoder.decoder import Decode as HuffmanDecode
-                
-                decoded_symbols = HuffmanDecode(encoded_indices, huffman_codes)
-                
-                # Parse decoded symbols back to indices
-                # El texto decodificado es de la forma "0|25|1|0|3|15|..." 
-                # donde cada número está separado por '|'
-                SEPARATOR = '|'
-                
-                # Split por el separador para obtener los índices
-                index_strings = decoded_symbols.split(SEPARATOR)
-                indices = [int(s) for s in index_strings if s]  # Ignorar strings vacíos
-                
-                # Reconstruct compressed_data tuples
-                compressed_data = list(zip(indices, characters))
-                
-                # Reconstruct LZ78 dictionary dynamically during decompression
-                # El diccionario se construye igual que durante la compresión
-                lz78_dictionary = {}
-                dict_index = 1
+                encoded_indices = BitWriter()
+                trie = None
+                for block, block_codes, block_bits in FileHandlerBinaryHuffman.iter_blocks(f, header):
+                    if block.block_type == FileHandlerBinaryHuffman.BLOCK_STORED:
+                        if trie is None:
+                            # Diccionario de los pares anteriores, solo si hay bloques almacenados
+                            trie = PhraseTrie(header['max_dictionary_size'], header['dictionary_policy'],
+                                              preset=FileHandlerBinaryHuffman._preset(header))
+                            for index, char in compressed_data:
+                                trie.add(index if 0 <= index <= trie.size else 0, char)
+                        block_data = FileHandlerBinaryHuffman._parse_stored(trie, block.text)
+                    else:
+                        block_data = block.pairs
+                        if trie is not None:
+                            for index, char in block_data:
+                                trie.add(index if 0 <= index <= trie.size else 0, char)
+                    compressed_data.extend(block_data)
+                    huffman_codes.update(block_codes)
+                    encoded_indices.WriteBytes(block_bits.ToBytes(), len(block_bits))
                 
-                # Crear diccionario inverso temporal para la reconstrucción
-                temp_reverse_dict = {}
+                # Reconstruct LZ78 dictionary replaying the same size limit and policy
+                lz78 = LZ78Compressor(header['max_dictionary_size'], header['dictionary_policy'],
+                                      FileHandlerBinaryHuffman._preset(header))
+                lz78_dictionary = lz78.rebuild_dictionary(compressed_data)
                 
-                for idx, char in compressed_data:
-                    if idx == 0:
-                        phrase = char
-                    else:
-                        # Obtener la frase padre del diccionario temporal
-                        if idx in temp_reverse_dict:
-                            phrase = temp_reverse_dict[idx] + char
-                        else:
-                            # Si no existe, es un error pero intentamos continuar
-                            phrase = char
-                    
-                    # Agregar al diccionario
-                    lz78_dictionary[phrase] = dict_index
-                    temp_reverse_dict[dict_index] = phrase
-                    dict_index += 1
+                # iter_blocks deja el archivo justo después del bloque de fin
+                checksum = FileHandlerBinaryHuffman.read_checksum(f, header['version'])
+                if checksum is not None:
+                    text = LZ78Compressor(header['max_dictionary_size'], header['dictionary_policy'],
+                                          FileHandlerBinaryHuffman._preset(header)
+                                          ).decompress(compressed_data, {})
+                    FileHandlerBinaryHuffman.check_checksum(checksum, zlib.crc32(text.encode('utf-8')))
                 
                 return compressed_data, lz78_dictionary, huffman_codes, encoded_indices, original_filename
-                
+        
         except Exception as e:
             raise ValueError(f"Error loading hybrid compressed file: {str(e)}")
     
@@ -235,42 +1492,72 @@ class FileHandlerBinaryHuffman:
     def get_compressed_size(compressed_data: List[Tuple[int, str]], 
                            lz78_dictionary: Dict[str, int],
                            huffman_codes: Dict[str, str],
-                           encoded_indices: str,
-                           original_filename: str) -> int:
+                           encoded_indices: BitWriter,
+                           original_filename: str,
+                           index_coding: str = INDEX_CODING_SYMBOL,
+                           literal_coding: str = LITERAL_CODING_HUFFMAN,
+                           max_dictionary_size: Optional[int] = None,
+                           dictionary_policy: str = POLICY_FREEZE,
+                           entropy_coder: str = ENTROPY_CODER_HUFFMAN,
+                           preset_dictionary: Optional[PresetDictionary] = None,
+                           text: Optional[str] = None) -> int:
         """
         Calculate the size of the hybrid compressed file without actually saving it.
         OPTIMIZED: No guardamos el diccionario LZ78, solo códigos Huffman.
         
         Returns:
-            Size in bytes
+            Size in bytes (single-block file as written by save_compressed_file)
         """
-        size = 0
-        
-        # Magic number + version
-        size += 4 + 1
+        return sum(FileHandlerBinaryHuffman.get_section_sizes(
+            compressed_data, huffman_codes, encoded_indices, original_filename,
+            index_coding, literal_coding, max_dictionary_size, dictionary_policy, entropy_coder,
+            preset_dictionary, text
+        ).values())
         
-        # Filename
-        filename_bytes = original_filename.encode('utf-8')
-        size += 2 + len(filename_bytes)
-        
-        # *** NO GUARDAMOS DICCIONARIO LZ78 - gran ahorro de espacio ***
+    @staticmethod
+    def get_section_sizes(compressed_data: List[Tuple[int, str]],
+                          huffman_codes: Dict,
+                          encoded_indices: BitWriter,
+                          original_filename: str,
+                          index_coding: str = INDEX_CODING_SYMBOL,
+                          literal_coding: str = LITERAL_CODING_HUFFMAN,
+                          max_dictionary_size: Optional[int] = None,
+                          dictionary_policy: str = POLICY_FREEZE,
+                          entropy_coder: str = ENTROPY_CODER_HUFFMAN,
+                          preset_dictionary: Optional[PresetDictionary] = None,
+                          text: Optional[str] = None) -> Dict[str, int]:
+        """
+        Size of each section of the file written by save_compressed_file.
         
-        # Huffman codes
-        size += 4
-        for symbol, code in huffman_codes.items():
-            symbol_bytes = symbol.encode('utf-8')
-            code_bytes = code.encode('utf-8')
-            size += 2 + len(symbol_bytes) + 2 + len(code_bytes)
+        The block is encoded in memory (the literals, and with an adaptive
+        entropy coder also the indices, are coded here), so the sizes are
+        exact. Given the text of the pairs, a block that
+        save_compressed_file would store only has a stored section. When
+        the file is saved anyway, use the sizes save_compressed_file
+        returns instead, which cost no extra coding.
         
-        # Encoded indices
-        bit_count = len(encoded_indices)
-        byte_count = (bit_count + 7) // 8
-        size += 4 + byte_count
+        Returns:
+            Dictionary with the bytes of: header (file header, block
+            framing, end marker and checksum), index_table, indices,
+            literal_table (literal count and code tables), literals and
+            stored (pair count and text of a stored block)
+        """
+        header = io.BytesIO()
+        FileHandlerBinaryHuffman.write_stream_header(
+            header, original_filename, max_dictionary_size, dictionary_policy, index_coding, literal_coding,
+            entropy_coder, dictionary_id=preset_dictionary.dictionary_id if preset_dictionary else None
+        )
         
-        # Characters
-        size += 4
-        for _, char in compressed_data:
-            char_bytes = char.encode('utf-8')
-            size += 1 + len(char_bytes)
+        # *** NO GUARDAMOS DICCIONARIO LZ78 - gran ahorro de espacio ***
         
-        return size
+        preset = preset_dictionary.pairs if preset_dictionary else ()
+        contexts = None
+        if literal_coding == LITERAL_CODING_CONTEXT:
+            contexts = LiteralContexts(max_dictionary_size, dictionary_policy, preset)
+        sizes = FileHandlerBinaryHuffman.write_block_sections(
+            io.BytesIO(), compressed_data, huffman_codes, encoded_indices, index_coding, literal_coding,
+            contexts, entropy_coder, LiveDictionarySize(max_dictionary_size, dictionary_policy, preset),
+            text.encode('utf-8') if text is not None else None
+        )
+        sizes['header'] += len(header.getvalue()) + FileHandlerBinaryHuffman.END_SIZE
+        return sizes
@@ -0,0 +1,413 @@
+"""
+Index coding for LZ78 + Huffman
+Turns the LZ78 phrase indices into a Huffman-coded bit stream and back
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .lz78_compressor import POLICY_FREEZE, POLICY_RESET
+
+# Import Huffman functions with absolute paths
+import sys
+import os
+huffman_path = os.path.join(os.path.dirname(__file__), 'Huffman')
+if huffman_path not in sys.path:
+    sys.path.insert(0, huffman_path)
+
+from encoder.encoder import Encode as HuffmanEncode, EncodeBits, BuildCodes
+from decoder.decoder import ToBitReader, DecodeTable
+from bitio.bitio import BitReader, BitWriter
+
+# Index codings. The position in INDEX_CODINGS is the code stored in the
+# .lz78 header.
+INDEX_CODING_TEXT = 'text'      # Huffman over the decimal index text "0|25|1|..." (format v2)
+INDEX_CODING_SYMBOL = 'symbol'  # Huffman over index buckets + raw extra bits
+INDEX_CODING_PHASED = 'phased'  # Phased-in binary codes sized to the live dictionary, no code table
+INDEX_CODINGS = (INDEX_CODING_TEXT, INDEX_CODING_SYMBOL, INDEX_CODING_PHASED)
+
+SEPARATOR = '|'  # Separador de índices en la codificación de texto
+
+# Índices menores que este valor son un símbolo propio sin bits extra
+DIRECT_SYMBOLS = 4
+
+# Longitud máxima de los códigos Huffman, para acotar las tablas del decodificador
+MAX_CODE_LENGTH = 15
+
+
+def index_to_symbol(index: int) -> Tuple[int, int, int]:
+    """
+    Map an index to its bucket symbol (Deflate-style distance codes).
+    
+    Indices 0-3 are their own symbol. Larger indices are grouped in two
+    buckets per power of two, identified by the bit length of the index
+    and its second most significant bit; the remaining low bits are
+    written raw after the Huffman code.
+    
+    Args:
+        index: LZ78 phrase index (>= 0)
+    
+    Returns:
+        Tuple of (symbol, extra_bits, extra_value)
+    """
+    if index < DIRECT_SYMBOLS:
+        return index, 0, 0
+    bit_length = index.bit_length()
+    extra_bits = bit_length - 2
+    half = (index >> extra_bits) & 1
+    return 2 * (bit_length - 1) + half, extra_bits, index & ((1 << extra_bits) - 1)
+
+
+def symbol_base(symbol: int) -> Tuple[int, int]:
+    """
+    Smallest index of a bucket symbol and its number of extra bits.
+    
+    Inverse of index_to_symbol: index = base + extra_value.
+    """
+    if symbol < DIRECT_SYMBOLS:
+        return symbol, 0
+    extra_bits = symbol // 2 - 1
+    return (2 | (symbol & 1)) << extra_bits, extra_bits
+
+
+class LiveDictionarySize:
+    """
+    Size of the LZ78 dictionary when each pair is coded.
+    
+    Pair k can only reference phrases 0..size, where size is the number
+    of phrases added by the k previous pairs under the dictionary-full
+    policy: every pair adds one phrase until the dictionary is full; then
+    the size stays at the limit ('freeze', 'lru') or drops to 0 ('reset').
+    Used by INDEX_CODING_PHASED; keep one instance for all the blocks of
+    a file, like the dictionary itself. The pairs of a preset dictionary
+    that fit in the dictionary (see PhraseTrie) count as coded pairs.
+    """
+    
+    def __init__(self, max_dictionary_size: Optional[int] = None,
+                 dictionary_policy: str = POLICY_FREEZE,
+                 preset: Sequence[Tuple[int, str]] = ()):
+        self.max_size = max_dictionary_size
+        self.policy = dictionary_policy
+        self.size = 0
+        for _ in preset[:max_dictionary_size]:
+            self.advance()
+    
+    def advance(self) -> None:
+        """Register one coded pair."""
+        if self.max_size is None or self.size < self.max_size:
+            self.size += 1
+        elif self.policy == POLICY_RESET:
+            self.size = 0
+    
+    def changes(self) -> bool:
+        """Whether advance() changes the size (False once it stays at the limit)."""
+        return self.size != self.max_size or self.policy == POLICY_RESET
+
+
+def phased_parameters(count: int) -> Tuple[int, int]:
+    """
+    Parameters of the phased-in (truncated binary) code of `count` values.
+    
+    With k = floor(log2(count)), the first 2^(k+1) - count values are
+    written in k bits and the others, plus that offset, in k + 1 bits. A
+    power of two takes k bits for every value and count = 1 takes no bits.
+    
+    Returns:
+        Tuple of (k, number of values written in k bits)
+    """
+    bits = count.bit_length() - 1
+    return bits, (2 << bits) - count
+
+
+def encode_indices(indices: List[int], index_coding: str,
+                   live_size: Optional[LiveDictionarySize] = None) -> Tuple[Dict, BitWriter]:
+    """
+    Encode a list of LZ78 indices.
+    
+    Args:
+        indices: Phrase indices, in order
+        index_coding: One of INDEX_CODINGS
+        live_size: Dictionary size before the first index (see
+            LiveDictionarySize); used and advanced by INDEX_CODING_PHASED
+            (default: an empty unbounded dictionary)
+    
+    Returns:
+        Tuple of (huffman_codes, encoded_indices), the latter as packed
+        bits. The codes are canonical (rebuilt from their lengths by
+        CanonicalCodes) and at most MAX_CODE_LENGTH bits long. With
+        INDEX_CODING_TEXT they are keyed by character ('0'-'9' and '|');
+        with INDEX_CODING_SYMBOL they are keyed by bucket symbol (int);
+        INDEX_CODING_PHASED has no codes.
+    
+    Raises:
+        ValueError: If the index coding is unknown, or a phased index is
+            not in the dictionary
+    """
+    if index_coding not in INDEX_CODINGS:
+        raise ValueError(f"Unknown index coding: {index_coding}")
+    
+    if index_coding == INDEX_CODING_PHASED:
+        if live_size is None:
+            live_size = LiveDictionarySize()
+        writer = BitWriter()
+        write = writer.Write
+        size = live_size.size
+        bits, short = phased_parameters(size + 1)
+        for index in indices:
+            if index > size or index < 0:
+                raise ValueError(f"Index {index} is not in a dictionary of {size} phrases")
+            # Código binario truncado para los size + 1 índices posibles
+            if index < short:
+                write(index, bits)
+            else:
+                write(index + short, bits + 1)
+            if live_size.changes():
+                live_size.advance()
+                size = live_size.size
+                bits, short = phased_parameters(size + 1)
+        return {}, writer
+    
+    if not indices:
+        return {}, BitWriter()
+    
+    if index_coding == INDEX_CODING_TEXT:
+        # Crear texto con índices separados por el separador
+        # Esto asegura que "256" sea tratado como un solo símbolo, no como '2', '5', '6'
+        indices_text = SEPARATOR.join(str(index) for index in indices)
+        freq_dict, huffman_tree, huffman_codes = HuffmanEncode(indices_text, canonical=True,
+                                                               maxLength=MAX_CODE_LENGTH)
+        
+        # Código de cada índice distinto seguido del separador, como entero
+        separator_code = huffman_codes.get(SEPARATOR, '')
+        index_codes: Dict[int, Tuple[int, int]] = {}
+        for index in set(indices):
+            code = ''.join([huffman_codes[digit] for digit in str(index)]) + separator_code
+            index_codes[index] = (int(code, 2), len(code))
+        
+        writer = BitWriter()
+        write = writer.Write
+        for index in indices:
+            write(*index_codes[index])
+        # El último índice no lleva separador
+        writer = BitWriter.FromBytes(writer.ToBytes(), len(writer) - len(separator_code))
+        return huffman_codes, writer
+    
+    # Huffman sobre los símbolos de cubeta; los bits bajos van sin codificar
+    index_counts = Counter(indices)
+    symbol_counts: Dict[int, int] = {}
+    for index, count in index_counts.items():
+        symbol = index_to_symbol(index)[0]
+        symbol_counts[symbol] = symbol_counts.get(symbol, 0) + count
+    freq_dict = dict(sorted(symbol_counts.items(), key=lambda item: item[1], reverse=True))
+    huffman_tree, huffman_codes = BuildCodes(freq_dict, canonical=True, maxLength=MAX_CODE_LENGTH)
+    
+    # Código completo (Huffman + bits extra) de cada índice distinto, como entero
+    index_codes: Dict[int, Tuple[int, int]] = {}
+    for index in index_counts:
+        symbol, extra_bits, extra_value = index_to_symbol(index)
+        code = huffman_codes[symbol]
+        index_codes[index] = ((int(code, 2) << extra_bits) | extra_value, len(code) + extra_bits)
+    
+    writer = BitWriter()
+    write = writer.Write
+    for index in indices:
+        write(*index_codes[index])
+    return huffman_codes, writer
+
+
+class IndexDecoder:
+    """
+    Incremental decoder for the bit stream written by encode_indices.
+    
+    Codes are decoded with the multi-bit lookup tables of the Huffman
+    package (DecodeTable). Bits can be given in pieces of any size with
+    decode(): the bits of an index cut by the end of a piece are kept and
+    decoded with the next one. finish() returns the last index of a
+    text-coded stream, which has no trailing separator.
+    
+    A phased stream needs the dictionary size before its first index
+    (`live_size`, advanced as indices are decoded) and its number of
+    indices (`count`): an index coded when the dictionary is empty takes
+    no bits.
+    """
+    
+    def __init__(self, huffman_codes: Dict, index_coding: str,
+                 live_size: Optional[LiveDictionarySize] = None,
+                 count: Optional[int] = None):
+        if index_coding not in INDEX_CODINGS:
+            raise ValueError(f"Unknown index coding: {index_coding}")
+        if index_coding == INDEX_CODING_PHASED and count is None:
+            raise ValueError("Phased index coding needs the number of indices")
+        self.index_coding = index_coding
+        self.live_size = live_size if live_size is not None else LiveDictionarySize()
+        self.pending = count if index_coding == INDEX_CODING_PHASED else 0
+        self.table = DecodeTable(huffman_codes)
+        self.carry_value = 0
+        self.carry_length = 0
+        self.digits = ''
+        # Base y bits extra de cada símbolo de cubeta
+        self.bases = {}
+        if index_coding == INDEX_CODING_SYMBOL:
+            self.bases = {symbol: symbol_base(symbol) for symbol in huffman_codes}
+    
+    def decode(self, bits: BitReader) -> List[int]:
+        """
+        Decode the next bits of the stream.
+        
+        Args:
+            bits: Reader over the next packed bits; all its remaining bits
+                are consumed
+        
+        Returns:
+            Indices completed by these bits
+        """
+        reader = bits
+        if self.carry_length:
+            # Anteponer los bits del índice que quedó cortado en el trozo anterior
+            writer = BitWriter()
+            writer.Write(self.carry_value, self.carry_length)
+            writer.WriteReader(bits)
+            reader = BitReader.FromWriter(writer)
+        
+        if self.index_coding == INDEX_CODING_TEXT:
+            indices = self._decode_text(reader)
+        elif self.index_coding == INDEX_CODING_PHASED:
+            indices = self._decode_phased(reader)
+        else:
+            indices = self._decode_symbols(reader)
+        
+        self.carry_length = reader.Remaining()
+        self.carry_value = reader.Read(self.carry_length)
+        bits.position = bits.bitCount
+        return indices
+    
+    def _decode_text(self, reader: BitReader) -> List[int]:
+        symbols = []
+        self.table.DecodeInto(reader, symbols, partial=True)
+        # El texto es de la forma "0|25|1|..."; el último número puede seguir en el próximo trozo
+        parts = (self.digits + ''.join(symbols)).split(SEPARATOR)
+        self.digits = parts.pop()
+        return [int(part) for part in parts if part]
+    
+    def _decode_symbols(self, reader: BitReader) -> List[int]:
+        table = self.table
+        bases = self.bases
+        max_length = table.maxLength
+        indices = []
+        
+        data = reader.data + bytes(16)
+        remaining = reader.Remaining()
+        byte_position = reader.position >> 3
+        available = 8 - (reader.position & 7)
+        window = data[byte_position] & ((1 << available) - 1) if remaining else 0
+        byte_position += 1
+        
+        while remaining > 0:
+            # La ventana debe contener un código y sus bits extra (a lo sumo 30)
+            while available < max_length + 32:
+                window = ((window & ((1 << available) - 1)) << 64) | int.from_bytes(data[byte_position:byte_position + 8], 'big')
+                available += 64
+                byte_position += 8
+                if byte_position > len(data):
+                    data += bytes(16)
+            
+            found = table.Lookup(window, available)
+            if found is None:
+                if remaining < max_length:
+                    break
+                raise ValueError("Invalid Huffman code in the encoded indices")
+            symbol, length = found
+            base, extra_bits = bases[symbol]
+            if length + extra_bits > remaining:
+                break
+            available -= length + extra_bits
+            remaining -= length + extra_bits
+            if extra_bits:
+                base += (window >> available) & ((1 << extra_bits) - 1)
+            indices.append(base)
+        
+        reader.position = reader.bitCount - remaining
+        return indices
+    
+    def _decode_phased(self, reader: BitReader) -> List[int]:
+        live_size = self.live_size
+        code_bits, short = phased_parameters(live_size.size + 1)
+        pending = self.pending
+        indices = []
+        
+        data = reader.data + bytes(16)
+        remaining = reader.Remaining()
+        byte_position = reader.position >> 3
+        available = 8 - (reader.position & 7)
+        window = data[byte_position] & ((1 << available) - 1) if remaining else 0
+        byte_position += 1
+        
+        while pending:
+            bits = code_bits
+            if bits > remaining:
+                break
+            # La ventana debe contener un código completo (a lo sumo 33 bits)
+            if available <= bits:
+                window = ((window & ((1 << available) - 1)) << 64) | int.from_bytes(data[byte_position:byte_position + 8], 'big')
+                available += 64
+                byte_position += 8
+                if byte_position > len(data):
+                    data += bytes(16)
+            
+            index = (window >> (available - bits)) & ((1 << bits) - 1)
+            if index >= short:
+                if bits == remaining:
+                    break
+                bits += 1
+                index = ((window >> (available - bits)) & ((1 << bits) - 1)) - short
+            available -= bits
+            remaining -= bits
+            indices.append(index)
+            pending -= 1
+            
+            if live_size.changes():
+                live_size.advance()
+                code_bits, short = phased_parameters(live_size.size + 1)
+        
+        self.pending = pending
+        reader.position = reader.bitCount - remaining
+        return indices
+    
+    def finish(self) -> List[int]:
+        """
+        Return the index still pending at the end of the stream, if any.
+        
+        Raises:
+            ValueError: If there are bits left that do not form an index,
+                or a phased stream ends before all its indices
+        """
+        if self.carry_length:
+            raise ValueError("Corrupted encoded indices: incomplete code at the end")
+        if self.pending:
+            raise ValueError("Corrupted encoded indices: missing indices at the end")
+        if self.digits:
+            digits, self.digits = self.digits, ''
+            return [int(digits)]
+        return []
+
+
+def decode_indices(encoded_indices: Union[BitWriter, BitReader], huffman_codes: Dict, index_coding: str,
+                   live_size: Optional[LiveDictionarySize] = None,
+                   count: Optional[int] = None) -> List[int]:
+    """
+    Decode a whole bit stream written by encode_indices.
+    
+    Args:
+        encoded_indices: Packed bits (BitWriter or BitReader)
+        huffman_codes: Codes returned by encode_indices
+        index_coding: One of INDEX_CODINGS
+        live_size: Dictionary size before the first index (phased coding)
+        count: Number of indices (required by the phased coding)
+    
+    Returns:
+        List of phrase indices
+    """
+    decoder = IndexDecoder(huffman_codes, index_coding, live_size, count)
+    indices = decoder.decode(ToBitReader(encoded_indices))
+    indices.extend(decoder.finish())
+    return indices
@@ -0,0 +1,194 @@
+"""
+Literal coding for LZ78 + Huffman
+Turns the literal characters of the LZ78 pairs into a Huffman-coded bit
+stream, optionally with one code table per order-1 context, and back
+"""
+
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .lz78_compressor import PhraseTrie, POLICY_FREEZE
+from .index_coding import MAX_CODE_LENGTH
+
+# Import Huffman functions with absolute paths
+import sys
+import os
+huffman_path = os.path.join(os.path.dirname(__file__), 'Huffman')
+if huffman_path not in sys.path:
+    sys.path.insert(0, huffman_path)
+
+from encoder.encoder import BuildCodes
+from decoder.decoder import DecodeTable
+from bitio.bitio import BitWriter
+
+# Literal codings. The position in LITERAL_CODINGS is the code stored in
+# the .lz78 header.
+LITERAL_CODING_RAW = 'raw'          # 1-byte length + UTF-8 bytes per literal
+LITERAL_CODING_HUFFMAN = 'huffman'  # One Huffman table for all the literals of a block
+LITERAL_CODING_CONTEXT = 'context'  # Huffman tables keyed by the last char of the parent phrase
+LITERAL_CODINGS = (LITERAL_CODING_RAW, LITERAL_CODING_HUFFMAN, LITERAL_CODING_CONTEXT)
+
+# Clave de la tabla compartida por los contextos sin tabla propia
+FALLBACK_TABLE = None
+
+
+class LiteralContexts:
+    """
+    Order-1 contexts of the literals: the last character of the parent phrase.
+    
+    The context of a pair (index, char) is the last character of phrase
+    `index` ('' for the empty phrase). The dictionary is replayed with a
+    PhraseTrie (same size limit and policy as the LZ78 coder), so the
+    encoder and the decoder see the same contexts, starting from the
+    same preset dictionary if there is one. Keep one instance for all the
+    blocks of a file: the dictionary is shared by them.
+    """
+    
+    def __init__(self, max_dictionary_size: Optional[int] = None,
+                 dictionary_policy: str = POLICY_FREEZE,
+                 preset: Sequence[Tuple[int, str]] = ()):
+        self.trie = PhraseTrie(max_dictionary_size, dictionary_policy, track_children=False, preset=preset)
+    
+    def context(self, index: int) -> str:
+        """Context of the literal that follows phrase `index`."""
+        chars = self.trie.chars
+        return chars[index] if index < len(chars) else ''
+    
+    def update(self, index: int, char: str) -> None:
+        """Register a decoded or encoded pair."""
+        if index > self.trie.size or index < 0:
+            # Índice inválido: el decodificador LZ78 usa la frase vacía
+            index = 0
+        self.trie.add(index, char)
+    
+    def contexts(self, pairs: List[Tuple[int, str]]) -> List[str]:
+        """Contexts of a list of pairs, registering them."""
+        contexts = []
+        for index, char in pairs:
+            contexts.append(self.context(index))
+            self.update(index, char)
+        return contexts
+
+
+def _table_size(codes: Dict[str, str]) -> int:
+    """Bytes of a code table as written in the .lz78 body (canonical code lengths)."""
+    return 2 + sum(1 + len(symbol.encode('utf-8')) + 1 for symbol in codes)
+
+
+def encode_literals(literals: List[str], literal_coding: str,
+                    contexts: Optional[List[str]] = None) -> Tuple[Dict, BitWriter]:
+    """
+    Huffman-encode the literal characters of a block.
+    
+    With LITERAL_CODING_CONTEXT, the literals of a context get their own
+    table when the bits it saves pay for its size; the literals of the
+    other contexts share the FALLBACK_TABLE.
+    
+    Args:
+        literals: Literal characters, in order
+        literal_coding: LITERAL_CODING_HUFFMAN or LITERAL_CODING_CONTEXT
+        contexts: Context of every literal (see LiteralContexts); required
+            with LITERAL_CODING_CONTEXT
+    
+    Returns:
+        Tuple of (tables, encoded_literals): tables maps a context (or
+        FALLBACK_TABLE) to canonical Huffman codes of at most
+        MAX_CODE_LENGTH bits
+    
+    Raises:
+        ValueError: If the literal coding is unknown or raw
+    """
+    if literal_coding not in LITERAL_CODINGS or literal_coding == LITERAL_CODING_RAW:
+        raise ValueError(f"Literal coding can't be Huffman-encoded: {literal_coding}")
+    if literal_coding == LITERAL_CODING_CONTEXT and (contexts is None or len(contexts) != len(literals)):
+        raise ValueError("Context coding needs the context of every literal")
+    
+    counts = Counter(literals)
+    tables: Dict[Optional[str], Dict[str, str]] = {}
+    
+    if literal_coding == LITERAL_CODING_CONTEXT:
+        _, order0_codes = BuildCodes(counts, canonical=True, maxLength=MAX_CODE_LENGTH)
+        context_counts: Dict[str, Counter] = {}
+        for context, literal in zip(contexts, literals):
+            context_counts.setdefault(context, Counter())[literal] += 1
+        
+        # Tabla propia solo si ahorra más bits de los que ocupa
+        shared = Counter()
+        for context, literal_counts in context_counts.items():
+            _, codes = BuildCodes(literal_counts, canonical=True, maxLength=MAX_CODE_LENGTH)
+            own_bits = sum(count * len(codes[literal]) for literal, count in literal_counts.items())
+            own_bits += 8 * (1 + len(context.encode('utf-8')) + _table_size(codes))
+            shared_bits = sum(count * len(order0_codes[literal]) for literal, count in literal_counts.items())
+            if own_bits < shared_bits:
+                tables[context] = codes
+            else:
+                shared.update(literal_counts)
+        counts = shared
+    
+    if counts:
+        tables[FALLBACK_TABLE] = BuildCodes(counts, canonical=True, maxLength=MAX_CODE_LENGTH)[1]
+    
+    # Código de cada literal como entero, por tabla
+    int_codes = {key: {literal: (int(code, 2), len(code)) for literal, code in codes.items()}
+                 for key, codes in tables.items()}
+    writer = BitWriter()
+    write = writer.Write
+    if literal_coding == LITERAL_CODING_HUFFMAN:
+        fallback = int_codes[FALLBACK_TABLE]
+        for literal in literals:
+            write(*fallback[literal])
+    else:
+        fallback = int_codes.get(FALLBACK_TABLE)
+        for context, literal in zip(contexts, literals):
+            write(*int_codes.get(context, fallback)[literal])
+    return tables, writer
+
+
+class LiteralDecoder:
+    """
+    Sequential decoder for the bit stream written by encode_literals.
+    
+    Bits are pulled on demand with `read(size) -> bytes` (for instance
+    from a section of a file), eight bytes at a time, so the encoded
+    literals never have to be loaded whole.
+    """
+    
+    REFILL_BYTES = 8
+    
+    def __init__(self, tables: Dict, read: Callable[[int], bytes], bit_count: int):
+        self.tables = {context: DecodeTable(codes) for context, codes in tables.items()
+                       if context is not FALLBACK_TABLE}
+        fallback = tables.get(FALLBACK_TABLE)
+        self.fallback = DecodeTable(fallback) if fallback else None
+        self.read = read
+        self.remaining = bit_count
+        self.window = 0
+        self.available = 0
+    
+    def decode(self, context: Optional[str] = None) -> str:
+        """
+        Decode the next literal.
+        
+        Args:
+            context: Context of the literal (ignored unless it has its own table)
+        
+        Raises:
+            ValueError: If the bits do not form a valid code
+        """
+        table = self.tables.get(context, self.fallback)
+        if table is None:
+            raise ValueError("Corrupted literals: no code table for context")
+        
+        if self.available < table.maxLength:
+            data = self.read(self.REFILL_BYTES)
+            data += bytes(self.REFILL_BYTES - len(data))
+            self.window = ((self.window & ((1 << self.available) - 1)) << 64) | int.from_bytes(data, 'big')
+            self.available += 64
+        
+        found = table.Lookup(self.window, self.available)
+        if found is None or found[1] > self.remaining:
+            raise ValueError("Corrupted literals: invalid Huffman code")
+        literal, length = found
+        self.available -= length
+        self.remaining -= length
+        return literal
@@ -0,0 +1,301 @@
+"""
+Batch LZ78 + Huffman compression of directory trees
+Walks a directory, compresses every supported text file into a mirrored
+tree of .lz78 files in worker processes, skips files that are already up
+to date and writes a JSON summary with the statistics of every file
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .lz78_compressor import POLICY_FREEZE
+from .index_coding import INDEX_CODING_SYMBOL
+from .literal_coding import LITERAL_CODING_HUFFMAN
+from .entropy_coding import ENTROPY_CODER_HUFFMAN
+from .lz78_huffman_compressor import LZ78HuffmanCompressor
+from .file_handler_binary_huffman import FileHandlerBinaryHuffman
+from .preset_dictionary import PresetDictionary
+
+# Extensions of the "Formatos de Archivo Soportados" table of the README
+SUPPORTED_EXTENSIONS = ('.txt', '.py', '.java', '.js', '.c', '.cpp', '.h', '.html', '.htm', '.css',
+                        '.json', '.xml', '.yaml', '.ini', '.log', '.sql', '.md')
+SUMMARY_FILENAME = 'lz78_summary.json'
+DEFAULT_MAX_IN_FLIGHT_BYTES = 64 << 20  # Bytes of source files being compressed at once
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_files(source_dir: str, patterns: Optional[Sequence[str]] = None,
+               exclude_dir: Optional[str] = None) -> Iterator[str]:
+    """
+    Files of a directory tree to compress, as paths relative to it.
+    
+    Args:
+        source_dir: Directory to walk
+        patterns: Glob patterns matched against the relative path (with '/')
+            and the file name; None = SUPPORTED_EXTENSIONS
+        exclude_dir: Directory not to walk (the output, if it is inside)
+    
+    Returns:
+        Relative paths in a stable (sorted) order; .lz78 files are never included
+    """
+    exclude = os.path.realpath(exclude_dir) if exclude_dir else None
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = sorted(d for d in dirs if os.path.realpath(os.path.join(root, d)) != exclude)
+        for name in sorted(files):
+            relative = os.path.relpath(os.path.join(root, name), source_dir).replace(os.sep, '/')
+            if name.endswith(FileHandlerBinaryHuffman.LZ78_EXTENSION):
+                continue
+            if patterns is None:
+                selected = os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS
+            else:
+                selected = any(fnmatch.fnmatch(relative, pattern) or fnmatch.fnmatch(name, pattern)
+                               for pattern in patterns)
+            if selected:
+                yield relative
+
+
+def _compress_one(source_path: str, target_path: str, max_dictionary_size: Optional[int],
+                  dictionary_policy: str, index_coding: str, literal_coding: str, entropy_coder: str,
+                  preset_dictionary: Optional[PresetDictionary]) -> Dict:
+    """
+    Compress one file of the tree (runs in a worker process).
+    
+    Returns:
+        Statistics from LZ78HuffmanCompressor.get_statistics(), plus
+        compressed_size (bytes of the .lz78 file), sha256 and mtime of
+        the source and time (seconds spent)
+    """
+    start = time.perf_counter()
+    with open(source_path, 'rb') as f:
+        data = f.read()
+    mtime = os.stat(source_path).st_mtime
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValueError("File is not readable as text (encoding error)")
+    
+    compressor = LZ78HuffmanCompressor(max_dictionary_size, dictionary_policy, index_coding,
+                                       literal_coding, entropy_coder, preset_dictionary)
+    result = compressor.compress(text)
+    filename = Path(source_path).name
+    os.makedirs(os.path.dirname(target_path) or '.', exist_ok=True)
+    sizes = FileHandlerBinaryHuffman.save_compressed_file(
+        target_path, *result, filename, max_dictionary_size, dictionary_policy,
+        index_coding, literal_coding, entropy_coder, preset_dictionary, text
+    )
+    
+    stats = compressor.get_statistics(text, filename, *result, sizes)
+    stats['compressed_size'] = os.path.getsize(target_path)
+    stats['sha256'] = hashlib.sha256(data).hexdigest()
+    stats['mtime'] = mtime
+    stats['time'] = time.perf_counter() - start
+    return stats
+
+
+def load_summary(summary_path: str) -> Dict:
+    """Summary written by a previous compress_tree, or an empty one if missing or unreadable."""
+    try:
+        with open(summary_path, 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return {'files': {}}
+    if not isinstance(summary.get('files'), dict):
+        summary['files'] = {}
+    return summary
+
+
+def _is_up_to_date(source_path: str, target_path: str, previous: Optional[Dict], check_hash: bool,
+                   settings: Dict) -> bool:
+    """
+    Whether the .lz78 file of a source file can be kept.
+    
+    Only a file whose statistics in the previous summary were compressed
+    with the same settings can be kept; without them it is compressed again.
+    """
+    if not os.path.isfile(target_path) or not previous or previous.get('settings') != settings:
+        return False
+    if check_hash and previous.get('sha256'):
+        # El contenido manda: un archivo tocado pero igual no se recomprime
+        return file_sha256(source_path) == previous['sha256']
+    return os.stat(target_path).st_mtime >= os.stat(source_path).st_mtime
+
+
+def _write_summary(summary_path: str, source_dir: str, target_dir: str, settings: Dict,
+                   files: Dict[str, Dict], compressed: List[str], skipped: List[str],
+                   failed: Dict[str, str], elapsed: float) -> Dict:
+    """Build the summary of compress_tree, write it as JSON and return it."""
+    original_size = sum(stats['original_size'] for stats in files.values())
+    compressed_size = sum(stats['compressed_size'] for stats in files.values())
+    summary = {
+        'source_dir': os.path.abspath(source_dir),
+        'target_dir': os.path.abspath(target_dir),
+        'settings': settings,
+        'files': dict(sorted(files.items())),
+        'compressed': compressed,
+        'skipped': skipped,
+        'failed': failed,
+        'totals': {
+            'files': len(files),
+            'original_size': original_size,
+            'compressed_size': compressed_size,
+            'compression_ratio': (compressed_size / original_size * 100) if original_size > 0 else 0,
+            'time': elapsed
+        }
+    }
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+
+def compress_tree(source_dir: str, target_dir: str,
+                  patterns: Optional[Sequence[str]] = None,
+                  max_dictionary_size: Optional[int] = None,
+                  dictionary_policy: str = POLICY_FREEZE,
+                  index_coding: str = INDEX_CODING_SYMBOL,
+                  literal_coding: str = LITERAL_CODING_HUFFMAN,
+                  entropy_coder: str = ENTROPY_CODER_HUFFMAN,
+                  preset_dictionary: Optional[PresetDictionary] = None,
+                  workers: Optional[int] = None,
+                  max_in_flight_bytes: int = DEFAULT_MAX_IN_FLIGHT_BYTES,
+                  check_hash: bool = False,
+                  force: bool = False,
+                  summary_path: Optional[str] = None) -> Dict:
+    """
+    Compress every text file of a directory tree using several processes.
+    
+    Each file selected by find_files is compressed in memory with
+    LZ78HuffmanCompressor and saved as target_dir/<relative path>.lz78
+    (a.py -> a.py.lz78, so a.py and a.txt do not collide). Files are
+    compressed in worker processes; a new file is only submitted while the
+    source files in flight add up to at most `max_in_flight_bytes` (one
+    file larger than that runs alone) and at most two files per worker
+    are in flight, so memory does not depend on the size of the tree.
+    
+    A file is skipped when the previous summary records it with the same
+    settings and its .lz78 file is newer than it or, with `check_hash`,
+    its SHA-256 equals the one in the previous summary. Files that fail
+    (e.g. not UTF-8, or a worker process that died) are recorded in the
+    summary and do not stop the batch. The summary is written as JSON to
+    `summary_path` (default target_dir/SUMMARY_FILENAME), even if the
+    batch is interrupted, and keeps the statistics of skipped files from
+    the previous run.
+    
+    Args:
+        source_dir: Directory to compress
+        target_dir: Directory of the .lz78 files (created if missing)
+        patterns: Glob patterns of the files to compress (None = SUPPORTED_EXTENSIONS)
+        max_dictionary_size: Dictionary size limit (None = unbounded)
+        dictionary_policy: Dictionary-full policy
+        index_coding: Index coding (see index_coding.INDEX_CODINGS)
+        literal_coding: Literal coding (see literal_coding.LITERAL_CODINGS)
+        entropy_coder: Entropy coder (see entropy_coding.ENTROPY_CODERS)
+        preset_dictionary: Preset dictionary every file starts from
+        workers: Worker processes (default: number of CPUs)
+        max_in_flight_bytes: Bytes of source files being compressed at once
+        check_hash: Decide whether a file changed by its SHA-256, not its mtime
+        force: Compress every file, even if it is up to date
+        summary_path: Path of the JSON summary
+    
+    Returns:
+        The summary: dictionary with settings, files (relative path ->
+        statistics, see _compress_one, plus the settings), compressed,
+        skipped and failed (relative path -> error) for this run, and
+        totals (files, original_size, compressed_size, compression_ratio,
+        time)
+    
+    Raises:
+        FileNotFoundError: If the source directory doesn't exist
+        ValueError: If the settings are invalid
+    """
+    if not Path(source_dir).is_dir():
+        raise FileNotFoundError(f"Directory not found: {source_dir}")
+    if max_in_flight_bytes < 1:
+        raise ValueError("In-flight memory must be at least 1 byte")
+    
+    # Validar la configuración antes de lanzar los procesos
+    LZ78HuffmanCompressor(max_dictionary_size, dictionary_policy, index_coding, literal_coding, entropy_coder)
+    settings = (max_dictionary_size, dictionary_policy, index_coding, literal_coding, entropy_coder,
+                preset_dictionary)
+    settings_record = {
+        'max_dictionary_size': max_dictionary_size,
+        'dictionary_policy': dictionary_policy,
+        'index_coding': index_coding,
+        'literal_coding': literal_coding,
+        'entropy_coder': entropy_coder,
+        'dictionary_id': preset_dictionary.dictionary_id if preset_dictionary else None
+    }
+    workers = workers or os.cpu_count() or 1
+    summary_path = summary_path or os.path.join(target_dir, SUMMARY_FILENAME)
+    os.makedirs(target_dir, exist_ok=True)
+    
+    previous = load_summary(summary_path)['files']
+    summary_file = os.path.realpath(summary_path)
+    files: Dict[str, Dict] = {}
+    compressed: List[str] = []
+    skipped: List[str] = []
+    failed: Dict[str, str] = {}
+    start = time.perf_counter()
+    
+    def collect(entry: Tuple[str, int, object]) -> int:
+        relative, size, future = entry
+        try:
+            stats = future.result()
+        except Exception as e:
+            # Cualquier fallo de un archivo (incluso un proceso caído) se anota sin parar el lote
+            failed[relative] = str(e) or type(e).__name__
+        else:
+            stats['settings'] = settings_record
+            files[relative] = stats
+            compressed.append(relative)
+        return size
+    
+    try:
+        with ProcessPoolExecutor(workers) as executor:
+            pending = deque()
+            in_flight = 0
+            for relative in find_files(source_dir, patterns, target_dir):
+                source_path = os.path.join(source_dir, relative)
+                if os.path.realpath(source_path) == summary_file:
+                    continue
+                target_path = os.path.join(target_dir, relative) + FileHandlerBinaryHuffman.LZ78_EXTENSION
+                try:
+                    if not force and _is_up_to_date(source_path, target_path, previous.get(relative), check_hash,
+                                                    settings_record):
+                        skipped.append(relative)
+                        files[relative] = previous[relative]
+                        continue
+                    size = os.path.getsize(source_path)
+                except OSError as e:
+                    failed[relative] = str(e)
+                    continue
+            
+                # Esperar a los primeros archivos hasta que quepa el siguiente
+                while pending and (in_flight + size > max_in_flight_bytes or len(pending) >= 2 * workers):
+                    in_flight -= collect(pending.popleft())
+                pending.append((relative, size,
+                                executor.submit(_compress_one, source_path, target_path, *settings)))
+                in_flight += size
+        
+            while pending:
+                collect(pending.popleft())
+    finally:
+        # El resumen se escribe aunque el lote se interrumpa, con lo comprimido hasta entonces
+        summary = _write_summary(summary_path, source_dir, target_dir, settings_record, files, compressed,
+                                 skipped, failed, time.perf_counter() - start)
+    return summary
@@ -2,100 +2,511 @@
 LZ78 Compression Algorithm Implementation
 """
 
-from typing import List, Tuple, Dict
+from collections import OrderedDict
+from collections.abc import Mapping
+from itertools import chain
+from typing import List, Tuple, Dict, Iterator, Iterable, Optional, Sequence, Callable
+
+
+# Dictionary-full policies (the position in this tuple is the code stored in .lz78 headers)
+POLICY_FREEZE = 'freeze'   # Stop adding phrases once the dictionary is full
+POLICY_RESET = 'reset'     # Clear the dictionary and start over
+POLICY_LRU = 'lru'         # Evict the least recently used leaf phrase and reuse its index
+DICTIONARY_POLICIES = (POLICY_FREEZE, POLICY_RESET, POLICY_LRU)
+
+PROGRESS_STEP = 1 << 16  # Characters (compression) or pairs (decompression) between progress callbacks
+
+
+class PhraseDictionary(Mapping):
+    """
+    Read-only {phrase: index} view over the LZ78 phrase trie.
+    
+    The trie stores every phrase as a (parent index, last character) pair,
+    so the phrase strings are only materialised the first time the view is
+    iterated or indexed. len() is answered from the trie directly, and
+    phrases() builds the phrases of some indices only, which is what a
+    table that shows a few rows at a time needs.
+    """
+    
+    def __init__(self, parents: List[int], chars: List[str]):
+        self._parents = parents
+        self._chars = chars
+        self._phrases: Optional[Dict[str, int]] = None
+    
+    def _materialize(self) -> Dict[str, int]:
+        if self._phrases is None:
+            # Con la política LRU un índice reutilizado puede tener un padre posterior,
+            # así que cada frase se resuelve subiendo hasta un ancestro ya conocido
+            parents = self._parents
+            strings: List[Optional[str]] = [None] * len(parents)
+            strings[0] = ''
+            phrases: Dict[str, int] = {}
+            for index in range(1, len(parents)):
+                path = []
+                node = index
+                while strings[node] is None:
+                    path.append(node)
+                    node = parents[node]
+                phrase = strings[node]
+                for node in reversed(path):
+                    phrase += self._chars[node]
+                    strings[node] = phrase
+                phrases[strings[index]] = index
+            self._phrases = phrases
+        return self._phrases
+    
+    def phrases(self, indices: Iterable[int]) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (index, phrase) for the given indices, in the same order.
+        
+        Only the phrases of those indices and their ancestors are built;
+        they are kept for the rest of the call, so consecutive indices
+        share the work of their common prefixes.
+        
+        Args:
+            indices: Phrase indices, from 1 to len()
+        """
+        parents = self._parents
+        chars = self._chars
+        strings: Dict[int, str] = {0: ''}
+        for index in indices:
+            phrase = strings.get(index)
+            if phrase is None:
+                path = []
+                node = index
+                while node not in strings:
+                    path.append(node)
+                    node = parents[node]
+                phrase = strings[node]
+                for node in reversed(path):
+                    phrase += chars[node]
+                    strings[node] = phrase
+            yield index, phrase
+    
+    def __getitem__(self, phrase: str) -> int:
+        return self._materialize()[phrase]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._materialize())
+    
+    def __len__(self) -> int:
+        return len(self._parents) - 1
+
+
+class _LeafRecency:
+    """
+    Recency order of the trie leaves for the LRU policy.
+    
+    Only phrases without children can be evicted (their indices are not
+    referenced by any other phrase). A phrase counts as used when it is
+    created or when it is the index of an emitted pair, which is exactly
+    what the decoder sees, so both sides evict the same phrases.
+    """
+    
+    def __init__(self):
+        self.leaves: 'OrderedDict[int, None]' = OrderedDict()
+        self.child_count: List[int] = [0]
+    
+    def touch(self, node: int) -> None:
+        if node in self.leaves:
+            self.leaves.move_to_end(node)
+    
+    def victim(self, protected: int) -> Optional[int]:
+        """Least recently used leaf other than `protected`, or None."""
+        for leaf in self.leaves:
+            if leaf != protected:
+                return leaf
+        return None
+    
+    def added(self, node: int, parent: int) -> None:
+        if node == len(self.child_count):
+            self.child_count.append(0)
+        else:
+            self.child_count[node] = 0
+        self.child_count[parent] += 1
+        self.leaves.pop(parent, None)
+        self.leaves[node] = None
+    
+    def removed(self, node: int, parent: int) -> None:
+        del self.leaves[node]
+        self.child_count[parent] -= 1
+        if parent and not self.child_count[parent]:
+            self.leaves[parent] = None
+    
+    def clear(self) -> None:
+        self.leaves.clear()
+        self.child_count = [0]
+
+
+class PhraseTrie:
+    """
+    LZ78 phrase dictionary stored as a trie with an optional size limit.
+    
+    Node 0 is the empty phrase; every other node is a phrase stored as
+    (parent index, last character). The same class is used by the encoder
+    (with the children lookup table) and by the decoder (without it), so
+    both apply the dictionary-full policy in exactly the same way.
+    
+    A preset dictionary (see preset_dictionary) is given as the pairs that
+    build it: they are added like any other pair, so the policy treats
+    preset phrases like the others. With a size limit only the first
+    max_size pairs are used, so the preset never triggers the policy.
+    
+    With the children lookup table the trie also keeps the length of
+    every phrase (depths), so the encoder knows how much text each
+    emitted pair covers.
+    """
+    
+    def __init__(self, max_size: Optional[int] = None, policy: str = POLICY_FREEZE,
+                 track_children: bool = True, preset: Sequence[Tuple[int, str]] = ()):
+        if policy not in DICTIONARY_POLICIES:
+            raise ValueError(f"Unknown dictionary policy: {policy}")
+        if max_size is not None and max_size < 1:
+            raise ValueError("Maximum dictionary size must be at least 1")
+        
+        self.max_size = max_size
+        self.policy = policy
+        self.children: Optional[Dict[Tuple[int, str], int]] = {} if track_children else None
+        self.depths: Optional[List[int]] = [0] if track_children else None
+        self.parents: List[int] = [0]
+        self.chars: List[str] = ['']
+        self.lru: Optional[_LeafRecency] = _LeafRecency() if policy == POLICY_LRU and max_size else None
+        for node, char in preset[:max_size]:
+            self.add(node, char)
+    
+    @property
+    def size(self) -> int:
+        """Number of phrases currently in the dictionary."""
+        return len(self.parents) - 1
+    
+    def add(self, node: int, char: str) -> Optional[int]:
+        """
+        Register the emitted pair (node, char) and add the phrase it defines.
+        
+        Args:
+            node: Index of the prefix phrase (0 = empty phrase)
+            char: Character appended to the prefix
+            
+        Returns:
+            Index given to the new phrase, or None if it was not added
+            (frozen dictionary, reset, or no evictable phrase)
+        """
+        lru = self.lru
+        if lru is not None and node:
+            lru.touch(node)
+        
+        if self.max_size is None or len(self.parents) <= self.max_size:
+            index = len(self.parents)
+            self.parents.append(node)
+            self.chars.append(char)
+            if self.children is not None:
+                self.children[(node, char)] = index
+            if self.depths is not None:
+                self.depths.append(self.depths[node] + 1)
+            if lru is not None:
+                lru.added(index, node)
+            return index
+        
+        if self.policy == POLICY_FREEZE:
+            return None
+        
+        if self.policy == POLICY_RESET:
+            if self.children is not None:
+                self.children.clear()
+            if self.depths is not None:
+                del self.depths[1:]
+            del self.parents[1:]
+            del self.chars[1:]
+            return None
+        
+        # POLICY_LRU: reutilizar el índice de la hoja menos usada recientemente
+        index = lru.victim(node)
+        if index is None:
+            return None
+        old_parent = self.parents[index]
+        if self.children is not None:
+            del self.children[(old_parent, self.chars[index])]
+            self.children[(node, char)] = index
+        if self.depths is not None:
+            # Solo se reutilizan hojas: ninguna frase depende de la longitud anterior
+            self.depths[index] = self.depths[node] + 1
+        lru.removed(index, old_parent)
+        self.parents[index] = node
+        self.chars[index] = char
+        lru.added(index, node)
+        return index
+    
+    def parse(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Split a text into the pairs the encoder emitted for it.
+        
+        Used to decode stored blocks (see FileHandlerBinaryHuffman), whose
+        pairs are not written: starting from the same dictionary, the
+        encoder's parse is replayed. The caller must add every pair (with
+        add(), directly or through a decoder) before taking the next one,
+        as the encoder did. A text that ends inside a phrase ends with the
+        pair of that phrase, as in LZ78Compressor.flush. A trie created
+        without the children lookup table builds it first and keeps it
+        from then on.
+        
+        Yields:
+            (index, char) pairs, in order
+        """
+        if self.children is None:
+            parents = self.parents
+            chars = self.chars
+            self.children = {(parents[index], chars[index]): index for index in range(1, len(parents))}
+        
+        node = 0
+        for char in text:
+            # Buscar en self.children cada vez: el llamador añade las frases
+            child = self.children.get((node, char))
+            if child is not None:
+                node = child
+            else:
+                yield node, char
+                node = 0
+        if node:
+            yield self.parents[node], self.chars[node]
 
 
 class LZ78Compressor:
     """
     Implements the LZ78 compression algorithm.
     Handles compression and decompression of text data.
+    
+    The phrase dictionary is kept as a trie: each phrase is an integer node
+    id and children are looked up by (parent_id, character), so matching
+    never builds intermediate strings.
+    
+    The dictionary can be bounded with `max_dictionary_size`; when it is
+    full, `dictionary_policy` decides what happens ('freeze', 'reset' or
+    'lru'). It can start from the phrases of a preset dictionary, given
+    as the pairs that build it (`preset`, see preset_dictionary).
+    Decompression must use the same settings.
     """
     
-    def __init__(self):
-        self.dictionary: Dict[str, int] = {}
+    def __init__(self, max_dictionary_size: Optional[int] = None,
+                 dictionary_policy: str = POLICY_FREEZE,
+                 preset: Sequence[Tuple[int, str]] = ()):
+        # Validar la configuración antes de comprimir nada
+        PhraseTrie(max_dictionary_size, dictionary_policy)
+        
+        self.max_dictionary_size = max_dictionary_size
+        self.dictionary_policy = dictionary_policy
+        self.preset = preset
+        self.dictionary: Mapping = PhraseDictionary([0], [''])
         self.compressed_data: List[Tuple[int, str]] = []
         self.dictionary_size: int = 0
+        self.trie = PhraseTrie(max_dictionary_size, dictionary_policy, preset=preset)
+        self._node = 0  # Frase en curso entre llamadas a feed()
         
-    def compress(self, text: str) -> Tuple[List[Tuple[int, str]], Dict[str, int]]:
+    def reset(self) -> None:
+        """Start a new LZ78 stream with an empty (or the preset) dictionary."""
+        self.trie = PhraseTrie(self.max_dictionary_size, self.dictionary_policy, preset=self.preset)
+        self._node = 0
+    
+    def feed(self, text: str, lengths: Optional[List[int]] = None) -> List[Tuple[int, str]]:
         """
-        Compress text using LZ78 algorithm.
+        Compress the next chunk of a stream.
+        
+        The phrase being matched at the end of the chunk is carried over to
+        the next call, so feeding a text in several chunks emits exactly the
+        same pairs as compressing it at once. Pairs are returned, not
+        accumulated, so memory is bounded by the dictionary.
         
         Args:
-            text: Input text to compress
+            text: Next chunk of input text
+            lengths: If given, the number of characters covered by every
+                emitted pair is appended to it
             
         Returns:
-            Tuple containing compressed data and dictionary
+            (index, char) pairs completed in this chunk
         """
-        self.dictionary = {}
-        self.compressed_data = []
-        self.dictionary_size = 0
+        trie = self.trie
+        children = trie.children
+        depths = trie.depths
+        pairs: List[Tuple[int, str]] = []
         
-        current_string = ""
+        node = self._node  # 0 = frase vacía (raíz del trie)
         
         for char in text:
-            combined = current_string + char
+            child = children.get((node, char))
             
-            if combined in self.dictionary:
-                current_string = combined
+            if child is not None:
+                node = child
             else:
-                # Add to dictionary
-                self.dictionary_size += 1
-                self.dictionary[combined] = self.dictionary_size
-                
-                # Output (index, char)
-                index = self.dictionary.get(current_string, 0)
-                self.compressed_data.append((index, char))
+                # Output (index, char) and add to dictionary
+                pairs.append((node, char))
+                if lengths is not None:
+                    lengths.append(depths[node] + 1)
+                trie.add(node, char)
                 
-                current_string = ""
+                node = 0
+        
+        self._node = node
+        return pairs
+    
+    def flush(self, lengths: Optional[List[int]] = None) -> List[Tuple[int, str]]:
+        """
+        End the stream started by reset() and emit the pending phrase.
+        
+        Args:
+            lengths: If given, the number of characters covered by the
+                final pair is appended to it (see feed)
+        
+        Returns:
+            The final (index, char) pair, if the input ended inside a phrase
+        """
+        node = self._node
+        self._node = 0
+        
+        # Handle remaining string (already a phrase: emit its parent + last char)
+        if node:
+            if lengths is not None:
+                lengths.append(self.trie.depths[node])
+            return [(self.trie.parents[node], self.trie.chars[node])]
+        return []
+    
+    def compress(self, text: str,
+                 progress: Optional[Callable[[int, int], None]] = None) -> Tuple[List[Tuple[int, str]], Mapping]:
+        """
+        Compress text using LZ78 algorithm.
         
-        # Handle remaining string
-        if current_string:
-            index = self.dictionary.get(current_string[:-1], 0) if len(current_string) > 1 else 0
-            self.compressed_data.append((index, current_string[-1]))
+        Args:
+            text: Input text to compress
+            progress: If given, called every PROGRESS_STEP characters with the
+                UTF-8 bytes consumed and the pairs emitted so far; an
+                exception raised by it aborts the compression
+            
+        Returns:
+            Tuple containing compressed data and dictionary (lazy phrase view)
+        """
+        self.reset()
+        if progress is None:
+            compressed_data = self.feed(text)
+        else:
+            # Trocear la entrada no cambia los pares (ver feed)
+            compressed_data = []
+            consumed = 0
+            for start in range(0, len(text), PROGRESS_STEP):
+                chunk = text[start:start + PROGRESS_STEP]
+                compressed_data.extend(self.feed(chunk))
+                consumed += len(chunk.encode('utf-8'))
+                progress(consumed, len(compressed_data))
+        compressed_data.extend(self.flush())
+        
+        self.compressed_data = compressed_data
+        self.dictionary_size = self.trie.size
+        self.dictionary = PhraseDictionary(self.trie.parents, self.trie.chars)
             
         return self.compressed_data, self.dictionary
     
-    def decompress(self, compressed_data: List[Tuple[int, str]], dictionary: Dict[str, int]) -> str:
+    def decompress(self, compressed_data: List[Tuple[int, str]], dictionary: Dict[str, int],
+                   progress: Optional[Callable[[int, int], None]] = None) -> str:
         """
         Decompress data using LZ78 algorithm.
         
+        Runs in time linear in the output size: the text is written into a
+        single UTF-8 buffer and every phrase is expanded by copying its
+        earlier occurrence in that buffer. The dictionary-full policy of
+        this compressor is replayed, so it must match the one used to
+        compress.
+        
         Args:
             compressed_data: List of (index, character) tuples
             dictionary: Dictionary used during compression (can be empty, will be reconstructed)
+            progress: If given, called every PROGRESS_STEP pairs with the
+                UTF-8 bytes written and the pairs decoded so far; an
+                exception raised by it aborts the decompression
             
         Returns:
             Decompressed text
         """
-        # Reconstruir el diccionario de forma incremental durante la descompresión
-        # Esto es necesario porque el diccionario no se guarda en el archivo
-        reverse_dict = {}  # {índice: frase}
-        decompressed = ""
-        dict_index = 1
+        # Reconstruir el diccionario de forma incremental durante la descompresión.
+        # Cada frase se guarda como una referencia hacia atrás (inicio, fin) dentro
+        # del buffer de salida, donde fue escrita al crearse: la memoria es lineal
+        # en el número de frases y expandirla es una copia de un slice.
+        trie = PhraseTrie(self.max_dictionary_size, self.dictionary_policy, track_children=False)
+        starts: List[int] = [0]
+        ends: List[int] = [0]
+        output = bytearray()
+        encoded_chars: Dict[str, bytes] = {}
         
-        for index, char in compressed_data:
-            if index == 0:
-                # Nueva entrada que empieza con un solo carácter
-                phrase = char
-            else:
-                # La frase es: frase_anterior[index] + carácter_actual
-                if index in reverse_dict:
-                    phrase = reverse_dict[index] + char
-                else:
+        if progress is None:
+            batches = (compressed_data,)
+        else:
+            batches = (compressed_data[start:start + PROGRESS_STEP]
+                       for start in range(0, len(compressed_data), PROGRESS_STEP))
+        preset_length = None
+        decoded = 0
+        
+        # Las frases del diccionario preestablecido se decodifican primero,
+        # para tenerlas en el buffer; su texto no forma parte de la salida
+        for pairs in chain((self.preset[:self.max_dictionary_size],), batches):
+            for index, char in pairs:
+                if index > trie.size or index < 0:
                     # Si el índice no existe, algo salió mal
                     # Intentamos recuperar usando solo el carácter
-                    phrase = char
+                    index = 0
+            
+                start = len(output)
+                if index:
+                    # La frase es: frase_anterior[index] + carácter_actual
+                    output += output[starts[index]:ends[index]]
             
-            # Agregar al texto descomprimido
-            decompressed += phrase
+                char_bytes = encoded_chars.get(char)
+                if char_bytes is None:
+                    char_bytes = encoded_chars[char] = char.encode('utf-8')
+                output += char_bytes
             
-            # Agregar esta frase al diccionario para futuras referencias
-            reverse_dict[dict_index] = phrase
-            dict_index += 1
+                # Agregar esta frase al diccionario para futuras referencias
+                new_index = trie.add(index, char)
+                if new_index == len(starts):
+                    starts.append(start)
+                    ends.append(len(output))
+                elif new_index is not None:
+                    starts[new_index] = start
+                    ends[new_index] = len(output)
             
-        return decompressed
+            if preset_length is None:
+                preset_length = len(output)
+            elif progress is not None:
+                decoded += len(pairs)
+                progress(len(output) - preset_length, decoded)
+            
+        return output[preset_length:].decode('utf-8')
     
-    def get_dictionary(self) -> Dict[str, int]:
-        """Return the current dictionary."""
+    def rebuild_dictionary(self, compressed_data: List[Tuple[int, str]]) -> Mapping:
+        """
+        Rebuild the phrase dictionary from a (index, char) stream.
+        
+        Replays the dictionary-full policy without producing any text; the
+        returned view only builds phrase strings when accessed.
+        
+        Args:
+            compressed_data: List of (index, character) tuples
+            
+        Returns:
+            Dictionary {phrase: index} as it was at the end of compression
+        """
+        trie = PhraseTrie(self.max_dictionary_size, self.dictionary_policy, preset=self.preset)
+        last = len(compressed_data) - 1
+        for position, (index, char) in enumerate(compressed_data):
+            if index > trie.size or index < 0:
+                index = 0
+            if position == last and (index, char) in trie.children:
+                # El último par puede repetir una frase existente (resto de la entrada)
+                break
+            trie.add(index, char)
+        return PhraseDictionary(trie.parents, trie.chars)
+    
+    def get_dictionary(self) -> Mapping:
+        """
+        Return the current dictionary as a {phrase: index} mapping.
+        
+        Phrase strings are built from the trie on first access.
+        """
         return self.dictionary
     
     def get_compressed_data(self) -> List[Tuple[int, str]]:
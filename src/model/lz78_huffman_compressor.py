@@ -3,18 +3,12 @@ LZ78 + Huffman Hybrid Compressor
 Combines LZ78 dictionary-based compression with Huffman optimal encoding
 """
 
-from typing import List, Tuple, Dict
-from .lz78_compressor import LZ78Compressor
-
-# Import Huffman functions with absolute paths
-import sys
-import os
-huffman_path = os.path.join(os.path.dirname(__file__), 'Huffman')
-if huffman_path not in sys.path:
-    sys.path.insert(0, huffman_path)
-
-from encoder.encoder import Encode as HuffmanEncode
-from decoder.decoder import Decode as HuffmanDecode
+from typing import List, Tuple, Dict, Optional, Callable
+from .lz78_compressor import LZ78Compressor, POLICY_FREEZE
+from .index_coding import encode_indices, BitWriter, LiveDictionarySize, INDEX_CODING_SYMBOL
+from .literal_coding import LITERAL_CODING_HUFFMAN, LITERAL_CODINGS
+from .entropy_coding import check_codings, ENTROPY_CODER_HUFFMAN
+from .preset_dictionary import PresetDictionary
 
 
 class LZ78HuffmanCompressor:
@@ -26,63 +20,108 @@ class LZ78HuffmanCompressor:
     2. Huffman Phase: Optimally encodes the indices (which repeat frequently)
     
     Result: Significant compression improvement over pure LZ78
+    
+    The LZ78 dictionary can be bounded with `max_dictionary_size`; see
+    LZ78Compressor for the available `dictionary_policy` values.
+    `index_coding` selects how the indices are Huffman-coded (see
+    index_coding.INDEX_CODINGS): 'symbol' (default) codes index buckets
+    plus raw extra bits, 'text' codes the decimal digits of the indices as
+    in format version 2, 'phased' writes each index with a phased-in
+    binary code sized to the dictionary at that point. `literal_coding`
+    selects how the literal characters are stored (see
+    literal_coding.LITERAL_CODINGS): 'huffman' (default) with one Huffman
+    table per block, 'context' with tables keyed by the last character of
+    the parent phrase, 'raw' as UTF-8. `entropy_coder` selects the coder
+    behind both (see entropy_coding.ENTROPY_CODERS): static 'huffman'
+    (default), or an adaptive coder such as 'range', which codes the
+    indices and literals in one pass when the blocks are written, with no
+    code tables; with it 'huffman' and 'context' select the order-0 and
+    order-1 literal models. With a `preset_dictionary` (see
+    preset_dictionary) the LZ78 dictionary starts with its phrases (the
+    Huffman tables are not primed); the same dictionary is needed to
+    decompress.
     """
     
-    def __init__(self):
-        self.lz78 = LZ78Compressor()
+    def __init__(self, max_dictionary_size: Optional[int] = None,
+                 dictionary_policy: str = POLICY_FREEZE,
+                 index_coding: str = INDEX_CODING_SYMBOL,
+                 literal_coding: str = LITERAL_CODING_HUFFMAN,
+                 entropy_coder: str = ENTROPY_CODER_HUFFMAN,
+                 preset_dictionary: Optional[PresetDictionary] = None):
+        if literal_coding not in LITERAL_CODINGS:
+            raise ValueError(f"Unknown literal coding: {literal_coding}")
+        check_codings(entropy_coder, index_coding)
+        self.preset_dictionary = preset_dictionary
+        self.preset = preset_dictionary.pairs if preset_dictionary is not None else ()
+        self.lz78 = LZ78Compressor(max_dictionary_size, dictionary_policy, self.preset)
+        self.max_dictionary_size = max_dictionary_size
+        self.dictionary_policy = dictionary_policy
+        self.index_coding = index_coding
+        self.literal_coding = literal_coding
+        self.entropy_coder = entropy_coder
     
-    def compress(self, text: str) -> Tuple[List[Tuple[int, str]], Dict[str, int], Dict[str, str], str]:
+    def compress(self, text: str, progress: Optional[Callable[[int, int], None]] = None
+                 ) -> Tuple[List[Tuple[int, str]], Dict[str, int], Dict, BitWriter]:
         """
         Compress text using LZ78 + Huffman hybrid approach.
         
         Optimización: Usa longitud variable de bits para índices.
-        Si el diccionario tiene N entradas, cada índice necesita log2(N) bits.
-        Luego aplica Huffman sobre estos valores para optimizar frecuencias.
+        Con index_coding='phased', si el diccionario tiene N entradas, cada
+        índice necesita log2(N + 1) bits (código binario truncado). Las
+        otras codificaciones aplican Huffman sobre los índices para
+        aprovechar sus frecuencias.
         
         Args:
             text: Input text to compress
+            progress: If given, called during the LZ78 phase with the bytes
+                consumed and the pairs emitted (see LZ78Compressor.compress)
             
         Returns:
             Tuple containing:
             - compressed_data: List of (index, character) tuples from LZ78
             - lz78_dictionary: LZ78 phrase dictionary
-            - huffman_codes: Huffman codes for index values
-            - encoded_indices: Binary string of Huffman-encoded indices
+            - huffman_codes: Huffman codes for index values (see encode_indices)
+            - encoded_indices: Huffman-encoded indices, packed in a BitWriter
+              (codes and bits are empty with an adaptive entropy coder)
         """
         # Phase 1: LZ78 Compression
-        compressed_data, lz78_dictionary = self.lz78.compress(text)
-        
-        if not compressed_data:
-            return compressed_data, lz78_dictionary, {}, ""
+        compressed_data, lz78_dictionary = self.lz78.compress(text, progress)
         
         # Phase 2: Apply Huffman to INDEX VALUES themselves
-        # Estrategia: Convertir todos los índices a strings con separador especial
-        # Esto asegura que Huffman trate cada índice como un símbolo atómico
-        
-        SEPARATOR = '|'  # Separador que no aparece en números
-        
-        index_symbols = []
-        for idx, _ in compressed_data:
-            index_symbols.append(str(idx))
+        huffman_codes, encoded_indices = self.encode_indices(compressed_data)
         
-        # Crear texto con índices separados por el separador
-        # Esto asegura que "256" sea tratado como un solo símbolo, no como '2', '6', '6'
-        indices_text = SEPARATOR.join(index_symbols)
-        
-        # Build Huffman tree based on index frequencies
-        freq_dict, huffman_tree, huffman_codes = HuffmanEncode(indices_text)
+        return compressed_data, lz78_dictionary, huffman_codes, encoded_indices
+    
+    def encode_indices(self, compressed_data: List[Tuple[int, str]],
+                       live_size: Optional[LiveDictionarySize] = None) -> Tuple[Dict, BitWriter]:
+        """
+        Encode the indices of a list of (index, char) pairs.
         
-        # Encode indices with Huffman - cada carácter del texto será codificado
-        encoded_indices = ''
-        for char in indices_text:
-            encoded_indices += huffman_codes.get(char, '')
+        Used for the whole text by compress() and for every block by the
+        streaming compressor.
         
-        return compressed_data, lz78_dictionary, huffman_codes, encoded_indices
+        Args:
+            compressed_data: List of (index, character) tuples from LZ78
+            live_size: Dictionary size before the first pair, shared by the
+                blocks of a file (phased coding; default: empty dictionary)
+            
+        Returns:
+            Tuple of (huffman_codes, encoded_indices); the codes are keyed by
+            index character or bucket symbol depending on index_coding
+            (empty with the phased coding). Both are empty with an adaptive
+            entropy coder: it codes the indices when the block is written.
+        """
+        if self.entropy_coder != ENTROPY_CODER_HUFFMAN:
+            return {}, BitWriter()
+        if live_size is None:
+            live_size = LiveDictionarySize(self.max_dictionary_size, self.dictionary_policy, self.preset)
+        return encode_indices([index for index, _ in compressed_data], self.index_coding, live_size)
     
     def decompress(self, compressed_data: List[Tuple[int, str]], 
                    lz78_dictionary: Dict[str, int],
                    huffman_codes: Dict[str, str],
-                   encoded_indices: str) -> str:
+                   encoded_indices: BitWriter,
+                   progress: Optional[Callable[[int, int], None]] = None) -> str:
         """
         Decompress data using Huffman + LZ78 hybrid approach.
         
@@ -90,7 +129,9 @@ class LZ78HuffmanCompressor:
             compressed_data: List of (index, character) tuples from LZ78
             lz78_dictionary: LZ78 phrase dictionary (not used in decompression)
             huffman_codes: Huffman codes for indices
-            encoded_indices: Binary string of Huffman-encoded indices
+            encoded_indices: Huffman-encoded indices (BitWriter)
+            progress: If given, called with the bytes written and the pairs
+                decoded (see LZ78Compressor.decompress)
             
         Returns:
             Original decompressed text
@@ -100,7 +141,7 @@ class LZ78HuffmanCompressor:
         # This step is for verification/alternative decompression path
         
         # Phase 2: LZ78 Decompression
-        original_text = self.lz78.decompress(compressed_data, lz78_dictionary)
+        original_text = self.lz78.decompress(compressed_data, lz78_dictionary, progress)
         
         return original_text
     
@@ -108,7 +149,8 @@ class LZ78HuffmanCompressor:
                       compressed_data: List[Tuple[int, str]],
                       lz78_dictionary: Dict[str, int],
                       huffman_codes: Dict[str, str],
-                      encoded_indices: str) -> Dict:
+                      encoded_indices: BitWriter,
+                      section_sizes: Optional[Dict[str, int]] = None) -> Dict:
         """
         Calculate compression statistics for LZ78+Huffman hybrid.
         
@@ -126,8 +168,16 @@ class LZ78HuffmanCompressor:
         - space_saved
         - dictionary_entries
         - huffman_codes_count
+        - header_size, index_table_size, indices_size, literal_table_size,
+          literals_size and stored_size: bytes of each part of hybrid_size
+          (stored_size is the text of the block when coding it would
+          expand it, see FileHandlerBinaryHuffman.write_stored_block)
+        
+        Given the section sizes returned by
+        FileHandlerBinaryHuffman.save_compressed_file, the block is not
+        coded again; otherwise get_section_sizes codes it in memory.
         """
-        import struct
+        from .file_handler_binary_huffman import FileHandlerBinaryHuffman
         
         original_bytes = len(original_text.encode('utf-8'))
         
@@ -136,31 +186,15 @@ class LZ78HuffmanCompressor:
         lz78_size = lz78_stats['compressed_size']
         
         # Calculate hybrid size (SOLO datos comprimidos, diccionario es header)
-        size = 0
-        
-        # 1. Magic number + version + filename (metadata básica)
-        filename_bytes = len(filename.encode('utf-8'))
-        size += 4 + 1 + 2 + filename_bytes
-        
-        # 2. Huffman codes dictionary (pequeño, parte del header)
-        size += 4  # count
-        for symbol, code in huffman_codes.items():
-            symbol_bytes = symbol.encode('utf-8')
-            code_bytes = code.encode('utf-8')
-            size += 2 + len(symbol_bytes) + 2 + len(code_bytes)
-        
-        # 3. Encoded indices (DATOS COMPRIMIDOS - Huffman reduce esto significativamente)
+        sizes = section_sizes or FileHandlerBinaryHuffman.get_section_sizes(
+            compressed_data, huffman_codes, encoded_indices, filename,
+            self.index_coding, self.literal_coding,
+            self.max_dictionary_size, self.dictionary_policy, self.entropy_coder,
+            self.preset_dictionary, original_text
+        )
+        hybrid_size = sum(sizes.values())
         encoded_bits = len(encoded_indices)
         encoded_bytes = (encoded_bits + 7) // 8
-        size += 4 + encoded_bytes
-        
-        # 4. Characters (DATOS COMPRIMIDOS)
-        size += 4  # count
-        for _, char in compressed_data:
-            char_bytes = char.encode('utf-8')
-            size += 1 + len(char_bytes)
-        
-        hybrid_size = size
         
         # Calculate metrics
         compression_ratio = (hybrid_size / original_bytes) * 100 if original_bytes > 0 else 0
@@ -178,5 +212,11 @@ class LZ78HuffmanCompressor:
             'huffman_codes_count': len(huffman_codes),
             'huffman_bits': encoded_bits,
             'huffman_bytes': encoded_bytes,
+            'header_size': sizes['header'],
+            'index_table_size': sizes['index_table'],
+            'indices_size': sizes['indices'],
+            'literal_table_size': sizes['literal_table'],
+            'literals_size': sizes['literals'],
+            'stored_size': sizes['stored'],
             'improvement_vs_lz78': ((lz78_size - hybrid_size) / lz78_size * 100) if lz78_size > 0 else 0
         }
@@ -0,0 +1,293 @@
+"""
+Block-parallel LZ78 + Huffman compression
+Splits the input into blocks that are compressed independently, each with
+its own dictionary and code tables, in worker processes, and writes them
+to a .lz78 file with a block index; the index lets the blocks be
+decompressed in parallel too, and can hold a filter of every block for
+searches (see lz78_random_access.search)
+"""
+
+import io
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .lz78_compressor import POLICY_FREEZE
+from .index_coding import LiveDictionarySize, INDEX_CODING_SYMBOL
+from .literal_coding import LiteralContexts, LITERAL_CODING_HUFFMAN, LITERAL_CODING_CONTEXT
+from .entropy_coding import ENTROPY_CODER_HUFFMAN
+from .lz78_huffman_compressor import LZ78HuffmanCompressor
+from .file_handler_binary_huffman import FileHandlerBinaryHuffman, FLAG_INDEPENDENT_BLOCKS, FLAG_BLOCK_FILTERS
+from .block_filter import BlockFilter
+from .preset_dictionary import PresetDictionary
+from .lz78_stream import LZ78StreamDecompressor, decompress_file
+
+DEFAULT_BLOCK_CHARS = 1 << 20  # Characters of the input per independent block
+
+
+def _compress_block(text: str, max_dictionary_size: Optional[int], dictionary_policy: str,
+                    index_coding: str, literal_coding: str, entropy_coder: str,
+                    filter_bits: int,
+                    preset_dictionary: Optional[PresetDictionary]) -> Tuple[bytes, int, int, bytes]:
+    """
+    Compress one block with a new dictionary (runs in a worker process).
+    
+    A block that coding would not make smaller than its text is stored
+    instead (see FileHandlerBinaryHuffman.write_block).
+    
+    Returns:
+        Tuple of (block as written by write_block, UTF-8 bytes of the text,
+        '\\n' characters in the text, BlockFilter bits of the text or b''
+        without filter_bits)
+    """
+    compressor = LZ78HuffmanCompressor(max_dictionary_size, dictionary_policy, index_coding,
+                                       literal_coding, entropy_coder, preset_dictionary)
+    compressed_data, _ = compressor.lz78.compress(text)
+    data = text.encode('utf-8')
+    
+    contexts = None
+    if literal_coding == LITERAL_CODING_CONTEXT:
+        contexts = LiteralContexts(max_dictionary_size, dictionary_policy, compressor.preset)
+    block = io.BytesIO()
+    FileHandlerBinaryHuffman.write_block(block, compressed_data, None, None, index_coding, literal_coding,
+                                         contexts, entropy_coder,
+                                         LiveDictionarySize(max_dictionary_size, dictionary_policy,
+                                                            compressor.preset), data)
+    block_filter = BlockFilter.from_text(data, filter_bits).bits if filter_bits else b''
+    return block.getvalue(), len(data), text.count('\n'), block_filter
+
+
+def compress_file_parallel(source_path: str, target_path: str,
+                           max_dictionary_size: Optional[int] = None,
+                           dictionary_policy: str = POLICY_FREEZE,
+                           block_chars: int = DEFAULT_BLOCK_CHARS,
+                           index_coding: str = INDEX_CODING_SYMBOL,
+                           literal_coding: str = LITERAL_CODING_HUFFMAN,
+                           entropy_coder: str = ENTROPY_CODER_HUFFMAN,
+                           workers: Optional[int] = None,
+                           filter_bits: int = 0,
+                           preset_dictionary: Optional[PresetDictionary] = None) -> Dict:
+    """
+    Compress a text file into a .lz78 file using several processes.
+    
+    The input is cut into blocks of `block_chars` characters. Every block
+    is compressed with a new dictionary (FLAG_INDEPENDENT_BLOCKS), so
+    blocks are compressed in parallel and can later be decoded on their
+    own; the price is a lower compression ratio for small blocks. Blocks
+    are written in input order, followed by a block index. At most two
+    blocks per worker are in flight, so memory does not depend on the
+    size of the input. With `filter_bits` every block also gets a Bloom
+    filter of its byte sequences in the block index (FLAG_BLOCK_FILTERS),
+    used by lz78_random_access.search to skip blocks. With a preset
+    dictionary every block starts from it instead of an empty dictionary.
+    
+    Args:
+        source_path: Path of the text file to compress
+        target_path: Path of the .lz78 file to write (extension added if missing)
+        max_dictionary_size: Dictionary size limit of every block (None = unbounded)
+        dictionary_policy: Dictionary-full policy
+        block_chars: Characters of the input per block
+        index_coding: Index coding (see index_coding.INDEX_CODINGS)
+        literal_coding: Literal coding (see literal_coding.LITERAL_CODINGS)
+        entropy_coder: Entropy coder (see entropy_coding.ENTROPY_CODERS)
+        workers: Worker processes (default: number of CPUs)
+        filter_bits: Filter bits per distinct byte sequence of a block
+            (0 = no filters; see block_filter.DEFAULT_FILTER_BITS)
+        preset_dictionary: Preset dictionary every block starts from
+    
+    Returns:
+        Dictionary with original_size, compressed_size, compression_ratio,
+        blocks, stored_blocks (blocks written uncompressed), workers and
+        filter_size (bytes of the block filters)
+    
+    Raises:
+        FileNotFoundError: If the source file doesn't exist
+        ValueError: If the file is not valid UTF-8 text or the settings are invalid
+    """
+    if block_chars < 1:
+        raise ValueError("Block size must be at least 1 character")
+    if filter_bits < 0:
+        raise ValueError("Filter bits must not be negative")
+    if not Path(source_path).is_file():
+        raise FileNotFoundError(f"File not found: {source_path}")
+    
+    if not target_path.endswith(FileHandlerBinaryHuffman.LZ78_EXTENSION):
+        target_path += FileHandlerBinaryHuffman.LZ78_EXTENSION
+    
+    # Validar la configuración antes de lanzar los procesos
+    LZ78HuffmanCompressor(max_dictionary_size, dictionary_policy, index_coding, literal_coding, entropy_coder)
+    settings = (max_dictionary_size, dictionary_policy, index_coding, literal_coding, entropy_coder, filter_bits,
+                preset_dictionary)
+    flags = FLAG_INDEPENDENT_BLOCKS | (FLAG_BLOCK_FILTERS if filter_bits else 0)
+    workers = workers or os.cpu_count() or 1
+    
+    entries = []
+    try:
+        with open(source_path, 'r', encoding='utf-8', newline='') as source, \
+                open(target_path, 'wb') as target, \
+                ProcessPoolExecutor(workers) as executor:
+            FileHandlerBinaryHuffman.write_stream_header(
+                target, Path(source_path).name, max_dictionary_size, dictionary_policy, index_coding,
+                literal_coding, entropy_coder, flags,
+                preset_dictionary.dictionary_id if preset_dictionary else None
+            )
+            
+            pending = deque()
+            checksum = 0
+            while True:
+                text = source.read(block_chars)
+                if text:
+                    # El CRC-32 de cada bloque y el del archivo se calculan aquí, en orden
+                    data = text.encode('utf-8')
+                    block_checksum = zlib.crc32(data)
+                    checksum = zlib.crc32(data, checksum)
+                    pending.append((block_checksum, executor.submit(_compress_block, text, *settings)))
+                
+                # Escribir en orden; sin esperar mientras queden procesos libres
+                while pending and (len(pending) >= 2 * workers or not text):
+                    block_checksum, future = pending.popleft()
+                    block, original_size, lines, block_filter = future.result()
+                    entries.append({
+                        'offset': target.tell(),
+                        'compressed_size': len(block) - 1 - 4,
+                        'original_size': original_size,
+                        'lines': lines,
+                        'crc32': block_checksum,
+                        'filter': block_filter,
+                        'stored': block[0] == FileHandlerBinaryHuffman.BLOCK_STORED
+                    })
+                    target.write(block)
+                
+                if not text:
+                    break
+            
+            FileHandlerBinaryHuffman.write_end(target, checksum)
+            FileHandlerBinaryHuffman.write_block_index(target, entries, flags)
+            compressed_size = target.tell()
+    
+    except UnicodeDecodeError:
+        raise ValueError("File is not readable as text (encoding error)")
+    
+    original_size = sum(entry['original_size'] for entry in entries)
+    return {
+        'original_size': original_size,
+        'compressed_size': compressed_size,
+        'compression_ratio': (compressed_size / original_size * 100) if original_size > 0 else 0,
+        'blocks': len(entries),
+        'stored_blocks': sum(entry['stored'] for entry in entries),
+        'workers': workers,
+        'filter_size': sum(len(entry['filter']) for entry in entries)
+    }
+
+
+def _decompress_block(source_path: str, header: Dict, entry: Dict[str, int],
+                      target_path: Optional[str]) -> bytes:
+    """
+    Decompress one block of a file with FLAG_INDEPENDENT_BLOCKS (runs in a worker process).
+    
+    The text is written straight to its place in the target file with
+    os.pwrite; without os.pwrite (or with no target_path) it is returned.
+    
+    Returns:
+        UTF-8 text of the block, or b'' if it was already written
+    """
+    decoder = LZ78StreamDecompressor(header['max_dictionary_size'], header['dictionary_policy'],
+                                     FileHandlerBinaryHuffman._preset(header))
+    with open(source_path, 'rb') as source:
+        text = ''.join(decoder.decode_batch(batch) for batch in
+                       FileHandlerBinaryHuffman.iter_block_pairs(source, header, entry['offset']))
+    data = text.encode('utf-8')
+    if len(data) != entry['original_size']:
+        raise ValueError(f"Corrupted block at offset {entry['offset']}: size differs from the block index")
+    FileHandlerBinaryHuffman.check_checksum(entry.get('crc32'), zlib.crc32(data))
+    
+    if target_path is None:
+        return data
+    fd = os.open(target_path, os.O_WRONLY)
+    try:
+        os.pwrite(fd, data, entry['original_offset'])
+    finally:
+        os.close(fd)
+    return b''
+
+
+def decompress_file_parallel(source_path: str, target_path: str,
+                             workers: Optional[int] = None,
+                             preset_dictionary: Optional[PresetDictionary] = None) -> Dict:
+    """
+    Decompress a .lz78 file using several processes.
+    
+    The block index at the end of the file gives the position of every
+    block and of its text in the output, so the output file is created
+    with its final size and every worker decodes whole blocks and writes
+    them at their offset (os.pwrite). Where os.pwrite is not available,
+    the blocks come back to this process and are written in order. At
+    most two blocks per worker are in flight. The text of every block is
+    checked against the CRC-32 in its index entry.
+    
+    Files whose blocks share one dictionary (written by
+    lz78_stream.compress_file or save_compressed_file) cannot be split
+    and are decompressed serially with lz78_stream.decompress_file.
+    
+    Args:
+        source_path: Path of the .lz78 file
+        target_path: Path of the text file to write
+        workers: Worker processes (default: number of CPUs)
+        preset_dictionary: Preset dictionary of the file, if it has one
+    
+    Returns:
+        Dictionary with original_filename, compressed_size,
+        decompressed_size and workers, plus blocks for files with a
+        block index (pairs and dictionary_entries otherwise, see
+        lz78_stream.decompress_file)
+    
+    Raises:
+        FileNotFoundError: If the source file doesn't exist
+        ValueError: If the file format is incorrect or can't be written
+    """
+    if not Path(source_path).is_file():
+        raise FileNotFoundError(f"File not found: {source_path}")
+    
+    try:
+        with open(source_path, 'rb') as source:
+            header = FileHandlerBinaryHuffman._read_header(source, preset_dictionary)
+            FileHandlerBinaryHuffman._preset(header)
+            if not header['flags'] & FLAG_INDEPENDENT_BLOCKS:
+                stats = decompress_file(source_path, target_path, preset_dictionary)
+                stats['workers'] = 1
+                return stats
+            entries = FileHandlerBinaryHuffman.read_block_index(source, header['flags'])
+        
+        workers = workers or os.cpu_count() or 1
+        decompressed_size = sum(entry['original_size'] for entry in entries)
+        positional = hasattr(os, 'pwrite')
+        
+        with open(target_path, 'wb') as target, ProcessPoolExecutor(workers) as executor:
+            # Con pwrite cada proceso escribe su bloque en su lugar
+            target.truncate(decompressed_size)
+            target.flush()
+            
+            pending = deque()
+            for entry in entries + [None]:
+                if entry is not None:
+                    pending.append(executor.submit(_decompress_block, source_path, header, entry,
+                                                   target_path if positional else None))
+                while pending and (len(pending) >= 2 * workers or entry is None):
+                    data = pending.popleft().result()
+                    if not positional:
+                        target.write(data)
+    
+    except (struct.error, UnicodeDecodeError, EOFError) as e:
+        raise ValueError(f"Error decompressing file: {str(e)}")
+    
+    return {
+        'original_filename': header['original_filename'],
+        'compressed_size': Path(source_path).stat().st_size,
+        'decompressed_size': decompressed_size,
+        'blocks': len(entries),
+        'workers': workers
+    }
@@ -0,0 +1,288 @@
+"""
+Random access to compressed LZ78 + Huffman files
+Reads a range of bytes or lines of the original text from a .lz78 file,
+or searches it; with a block index (see lz78_parallel) only the blocks
+that overlap the range, or that can contain the pattern, are decoded
+"""
+
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+from .file_handler_binary_huffman import FileHandlerBinaryHuffman, FLAG_INDEPENDENT_BLOCKS
+from .lz78_stream import LZ78StreamDecompressor
+from .block_filter import BlockFilter
+from .preset_dictionary import PresetDictionary
+
+
+def _iter_text(f: BinaryIO, header: Dict, entries: Optional[List[Dict[str, int]]]) -> Iterator[str]:
+    """
+    Decoded text of a .lz78 file, one batch of pairs at a time.
+    
+    Every block that is decoded to its end is checked against the CRC-32
+    of its index entry and, when the whole file is decoded, the text is
+    checked against the CRC-32 of the file (see
+    FileHandlerBinaryHuffman.check_checksum); a reader that stops early
+    only gets the blocks it finished checked.
+    
+    Args:
+        f: Binary file positioned after the header
+        header: Header read by FileHandlerBinaryHuffman._read_header
+        entries: Block index entries of the blocks to decode (None = the
+            whole file, in order)
+    
+    Raises:
+        ValueError: If a checksum does not match the decoded text
+    """
+    whole_file = entries is None
+    checksum = None
+    if whole_file and header['flags'] & FLAG_INDEPENDENT_BLOCKS:
+        entries = [{'offset': offset}
+                   for offset in FileHandlerBinaryHuffman.iter_block_offsets(f)]
+        checksum = FileHandlerBinaryHuffman.read_checksum(f, header['version'])
+    if entries is None:
+        blocks = [({}, FileHandlerBinaryHuffman.iter_pairs(f, header))]
+    else:
+        # Cada bloque empieza con un diccionario nuevo
+        blocks = ((entry, FileHandlerBinaryHuffman.iter_block_pairs(f, header, entry['offset']))
+                  for entry in entries)
+    
+    preset = FileHandlerBinaryHuffman._preset(header)
+    file_checksum = 0
+    for entry, batches in blocks:
+        decoder = LZ78StreamDecompressor(header['max_dictionary_size'], header['dictionary_policy'], preset)
+        block_checksum = 0
+        for batch in batches:
+            text = decoder.decode_batch(batch)
+            data = text.encode('utf-8')
+            block_checksum = zlib.crc32(data, block_checksum)
+            file_checksum = zlib.crc32(data, file_checksum)
+            yield text
+        FileHandlerBinaryHuffman.check_checksum(entry.get('crc32'), block_checksum)
+    
+    if whole_file:
+        if not header['flags'] & FLAG_INDEPENDENT_BLOCKS:
+            # iter_pairs deja el archivo justo después del bloque de fin
+            checksum = FileHandlerBinaryHuffman.read_checksum(f, header['version'])
+        FileHandlerBinaryHuffman.check_checksum(checksum, file_checksum)
+
+
+def _read_index(f: BinaryIO, header: Dict) -> Optional[List[Dict[str, int]]]:
+    """Block index of the file, or None if its blocks share one dictionary."""
+    if not header['flags'] & FLAG_INDEPENDENT_BLOCKS:
+        return None
+    return FileHandlerBinaryHuffman.read_block_index(f, header['flags'])
+
+
+def _after_newlines(text: str, count: int) -> int:
+    """Position in `text` after its `count`-th '\\n' (len(text) if it has fewer)."""
+    position = 0
+    for _ in range(count):
+        position = text.find('\n', position) + 1
+        if not position:
+            return len(text)
+    return position
+
+
+def read_range(source_path: str, start: int, end: int,
+               preset_dictionary: Optional[PresetDictionary] = None) -> bytes:
+    """
+    Read bytes [start, end) of the original file from a .lz78 file.
+    
+    Offsets are UTF-8 bytes of the original text, so the range can cut a
+    character in two. Files with a block index (FLAG_INDEPENDENT_BLOCKS)
+    only decode the blocks that overlap the range; the others are decoded
+    from the start and decoding stops at `end`.
+    
+    Args:
+        source_path: Path of the .lz78 file
+        start: First byte to read
+        end: Byte after the last one to read (may be past the end of the text)
+        preset_dictionary: Preset dictionary of the file, if it has one
+    
+    Returns:
+        Bytes of the original text in the range
+    
+    Raises:
+        FileNotFoundError: If the source file doesn't exist
+        ValueError: If the range is invalid or the file format is incorrect
+    """
+    if start < 0 or end < start:
+        raise ValueError(f"Invalid byte range: {start}-{end}")
+    if not Path(source_path).is_file():
+        raise FileNotFoundError(f"File not found: {source_path}")
+    
+    try:
+        with open(source_path, 'rb') as f:
+            header = FileHandlerBinaryHuffman._read_header(f, preset_dictionary)
+            entries = _read_index(f, header)
+            position = 0
+            if entries is not None:
+                entries = [entry for entry in entries
+                           if entry['original_offset'] < end
+                           and entry['original_offset'] + entry['original_size'] > start]
+                if not entries:
+                    return b''
+                position = entries[0]['original_offset']
+            
+            pieces = []
+            for text in _iter_text(f, header, entries):
+                data = text.encode('utf-8')
+                if position + len(data) > start:
+                    pieces.append(data[max(start - position, 0):end - position])
+                position += len(data)
+                if position >= end:
+                    break
+            return b''.join(pieces)
+    
+    except (struct.error, UnicodeDecodeError, EOFError) as e:
+        raise ValueError(f"Error reading file: {str(e)}")
+
+
+def read_lines(source_path: str, first: int, last: int,
+               preset_dictionary: Optional[PresetDictionary] = None) -> str:
+    """
+    Read lines [first, last) of the original file from a .lz78 file.
+    
+    Lines are numbered from 0 and keep their '\\n', as in
+    str.splitlines(keepends=True) for '\\n' line ends. Files with a block
+    index (FLAG_INDEPENDENT_BLOCKS) only decode the blocks that overlap
+    the lines; the others are decoded from the start and decoding stops
+    at line `last`.
+    
+    Args:
+        source_path: Path of the .lz78 file
+        first: First line to read
+        last: Line after the last one to read (may be past the end of the text)
+        preset_dictionary: Preset dictionary of the file, if it has one
+    
+    Returns:
+        Text of the lines
+    
+    Raises:
+        FileNotFoundError: If the source file doesn't exist
+        ValueError: If the range is invalid or the file format is incorrect
+    """
+    if first < 0 or last < first:
+        raise ValueError(f"Invalid line range: {first}-{last}")
+    if not Path(source_path).is_file():
+        raise FileNotFoundError(f"File not found: {source_path}")
+    
+    try:
+        with open(source_path, 'rb') as f:
+            header = FileHandlerBinaryHuffman._read_header(f, preset_dictionary)
+            entries = _read_index(f, header)
+            line = 0  # Saltos de línea antes del texto decodificado
+            if entries is not None:
+                # Un bloque contiene las líneas first_line..first_line + lines
+                entries = [entry for entry in entries
+                           if entry['first_line'] < last and entry['first_line'] + entry['lines'] >= first]
+                if not entries:
+                    return ''
+                line = entries[0]['first_line']
+            
+            pieces = []
+            for text in _iter_text(f, header, entries):
+                newlines = text.count('\n')
+                if line + newlines >= first:
+                    pieces.append(text[_after_newlines(text, first - line):_after_newlines(text, last - line)])
+                line += newlines
+                if line >= last:
+                    break
+            return ''.join(pieces)
+    
+    except (struct.error, UnicodeDecodeError, EOFError) as e:
+        raise ValueError(f"Error reading file: {str(e)}")
+
+
+def _candidate_blocks(entries: List[Dict[str, int]], needle: bytes) -> List[int]:
+    """
+    Blocks that can hold part of an occurrence of `needle`, by their filters.
+    
+    A block is a candidate if its filter can contain the whole needle, or
+    if it can end with a prefix of the needle and the next block can start
+    with the rest of it (an occurrence across the boundary). Without
+    filters, or if the needle could span more than two blocks, every block
+    is a candidate.
+    
+    Returns:
+        Numbers of the candidate blocks, in order
+    """
+    if not entries or 'filter' not in entries[0] \
+            or len(needle) > min(entry['original_size'] for entry in entries[:-1] or entries):
+        return list(range(len(entries)))
+    
+    filters = [BlockFilter(entry['filter']) for entry in entries]
+    candidates = {number for number, block_filter in enumerate(filters) if block_filter.might_contain(needle)}
+    for number in range(len(filters) - 1):
+        if any(filters[number].might_end_with(needle[:split])
+               and filters[number + 1].might_start_with(needle[split:])
+               for split in range(1, len(needle))):
+            candidates.update((number, number + 1))
+    return sorted(candidates)
+
+
+def search(source_path: str, pattern: str,
+           preset_dictionary: Optional[PresetDictionary] = None) -> List[int]:
+    """
+    Find every occurrence of a text in the original file of a .lz78 file.
+    
+    Files with block filters (FLAG_BLOCK_FILTERS, see
+    lz78_parallel.compress_file_parallel) only decode the blocks whose
+    filters can contain the pattern; the others are decoded whole. Runs of
+    consecutive candidate blocks are searched as one text, so occurrences
+    across block boundaries are found too.
+    
+    Args:
+        source_path: Path of the .lz78 file
+        pattern: Text to find (not empty)
+        preset_dictionary: Preset dictionary of the file, if it has one
+    
+    Returns:
+        Offsets (UTF-8 bytes of the original text) of every occurrence,
+        overlapping ones included, in order
+    
+    Raises:
+        FileNotFoundError: If the source file doesn't exist
+        ValueError: If the pattern is empty or the file format is incorrect
+    """
+    if not pattern:
+        raise ValueError("Search pattern must not be empty")
+    if not Path(source_path).is_file():
+        raise FileNotFoundError(f"File not found: {source_path}")
+    
+    needle = pattern.encode('utf-8')
+    try:
+        with open(source_path, 'rb') as f:
+            header = FileHandlerBinaryHuffman._read_header(f, preset_dictionary)
+            entries = _read_index(f, header)
+            if entries is None:
+                runs = [(0, None)]
+            else:
+                # Agrupar los bloques candidatos consecutivos
+                runs = []
+                for number in _candidate_blocks(entries, needle):
+                    if runs and runs[-1][1][-1] is entries[number - 1]:
+                        runs[-1][1].append(entries[number])
+                    else:
+                        runs.append((entries[number]['original_offset'], [entries[number]]))
+            
+            matches = []
+            for position, run in runs:
+                # Se guardan los últimos len(needle) - 1 bytes por si la
+                # coincidencia sigue en el siguiente trozo
+                tail = b''
+                for text in _iter_text(f, header, run):
+                    data = tail + text.encode('utf-8')
+                    found = data.find(needle)
+                    while found != -1:
+                        matches.append(position + found)
+                        found = data.find(needle, found + 1)
+                    keep = min(len(needle) - 1, len(data))
+                    position += len(data) - keep
+                    tail = data[len(data) - keep:]
+            return matches
+    
+    except (struct.error, UnicodeDecodeError, EOFError) as e:
+        raise ValueError(f"Error reading file: {str(e)}")
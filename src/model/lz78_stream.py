@@ -0,0 +1,432 @@
+"""
+Streaming LZ78 + Huffman compression
+Compresses text incrementally into the block-based .lz78 format (version 3)
+and decompresses .lz78 files straight to disk
+"""
+
+import io
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+from .lz78_compressor import PhraseTrie, POLICY_FREEZE
+from .index_coding import LiveDictionarySize, INDEX_CODING_SYMBOL
+from .literal_coding import LiteralContexts, LITERAL_CODING_HUFFMAN, LITERAL_CODING_CONTEXT
+from .entropy_coding import ENTROPY_CODER_HUFFMAN
+from .lz78_huffman_compressor import LZ78HuffmanCompressor
+from .file_handler_binary_huffman import FileHandlerBinaryHuffman, PairBatch, FLAG_INDEPENDENT_BLOCKS
+from .preset_dictionary import PresetDictionary
+
+DEFAULT_CHUNK_SIZE = 1 << 20    # Characters read from the input per chunk
+DEFAULT_BLOCK_PAIRS = 1 << 16   # (index, char) pairs per block
+PHRASE_CACHE_LENGTH = 64        # Phrases up to this length are kept expanded
+
+
+class LZ78StreamCompressor:
+    """
+    Incremental LZ78 + Huffman compressor.
+    
+    Text is given with feed(chunk) and compressed data is written to the
+    output as soon as a block of pairs is complete; flush() writes the
+    last block and the end-of-stream marker. Memory is bounded by one
+    chunk, one block of pairs and the LZ78 dictionary (use
+    max_dictionary_size to bound it), not by the size of the input.
+    
+    A block that entropy coding would not make smaller than its text is
+    written as a stored block (see FileHandlerBinaryHuffman.write_block);
+    when the size estimate already says so, the block is not coded at all.
+    """
+    
+    def __init__(self, output: BinaryIO, original_filename: str,
+                 max_dictionary_size: Optional[int] = None,
+                 dictionary_policy: str = POLICY_FREEZE,
+                 block_pairs: int = DEFAULT_BLOCK_PAIRS,
+                 index_coding: str = INDEX_CODING_SYMBOL,
+                 literal_coding: str = LITERAL_CODING_HUFFMAN,
+                 entropy_coder: str = ENTROPY_CODER_HUFFMAN,
+                 preset_dictionary: Optional[PresetDictionary] = None):
+        if block_pairs < 1:
+            raise ValueError("Block size must be at least 1 pair")
+        
+        self.output = output
+        self.compressor = LZ78HuffmanCompressor(max_dictionary_size, dictionary_policy, index_coding,
+                                                literal_coding, entropy_coder, preset_dictionary)
+        preset = self.compressor.preset
+        self.contexts: Optional[LiteralContexts] = None
+        if literal_coding == LITERAL_CODING_CONTEXT:
+            self.contexts = LiteralContexts(max_dictionary_size, dictionary_policy, preset)
+        self.live_size = LiveDictionarySize(max_dictionary_size, dictionary_policy, preset)
+        self.block_pairs = block_pairs
+        self.pending: List[Tuple[int, str]] = []
+        self.pending_lengths: List[int] = []  # Caracteres de cada par pendiente
+        self.pending_text = ''                # Texto de los pares pendientes y de la frase en curso
+        self.finished = False
+        self.checksum = 0                     # CRC-32 del texto escrito hasta ahora
+        
+        # Statistics
+        self.bytes_in = 0
+        self.pairs_out = 0
+        self.blocks_written = 0
+        self.stored_blocks = 0
+        self.bytes_written = 0
+        
+        self.compressor.lz78.reset()
+        
+        header = io.BytesIO()
+        FileHandlerBinaryHuffman.write_stream_header(
+            header, original_filename, max_dictionary_size, dictionary_policy, index_coding,
+            literal_coding, entropy_coder,
+            dictionary_id=preset_dictionary.dictionary_id if preset_dictionary else None
+        )
+        self.output.write(header.getvalue())
+        self.bytes_written += len(header.getvalue())
+    
+    def feed(self, chunk: str) -> int:
+        """
+        Compress the next chunk of text.
+        
+        Args:
+            chunk: Next piece of the input text (any size)
+        
+        Returns:
+            Number of bytes written to the output by this call
+        """
+        if self.finished:
+            raise ValueError("Stream already flushed")
+        
+        self.bytes_in += len(chunk.encode('utf-8'))
+        self.pending.extend(self.compressor.lz78.feed(chunk, self.pending_lengths))
+        self.pending_text += chunk
+        
+        written = 0
+        start = 0
+        while len(self.pending) >= self.block_pairs:
+            block = self.pending[:self.block_pairs]
+            del self.pending[:self.block_pairs]
+            end = start + sum(self.pending_lengths[:self.block_pairs])
+            del self.pending_lengths[:self.block_pairs]
+            written += self._write_block(block, self.pending_text[start:end])
+            start = end
+        if start:
+            self.pending_text = self.pending_text[start:]
+        return written
+    
+    def flush(self) -> int:
+        """
+        Finish the stream: emit the pending phrase, the last block and the end marker.
+        
+        Returns:
+            Number of bytes written to the output by this call
+        """
+        if self.finished:
+            return 0
+        
+        self.pending.extend(self.compressor.lz78.flush(self.pending_lengths))
+        written = self._write_block(self.pending, self.pending_text)
+        self.pending = []
+        self.pending_lengths = []
+        self.pending_text = ''
+        
+        FileHandlerBinaryHuffman.write_end(self.output, self.checksum)
+        written += FileHandlerBinaryHuffman.END_SIZE
+        self.bytes_written += FileHandlerBinaryHuffman.END_SIZE
+        self.finished = True
+        return written
+    
+    def _write_block(self, block: List[Tuple[int, str]], text: str) -> int:
+        """Entropy-code one block of pairs and write it, or store its text."""
+        if not block:
+            return 0
+        
+        data = text.encode('utf-8')
+        self.checksum = zlib.crc32(data, self.checksum)
+        block_type, written = FileHandlerBinaryHuffman.write_block(
+            self.output, block, None, None, self.compressor.index_coding, self.compressor.literal_coding,
+            self.contexts, self.compressor.entropy_coder, self.live_size, data
+        )
+        
+        self.pairs_out += len(block)
+        self.blocks_written += 1
+        self.stored_blocks += block_type == FileHandlerBinaryHuffman.BLOCK_STORED
+        self.bytes_written += written
+        return written
+    
+    def get_statistics(self) -> Dict:
+        """
+        Statistics of the data compressed so far.
+        
+        Returns:
+            Dictionary with original_size, compressed_size, compression_ratio,
+            pairs, blocks, stored_blocks (blocks written uncompressed) and
+            dictionary_entries
+        """
+        compression_ratio = (self.bytes_written / self.bytes_in * 100) if self.bytes_in > 0 else 0
+        
+        return {
+            'original_size': self.bytes_in,
+            'compressed_size': self.bytes_written,
+            'compression_ratio': compression_ratio,
+            'pairs': self.pairs_out,
+            'blocks': self.blocks_written,
+            'stored_blocks': self.stored_blocks,
+            'dictionary_entries': self.compressor.lz78.trie.size
+        }
+
+
+def compress_file(source_path: str, target_path: str,
+                  max_dictionary_size: Optional[int] = None,
+                  dictionary_policy: str = POLICY_FREEZE,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  block_pairs: int = DEFAULT_BLOCK_PAIRS,
+                  index_coding: str = INDEX_CODING_SYMBOL,
+                  literal_coding: str = LITERAL_CODING_HUFFMAN,
+                  entropy_coder: str = ENTROPY_CODER_HUFFMAN,
+                  preset_dictionary: Optional[PresetDictionary] = None) -> Dict:
+    """
+    Compress a text file into a .lz78 file without loading it in memory.
+    
+    The input is read in chunks of `chunk_size` characters and the output
+    is written block by block. Line endings are kept as they are.
+    
+    Args:
+        source_path: Path of the text file to compress
+        target_path: Path of the .lz78 file to write (extension added if missing)
+        max_dictionary_size: Dictionary size limit (None = unbounded)
+        dictionary_policy: Dictionary-full policy
+        chunk_size: Characters read per chunk
+        block_pairs: (index, char) pairs per block
+        index_coding: Index coding (see index_coding.INDEX_CODINGS)
+        literal_coding: Literal coding (see literal_coding.LITERAL_CODINGS)
+        entropy_coder: Entropy coder (see entropy_coding.ENTROPY_CODERS)
+        preset_dictionary: Preset dictionary to start from (see preset_dictionary)
+    
+    Returns:
+        Statistics from LZ78StreamCompressor.get_statistics()
+    
+    Raises:
+        FileNotFoundError: If the source file doesn't exist
+        ValueError: If the file is not valid UTF-8 text or can't be written
+    """
+    if not Path(source_path).is_file():
+        raise FileNotFoundError(f"File not found: {source_path}")
+    
+    if not target_path.endswith(FileHandlerBinaryHuffman.LZ78_EXTENSION):
+        target_path += FileHandlerBinaryHuffman.LZ78_EXTENSION
+    
+    try:
+        with open(source_path, 'r', encoding='utf-8', newline='') as source, \
+                open(target_path, 'wb') as target:
+            stream = LZ78StreamCompressor(
+                target, Path(source_path).name,
+                max_dictionary_size, dictionary_policy, block_pairs, index_coding,
+                literal_coding, entropy_coder, preset_dictionary
+            )
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                stream.feed(chunk)
+            stream.flush()
+        
+        return stream.get_statistics()
+    
+    except UnicodeDecodeError:
+        raise ValueError("File is not readable as text (encoding error)")
+
+
+class LZ78StreamDecompressor:
+    """
+    Incremental LZ78 decoder.
+    
+    Pairs are given with decode(pairs) and the text they expand to is
+    returned right away; nothing of the output is retained. Phrases are
+    kept as (parent, char) in a PhraseTrie, which replays the
+    dictionary-full policy of the encoder. Phrases up to
+    PHRASE_CACHE_LENGTH characters are also cached expanded; longer ones
+    are expanded by walking up to their nearest cached ancestor. Memory is
+    therefore bounded by the dictionary size, not by the output size.
+    """
+    
+    def __init__(self, max_dictionary_size: Optional[int] = None,
+                 dictionary_policy: str = POLICY_FREEZE,
+                 preset: Sequence[Tuple[int, str]] = ()):
+        self.trie = PhraseTrie(max_dictionary_size, dictionary_policy, track_children=False)
+        self.phrases: List[Optional[str]] = ['']
+        
+        # Statistics
+        self.pairs_in = 0
+        self.chars_out = 0
+        
+        # El diccionario preestablecido se decodifica como cualquier otro
+        # par (solo lo que cabe, como en PhraseTrie), sin contarlo en las
+        # estadísticas
+        if preset:
+            self.decode(preset[:max_dictionary_size])
+            self.pairs_in = 0
+            self.chars_out = 0
+    
+    def _expand(self, index: int) -> str:
+        """Text of phrase `index`."""
+        phrase = self.phrases[index]
+        if phrase is not None:
+            return phrase
+        
+        # Subir por los padres hasta la primera frase guardada expandida
+        parents = self.trie.parents
+        chars = self.trie.chars
+        phrases = self.phrases
+        suffix = []
+        node = index
+        while phrases[node] is None:
+            suffix.append(chars[node])
+            node = parents[node]
+        suffix.reverse()
+        return phrases[node] + ''.join(suffix)
+    
+    def decode_batch(self, batch: PairBatch) -> str:
+        """
+        Decode a batch yielded by FileHandlerBinaryHuffman.iter_pairs or iter_block_pairs.
+        
+        Returns:
+            Text of the batch
+        """
+        if batch.block_type == FileHandlerBinaryHuffman.BLOCK_STORED:
+            return self.decode_stored(batch.text)
+        return self.decode(batch.pairs)
+    
+    def decode_stored(self, text: str) -> str:
+        """
+        Decode the text of a stored block.
+        
+        Its pairs are parsed again from the dictionary, to keep it in step
+        with the encoder.
+        
+        Returns:
+            The text itself
+        """
+        for pair in self.trie.parse(text):
+            self.decode([pair])
+        return text
+    
+    def decode(self, pairs: List[Tuple[int, str]]) -> str:
+        """
+        Decode the next pairs of the stream.
+        
+        Args:
+            pairs: Next (index, char) pairs, in order
+        
+        Returns:
+            Text of those pairs
+        """
+        trie = self.trie
+        phrases = self.phrases
+        pieces = []
+        
+        for index, char in pairs:
+            if index > trie.size or index < 0:
+                # Índice inválido: recuperar usando solo el carácter
+                index = 0
+            
+            phrase = self._expand(index) + char
+            pieces.append(phrase)
+            
+            cached = phrase if len(phrase) <= PHRASE_CACHE_LENGTH else None
+            new_index = trie.add(index, char)
+            if new_index == len(phrases):
+                phrases.append(cached)
+            elif new_index is not None:
+                phrases[new_index] = cached
+            elif len(phrases) > len(trie.parents):
+                # La política reset vació el diccionario
+                del phrases[len(trie.parents):]
+        
+        text = ''.join(pieces)
+        self.pairs_in += len(pairs)
+        self.chars_out += len(text)
+        return text
+    
+    def get_statistics(self) -> Dict:
+        """
+        Statistics of the data decompressed so far.
+        
+        Returns:
+            Dictionary with pairs, decompressed_chars and dictionary_entries
+        """
+        return {
+            'pairs': self.pairs_in,
+            'decompressed_chars': self.chars_out,
+            'dictionary_entries': self.trie.size
+        }
+
+
+def decompress_file(source_path: str, target_path: str,
+                    preset_dictionary: Optional[PresetDictionary] = None) -> Dict:
+    """
+    Decompress a .lz78 file straight to a text file.
+    
+    Indices are decoded incrementally and every batch of expanded phrases
+    is written to the output as soon as it is decoded, so the decompressed
+    text is never held in memory. Files whose blocks were compressed
+    independently (see lz78_parallel) are decoded block by block, each
+    with a new dictionary. The CRC-32 of the decoded text is checked
+    against the checksum of the file (version 2 files have none).
+    
+    Args:
+        source_path: Path of the .lz78 file
+        target_path: Path of the text file to write
+        preset_dictionary: Preset dictionary of the file, if it has one
+    
+    Returns:
+        Dictionary with original_filename, compressed_size,
+        decompressed_size, pairs and dictionary_entries
+    
+    Raises:
+        FileNotFoundError: If the source file doesn't exist
+        ValueError: If the file format is incorrect, the text does not
+            match the checksum or the output can't be written
+    """
+    if not Path(source_path).is_file():
+        raise FileNotFoundError(f"File not found: {source_path}")
+    
+    try:
+        with open(source_path, 'rb') as source, \
+                open(target_path, 'w', encoding='utf-8', newline='') as target:
+            header = FileHandlerBinaryHuffman._read_header(source, preset_dictionary)
+            preset = FileHandlerBinaryHuffman._preset(header)
+            if header['flags'] & FLAG_INDEPENDENT_BLOCKS:
+                # Cada bloque empieza con un diccionario nuevo
+                blocks = (FileHandlerBinaryHuffman.iter_block_pairs(source, header, offset)
+                          for offset in FileHandlerBinaryHuffman.iter_block_offsets(source))
+            else:
+                blocks = [FileHandlerBinaryHuffman.iter_pairs(source, header)]
+            
+            decompressed_size = 0
+            checksum = 0
+            pair_count = 0
+            dictionary_entries = 0
+            for batches in blocks:
+                decoder = LZ78StreamDecompressor(header['max_dictionary_size'], header['dictionary_policy'], preset)
+                for batch in batches:
+                    text = decoder.decode_batch(batch)
+                    data = text.encode('utf-8')
+                    decompressed_size += len(data)
+                    checksum = zlib.crc32(data, checksum)
+                    target.write(text)
+                pair_count += decoder.pairs_in
+                dictionary_entries = decoder.get_statistics()['dictionary_entries']
+            
+            # Tras el bloque de fin: el CRC-32 del texto (salvo en la versión 2)
+            FileHandlerBinaryHuffman.check_checksum(
+                FileHandlerBinaryHuffman.read_checksum(source, header['version']), checksum)
+        
+        return {
+            'original_filename': header['original_filename'],
+            'compressed_size': Path(source_path).stat().st_size,
+            'decompressed_size': decompressed_size,
+            'pairs': pair_count,
+            'dictionary_entries': dictionary_entries
+        }
+    
+    except (struct.error, UnicodeDecodeError, EOFError) as e:
+        raise ValueError(f"Error decompressing file: {str(e)}")
@@ -0,0 +1,181 @@
+"""
+Preset LZ78 dictionaries
+Trains a dictionary of frequent phrases on sample files and stores it in a
+.lz78dict file; the compressor and the decompressor can start from it
+instead of an empty dictionary, so small files find phrases to reference
+from their first characters
+"""
+
+import struct
+import zlib
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+from .lz78_compressor import LZ78Compressor
+
+DICTIONARY_EXTENSION = '.lz78dict'
+DEFAULT_PRESET_PHRASES = 4096  # Phrases kept by train_dictionary
+
+
+class PresetDictionary:
+    """
+    Phrases an LZ78 dictionary starts with.
+    
+    The dictionary is kept as the (parent index, char) pairs that build
+    it, in order: pair k adds phrase k + 1, whose parent is an earlier
+    phrase. Encoder and decoder add them to their PhraseTrie like any
+    other pair, so they start from the same dictionary under any
+    dictionary-full policy; a bounded dictionary only takes the first
+    phrases that fit. .lz78 files refer to it by `dictionary_id`, the
+    CRC-32 of its pairs.
+    
+    Only the LZ78 dictionary is primed, not the Huffman code tables:
+    every block of a file still stores its own tables, which take a
+    noticeable share of a small file (an adaptive entropy coder stores
+    none).
+    
+    Binary format (.lz78dict):
+    - Magic number (4 bytes): 'LZ7D'
+    - Version (1 byte): 1
+    - Phrase count (4 bytes): uint32
+    - For each phrase:
+        - Parent index (4 bytes): uint32
+        - Char length (1 byte): uint8
+        - Char (1-4 bytes): UTF-8
+    """
+    
+    MAGIC_NUMBER = b'LZ7D'
+    VERSION = 1
+    
+    def __init__(self, pairs: Sequence[Tuple[int, str]]):
+        self.pairs: List[Tuple[int, str]] = list(pairs)
+        for position, (parent, char) in enumerate(self.pairs):
+            if not 0 <= parent <= position or len(char) != 1:
+                raise ValueError(f"Invalid preset phrase {position + 1}: ({parent}, {char!r})")
+        self.dictionary_id = zlib.crc32(self._phrases_bytes())
+    
+    def __len__(self) -> int:
+        return len(self.pairs)
+    
+    def _phrases_bytes(self) -> bytes:
+        """Phrase count and phrases as stored in the file."""
+        parts = [struct.pack('I', len(self.pairs))]
+        for parent, char in self.pairs:
+            char_bytes = char.encode('utf-8')
+            parts.append(struct.pack('I', parent))
+            parts.append(struct.pack('B', len(char_bytes)))
+            parts.append(char_bytes)
+        return b''.join(parts)
+    
+    def phrases(self) -> List[str]:
+        """Text of every phrase, by index - 1."""
+        texts = ['']
+        for parent, char in self.pairs:
+            texts.append(texts[parent] + char)
+        return texts[1:]
+    
+    def save(self, file_path: str) -> int:
+        """
+        Write the dictionary to a .lz78dict file.
+        
+        Args:
+            file_path: Path of the file (extension added if missing)
+        
+        Returns:
+            Size of the file in bytes
+        """
+        if not file_path.endswith(DICTIONARY_EXTENSION):
+            file_path += DICTIONARY_EXTENSION
+        data = self.MAGIC_NUMBER + struct.pack('B', self.VERSION) + self._phrases_bytes()
+        with open(file_path, 'wb') as f:
+            f.write(data)
+        return len(data)
+    
+    @classmethod
+    def load(cls, file_path: str) -> 'PresetDictionary':
+        """
+        Read a .lz78dict file written by save().
+        
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If the file format is incorrect
+        """
+        if not Path(file_path).is_file():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        try:
+            with open(file_path, 'rb') as f:
+                if f.read(4) != cls.MAGIC_NUMBER:
+                    raise ValueError("Invalid file format: not a preset dictionary")
+                version = struct.unpack('B', f.read(1))[0]
+                if version != cls.VERSION:
+                    raise ValueError(f"Unsupported dictionary version: {version}")
+                
+                pairs = []
+                for _ in range(struct.unpack('I', f.read(4))[0]):
+                    parent = struct.unpack('I', f.read(4))[0]
+                    char_length = struct.unpack('B', f.read(1))[0]
+                    pairs.append((parent, f.read(char_length).decode('utf-8')))
+            return cls(pairs)
+        
+        except (struct.error, UnicodeDecodeError) as e:
+            raise ValueError(f"Error loading preset dictionary: {str(e)}")
+
+
+def train_dictionary(sample_paths: Sequence[str],
+                     max_phrases: int = DEFAULT_PRESET_PHRASES) -> PresetDictionary:
+    """
+    Build a preset dictionary from sample files.
+    
+    The samples are compressed one after the other with an unbounded
+    LZ78 dictionary, counting how many pairs reference every phrase or
+    one of its extensions. The `max_phrases` most referenced phrases are
+    kept, most referenced first; a phrase is referenced at least as often
+    as its extensions, so the parent of every kept phrase is kept and
+    comes before it. Any prefix of the dictionary is thus the best
+    dictionary of its size. Only phrases are trained: no Huffman code
+    tables are derived from the samples (see PresetDictionary).
+    
+    Args:
+        sample_paths: Paths of UTF-8 text files similar to the ones to compress
+        max_phrases: Maximum number of phrases of the dictionary
+    
+    Returns:
+        The trained dictionary
+    
+    Raises:
+        FileNotFoundError: If a sample file doesn't exist
+        ValueError: If a sample is not valid UTF-8 text
+    """
+    if max_phrases < 0:
+        raise ValueError("Maximum number of phrases must not be negative")
+    
+    lz78 = LZ78Compressor()
+    lz78.reset()
+    references = [0]
+    for sample_path in sample_paths:
+        if not Path(sample_path).is_file():
+            raise FileNotFoundError(f"File not found: {sample_path}")
+        try:
+            with open(sample_path, 'r', encoding='utf-8', newline='') as f:
+                pairs = lz78.feed(f.read()) + lz78.flush()
+        except UnicodeDecodeError:
+            raise ValueError(f"File is not readable as text (encoding error): {sample_path}")
+        references.extend([0] * (len(lz78.trie.parents) - len(references)))
+        for index, _ in pairs:
+            references[index] += 1
+    
+    # Sumar a cada frase las referencias de sus extensiones (los hijos
+    # tienen índices mayores que sus padres)
+    parents = lz78.trie.parents
+    chars = lz78.trie.chars
+    for index in range(len(parents) - 1, 0, -1):
+        references[parents[index]] += references[index]
+    
+    kept = sorted(range(1, len(parents)), key=lambda index: (-references[index], index))[:max_phrases]
+    new_indices = {0: 0}
+    preset = []
+    for index in kept:
+        preset.append((new_indices[parents[index]], chars[index]))
+        new_indices[index] = len(preset)
+    return PresetDictionary(preset)
@@ -0,0 +1,256 @@
+"""
+Adaptive range coder
+Byte-oriented range coder (LZMA style, with carry propagation) and
+adaptive frequency models with an escape symbol for new symbols
+"""
+
+from typing import Callable, Dict, Hashable, List, Optional
+
+from .entropy_coding import AdaptiveEncoder, AdaptiveDecoder, ESCAPE
+
+TOP = 1 << 24           # El rango se renormaliza cuando baja de este valor
+MAX_TOTAL = 1 << 16     # Frecuencia total máxima de un modelo (precisión del rango)
+
+
+class FrequencyModel:
+    """
+    Adaptive frequency table of one alphabet.
+    
+    Slot 0 is the escape symbol, used to code a symbol the model has not
+    seen yet; the caller codes it some other way and registers it with
+    add(). Every coded symbol gets INCREMENT more counts and every new
+    symbol gives ESCAPE_INCREMENT to the escape, so the escape gets
+    cheaper while new symbols keep appearing. Counts are halved when the
+    total exceeds MAX_TOTAL, which also lets the model follow changes in
+    the statistics of the data.
+    
+    The counts are also kept in a Fenwick tree, so the cumulative count
+    of a slot (start()) and the slot of a cumulative count (find()) take
+    O(log alphabet) instead of a sum over the whole alphabet.
+    """
+    
+    INCREMENT = 32
+    ESCAPE_INCREMENT = 8
+    
+    def __init__(self):
+        self.symbols: List[Optional[Hashable]] = [ESCAPE]
+        self.frequencies: List[int] = [self.INCREMENT]
+        self.slots: Dict[Hashable, int] = {}
+        self.total = self.INCREMENT
+        # tree[i] = suma de frequencies[i - (i & -i):i] (índices desde 1)
+        self.tree: List[int] = [0, self.INCREMENT]
+    
+    def add(self, symbol: Hashable) -> None:
+        """Register a symbol coded after an escape."""
+        slot = len(self.symbols)
+        self.slots[symbol] = slot
+        self.symbols.append(symbol)
+        self.frequencies.append(self.INCREMENT)
+        # Nuevo nodo: su frecuencia más la de los nodos que cubre
+        node = slot + 1
+        self.tree.append(self.INCREMENT + self.start(slot) - self.start(node - (node & -node)))
+        self._add(0, self.ESCAPE_INCREMENT)
+        self.total += self.INCREMENT + self.ESCAPE_INCREMENT
+        if self.total > MAX_TOTAL:
+            self._rescale()
+    
+    def update(self, slot: int) -> None:
+        """Count one more occurrence of the symbol in `slot`."""
+        self._add(slot, self.INCREMENT)
+        self.total += self.INCREMENT
+        if self.total > MAX_TOTAL:
+            self._rescale()
+    
+    def start(self, slot: int) -> int:
+        """Sum of the counts of the slots before `slot`."""
+        tree = self.tree
+        total = 0
+        while slot:
+            total += tree[slot]
+            slot &= slot - 1
+        return total
+    
+    def find(self, target: int) -> int:
+        """Slot whose counts cover the cumulative count `target` (< total)."""
+        tree = self.tree
+        size = len(tree) - 1
+        slot = 0
+        step = 1 << (size.bit_length() - 1)
+        while step:
+            node = slot + step
+            if node <= size and tree[node] <= target:
+                slot = node
+                target -= tree[node]
+            step >>= 1
+        return slot
+    
+    def _add(self, slot: int, increment: int) -> None:
+        self.frequencies[slot] += increment
+        tree = self.tree
+        node = slot + 1
+        while node < len(tree):
+            tree[node] += increment
+            node += node & -node
+    
+    def _rescale(self) -> None:
+        self.frequencies = [(frequency + 1) >> 1 for frequency in self.frequencies]
+        self.total = sum(self.frequencies)
+        tree = [0] + self.frequencies
+        for node in range(1, len(tree)):
+            parent = node + (node & -node)
+            if parent < len(tree):
+                tree[parent] += tree[node]
+        self.tree = tree
+
+
+class RangeEncoder(AdaptiveEncoder):
+    """
+    Range encoder with 32-bit low/range registers.
+    
+    Output bytes are kept in memory; a carry out of `low` is propagated
+    into the byte held in `cache` and the pending 0xFF bytes after it.
+    """
+    
+    def __init__(self):
+        self.low = 0
+        self.range = 0xFFFFFFFF
+        self.cache = 0
+        self.cache_size = 1
+        self.output = bytearray()
+    
+    def new_model(self) -> FrequencyModel:
+        return FrequencyModel()
+    
+    def _encode(self, start: int, size: int, total: int) -> None:
+        r = self.range // total
+        self.low += r * start
+        self.range = r * size
+        while self.range < TOP:
+            self.range <<= 8
+            self._shift_low()
+    
+    def _shift_low(self) -> None:
+        low = self.low
+        if low < 0xFF000000 or low > 0xFFFFFFFF:
+            # El byte en espera ya es definitivo (más el acarreo, si lo hay)
+            carry = low >> 32
+            byte = self.cache
+            while True:
+                self.output.append((byte + carry) & 0xFF)
+                byte = 0xFF
+                self.cache_size -= 1
+                if not self.cache_size:
+                    break
+            self.cache = (low >> 24) & 0xFF
+        self.cache_size += 1
+        self.low = (low & 0x00FFFFFF) << 8
+    
+    def encode(self, model: FrequencyModel, symbol: Hashable) -> bool:
+        slot = model.slots.get(symbol)
+        frequencies = model.frequencies
+        if slot is None:
+            self._encode(0, frequencies[0], model.total)
+            return False
+        self._encode(model.start(slot), frequencies[slot], model.total)
+        model.update(slot)
+        return True
+    
+    def encode_uniform(self, value: int, count: int) -> None:
+        if count > MAX_TOTAL:
+            # Parte alta con el rango completo, bits bajos aparte
+            shift = (count - 1).bit_length() - 16
+            self._encode(value >> shift, 1, ((count - 1) >> shift) + 1)
+            self.encode_bits(value & ((1 << shift) - 1), shift)
+        elif count > 1:
+            self._encode(value, 1, count)
+    
+    def encode_bits(self, value: int, bits: int) -> None:
+        while bits > 16:
+            bits -= 16
+            self._encode((value >> bits) & 0xFFFF, 1, 1 << 16)
+        if bits:
+            self._encode(value & ((1 << bits) - 1), 1, 1 << bits)
+    
+    def finish(self) -> bytes:
+        for _ in range(5):
+            self._shift_low()
+        # El primer byte siempre es 0 (la caché inicial): no se guarda
+        return bytes(self.output[1:])
+
+
+class RangeDecoder(AdaptiveDecoder):
+    """
+    Decoder for the bytes written by RangeEncoder.
+    
+    Bytes are pulled on demand with `read(size) -> bytes`, READ_SIZE at a
+    time; missing bytes at the end of the data are read as zeros.
+    """
+    
+    READ_SIZE = 4096
+    
+    def __init__(self, read: Callable[[int], bytes]):
+        self.read = read
+        self.buffer = b''
+        self.buffer_pos = 0
+        self.range = 0xFFFFFFFF
+        self.code = 0
+        for _ in range(4):
+            self.code = (self.code << 8) | self._next_byte()
+        self.r = 0
+    
+    def new_model(self) -> FrequencyModel:
+        return FrequencyModel()
+    
+    def _next_byte(self) -> int:
+        if self.buffer_pos >= len(self.buffer):
+            self.buffer = self.read(self.READ_SIZE) or bytes(4)
+            self.buffer_pos = 0
+        byte = self.buffer[self.buffer_pos]
+        self.buffer_pos += 1
+        return byte
+    
+    def _target(self, total: int) -> int:
+        """Value in [0, total) of the next symbol; _consume() must follow."""
+        self.r = self.range // total
+        return min(self.code // self.r, total - 1)
+    
+    def _consume(self, start: int, size: int) -> None:
+        self.code -= start * self.r
+        self.range = self.r * size
+        while self.range < TOP:
+            self.code = ((self.code << 8) | self._next_byte()) & 0xFFFFFFFF
+            self.range <<= 8
+    
+    def decode(self, model: FrequencyModel) -> Optional[Hashable]:
+        target = self._target(model.total)
+        slot = model.find(target)
+        self._consume(model.start(slot), model.frequencies[slot])
+        if slot == 0:
+            return ESCAPE
+        model.update(slot)
+        return model.symbols[slot]
+    
+    def decode_uniform(self, count: int) -> int:
+        if count > MAX_TOTAL:
+            shift = (count - 1).bit_length() - 16
+            high = self._target(((count - 1) >> shift) + 1)
+            self._consume(high, 1)
+            return (high << shift) | self.decode_bits(shift)
+        if count > 1:
+            value = self._target(count)
+            self._consume(value, 1)
+            return value
+        return 0
+    
+    def decode_bits(self, bits: int) -> int:
+        value = 0
+        while bits > 16:
+            bits -= 16
+            chunk = self._target(1 << 16)
+            self._consume(chunk, 1)
+            value = (value << 16) | chunk
+        if bits:
+            chunk = self._target(1 << bits)
+            self._consume(chunk, 1)
+            value = (value << bits) | chunk
+        return value
@@ -0,0 +1,127 @@
+"""
+Text Pager - Pages of a large UTF-8 text without decoding all of it
+"""
+
+import mmap
+from typing import Optional, Tuple, Union
+
+PAGE_SIZE = 1 << 16        # Bytes of text per page
+MAX_LINE_SCAN = 1 << 12    # Bytes searched for a line break to start or end a page
+
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+
+class TextPager:
+    """
+    Splits a UTF-8 text held in memory or in a memory-mapped file into pages.
+    
+    Pages are byte ranges that start and end on character boundaries and,
+    when there is a line break within MAX_LINE_SCAN bytes, on line
+    boundaries; only the page being shown is decoded. Consecutive pages
+    (see page and page_before) cover the text without gaps or overlaps.
+    Invalid UTF-8 is shown with replacement characters.
+    """
+    
+    def __init__(self, data: Buffer, page_size: int = PAGE_SIZE):
+        if page_size < 4:
+            raise ValueError("Page size must hold a UTF-8 character (at least 4 bytes)")
+        self.data = data
+        self.size = len(data)
+        self.page_size = page_size
+        self._file = None
+    
+    @classmethod
+    def open(cls, file_path: str, page_size: int = PAGE_SIZE) -> 'TextPager':
+        """
+        Memory-map a text file read-only.
+        
+        Args:
+            file_path: Path of the UTF-8 text file
+            page_size: Bytes of text per page (at least 4)
+        
+        Returns:
+            A pager over the file; close() releases it
+        
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        f = open(file_path, 'rb')
+        try:
+            # mmap no admite archivos vacíos
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if f.seek(0, 2) else b''
+        except Exception:
+            f.close()
+            raise
+        pager = cls(data, page_size)
+        pager._file = f
+        return pager
+    
+    def close(self) -> None:
+        """Release the memory-mapped file, if any."""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.data = b''
+        self.size = 0
+    
+    def char_start(self, offset: int) -> int:
+        """Move an offset back to the start of the UTF-8 character that contains it."""
+        offset = max(0, min(offset, self.size))
+        # Como mucho 3 bytes de continuación (10xxxxxx) por carácter
+        for _ in range(3):
+            if offset == 0 or offset == self.size or self.data[offset] & 0xC0 != 0x80:
+                break
+            offset -= 1
+        return offset
+    
+    def line_start(self, offset: int) -> int:
+        """Start of the line that contains an offset, or of its character if the line is too long."""
+        offset = self.char_start(offset)
+        if offset == 0:
+            return 0
+        newline = self.data.rfind(b'\n', max(0, offset - MAX_LINE_SCAN), offset)
+        if newline >= 0:
+            return newline + 1
+        return 0 if offset <= MAX_LINE_SCAN else offset
+    
+    def _page_end(self, start: int) -> int:
+        """End of a page that must go past `start`."""
+        if start + self.page_size >= self.size:
+            return self.size
+        end = self.line_start(start + self.page_size)
+        if end <= start:
+            # Línea más larga que la página: cortar en un carácter
+            end = self.char_start(start + self.page_size)
+        return end
+    
+    def page(self, offset: int) -> Tuple[int, int]:
+        """
+        Byte range of the page that shows an offset.
+        
+        Args:
+            offset: Byte offset in the text
+        
+        Returns:
+            (start, end) of the page: from the start of the line that
+            contains the offset to about page_size bytes after the offset
+        """
+        offset = max(0, min(offset, self.size))
+        return self.line_start(offset), self._page_end(offset)
+    
+    def next_page(self, end: int) -> Optional[Tuple[int, int]]:
+        """Byte range of the page that follows the one ending at `end`, or None at the end of the text."""
+        if end >= self.size:
+            return None
+        return end, self._page_end(end)
+    
+    def page_before(self, start: int) -> Optional[Tuple[int, int]]:
+        """Byte range of the page that ends where the page at `start` begins, or None at the start."""
+        if start <= 0:
+            return None
+        return self.line_start(start - self.page_size), start
+    
+    def text(self, start: int, end: int) -> str:
+        """Decode the bytes of a page."""
+        return bytes(self.data[start:end]).decode('utf-8', errors='replace')
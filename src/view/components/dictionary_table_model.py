@@ -0,0 +1,155 @@
+"""
+Dictionary Table Model - Lazy view of the LZ78 phrase dictionary
+"""
+
+from typing import List, Optional
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, pyqtSignal
+
+
+class DictionaryTableModel(QAbstractTableModel):
+    """
+    Table of the LZ78 dictionary (phrase, index) that builds rows on demand.
+    
+    The rows are read from the phrase arrays of a PhraseDictionary (see
+    PhraseDictionary.phrases) only when the view paints them, so showing a
+    dictionary costs the same at any size. Rows are in index order, so
+    sorting by index only reverses the order; sorting by phrase builds
+    every visible phrase once.
+    
+    set_filter() keeps the phrases that contain a text. It scans
+    FILTER_BATCH indices per event loop turn and appends the matches as
+    it goes, so the window keeps responding; when the new text extends
+    the previous one only the previous matches are scanned again.
+    """
+    
+    HEADERS = ["Cadena", "Índice"]
+    PHRASE_COLUMN = 0
+    INDEX_COLUMN = 1
+    FILTER_BATCH = 20000  # Indices scanned per event loop turn
+    
+    filter_progress = pyqtSignal(int, int)  # Matches found, indices left to scan
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.dictionary = None
+        self.count = 0
+        self.sort_column = self.INDEX_COLUMN
+        self.sort_order = Qt.AscendingOrder
+        self.filter_text = ''
+        # Índices visibles en orden; None = todos (1..count según el orden)
+        self.rows: Optional[List[int]] = None
+        # Índices que quedan por revisar con el filtro actual
+        self.pending: List[int] = []
+        self.generation = 0
+    
+    def set_dictionary(self, dictionary):
+        """Show a new dictionary (a PhraseDictionary), keeping the sort and filter."""
+        self.beginResetModel()
+        self.dictionary = dictionary
+        self.count = len(dictionary) if dictionary is not None else 0
+        self.rows = None
+        self.pending = []
+        self.generation += 1
+        self.endResetModel()
+        if self.filter_text:
+            text, self.filter_text = self.filter_text, ''
+            self.set_filter(text)
+        elif self.sort_column == self.PHRASE_COLUMN:
+            self.sort(self.sort_column, self.sort_order)
+    
+    def index_at(self, row: int) -> int:
+        """Dictionary index shown in a row."""
+        if self.rows is not None:
+            return self.rows[row]
+        if self.sort_order == Qt.DescendingOrder:
+            return self.count - row
+        return row + 1
+    
+    def all_indices(self) -> List[int]:
+        """Every index of the dictionary, in the order of the index column."""
+        if self.sort_order == Qt.DescendingOrder and self.sort_column == self.INDEX_COLUMN:
+            return list(range(self.count, 0, -1))
+        return list(range(1, self.count + 1))
+    
+    # Qt model interface
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.rows) if self.rows is not None else self.count
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        dictionary_index = self.index_at(index.row())
+        if index.column() == self.INDEX_COLUMN:
+            return str(dictionary_index)
+        return next(self.dictionary.phrases((dictionary_index,)))[1]
+    
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+    
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        """Sort by index (free) or by phrase (builds the visible phrases)."""
+        self.layoutAboutToBeChanged.emit()
+        previous_column, previous_order = self.sort_column, self.sort_order
+        self.sort_column, self.sort_order = column, order
+        if column == self.PHRASE_COLUMN:
+            rows = self.rows if self.rows is not None else self.all_indices()
+            phrases = dict(self.dictionary.phrases(rows)) if self.dictionary is not None else {}
+            self.rows = sorted(rows, key=phrases.__getitem__, reverse=order == Qt.DescendingOrder)
+        elif self.rows is not None:
+            self.rows.sort(reverse=order == Qt.DescendingOrder)
+        if self.pending and (column, order) != (previous_column, previous_order):
+            # El resto del filtro se revisa en el nuevo orden de índices
+            self.pending.sort(reverse=order == Qt.DescendingOrder)
+        self.layoutChanged.emit()
+    
+    # Incremental filter
+    def set_filter(self, text: str):
+        """Keep the phrases that contain `text` (all of them if it is empty)."""
+        if self.pending or not self.filter_text or self.filter_text not in text:
+            candidates = self.all_indices() if text else []
+        else:
+            # El texto nuevo amplía el anterior: basta con revisar sus coincidencias
+            candidates = list(self.rows)
+        
+        self.beginResetModel()
+        self.filter_text = text
+        self.generation += 1
+        self.rows = [] if text else None
+        self.pending = candidates
+        self.endResetModel()
+        
+        if text:
+            self.scan_batch(self.generation)
+        elif self.sort_column == self.PHRASE_COLUMN:
+            self.sort(self.sort_column, self.sort_order)
+    
+    def scan_batch(self, generation: int):
+        """Scan the next FILTER_BATCH candidates and append the matches."""
+        if generation != self.generation or self.dictionary is None:
+            return  # Filtro sustituido por otro
+        batch = self.pending[:self.FILTER_BATCH]
+        del self.pending[:self.FILTER_BATCH]
+        text = self.filter_text
+        matches = [index for index, phrase in self.dictionary.phrases(batch) if text in phrase]
+        if matches:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(matches) - 1)
+            self.rows.extend(matches)
+            self.endInsertRows()
+        self.filter_progress.emit(len(self.rows), len(self.pending))
+        
+        if self.pending:
+            QTimer.singleShot(0, lambda: self.scan_batch(generation))
+        elif self.sort_column == self.PHRASE_COLUMN:
+            # Las coincidencias llegan en orden de índice
+            self.sort(self.sort_column, self.sort_order)
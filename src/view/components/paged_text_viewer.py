@@ -0,0 +1,130 @@
+"""
+Paged Text Viewer - Read-only viewer that shows a large text one page at a time
+"""
+
+from typing import Optional
+
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QPushButton, QLabel, QLineEdit
+from PyQt5.QtGui import QIntValidator
+
+from ...utils.text_pager import TextPager
+
+
+class PagedTextViewer(QWidget):
+    """
+    Read-only text viewer for files of any size.
+    
+    The text is held by a TextPager (a memory-mapped file or a bytes
+    buffer) and only the page being shown is decoded and laid out, so
+    opening a multi-MB file costs the same as a small one. The navigation
+    bar moves to the previous or next page and jumps to a byte offset.
+    """
+    
+    def __init__(self, placeholder: str = "", parent=None):
+        super().__init__(parent)
+        self.pager: Optional[TextPager] = None
+        self.start = 0
+        self.end = 0
+        
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+        
+        self.editor = QPlainTextEdit()
+        self.editor.setReadOnly(True)
+        self.editor.setPlaceholderText(placeholder)
+        layout.addWidget(self.editor)
+        
+        # Navigation bar
+        navigation = QHBoxLayout()
+        self.btn_previous = QPushButton("◀ Anterior")
+        self.btn_next = QPushButton("Siguiente ▶")
+        self.offset_input = QLineEdit()
+        self.offset_input.setPlaceholderText("Byte")
+        self.offset_input.setValidator(QIntValidator(0, 2 ** 31 - 1))
+        self.offset_input.setMaximumWidth(120)
+        self.btn_go = QPushButton("Ir")
+        self.position_label = QLabel()
+        
+        navigation.addWidget(self.btn_previous)
+        navigation.addWidget(self.btn_next)
+        navigation.addStretch()
+        navigation.addWidget(self.position_label)
+        navigation.addWidget(QLabel("Ir al byte:"))
+        navigation.addWidget(self.offset_input)
+        navigation.addWidget(self.btn_go)
+        layout.addLayout(navigation)
+        
+        self.btn_previous.clicked.connect(self.show_previous_page)
+        self.btn_next.clicked.connect(self.show_next_page)
+        self.btn_go.clicked.connect(self.go_to_offset)
+        self.offset_input.returnPressed.connect(self.go_to_offset)
+        
+        self.update_navigation()
+    
+    def open_file(self, file_path: str):
+        """Show a UTF-8 text file, memory-mapped."""
+        self.set_pager(TextPager.open(file_path))
+    
+    def set_data(self, data: bytes):
+        """Show a UTF-8 text held in memory."""
+        self.set_pager(TextPager(data))
+    
+    def set_pager(self, pager: TextPager):
+        """Show the first page of a pager, releasing the previous one."""
+        self.clear()
+        self.pager = pager
+        self.show_page(*pager.page(0))
+    
+    def clear(self):
+        """Remove the text (and unmap its file)."""
+        if self.pager is not None:
+            self.pager.close()
+            self.pager = None
+        self.start = self.end = 0
+        self.editor.clear()
+        self.update_navigation()
+    
+    def show_page(self, start: int, end: int):
+        """Decode and show the bytes [start, end) of the text."""
+        self.start, self.end = start, end
+        self.editor.setPlainText(self.pager.text(start, end))
+        self.update_navigation()
+    
+    def show_previous_page(self):
+        if self.pager is not None:
+            page = self.pager.page_before(self.start)
+            if page is not None:
+                self.show_page(*page)
+    
+    def show_next_page(self):
+        if self.pager is not None:
+            page = self.pager.next_page(self.end)
+            if page is not None:
+                self.show_page(*page)
+    
+    def go_to_offset(self):
+        """Show the page that contains the byte offset typed by the user."""
+        if self.pager is None or not self.offset_input.text():
+            return
+        offset = min(int(self.offset_input.text()), max(self.pager.size - 1, 0))
+        self.show_page(*self.pager.page(offset))
+        
+        # Colocar el cursor en el carácter del byte pedido
+        prefix = self.pager.text(self.start, self.pager.char_start(offset))
+        cursor = self.editor.textCursor()
+        cursor.setPosition(min(len(prefix), len(self.editor.toPlainText())))
+        self.editor.setTextCursor(cursor)
+        self.editor.centerCursor()
+    
+    def update_navigation(self):
+        """Enable the navigation buttons and show the byte range of the page."""
+        size = self.pager.size if self.pager is not None else 0
+        self.btn_previous.setEnabled(self.start > 0)
+        self.btn_next.setEnabled(self.end < size)
+        self.btn_go.setEnabled(size > 0)
+        self.offset_input.setEnabled(size > 0)
+        if size:
+            self.position_label.setText(f"Bytes {self.start:,}-{self.end:,} de {size:,}")
+        else:
+            self.position_label.setText("")
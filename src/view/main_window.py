@@ -5,11 +5,14 @@ Main Window - PyQt5 GUI for LZ78 Compressor
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QPushButton, QLabel, QTextEdit, QFileDialog, 
                              QMessageBox, QGroupBox, QGridLayout, QProgressBar,
-                             QTableWidget, QTableWidgetItem, QTabWidget, QSplitter)
+                             QTableView, QLineEdit, QTabWidget, QSplitter)
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
 from pathlib import Path
 
+from .components.dictionary_table_model import DictionaryTableModel
+from .components.paged_text_viewer import PagedTextViewer
+
 
 class MainWindow(QMainWindow):
     """
@@ -59,6 +62,7 @@ class MainWindow(QMainWindow):
         
         # Status bar
         self.statusBar().showMessage("Listo")
+        self.create_progress_widgets()
         
         # Apply modern styling
         self.apply_styles()
@@ -137,9 +141,8 @@ class MainWindow(QMainWindow):
         original_layout = QVBoxLayout()
         original_group.setLayout(original_layout)
         
-        self.text_original = QTextEdit()
-        self.text_original.setPlaceholderText("Carga un archivo de texto para comprimir...")
-        self.text_original.setReadOnly(True)
+        # Solo se muestra una página del archivo cada vez
+        self.text_original = PagedTextViewer("Carga un archivo de texto para comprimir...")
         original_layout.addWidget(self.text_original)
         
         # Compressed data area
@@ -184,9 +187,7 @@ class MainWindow(QMainWindow):
         decompressed_layout = QVBoxLayout()
         decompressed_group.setLayout(decompressed_layout)
         
-        self.text_decompressed = QTextEdit()
-        self.text_decompressed.setPlaceholderText("Carga un archivo .lz78 para descomprimir...")
-        self.text_decompressed.setReadOnly(True)
+        self.text_decompressed = PagedTextViewer("Carga un archivo .lz78 para descomprimir...")
         decompressed_layout.addWidget(self.text_decompressed)
         
         # Buttons
@@ -215,12 +216,30 @@ class MainWindow(QMainWindow):
         label.setFont(QFont("Arial", 12, QFont.Bold))
         layout.addWidget(label)
         
-        self.dictionary_table = QTableWidget()
-        self.dictionary_table.setColumnCount(2)
-        self.dictionary_table.setHorizontalHeaderLabels(["Cadena", "Índice"])
+        # Filtro incremental de frases
+        filter_layout = QHBoxLayout()
+        self.dictionary_filter = QLineEdit()
+        self.dictionary_filter.setPlaceholderText("Buscar frases que contengan...")
+        self.dictionary_filter.setClearButtonEnabled(True)
+        self.dictionary_count_label = QLabel("0 entradas")
+        filter_layout.addWidget(self.dictionary_filter)
+        filter_layout.addWidget(self.dictionary_count_label)
+        layout.addLayout(filter_layout)
+        
+        # Las filas se leen del diccionario solo al mostrarse
+        self.dictionary_model = DictionaryTableModel(self)
+        self.dictionary_table = QTableView()
+        self.dictionary_table.setModel(self.dictionary_model)
         self.dictionary_table.horizontalHeader().setStretchLastSection(True)
+        self.dictionary_table.horizontalHeader().setSortIndicator(DictionaryTableModel.INDEX_COLUMN, Qt.AscendingOrder)
+        self.dictionary_table.setSortingEnabled(True)
+        self.dictionary_table.verticalHeader().setDefaultSectionSize(22)
         layout.addWidget(self.dictionary_table)
         
+        self.dictionary_filter.textChanged.connect(self.dictionary_model.set_filter)
+        self.dictionary_model.filter_progress.connect(self.update_dictionary_count)
+        self.dictionary_model.modelReset.connect(self.update_dictionary_count)
+        
         return widget
     
     def create_statistics_section(self) -> QGroupBox:
@@ -238,6 +257,8 @@ class MainWindow(QMainWindow):
         self.lbl_huffman_codes = QLabel("0 códigos")
         self.lbl_space_saved = QLabel("0 bytes")
         self.lbl_improvement = QLabel("0%")
+        self.lbl_indices_size = QLabel("0 bytes")
+        self.lbl_literals_size = QLabel("0 bytes")
         
         # Add to layout
         layout.addWidget(QLabel("Tamaño Original:"), 0, 0)
@@ -260,8 +281,26 @@ class MainWindow(QMainWindow):
         layout.addWidget(QLabel("Códigos Huffman:"), 3, 2)
         layout.addWidget(self.lbl_huffman_codes, 3, 3)
         
+        layout.addWidget(QLabel("Índices (tabla + datos):"), 4, 0)
+        layout.addWidget(self.lbl_indices_size, 4, 1)
+        layout.addWidget(QLabel("Literales (tablas + datos):"), 4, 2)
+        layout.addWidget(self.lbl_literals_size, 4, 3)
+        
         return group
     
+    def create_progress_widgets(self):
+        """Create the progress bar and cancel button of background operations."""
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setMaximumWidth(250)
+        self.progress_bar.setVisible(False)
+        
+        self.btn_cancel = QPushButton("Cancelar")
+        self.btn_cancel.setVisible(False)
+        
+        self.statusBar().addPermanentWidget(self.progress_bar)
+        self.statusBar().addPermanentWidget(self.btn_cancel)
+    
     def apply_styles(self):
         """Apply modern styling to the application."""
         self.setStyleSheet("""
@@ -300,14 +339,14 @@ class MainWindow(QMainWindow):
             QPushButton:disabled {
                 background-color: #bdc3c7;
             }
-            QTextEdit {
+            QTextEdit, QPlainTextEdit {
                 border: 1px solid #dcdde1;
                 border-radius: 4px;
                 padding: 5px;
                 background-color: white;
                 font-family: Consolas, Monaco, monospace;
             }
-            QTableWidget {
+            QTableView {
                 border: 1px solid #dcdde1;
                 border-radius: 4px;
                 background-color: white;
@@ -346,12 +385,19 @@ class MainWindow(QMainWindow):
         """)
     
     # UI Update Methods
-    def update_dictionary_display(self, dictionary: dict):
-        """Update dictionary table display."""
-        self.dictionary_table.setRowCount(len(dictionary))
-        for i, (string, index) in enumerate(sorted(dictionary.items(), key=lambda x: x[1])):
-            self.dictionary_table.setItem(i, 0, QTableWidgetItem(string))
-            self.dictionary_table.setItem(i, 1, QTableWidgetItem(str(index)))
+    def update_dictionary_display(self, dictionary):
+        """Update dictionary table display (rows are built when shown)."""
+        self.dictionary_model.set_dictionary(dictionary)
+    
+    def update_dictionary_count(self, matches: int = 0, pending: int = 0):
+        """Show the number of entries, or of matches of the filter."""
+        model = self.dictionary_model
+        if not model.filter_text:
+            self.dictionary_count_label.setText(f"{model.count:,} entradas")
+        elif pending:
+            self.dictionary_count_label.setText(f"{model.rowCount():,} coincidencias (buscando...)")
+        else:
+            self.dictionary_count_label.setText(f"{model.rowCount():,} de {model.count:,} entradas")
     
     def update_statistics(self, stats: dict):
         """Update statistics display with hybrid compression metrics."""
@@ -395,6 +441,32 @@ class MainWindow(QMainWindow):
         
         self.lbl_dictionary_size.setText(f"{stats['dictionary_entries']} entradas")
         self.lbl_huffman_codes.setText(f"{stats['huffman_codes_count']} códigos")
+        
+        # Tamaño de cada parte del archivo .lz78
+        self.lbl_indices_size.setText(
+            f"{format_bytes(stats['index_table_size'])} + {format_bytes(stats['indices_size'])}"
+        )
+        self.lbl_literals_size.setText(
+            f"{format_bytes(stats['literal_table_size'])} + {format_bytes(stats['literals_size'])}"
+        )
+        if stats.get('stored_size'):
+            # Codificar expandía el texto: el bloque se guarda sin comprimir
+            self.lbl_indices_size.setText(f"{format_bytes(stats['stored_size'])} (sin comprimir)")
+            self.lbl_literals_size.setText("-")
+    
+    def show_progress(self, message: str, percent: int):
+        """Show the progress of a background operation in the status bar."""
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setVisible(True)
+        self.btn_cancel.setVisible(True)
+        self.statusBar().showMessage(message)
+    
+    def hide_progress(self):
+        """Hide the progress bar once the operation ends."""
+        self.progress_bar.setVisible(False)
+        self.btn_cancel.setVisible(False)
+        self.btn_cancel.setEnabled(True)
+        self.statusBar().clearMessage()
     
     def show_error(self, title: str, message: str):
         """Show error message dialog."""
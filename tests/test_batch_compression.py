@@ -0,0 +1,250 @@
+"""
+Script de prueba y benchmark para la compresión por lotes de carpetas
+Comprime un árbol de carpetas con varios procesos, comprueba que cada
+archivo se descomprime igual, que los archivos al día se saltan por fecha
+o por SHA-256 y que el resumen JSON recoge las estadísticas de cada uno;
+compara el tiempo con uno y varios procesos
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+
+# Añadir src al path del proyecto
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+import model.lz78_batch as lz78_batch
+from model.lz78_batch import compress_tree, find_files, SUMMARY_FILENAME
+from model.lz78_stream import decompress_file
+
+sample_data_dir = os.path.join(os.path.dirname(__file__), 'sample_data')
+
+SAMPLE_FILES = ("example_code.py", "config_example.json", "example_page.html", "sales_dataset.csv")
+
+
+def make_tree(root):
+    """Árbol con subcarpetas, archivos de varios tipos y un archivo que no es UTF-8"""
+    for i, name in enumerate(SAMPLE_FILES):
+        folder = os.path.join(root, "data", f"sub{i % 2}")
+        os.makedirs(folder, exist_ok=True)
+        shutil.copy(os.path.join(sample_data_dir, name), folder)
+    with open(os.path.join(root, "notes.txt"), 'w', encoding='utf-8') as f:
+        f.write("ñandú 日本語 😀\n" * 200)
+    with open(os.path.join(root, "binary.log"), 'wb') as f:
+        f.write(bytes(range(256)) * 4)
+    with open(os.path.join(root, "image.png"), 'wb') as f:
+        f.write(b'\x89PNG')
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def compress_or_crash(source_path, *args):
+    """Compresión de un archivo que mata al proceso con notes.txt"""
+    if source_path.endswith("notes.txt"):
+        os._exit(1)
+    return original_compress_one(source_path, *args)
+
+
+original_compress_one = lz78_batch._compress_one
+
+
+def test_round_trip():
+    """Cada archivo del árbol se descomprime igual al original; los que no son texto se anotan como errores"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source, target = os.path.join(tmp_dir, "in"), os.path.join(tmp_dir, "out")
+        make_tree(source)
+        summary = compress_tree(source, target, workers=2, max_in_flight_bytes=1 << 16,
+                                max_dictionary_size=4096, dictionary_policy="lru")
+
+        assert sorted(summary['compressed']) == ["data/sub0/example_code.py", "data/sub0/example_page.html",
+                                                 "data/sub1/config_example.json", "notes.txt"]
+        assert list(summary['failed']) == ["binary.log"]
+        for relative in summary['compressed']:
+            decompressed = os.path.join(tmp_dir, "check")
+            decompress_file(os.path.join(target, relative + ".lz78"), decompressed)
+            assert read_bytes(decompressed) == read_bytes(os.path.join(source, relative)), relative
+
+
+def test_globs():
+    """Los patrones glob sustituyen a la lista de extensiones y la carpeta de salida nunca se recorre"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        make_tree(tmp_dir)
+        assert list(find_files(tmp_dir, ["*.csv", "data/sub0/*"])) == [
+            "data/sub0/example_code.py", "data/sub0/example_page.html", "data/sub1/sales_dataset.csv"]
+
+        # Salida dentro de la entrada
+        target = os.path.join(tmp_dir, "out")
+        summary = compress_tree(tmp_dir, target, ["*.txt", "*.json"], workers=1)
+        assert sorted(summary['files']) == ["data/sub1/config_example.json", "notes.txt"]
+        summary = compress_tree(tmp_dir, target, ["*"], workers=1)
+        assert not any(relative.startswith("out/") for relative in summary['files'])
+
+
+def test_skip_up_to_date():
+    """Los archivos al día se saltan por fecha de modificación o, con check_hash, por SHA-256"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source, target = os.path.join(tmp_dir, "in"), os.path.join(tmp_dir, "out")
+        make_tree(source)
+        notes = os.path.join(source, "notes.txt")
+        first = compress_tree(source, target, ["*.txt", "*.py"], workers=1)
+
+        summary = compress_tree(source, target, ["*.txt", "*.py"], workers=1)
+        assert summary['compressed'] == [] and len(summary['skipped']) == 2
+        assert summary['files'] == first['files']
+
+        # Tocado sin cambios: por fecha se recomprime, por SHA-256 no
+        future = time.time() + 100
+        os.utime(notes, (future, future))
+        summary = compress_tree(source, target, ["*.txt", "*.py"], workers=1, check_hash=True)
+        assert summary['compressed'] == []
+        summary = compress_tree(source, target, ["*.txt", "*.py"], workers=1)
+        assert summary['compressed'] == ["notes.txt"]
+
+        # Contenido distinto: con check_hash se recomprime aunque la fecha sea antigua
+        with open(notes, 'a', encoding='utf-8') as f:
+            f.write("más texto\n")
+        os.utime(notes, (0, 0))
+        summary = compress_tree(source, target, ["*.txt", "*.py"], workers=1, check_hash=True)
+        assert summary['compressed'] == ["notes.txt"]
+
+        summary = compress_tree(source, target, ["*.txt", "*.py"], workers=1, force=True)
+        assert len(summary['compressed']) == 2
+
+
+def test_settings_change():
+    """Cambiar la configuración recomprime los archivos, aunque estén al día"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source, target = os.path.join(tmp_dir, "in"), os.path.join(tmp_dir, "out")
+        make_tree(source)
+        first = compress_tree(source, target, ["*.txt", "*.py"], workers=1)
+        assert all(stats['settings'] == first['settings'] for stats in first['files'].values())
+
+        summary = compress_tree(source, target, ["*.txt", "*.py"], workers=1, max_dictionary_size=1024,
+                                dictionary_policy="lru")
+        assert len(summary['compressed']) == 2 and summary['skipped'] == []
+        summary = compress_tree(source, target, ["*.txt", "*.py"], workers=1, max_dictionary_size=1024,
+                                dictionary_policy="lru", check_hash=True)
+        assert summary['compressed'] == [] and len(summary['skipped']) == 2
+        summary = compress_tree(source, target, ["*.txt", "*.py"], workers=1, max_dictionary_size=1024,
+                                dictionary_policy="lru", literal_coding="raw")
+        assert len(summary['compressed']) == 2
+
+        # Sin estadísticas previas (otro resumen) no se sabe con qué se comprimió
+        summary = compress_tree(source, target, ["*.txt", "*.py"], workers=1,
+                                summary_path=os.path.join(tmp_dir, "other.json"))
+        assert len(summary['compressed']) == 2
+
+
+def test_worker_crash():
+    """Un proceso que muere se anota como fallo del archivo y el resumen se escribe igualmente"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source, target = os.path.join(tmp_dir, "in"), os.path.join(tmp_dir, "out")
+        make_tree(source)
+        lz78_batch._compress_one = compress_or_crash
+        try:
+            summary = compress_tree(source, target, ["*.txt", "*.py"], workers=1)
+        finally:
+            lz78_batch._compress_one = original_compress_one
+        # Los archivos pendientes al morir el proceso también fallan, sin parar el lote
+        assert "notes.txt" in summary['failed'] and "notes.txt" not in summary['files']
+        assert sorted(summary['compressed'] + list(summary['failed'])) == ["data/sub0/example_code.py", "notes.txt"]
+        with open(os.path.join(target, SUMMARY_FILENAME), encoding='utf-8') as f:
+            assert json.load(f)['failed'] == summary['failed']
+
+        # Un error que para el lote también deja el resumen escrito
+        original_find_files = lz78_batch.find_files
+
+        def find_then_fail(*args):
+            yield from original_find_files(*args)
+            raise RuntimeError("interrumpido")
+
+        lz78_batch.find_files = find_then_fail
+        try:
+            compress_tree(source, target, ["*.txt", "*.py"], workers=1, force=True)
+            assert False, "Se esperaba RuntimeError"
+        except RuntimeError:
+            pass
+        finally:
+            lz78_batch.find_files = original_find_files
+        with open(os.path.join(target, SUMMARY_FILENAME), encoding='utf-8') as f:
+            saved = json.load(f)
+        assert saved['failed'] == {} and saved['skipped'] == []
+
+        summary = compress_tree(source, target, ["*.txt", "*.py"], workers=1)
+        assert "notes.txt" in summary['compressed']
+
+
+def test_json_summary():
+    """El resumen JSON guarda las estadísticas de get_statistics de cada archivo y los totales"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source, target = os.path.join(tmp_dir, "in"), os.path.join(tmp_dir, "out")
+        make_tree(source)
+        summary_path = os.path.join(tmp_dir, "summary.json")
+        summary = compress_tree(source, target, ["*.py", "*.html"], workers=2, summary_path=summary_path)
+        with open(summary_path, encoding='utf-8') as f:
+            saved = json.load(f)
+        assert saved['files'] == summary['files'] and saved['failed'] == {}
+        assert not os.path.exists(os.path.join(target, SUMMARY_FILENAME))
+
+        for relative, stats in saved['files'].items():
+            assert stats['original_size'] == os.path.getsize(os.path.join(source, relative))
+            assert stats['compressed_size'] == os.path.getsize(os.path.join(target, relative + ".lz78"))
+            for key in ("hybrid_size", "lz78_only_size", "dictionary_entries", "huffman_codes_count", "sha256"):
+                assert key in stats, key
+        totals = saved['totals']
+        assert totals['files'] == 2
+        assert totals['compressed_size'] == sum(stats['compressed_size'] for stats in saved['files'].values())
+
+        try:
+            compress_tree(os.path.join(tmp_dir, "missing"), target)
+            assert False, "Se esperaba FileNotFoundError"
+        except FileNotFoundError:
+            pass
+
+
+def main():
+    print("=" * 100)
+    print("BENCHMARK: COMPRESIÓN POR LOTES DE CARPETAS".center(100))
+    print("=" * 100)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "in")
+        for copy in range(4):
+            folder = os.path.join(source, f"copy{copy}")
+            os.makedirs(folder)
+            for name in SAMPLE_FILES + ("large_code.py", "system_logs.txt"):
+                shutil.copy(os.path.join(sample_data_dir, name), folder)
+
+        print(f"\n{'Ejecución':<36}{'Archivos':>10}{'Original':>14}{'Comprimido':>14}{'Ratio':>10}{'Tiempo':>12}")
+        print("-" * 100)
+        runs = [("1 proceso", 1, False), (f"{os.cpu_count()} procesos", os.cpu_count(), False),
+                ("Segunda ejecución (fecha)", None, False), ("Segunda ejecución (SHA-256)", None, True)]
+        for index, (name, workers, check_hash) in enumerate(runs):
+            target = os.path.join(tmp_dir, "out1" if index == 0 else "out")
+            start = time.perf_counter()
+            summary = compress_tree(source, target, ["*"], workers=workers, check_hash=check_hash)
+            totals = summary['totals']
+            print(f"{name:<36}{len(summary['compressed']):>10}{totals['original_size']:>14,}"
+                  f"{totals['compressed_size']:>14,}{totals['compression_ratio']:>9.2f}%"
+                  f"{time.perf_counter() - start:>10.2f}s")
+
+    print()
+    for test in (test_round_trip, test_globs, test_skip_up_to_date, test_settings_change, test_worker_crash,
+                 test_json_summary):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 100)
+    print("BENCHMARK COMPLETADO".center(100))
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Script de prueba y benchmark para la línea de comandos
+Ejecuta python -m src.cli como lo haría una tarea programada: comprime,
+descomprime, describe y comprueba archivos .lz78 sin importar PyQt5;
+mide el tiempo de arranque de cada orden
+"""
+
+import sys
+import os
+import time
+import tempfile
+import subprocess
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sample_data_dir = os.path.join(project_root, 'tests', 'sample_data')
+
+
+def run_cli(*args):
+    """Ejecutar la línea de comandos desde la raíz del proyecto"""
+    return subprocess.run([sys.executable, "-m", "src.cli", *args], cwd=project_root,
+                          capture_output=True, text=True, encoding='utf-8')
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_does_not_import_qt():
+    """La línea de comandos no importa PyQt5 ni la vista o el controlador"""
+    code = ("import sys, src.cli; "
+            "print(sorted(m for m in sys.modules if m.split('.')[0] == 'PyQt5' "
+            "or m.startswith(('src.view', 'src.controller'))))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]", result.stdout
+
+
+def test_round_trip():
+    """compress y decompress devuelven el archivo original, por flujo y en paralelo"""
+    source = os.path.join(sample_data_dir, "large_code.py")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for options in ([], ["--workers", "2", "--block-chars", "10000"], ["--entropy-coder", "range"]):
+            compressed = os.path.join(tmp_dir, "large_code.lz78")
+            result = run_cli("compress", source, "-o", compressed, "--force", *options)
+            assert result.returncode == 0, result.stderr
+
+            target = os.path.join(tmp_dir, "large_code.py")
+            result = run_cli("decompress", compressed, "--force", "--workers", "2")
+            assert result.returncode == 0, result.stderr
+            assert read_bytes(target) == read_bytes(source), options
+
+        # Sin --force no se sobrescribe nada
+        result = run_cli("compress", source, "-o", compressed)
+        assert result.returncode == 1 and "--force" in result.stderr
+
+
+def test_decompress_untrusted_name():
+    """decompress sin -o solo usa el último componente del nombre guardado en el encabezado"""
+    source = os.path.join(sample_data_dir, "example_code.py")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        folder = os.path.join(tmp_dir, "in")
+        os.makedirs(folder)
+        compressed = os.path.join(folder, "example.lz78")
+        assert run_cli("compress", source, "-o", compressed).returncode == 0
+        data = read_bytes(compressed)
+
+        # Mismo largo que "example_code.py": solo cambia el nombre del encabezado
+        for name, expected in ((b"../../escaped.p", "escaped.p"), (b"/tmp/abs/name.p", "name.p"),
+                               (b"..\\..\\windows.p", "windows.p"), (b"../..//../../..", None)):
+            with open(compressed, 'wb') as f:
+                f.write(data.replace(b"example_code.py", name, 1))
+            result = run_cli("decompress", compressed, "--force")
+            if expected is None:
+                assert result.returncode == 1 and "-o" in result.stderr, name
+            else:
+                assert result.returncode == 0, result.stderr
+                assert read_bytes(os.path.join(folder, expected)) == read_bytes(source), name
+        assert sorted(os.listdir(tmp_dir)) == ["in"]
+
+
+def test_info_and_test():
+    """info describe el archivo y test detecta archivos dañados con código de salida 1"""
+    source = os.path.join(sample_data_dir, "example_code.py")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        compressed = os.path.join(tmp_dir, "example.lz78")
+        assert run_cli("compress", source, "-o", compressed, "--workers", "1",
+                       "--block-chars", "2000").returncode == 0
+
+        result = run_cli("info", compressed)
+        assert result.returncode == 0, result.stderr
+        assert "example_code.py" in result.stdout and "independientes" in result.stdout
+
+        damaged = os.path.join(tmp_dir, "damaged.lz78")
+        with open(damaged, 'wb') as f:
+            f.write(read_bytes(compressed)[:-40])
+        result = run_cli("test", compressed, damaged)
+        assert result.returncode == 1
+        assert f"OK: {compressed}" in result.stdout and f"ERROR: {damaged}" in result.stderr
+
+        # Un carácter cambiado decodifica sin errores: solo el CRC-32 lo detecta
+        for options in ([], ["--workers", "1", "--block-chars", "2000"]):
+            assert run_cli("compress", source, "-o", compressed, "--force", "--literal-coding", "raw",
+                           *options).returncode == 0
+            data = bytearray(read_bytes(compressed))
+            # Literales sin codificar (longitud 1 + carácter ASCII) al final del primer bloque
+            position = data.index(b"\x01", len(data) // 3)
+            while not (data[position] == 1 and 0x41 <= data[position + 1] <= 0x7A):
+                position += 1
+            data[position + 1] ^= 0x20
+            with open(damaged, 'wb') as f:
+                f.write(data)
+            result = run_cli("test", damaged)
+            assert result.returncode == 1 and "CRC-32" in result.stderr, result.stderr
+            result = run_cli("decompress", damaged, "-o", os.path.join(tmp_dir, "out.txt"), "--force", "--workers", "2")
+            assert result.returncode == 1 and "CRC-32" in result.stderr, result.stderr
+
+        result = run_cli("info", os.path.join(tmp_dir, "missing.lz78"))
+        assert result.returncode == 1 and result.stderr.startswith("Error:")
+
+
+def test_batch():
+    """batch comprime una carpeta, salta los archivos al día y escribe el resumen JSON"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        target = os.path.join(tmp_dir, "out")
+        result = run_cli("batch", sample_data_dir, target, "--include", "*.py", "--workers", "2")
+        assert result.returncode == 0, result.stderr
+        assert "2 comprimidos, 0 al día" in result.stdout
+        assert os.path.isfile(os.path.join(target, "large_code.py.lz78"))
+        assert os.path.isfile(os.path.join(target, "lz78_summary.json"))
+
+        result = run_cli("batch", sample_data_dir, target, "--include", "*.py", "--hash")
+        assert result.returncode == 0 and "0 comprimidos, 2 al día" in result.stdout
+
+
+def main():
+    print("=" * 100)
+    print("BENCHMARK: LÍNEA DE COMANDOS".center(100))
+    print("=" * 100)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        compressed = os.path.join(tmp_dir, "example.lz78")
+        source = os.path.join(sample_data_dir, "example_code.py")
+        commands = [
+            ("python -c pass", [sys.executable, "-c", "pass"]),
+            ("--help", [sys.executable, "-m", "src.cli", "--help"]),
+            ("compress", [sys.executable, "-m", "src.cli", "compress", source, "-o", compressed, "--force"]),
+            ("info", [sys.executable, "-m", "src.cli", "info", compressed]),
+            ("test", [sys.executable, "-m", "src.cli", "test", compressed]),
+        ]
+        print(f"\n{'Orden (example_code.py)':<30}{'Tiempo':>12}")
+        print("-" * 100)
+        for name, command in commands:
+            start = time.perf_counter()
+            subprocess.run(command, cwd=project_root, capture_output=True, check=True)
+            print(f"{name:<30}{(time.perf_counter() - start) * 1000:>10.0f}ms")
+
+    print()
+    for test in (test_does_not_import_qt, test_round_trip, test_decompress_untrusted_name, test_info_and_test,
+                 test_batch):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 100)
+    print("BENCHMARK COMPLETADO".center(100))
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    main()
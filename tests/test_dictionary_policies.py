@@ -0,0 +1,127 @@
+"""
+Script de prueba para el límite de tamaño del diccionario LZ78
+Verifica las políticas freeze / reset / lru y que se guarden en el encabezado .lz78
+"""
+
+import sys
+import os
+import tempfile
+
+# Añadir src al path del proyecto
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from model.lz78_compressor import LZ78Compressor, DICTIONARY_POLICIES
+from model.lz78_huffman_compressor import LZ78HuffmanCompressor
+from model.file_handler_binary_huffman import FileHandlerBinaryHuffman
+
+sample_data_dir = os.path.join(os.path.dirname(__file__), 'sample_data')
+SAMPLE_FILE = os.path.join(sample_data_dir, "large_code.py")
+MAX_SIZES = [1, 2, 64, 4096]
+
+
+def read_sample():
+    """Leer el archivo de muestra"""
+    with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_unbounded_matches_reference():
+    """Sin límite, el diccionario crece igual que el LZ78 clásico"""
+    text = "abababababcabcabcd" * 20
+    compressed_data, dictionary = LZ78Compressor().compress(text)
+
+    # Referencia: LZ78 con diccionario de cadenas
+    reference = {}
+    expected = []
+    current = ""
+    for char in text:
+        if current + char in reference:
+            current += char
+        else:
+            reference[current + char] = len(reference) + 1
+            expected.append((reference.get(current, 0), char))
+            current = ""
+    if current:
+        expected.append((reference.get(current[:-1], 0), current[-1]))
+
+    assert compressed_data == expected
+    assert dict(dictionary) == reference
+
+
+def test_policies_round_trip():
+    """Cada política respeta el límite y la descompresión es exacta"""
+    text = read_sample()
+    for policy in DICTIONARY_POLICIES:
+        for max_size in MAX_SIZES:
+            compressor = LZ78Compressor(max_size, policy)
+            compressed_data, dictionary = compressor.compress(text)
+            assert len(dictionary) <= max_size, (policy, max_size)
+            assert compressor.decompress(compressed_data, {}) == text, (policy, max_size)
+            rebuilt = compressor.rebuild_dictionary(compressed_data)
+            assert dict(rebuilt) == dict(dictionary), (policy, max_size)
+
+
+def test_policy_stored_in_header():
+    """La política y el límite se guardan en el archivo y se reproducen al cargar"""
+    text = read_sample()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for policy in DICTIONARY_POLICIES:
+            compressor = LZ78HuffmanCompressor(512, policy)
+            result = compressor.compress(text)
+            path = os.path.join(tmp_dir, f"{policy}.lz78")
+            FileHandlerBinaryHuffman.save_compressed_file(path, *result, "large_code.py", 512, policy)
+
+            header = FileHandlerBinaryHuffman.read_header(path)
+            assert header['dictionary_policy'] == policy
+            assert header['max_dictionary_size'] == 512
+
+            loaded = FileHandlerBinaryHuffman.load_compressed_file(path)
+            decompressor = LZ78HuffmanCompressor(header['max_dictionary_size'], header['dictionary_policy'])
+            assert decompressor.decompress(*loaded[:4]) == text
+
+
+def test_phrases_on_demand():
+    """phrases() construye solo las frases pedidas, iguales a las del diccionario completo"""
+    text = read_sample()
+    for policy in DICTIONARY_POLICIES:
+        for max_size in MAX_SIZES + [None]:
+            _, dictionary = LZ78Compressor(max_size, policy).compress(text)
+            by_index = {index: phrase for phrase, index in dictionary.items()}
+            indices = list(range(1, len(dictionary) + 1))
+            assert dict(dictionary.phrases(indices)) == by_index, (policy, max_size)
+            # En cualquier orden y de una en una
+            for index in reversed(indices[-50:]):
+                assert next(dictionary.phrases((index,))) == (index, by_index[index])
+
+
+def main():
+    print("=" * 70)
+    print("PRUEBA DE POLÍTICAS DE DICCIONARIO LZ78".center(70))
+    print("=" * 70)
+
+    text = read_sample()
+    print(f"\nArchivo: {os.path.basename(SAMPLE_FILE)} ({len(text):,} caracteres)")
+    print("-" * 70)
+    print(f"{'Política':<10}{'Límite':>10}{'Tuplas':>12}{'Diccionario':>14}  Descompresión")
+
+    for policy in DICTIONARY_POLICIES:
+        for max_size in MAX_SIZES:
+            compressor = LZ78Compressor(max_size, policy)
+            compressed_data, dictionary = compressor.compress(text)
+            ok = compressor.decompress(compressed_data, {}) == text
+            print(f"{policy:<10}{max_size:>10,}{len(compressed_data):>12,}{len(dictionary):>14,}  "
+                  f"{'EXACTA' if ok else 'ERROR'}")
+
+    for test in (test_unbounded_matches_reference, test_policies_round_trip, test_policy_stored_in_header,
+                 test_phrases_on_demand):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 70)
+    print("PRUEBAS COMPLETADAS".center(70))
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Script de prueba y benchmark para los codificadores de entropía
+Compara Huffman estático (dos pasadas, tablas en cada bloque) con los
+codificadores adaptativos (una pasada, sin tablas): rango y Huffman adaptativo
+"""
+
+import sys
+import io
+import os
+import time
+import random
+import tempfile
+from itertools import product
+
+# Añadir src al path del proyecto
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from model.lz78_huffman_compressor import LZ78HuffmanCompressor
+from model.file_handler_binary_huffman import FileHandlerBinaryHuffman
+from model.adaptive_huffman import AdaptiveHuffmanTree
+from model.range_coder import FrequencyModel
+from model.entropy_coding import (AdaptiveEncoder, AdaptiveDecoder, adaptive_coder, ESCAPE, ENTROPY_CODERS, ENTROPY_CODER_HUFFMAN,
+                                  ENTROPY_CODER_RANGE, ENTROPY_CODER_ADAPTIVE_HUFFMAN)
+from model.index_coding import INDEX_CODING_SYMBOL, INDEX_CODING_PHASED
+from model.literal_coding import LITERAL_CODINGS, LITERAL_CODING_CONTEXT
+from model.lz78_stream import compress_file, decompress_file
+
+sample_data_dir = os.path.join(os.path.dirname(__file__), 'sample_data')
+ADAPTIVE_CODERS = [coder for coder in ENTROPY_CODERS if coder != ENTROPY_CODER_HUFFMAN]
+SAMPLE_FILES = ["config_example.json", "example_code.py", "example_page.html", "large_code.py",
+                "test_very_large_data.txt", "system_logs.txt", "sales_dataset.csv"]
+BLOCK_SIZES = (1024, 8192, 65536)
+
+
+def read_sample(name):
+    """Leer un archivo de muestra sin traducir los saltos de línea"""
+    with open(os.path.join(sample_data_dir, name), 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def test_adaptive_coders_round_trip():
+    """Los codificadores adaptativos decodifican exactamente símbolos, valores uniformes y bits"""
+    rng = random.Random(13)
+    for trial in range(20):
+        encoder_class, decoder_class = adaptive_coder(ADAPTIVE_CODERS[trial % len(ADAPTIVE_CODERS)])
+        operations = []
+        for _ in range(rng.randint(0, 3000)):
+            kind = rng.choice(('model', 'model', 'uniform', 'bits'))
+            if kind == 'model':
+                # Distribución muy sesgada: fuerza acarreos y reescalados
+                operations.append((kind, rng.randint(0, 2), min(int(rng.expovariate(0.3)), 200)))
+            elif kind == 'uniform':
+                count = rng.choice((1, 2, 3, 1000, 65536, 65537, 2 ** 32))
+                operations.append((kind, count, rng.randrange(count)))
+            else:
+                bits = rng.randint(0, 40)
+                operations.append((kind, bits, rng.getrandbits(bits)))
+
+        encoder = encoder_class()
+        models = [encoder.new_model() for _ in range(3)]
+        for kind, parameter, value in operations:
+            if kind == 'model':
+                if not encoder.encode(models[parameter], value):
+                    encoder.encode_bits(value, 8)
+                    models[parameter].add(value)
+            elif kind == 'uniform':
+                encoder.encode_uniform(value, parameter)
+            else:
+                encoder.encode_bits(value, parameter)
+        data = encoder.finish()
+
+        decoder = decoder_class(io.BytesIO(data).read)
+        models = [decoder.new_model() for _ in range(3)]
+        for kind, parameter, value in operations:
+            if kind == 'model':
+                symbol = decoder.decode(models[parameter])
+                if symbol is ESCAPE:
+                    symbol = decoder.decode_bits(8)
+                    models[parameter].add(symbol)
+            elif kind == 'uniform':
+                symbol = decoder.decode_uniform(parameter)
+            else:
+                symbol = decoder.decode_bits(parameter)
+            assert symbol == value, (kind, parameter)
+
+
+def test_adaptive_huffman_tree():
+    """El árbol de Huffman adaptativo conserva la propiedad de hermanos y sus pesos"""
+    rng = random.Random(14)
+    tree = AdaptiveHuffmanTree()
+    counts = {}
+    for step in range(5000):
+        symbol = min(int(rng.expovariate(0.05)), 500)
+        leaf = tree.leaves.get(symbol)
+        if leaf is None:
+            tree.add(symbol)
+        else:
+            tree.update(leaf)
+        counts[symbol] = counts.get(symbol, 0) + 1
+        if step % 250:
+            continue
+
+        weights = [tree.weights[node] for node in tree.order]
+        assert weights == sorted(weights, reverse=True)
+        for node, left in enumerate(tree.lefts):
+            if left != -1:
+                right = tree.rights[node]
+                assert tree.weights[node] == tree.weights[left] + tree.weights[right]
+                assert abs(tree.positions[left] - tree.positions[right]) == 1
+        assert {symbol: tree.weights[leaf] for symbol, leaf in tree.leaves.items()} == counts
+
+
+def test_frequency_model():
+    """El árbol de Fenwick del modelo de frecuencias da las mismas sumas acumuladas que la tabla"""
+    rng = random.Random(15)
+    model = FrequencyModel()
+    for step in range(20000):
+        if len(model.symbols) < 2 or rng.random() < 0.05:
+            model.add(step)
+        else:
+            model.update(rng.randrange(len(model.symbols)))
+        if step % 500 == 0:
+            frequencies = model.frequencies
+            assert model.total == sum(frequencies)
+            for slot in range(len(frequencies)):
+                assert model.start(slot) == sum(frequencies[:slot])
+            for target in range(0, model.total, 7):
+                slot = model.find(target)
+                assert model.start(slot) <= target < model.start(slot) + frequencies[slot]
+
+    # Las interfaces son abstractas: una clase incompleta no se puede instanciar
+    for interface in (AdaptiveEncoder, AdaptiveDecoder):
+        try:
+            type("Incomplete", (interface,), {"new_model": lambda self: None})()
+            assert False, "Se esperaba TypeError"
+        except TypeError:
+            pass
+
+
+def test_files_round_trip():
+    """Los archivos .lz78 de los codificadores adaptativos se descomprimen exactamente"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for entropy_coder, name in product(ADAPTIVE_CODERS, ("large_code.py", "example_page.html")):
+            text = read_sample(name)
+            for index_coding in (INDEX_CODING_SYMBOL, INDEX_CODING_PHASED):
+                for literal_coding in LITERAL_CODINGS:
+                    for max_size, policy in [(None, 'freeze'), (128, 'reset'), (128, 'lru')]:
+                        path = os.path.join(tmp_dir, "adaptive.lz78")
+                        compressor = LZ78HuffmanCompressor(max_size, policy, index_coding, literal_coding,
+                                                           entropy_coder)
+                        result = compressor.compress(text)
+                        FileHandlerBinaryHuffman.save_compressed_file(path, *result, name, max_size, policy,
+                                                                      index_coding, literal_coding,
+                                                                      entropy_coder)
+                        stats = compressor.get_statistics(text, name, *result)
+                        assert os.path.getsize(path) == stats['hybrid_size']
+                        assert FileHandlerBinaryHuffman.read_header(path)['entropy_coder'] == entropy_coder
+
+                        loaded = FileHandlerBinaryHuffman.load_compressed_file(path)
+                        assert loaded[0] == result[0], (entropy_coder, name, index_coding, literal_coding, policy)
+
+                        # Varios bloques: cada uno empieza con los modelos vacíos
+                        compress_file(os.path.join(sample_data_dir, name), path, max_size, policy,
+                                      block_pairs=300, index_coding=index_coding,
+                                      literal_coding=literal_coding, entropy_coder=entropy_coder)
+                        target = os.path.join(tmp_dir, name)
+                        decompress_file(path, target)
+                        with open(target, 'r', encoding='utf-8', newline='') as f:
+                            assert f.read() == text, (entropy_coder, name, index_coding, literal_coding, policy)
+
+    # La codificación de índices como texto solo existe con Huffman
+    try:
+        LZ78HuffmanCompressor(index_coding='text', entropy_coder=ENTROPY_CODER_RANGE)
+        assert False, "Se esperaba ValueError"
+    except ValueError:
+        pass
+
+
+def test_statistics_components():
+    """get_statistics informa el tamaño de cada parte con los codificadores adaptativos"""
+    text = read_sample("example_code.py")
+    sizes = {}
+    for entropy_coder in ENTROPY_CODERS:
+        compressor = LZ78HuffmanCompressor(literal_coding=LITERAL_CODING_CONTEXT, entropy_coder=entropy_coder)
+        result = compressor.compress(text)
+        stats = compressor.get_statistics(text, "example_code.py", *result)
+        parts = ('header_size', 'index_table_size', 'indices_size', 'literal_table_size', 'literals_size')
+        assert sum(stats[part] for part in parts) == stats['hybrid_size']
+        sizes[entropy_coder] = stats
+
+    # Sin tablas de códigos
+    for entropy_coder in ADAPTIVE_CODERS:
+        assert sizes[entropy_coder]['index_table_size'] == 0
+    assert sizes[ENTROPY_CODER_RANGE]['hybrid_size'] < sizes[ENTROPY_CODER_HUFFMAN]['hybrid_size']
+
+
+def main():
+    print("=" * 115)
+    print("BENCHMARK: CODIFICADORES DE ENTROPÍA (Huffman estático vs adaptativos)".center(115))
+    print("=" * 115)
+    print(f"\n{'Archivo':<26}{'Original':>11}{'Codificador':>18}{'Archivo .lz78':>15}{'Índices':>11}"
+          f"{'Literales':>11}{'Comprimir':>10}{'Descomprimir':>13}")
+    print("-" * 115)
+
+    totals = {entropy_coder: [0, 0.0, 0.0] for entropy_coder in ENTROPY_CODERS}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in SAMPLE_FILES:
+            if not os.path.exists(os.path.join(sample_data_dir, name)):
+                continue
+            text = read_sample(name)
+            for entropy_coder in ENTROPY_CODERS:
+                path = os.path.join(tmp_dir, name + ".lz78")
+                compressor = LZ78HuffmanCompressor(65536, 'lru', literal_coding=LITERAL_CODING_CONTEXT,
+                                                   entropy_coder=entropy_coder)
+                start = time.perf_counter()
+                result = compressor.compress(text)
+                FileHandlerBinaryHuffman.save_compressed_file(path, *result, name, 65536, 'lru',
+                                                              literal_coding=LITERAL_CODING_CONTEXT,
+                                                              entropy_coder=entropy_coder)
+                compress_time = time.perf_counter() - start
+                start = time.perf_counter()
+                decompress_file(path, os.path.join(tmp_dir, name))
+                decompress_time = time.perf_counter() - start
+                stats = compressor.get_statistics(text, name, *result)
+
+                label = name if entropy_coder == ENTROPY_CODER_HUFFMAN else ""
+                original = f"{stats['original_size']:,}" if entropy_coder == ENTROPY_CODER_HUFFMAN else ""
+                print(f"{label:<26}{original:>11}{entropy_coder:>18}{stats['hybrid_size']:>15,}"
+                      f"{stats['index_table_size'] + stats['indices_size']:>11,}"
+                      f"{stats['literal_table_size'] + stats['literals_size']:>11,}"
+                      f"{compress_time:>9.3f}s{decompress_time:>12.3f}s")
+                total = totals[entropy_coder]
+                total[0] += stats['hybrid_size']
+                total[1] += compress_time
+                total[2] += decompress_time
+
+    print("-" * 115)
+    for entropy_coder, (size, compress_time, decompress_time) in totals.items():
+        print(f"{'TOTAL':<26}{'':>11}{entropy_coder:>18}{size:>15,}{'':>22}"
+              f"{compress_time:>9.3f}s{decompress_time:>12.3f}s")
+    huffman_total = totals[ENTROPY_CODER_HUFFMAN]
+    print()
+    for entropy_coder in ADAPTIVE_CODERS:
+        total = totals[entropy_coder]
+        print(f"Archivo .lz78 con {entropy_coder}: {(1 - total[0] / huffman_total[0]) * 100:.1f}% más pequeño, "
+              f"descompresión {total[2] / huffman_total[2]:.1f}x más lenta")
+
+    # Bloques pequeños (baja latencia en tuberías): las tablas de Huffman
+    # estático se repiten en cada bloque, los modelos adaptativos no tienen tablas
+    name = "system_logs.txt"
+    if os.path.exists(os.path.join(sample_data_dir, name)):
+        print(f"\n{name} por bloques (tamaño del archivo .lz78):")
+        print(f"{'Codificador':<18}" + "".join(f"{f'{pairs} pares':>16}" for pairs in BLOCK_SIZES))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, name + ".lz78")
+            for entropy_coder in ENTROPY_CODERS:
+                sizes = [compress_file(os.path.join(sample_data_dir, name), path, 65536, 'lru',
+                                       block_pairs=pairs, literal_coding=LITERAL_CODING_CONTEXT,
+                                       entropy_coder=entropy_coder)['compressed_size']
+                         for pairs in BLOCK_SIZES]
+                print(f"{entropy_coder:<18}" + "".join(f"{size:>16,}" for size in sizes))
+
+    for test in (test_adaptive_coders_round_trip, test_adaptive_huffman_tree, test_frequency_model,
+                 test_files_round_trip, test_statistics_components):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 115)
+    print("BENCHMARK COMPLETADO".center(115))
+    print("=" * 115)
+
+
+if __name__ == "__main__":
+    main()
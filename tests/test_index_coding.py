@@ -0,0 +1,342 @@
+"""
+Script de prueba y benchmark para la codificación de índices LZ78
+Compara Huffman sobre el texto decimal de los índices (formato v2),
+Huffman sobre símbolos de cubeta + bits extra y códigos binarios por
+fases según el tamaño del diccionario
+"""
+
+import sys
+import os
+import time
+import math
+import random
+import tempfile
+from collections import Counter
+
+# Añadir src al path del proyecto
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from model.lz78_compressor import LZ78Compressor, PhraseTrie
+from model.lz78_huffman_compressor import LZ78HuffmanCompressor
+from model.file_handler_binary_huffman import FileHandlerBinaryHuffman
+from model.index_coding import (encode_indices, decode_indices, index_to_symbol, symbol_base,
+                                phased_parameters, IndexDecoder, LiveDictionarySize, INDEX_CODINGS,
+                                INDEX_CODING_TEXT, INDEX_CODING_SYMBOL, INDEX_CODING_PHASED)
+from model.lz78_stream import compress_file, decompress_file
+from model.Huffman import (Encode, EncodeBits, Decode, TableDecode, DecodeTable, CanonicalCodes, CodeLengths,
+                           LengthLimitLoss, BitWriter, BitReader)
+
+sample_data_dir = os.path.join(os.path.dirname(__file__), 'sample_data')
+SAMPLE_FILES = ["config_example.json", "example_code.py", "example_page.html", "large_code.py",
+                "test_very_large_data.txt", "system_logs.txt", "sales_dataset.csv"]
+
+
+def read_sample(name):
+    """Leer un archivo de muestra sin traducir los saltos de línea"""
+    with open(os.path.join(sample_data_dir, name), 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def test_bit_writer_reader():
+    """Los bits empaquetados se leen igual que se escribieron"""
+    rng = random.Random(78)
+    for _ in range(200):
+        items = [(rng.getrandbits(length), length) for length in
+                 (rng.randint(0, 40) for _ in range(rng.randint(0, 60)))]
+        writer = BitWriter()
+        for value, length in items:
+            writer.Write(value, length)
+        assert len(writer) == sum(length for _, length in items)
+        assert len(writer.ToBytes()) == (len(writer) + 7) // 8
+
+        reader = BitReader.FromWriter(writer)
+        assert all(reader.Read(length) == value for value, length in items)
+        assert reader.Remaining() == 0
+
+        # Concatenar flujos que no terminan en un límite de byte
+        prefix = rng.randint(0, 12)
+        joined = BitWriter()
+        joined.Write(rng.getrandbits(prefix), prefix)
+        joined.WriteBytes(writer.ToBytes(), len(writer))
+        reader = BitReader.FromWriter(joined)
+        reader.Skip(prefix)
+        assert list(reader.IterBits()) == list(BitReader.FromWriter(writer).IterBits())
+
+    text = "abracadabra " * 100
+    freq, tree, codes = Encode(text)
+    assert Decode(EncodeBits(text, codes), codes) == text
+    assert Decode(''.join(codes[char] for char in text), codes) == text
+
+
+def test_table_decoder():
+    """El decodificador por tablas produce lo mismo que el decodificador bit a bit"""
+    # Frecuencias de Fibonacci: códigos más largos que la tabla primaria
+    text = ''.join(chr(65 + i) * count for i, count in
+                   enumerate([1, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233, 377, 610, 987]))
+    text = ''.join(random.Random(8).sample(text, len(text)))
+    for sample in (text, read_sample("example_code.py"), "aaaa"):
+        freq, tree, codes = Encode(sample)
+        bits = EncodeBits(sample, codes)
+        for primary_bits in (1, 4, 12):
+            assert TableDecode(bits, codes, primary_bits) == Decode(bits, codes) == sample
+
+
+def test_table_decoder_long_codes():
+    """Códigos de hasta 80 bits se decodifican por subtablas pequeñas, igual que bit a bit"""
+    # Código completo con longitudes 1, 2, ..., 80 (como el de unas frecuencias de Fibonacci)
+    codes = {chr(48 + i): '1' * i + '0' for i in range(80)}
+    codes[chr(128)] = '1' * 80
+    message = ''.join(random.Random(3).choice("017Q\x7f\x80") for _ in range(500))
+    bits = EncodeBits(message, codes)
+    for primary_bits in (1, 4, 12):
+        table = DecodeTable(codes, primary_bits)
+        assert TableDecode(bits, codes, primary_bits) == Decode(bits, codes) == message
+        sizes = []
+        pending = [table.primary]
+        while pending:
+            entries = pending.pop()
+            sizes.append(len(entries))
+            pending.extend(entry[2][1] for entry in entries if entry is not None and entry[2] is not None)
+        assert max(sizes[1:]) <= 256, primary_bits
+
+
+def test_canonical_codes():
+    """Los códigos canónicos se reconstruyen solo a partir de sus longitudes"""
+    for sample in (read_sample("example_code.py"), "abracadabra", "a"):
+        _, _, codes = Encode(sample)
+        _, _, canonical = Encode(sample, canonical=True)
+        assert CodeLengths(canonical) == CodeLengths(codes)
+        assert CanonicalCodes(CodeLengths(canonical)) == canonical
+        assert Decode(EncodeBits(sample, canonical), canonical) == sample
+
+    # La tabla de códigos del formato v5 es más pequeña que la del v4
+    compressed_data, _ = LZ78Compressor().compress(read_sample("example_code.py"))
+    indices = [index for index, _ in compressed_data]
+    for index_coding in (INDEX_CODING_TEXT, INDEX_CODING_SYMBOL):
+        codes, _ = encode_indices(indices, index_coding)
+        if index_coding == INDEX_CODING_TEXT:
+            # v4: longitud y símbolo en UTF-8, longitud y código como texto '0'/'1'
+            v4_size = 4 + sum(4 + len(symbol.encode('utf-8')) + len(code) for symbol, code in codes.items())
+        else:
+            # v4: símbolo, longitud y código empaquetado
+            v4_size = 4 + sum(2 + (len(code) + 7) // 8 for code in codes.values())
+        assert FileHandlerBinaryHuffman._codes_size(codes, index_coding) < v4_size
+
+
+def test_length_limited_codes():
+    """Los códigos limitados no superan la longitud máxima y pierden muy poco"""
+    # Frecuencias de Fibonacci: el árbol de Huffman sin límite tiene 23 niveles
+    counts = [1, 1]
+    while len(counts) < 24:
+        counts.append(counts[-1] + counts[-2])
+    text = ''.join(chr(65 + i) * count for i, count in enumerate(counts))
+    _, _, unlimited = Encode(text)
+    assert max(CodeLengths(unlimited).values()) == 23
+
+    for max_length in (6, 10, 15):
+        freq, tree, codes = Encode(text, maxLength=max_length)
+        assert max(CodeLengths(codes).values()) == max_length
+        assert sum(2 ** -length for length in CodeLengths(codes).values()) == 1
+        assert Decode(EncodeBits(text, codes), codes) == text
+        extra_bits, loss = LengthLimitLoss(freq, codes)
+        assert extra_bits > 0 and loss < 20
+    assert LengthLimitLoss(freq, unlimited) == (0, 0.0)
+
+    # Con un límite holgado los códigos no cambian
+    _, _, codes = Encode(text, maxLength=23)
+    assert codes == unlimited
+
+
+def test_bucket_symbols():
+    """Cada índice se recupera a partir de su símbolo y sus bits extra"""
+    for index in list(range(5000)) + [2 ** 20 - 1, 2 ** 20, 2 ** 32 - 1]:
+        symbol, extra_bits, extra_value = index_to_symbol(index)
+        base, base_extra_bits = symbol_base(symbol)
+        assert base_extra_bits == extra_bits
+        assert base + extra_value == index
+        assert extra_value < (1 << extra_bits) or extra_bits == 0
+
+
+def test_indices_round_trip():
+    """Todas las codificaciones decodifican exactamente los índices"""
+    compressed_data, _ = LZ78Compressor().compress(read_sample("large_code.py"))
+    indices = [index for index, _ in compressed_data]
+    for index_coding in INDEX_CODINGS:
+        codes, bits = encode_indices(indices, index_coding)
+        assert decode_indices(bits, codes, index_coding, count=len(indices)) == indices, index_coding
+        if index_coding != INDEX_CODING_PHASED:
+            codes, bits = encode_indices([7], index_coding)
+            assert decode_indices(bits, codes, index_coding) == [7], index_coding
+
+        # Bits entregados en trozos de tamaño arbitrario
+        codes, bits = encode_indices(indices, index_coding)
+        data = bits.ToBytes()
+        rng = random.Random(len(indices))
+        decoder = IndexDecoder(codes, index_coding, count=len(indices))
+        decoded = []
+        position = 0
+        while position < len(bits):
+            size = min(rng.randint(1, 200), len(bits) - position)
+            reader = BitReader(data, position + size)
+            reader.Skip(position)
+            decoded.extend(decoder.decode(reader))
+            position += size
+        decoded.extend(decoder.finish())
+        assert decoded == indices, index_coding
+
+
+def test_phased_codes():
+    """Los códigos por fases siguen el tamaño del diccionario con todas las políticas"""
+    # Código binario truncado: 5 valores -> 0, 1, 2 en 2 bits; 3, 4 en 3 bits
+    assert phased_parameters(5) == (2, 3)
+    assert phased_parameters(8) == (3, 8)
+    assert phased_parameters(1) == (0, 1)
+
+    text = read_sample("large_code.py")
+    for max_size, policy in [(None, 'freeze'), (100, 'freeze'), (100, 'reset'), (100, 'lru'), (1, 'reset')]:
+        compressed_data, _ = LZ78Compressor(max_size, policy).compress(text)
+        indices = [index for index, _ in compressed_data]
+
+        # El tamaño calculado coincide con el del diccionario reconstruido
+        trie = PhraseTrie(max_size, policy, track_children=False)
+        live_size = LiveDictionarySize(max_size, policy)
+        for index, char in compressed_data:
+            assert live_size.size == trie.size
+            trie.add(index, char)
+            live_size.advance()
+
+        # Varios bloques comparten el tamaño del diccionario
+        live_size = LiveDictionarySize(max_size, policy)
+        blocks = [encode_indices(indices[start:start + 333], INDEX_CODING_PHASED, live_size)
+                  for start in range(0, len(indices), 333)]
+        live_size = LiveDictionarySize(max_size, policy)
+        decoded = []
+        for start, (codes, bits) in zip(range(0, len(indices), 333), blocks):
+            count = len(indices[start:start + 333])
+            decoded.extend(decode_indices(bits, codes, INDEX_CODING_PHASED, live_size, count))
+        assert decoded == indices, (max_size, policy)
+
+        # Sin tabla de códigos y nunca más bits que el índice más grande posible
+        codes, bits = encode_indices(indices, INDEX_CODING_PHASED, LiveDictionarySize(max_size, policy))
+        assert codes == {}
+        assert len(bits) <= sum(min(position, max_size or position).bit_length()
+                                for position in range(1, len(indices) + 1))
+
+    # Un índice que no está en el diccionario no se puede codificar
+    try:
+        encode_indices([0, 2], INDEX_CODING_PHASED)
+        assert False, "Se esperaba ValueError"
+    except ValueError:
+        pass
+
+
+def test_files_round_trip():
+    """Los archivos .lz78 de todas las codificaciones se descomprimen exactamente"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in ("large_code.py", "example_page.html"):
+            text = read_sample(name)
+            for index_coding in INDEX_CODINGS:
+                path = os.path.join(tmp_dir, f"{index_coding}.lz78")
+                compressor = LZ78HuffmanCompressor(index_coding=index_coding)
+                result = compressor.compress(text)
+                FileHandlerBinaryHuffman.save_compressed_file(path, *result, name,
+                                                              index_coding=index_coding)
+                assert os.path.getsize(path) == compressor.get_statistics(text, name, *result)['hybrid_size']
+                assert FileHandlerBinaryHuffman.read_header(path)['index_coding'] == index_coding
+
+                loaded = FileHandlerBinaryHuffman.load_compressed_file(path)
+                assert compressor.decompress(*loaded[:4]) == text
+
+                compress_file(os.path.join(sample_data_dir, name), path, 256, 'lru',
+                              block_pairs=100, index_coding=index_coding)
+                target = os.path.join(tmp_dir, name)
+                decompress_file(path, target)
+                with open(target, 'r', encoding='utf-8', newline='') as f:
+                    assert f.read() == text, (name, index_coding)
+
+
+def index_entropy_bytes(indices):
+    """Tamaño mínimo (entropía de orden 0) de los índices, en bytes"""
+    counts = Counter(indices)
+    total = len(indices)
+    bits = -sum(count * math.log2(count / total) for count in counts.values())
+    return bits / 8
+
+
+def benchmark(name):
+    """Comprimir un archivo con todas las codificaciones y medir tamaño y tiempo"""
+    text = read_sample(name)
+    compressed_data, dictionary = LZ78Compressor().compress(text)
+    indices = [index for index, _ in compressed_data]
+
+    results = {}
+    for index_coding in INDEX_CODINGS:
+        start = time.perf_counter()
+        codes, bits = encode_indices(indices, index_coding)
+        encode_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decoded = decode_indices(bits, codes, index_coding, count=len(indices))
+        decode_time = time.perf_counter() - start
+        assert decoded == indices
+
+        size = FileHandlerBinaryHuffman.get_compressed_size(
+            compressed_data, dictionary, codes, bits, name, index_coding
+        )
+        results[index_coding] = (size, (len(bits) + 7) // 8, encode_time, decode_time)
+
+    return len(text.encode('utf-8')), index_entropy_bytes(indices), results
+
+
+def main():
+    print("=" * 100)
+    print("BENCHMARK: CODIFICACIÓN DE ÍNDICES LZ78 (texto v2 vs símbolos vs fases)".center(100))
+    print("=" * 100)
+    print(f"\n{'Archivo':<26}{'Original':>11}{'Codif.':>9}{'Archivo .lz78':>15}{'Índices':>11}"
+          f"{'Entropía':>11}{'Codificar':>10}{'Decodificar':>13}")
+    print("-" * 100)
+
+    totals = {index_coding: [0, 0, 0.0, 0.0] for index_coding in INDEX_CODINGS}
+    for name in SAMPLE_FILES:
+        if not os.path.exists(os.path.join(sample_data_dir, name)):
+            continue
+        original_size, entropy, results = benchmark(name)
+        for index_coding, (size, index_bytes, encode_time, decode_time) in results.items():
+            label = name if index_coding == INDEX_CODING_TEXT else ""
+            original = f"{original_size:,}" if index_coding == INDEX_CODING_TEXT else ""
+            print(f"{label:<26}{original:>11}{index_coding:>9}{size:>15,}{index_bytes:>11,}"
+                  f"{entropy:>11,.0f}{encode_time:>9.3f}s{decode_time:>12.3f}s")
+            total = totals[index_coding]
+            total[0] += size
+            total[1] += index_bytes
+            total[2] += encode_time
+            total[3] += decode_time
+
+    print("-" * 100)
+    for index_coding, (size, index_bytes, encode_time, decode_time) in totals.items():
+        print(f"{'TOTAL':<26}{'':>11}{index_coding:>9}{size:>15,}{index_bytes:>11,}"
+              f"{'':>11}{encode_time:>9.3f}s{decode_time:>12.3f}s")
+
+    text_total = totals[INDEX_CODING_TEXT]
+    symbol_total = totals[INDEX_CODING_SYMBOL]
+    phased_total = totals[INDEX_CODING_PHASED]
+    print(f"\nArchivo .lz78: {(1 - symbol_total[0] / text_total[0]) * 100:.1f}% más pequeño con símbolos")
+    print(f"Índices:       {(1 - symbol_total[1] / text_total[1]) * 100:.1f}% menos bytes")
+    print(f"Fases vs símbolos: archivo .lz78 {(1 - phased_total[0] / symbol_total[0]) * 100:.1f}% más pequeño, "
+          f"decodificación {symbol_total[3] / phased_total[3]:.1f}x más rápida")
+
+    for test in (test_bit_writer_reader, test_table_decoder, test_table_decoder_long_codes,
+                 test_canonical_codes,
+                 test_length_limited_codes, test_bucket_symbols, test_indices_round_trip, test_phased_codes,
+                 test_files_round_trip):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 100)
+    print("BENCHMARK COMPLETADO".center(100))
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    main()
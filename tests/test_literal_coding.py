@@ -0,0 +1,149 @@
+"""
+Script de prueba y benchmark para la codificación de literales LZ78
+Compara los caracteres sin codificar (1 byte de longitud + UTF-8) con
+Huffman de orden 0 y Huffman con contexto de orden 1
+"""
+
+import sys
+import io
+import os
+import time
+import tempfile
+
+# Añadir src al path del proyecto
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from model.lz78_compressor import LZ78Compressor
+from model.lz78_huffman_compressor import LZ78HuffmanCompressor
+from model.file_handler_binary_huffman import FileHandlerBinaryHuffman
+from model.literal_coding import (LiteralContexts, LiteralDecoder, encode_literals, LITERAL_CODINGS,
+                                  LITERAL_CODING_RAW, LITERAL_CODING_HUFFMAN, LITERAL_CODING_CONTEXT)
+from model.lz78_stream import compress_file, decompress_file
+
+sample_data_dir = os.path.join(os.path.dirname(__file__), 'sample_data')
+SAMPLE_FILES = ["config_example.json", "example_code.py", "example_page.html", "large_code.py",
+                "test_very_large_data.txt", "system_logs.txt", "sales_dataset.csv"]
+
+
+def read_sample(name):
+    """Leer un archivo de muestra sin traducir los saltos de línea"""
+    with open(os.path.join(sample_data_dir, name), 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def test_literals_round_trip():
+    """Los literales se decodifican exactamente con y sin contexto"""
+    text = read_sample("large_code.py") + "ñandú €uro 😀"
+    pairs, _ = LZ78Compressor(256, 'lru').compress(text)
+    literals = [char for _, char in pairs]
+    contexts = LiteralContexts(256, 'lru').contexts(pairs)
+
+    for literal_coding in (LITERAL_CODING_HUFFMAN, LITERAL_CODING_CONTEXT):
+        tables, bits = encode_literals(literals, literal_coding, contexts)
+        decoder = LiteralDecoder(tables, io.BytesIO(bits.ToBytes()).read, len(bits))
+        assert [decoder.decode(context) for context in contexts] == literals, literal_coding
+        assert decoder.remaining == 0
+
+    # Con contexto, varios contextos frecuentes tienen su propia tabla
+    tables, _ = encode_literals(literals, LITERAL_CODING_CONTEXT, contexts)
+    assert len(tables) > 2
+
+
+def test_files_round_trip():
+    """Los archivos .lz78 de todas las codificaciones de literales se descomprimen exactamente"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in ("large_code.py", "example_page.html"):
+            text = read_sample(name)
+            for literal_coding in LITERAL_CODINGS:
+                for max_size, policy in [(None, 'freeze'), (128, 'reset'), (128, 'lru')]:
+                    path = os.path.join(tmp_dir, f"{literal_coding}.lz78")
+                    compressor = LZ78HuffmanCompressor(max_size, policy, literal_coding=literal_coding)
+                    result = compressor.compress(text)
+                    FileHandlerBinaryHuffman.save_compressed_file(path, *result, name, max_size, policy,
+                                                                  literal_coding=literal_coding, text=text)
+                    stats = compressor.get_statistics(text, name, *result)
+                    assert os.path.getsize(path) == stats['hybrid_size']
+                    assert FileHandlerBinaryHuffman.read_header(path)['literal_coding'] == literal_coding
+
+                    loaded = FileHandlerBinaryHuffman.load_compressed_file(path)
+                    assert loaded[0] == result[0], (name, literal_coding, policy)
+                    assert compressor.decompress(*loaded[:4]) == text
+
+                    # Varios bloques: el contexto continúa de un bloque al siguiente
+                    compress_file(os.path.join(sample_data_dir, name), path, max_size, policy,
+                                  block_pairs=300, literal_coding=literal_coding)
+                    target = os.path.join(tmp_dir, name)
+                    decompress_file(path, target)
+                    with open(target, 'r', encoding='utf-8', newline='') as f:
+                        assert f.read() == text, (name, literal_coding, policy)
+
+
+def test_statistics_components():
+    """get_statistics informa el tamaño de cada parte del archivo"""
+    text = read_sample("example_code.py")
+    sizes = {}
+    for literal_coding in LITERAL_CODINGS:
+        compressor = LZ78HuffmanCompressor(literal_coding=literal_coding)
+        result = compressor.compress(text)
+        stats = compressor.get_statistics(text, "example_code.py", *result)
+        parts = ('header_size', 'index_table_size', 'indices_size', 'literal_table_size', 'literals_size')
+        assert sum(stats[part] for part in parts) == stats['hybrid_size']
+        assert stats['indices_size'] == 4 + stats['huffman_bytes']
+        sizes[literal_coding] = stats['literal_table_size'] + stats['literals_size']
+
+    # Sin codificar: contador, y longitud + UTF-8 por literal
+    assert sizes[LITERAL_CODING_RAW] == 4 + sum(1 + len(char.encode('utf-8')) for _, char in result[0])
+    assert sizes[LITERAL_CODING_HUFFMAN] < sizes[LITERAL_CODING_RAW]
+
+
+def main():
+    print("=" * 100)
+    print("BENCHMARK: CODIFICACIÓN DE LITERALES LZ78 (sin codificar vs Huffman vs contexto)".center(100))
+    print("=" * 100)
+    print(f"\n{'Archivo':<26}{'Original':>11}{'Codif.':>9}{'Archivo .lz78':>15}{'Tablas':>9}"
+          f"{'Literales':>11}{'Descomprimir':>14}")
+    print("-" * 100)
+
+    totals = {literal_coding: 0 for literal_coding in LITERAL_CODINGS}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in SAMPLE_FILES:
+            if not os.path.exists(os.path.join(sample_data_dir, name)):
+                continue
+            text = read_sample(name)
+            for literal_coding in LITERAL_CODINGS:
+                compressor = LZ78HuffmanCompressor(65536, 'lru', literal_coding=literal_coding)
+                result = compressor.compress(text)
+                stats = compressor.get_statistics(text, name, *result)
+                path = os.path.join(tmp_dir, name + ".lz78")
+                FileHandlerBinaryHuffman.save_compressed_file(path, *result, name, 65536, 'lru',
+                                                              literal_coding=literal_coding)
+                start = time.perf_counter()
+                decompress_file(path, os.path.join(tmp_dir, name))
+                elapsed = time.perf_counter() - start
+
+                label = name if literal_coding == LITERAL_CODING_RAW else ""
+                original = f"{stats['original_size']:,}" if literal_coding == LITERAL_CODING_RAW else ""
+                print(f"{label:<26}{original:>11}{literal_coding:>9}{stats['hybrid_size']:>15,}"
+                      f"{stats['literal_table_size']:>9,}{stats['literals_size']:>11,}{elapsed:>13.3f}s")
+                totals[literal_coding] += stats['hybrid_size']
+
+    print("-" * 100)
+    for literal_coding, size in totals.items():
+        print(f"{'TOTAL':<26}{'':>11}{literal_coding:>9}{size:>15,}")
+    raw_total = totals[LITERAL_CODING_RAW]
+    for literal_coding in (LITERAL_CODING_HUFFMAN, LITERAL_CODING_CONTEXT):
+        print(f"Archivo .lz78 con {literal_coding}: {(1 - totals[literal_coding] / raw_total) * 100:.1f}% "
+              f"más pequeño que sin codificar")
+
+    for test in (test_literals_round_trip, test_files_round_trip, test_statistics_components):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 100)
+    print("BENCHMARK COMPLETADO".center(100))
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    main()
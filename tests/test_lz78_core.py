@@ -0,0 +1,162 @@
+"""
+Script de prueba y benchmark para el núcleo LZ78
+Compara el diccionario de frases en trie y la descompresión por
+referencias hacia atrás con la implementación original sobre cadenas
+(mismos pares, mismo diccionario y mismo texto) y mide el tiempo de
+compresión y descompresión de ambas
+"""
+
+import sys
+import os
+import time
+
+# Añadir src al path del proyecto
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from model.lz78_compressor import LZ78Compressor, PhraseDictionary
+
+sample_data_dir = os.path.join(os.path.dirname(__file__), 'sample_data')
+
+EDGE_CASES = ["", "a", "aaaaaaaaaa", "abababab", "abcabcabcabc", "ñandú 日本語 😀 ñandú 日本語 😀",
+              "línea\r\nlínea\r\n", "a" * 1000 + "b"]
+
+
+def read_sample(name):
+    with open(os.path.join(sample_data_dir, name), 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def sample_texts():
+    """Archivos de muestra y casos límite"""
+    texts = [read_sample(name) for name in sorted(os.listdir(sample_data_dir))
+             if os.path.isfile(os.path.join(sample_data_dir, name))]
+    return texts + EDGE_CASES
+
+
+def reference_compress(text):
+    """LZ78 original: diccionario {frase: índice} construido concatenando cadenas"""
+    dictionary = {}
+    compressed_data = []
+    current_string = ""
+    for char in text:
+        combined = current_string + char
+        if combined in dictionary:
+            current_string = combined
+        else:
+            dictionary[combined] = len(dictionary) + 1
+            compressed_data.append((dictionary.get(current_string, 0), char))
+            current_string = ""
+    if current_string:
+        index = dictionary.get(current_string[:-1], 0) if len(current_string) > 1 else 0
+        compressed_data.append((index, current_string[-1]))
+    return compressed_data, dictionary
+
+
+def reference_decompress(compressed_data):
+    """LZ78 original: cada frase guardada como cadena completa"""
+    reverse_dict = {}
+    pieces = []
+    for index, char in compressed_data:
+        phrase = reverse_dict[index] + char if index in reverse_dict else char
+        pieces.append(phrase)
+        reverse_dict[len(reverse_dict) + 1] = phrase
+    return ''.join(pieces)
+
+
+def test_trie_matches_string_dictionary():
+    """El trie emite los mismos pares y el mismo diccionario que la implementación sobre cadenas"""
+    for text in sample_texts():
+        compressed_data, dictionary = LZ78Compressor().compress(text)
+        reference_data, reference_dictionary = reference_compress(text)
+        assert compressed_data == reference_data, text[:40]
+        assert dict(dictionary) == reference_dictionary, text[:40]
+
+
+def test_chunked_feed():
+    """Comprimir por trozos con feed da los mismos pares que comprimir de una vez"""
+    text = read_sample("example_code.py")
+    expected, _ = reference_compress(text)
+    for chunk_size in (1, 7, 1000):
+        compressor = LZ78Compressor()
+        compressor.reset()
+        pairs = []
+        for start in range(0, len(text), chunk_size):
+            pairs.extend(compressor.feed(text[start:start + chunk_size]))
+        pairs.extend(compressor.flush())
+        assert pairs == expected, chunk_size
+
+
+def test_phrase_dictionary_view():
+    """La vista {frase: índice} del trie se comporta como un diccionario"""
+    compressed_data, dictionary = LZ78Compressor().compress("abracadabra abracadabra")
+    _, reference_dictionary = reference_compress("abracadabra abracadabra")
+    assert isinstance(dictionary, PhraseDictionary)
+    assert len(dictionary) == len(reference_dictionary)
+    assert all(dictionary[phrase] == index for phrase, index in reference_dictionary.items())
+    assert "zzz" not in dictionary and "abr" in dictionary
+    assert list(dictionary.phrases([3, 1])) == [(3, "r"), (1, "a")]
+
+
+def test_decompress_round_trip():
+    """La descompresión por referencias hacia atrás devuelve el texto original con cada política"""
+    for text in sample_texts():
+        compressed_data, dictionary = LZ78Compressor().compress(text)
+        assert LZ78Compressor().decompress(compressed_data, dictionary) == text, text[:40]
+
+    # Con diccionario limitado los índices se reutilizan: las referencias deben seguirlos
+    text = read_sample("large_code.py")
+    for policy in ("freeze", "reset", "lru"):
+        compressor = LZ78Compressor(256, policy)
+        compressed_data, dictionary = compressor.compress(text)
+        assert LZ78Compressor(256, policy).decompress(compressed_data, dictionary) == text, policy
+
+
+def test_decompress_matches_reference():
+    """La descompresión coincide con la original, también con índices inválidos y caracteres de varios bytes"""
+    pairs = [(0, "ñ"), (1, "a"), (2, "😀"), (9, "x"), (-1, "日"), (3, "本"), (4, "\n"), (7, "é")]
+    assert LZ78Compressor().decompress(pairs, {}) == reference_decompress(pairs)
+    for text in EDGE_CASES:
+        compressed_data, _ = reference_compress(text)
+        assert LZ78Compressor().decompress(compressed_data, {}) == reference_decompress(compressed_data) == text
+
+
+def main():
+    print("=" * 100)
+    print("BENCHMARK: NÚCLEO LZ78".center(100))
+    print("=" * 100)
+
+    print(f"\n{'Archivo':<28}{'Tamaño':>14}{'Pares':>12}{'Comprimir':>23}{'Descomprimir':>23}")
+    print(f"{'':<54}{'Cadenas':>11}{'Trie':>12}{'Cadenas':>11}{'Referencias':>12}")
+    print("-" * 100)
+    for name in ("example_code.py", "large_code.py", "sales_dataset.csv", "system_logs.txt"):
+        text = read_sample(name)
+        start = time.perf_counter()
+        reference_data, _ = reference_compress(text)
+        reference_time = time.perf_counter() - start
+        start = time.perf_counter()
+        LZ78Compressor().compress(text)
+        trie_time = time.perf_counter() - start
+        start = time.perf_counter()
+        reference_decompress(reference_data)
+        reference_decompress_time = time.perf_counter() - start
+        start = time.perf_counter()
+        LZ78Compressor().decompress(reference_data, {})
+        decompress_time = time.perf_counter() - start
+        print(f"{name:<28}{len(text.encode('utf-8')):>14,}{len(reference_data):>12,}"
+              f"{reference_time:>10.3f}s{trie_time:>11.3f}s"
+              f"{reference_decompress_time:>10.3f}s{decompress_time:>11.3f}s")
+
+    print()
+    for test in (test_trie_matches_string_dictionary, test_chunked_feed, test_phrase_dictionary_view,
+                 test_decompress_round_trip, test_decompress_matches_reference):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 100)
+    print("BENCHMARK COMPLETADO".center(100))
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    main()
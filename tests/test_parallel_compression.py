@@ -0,0 +1,198 @@
+"""
+Script de prueba y benchmark para la compresión por bloques en paralelo
+Cada bloque se comprime con su propio diccionario en un proceso distinto y
+el archivo .lz78 termina con un índice de bloques, que permite también
+descomprimir los bloques en paralelo
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+# Añadir src al path del proyecto
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from model.lz78_parallel import compress_file_parallel, decompress_file_parallel
+from model.lz78_stream import LZ78StreamDecompressor, compress_file, decompress_file
+from model.file_handler_binary_huffman import FileHandlerBinaryHuffman, FLAG_INDEPENDENT_BLOCKS
+from model.entropy_coding import ENTROPY_CODER_RANGE
+from model.index_coding import INDEX_CODING_PHASED
+from model.literal_coding import LITERAL_CODING_CONTEXT
+
+sample_data_dir = os.path.join(os.path.dirname(__file__), 'sample_data')
+SAMPLE_FILES = ["large_code.py", "test_very_large_data.txt", "system_logs.txt", "sales_dataset.csv"]
+
+
+def read_sample(name):
+    """Leer un archivo de muestra sin traducir los saltos de línea"""
+    with open(os.path.join(sample_data_dir, name), 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def test_parallel_round_trip():
+    """Los archivos comprimidos por bloques independientes se descomprimen exactamente"""
+    source = os.path.join(sample_data_dir, "large_code.py")
+    text = read_sample("large_code.py")
+    configurations = [
+        {},
+        {'max_dictionary_size': 256, 'dictionary_policy': 'lru', 'index_coding': INDEX_CODING_PHASED},
+        {'literal_coding': LITERAL_CODING_CONTEXT, 'entropy_coder': ENTROPY_CODER_RANGE},
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for settings in configurations:
+            for block_chars in (7000, len(text) + 1):
+                outputs = []
+                for workers in (1, 2):
+                    path = os.path.join(tmp_dir, f"parallel_{workers}.lz78")
+                    stats = compress_file_parallel(source, path, block_chars=block_chars,
+                                                   workers=workers, **settings)
+                    assert stats['compressed_size'] == os.path.getsize(path)
+                    assert stats['blocks'] == -(-len(text) // block_chars)
+                    target = os.path.join(tmp_dir, "large_code.py")
+                    decompress_file(path, target)
+                    with open(target, 'r', encoding='utf-8', newline='') as f:
+                        assert f.read() == text, (settings, block_chars, workers)
+                    with open(path, 'rb') as f:
+                        outputs.append(f.read())
+                # El número de procesos no cambia el resultado
+                assert outputs[0] == outputs[1], (settings, block_chars)
+
+
+def test_block_index():
+    """El índice de bloques apunta a cada bloque y cada bloque se decodifica por separado"""
+    text = read_sample("example_page.html")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "indexed.lz78")
+        compress_file_parallel(os.path.join(sample_data_dir, "example_page.html"), path,
+                               block_chars=1000, workers=2)
+
+        with open(path, 'rb') as f:
+            header = FileHandlerBinaryHuffman._read_header(f)
+            assert header['flags'] == FLAG_INDEPENDENT_BLOCKS
+            offsets = list(FileHandlerBinaryHuffman.iter_block_offsets(f))
+            entries = FileHandlerBinaryHuffman.read_block_index(f)
+            assert [entry['offset'] for entry in entries] == offsets
+
+            data = text.encode('utf-8')
+            for number, entry in enumerate(entries):
+                decoder = LZ78StreamDecompressor()
+                block_text = ''.join(decoder.decode_batch(batch) for batch in
+                                     FileHandlerBinaryHuffman.iter_block_pairs(f, header, entry['offset']))
+                assert block_text == text[number * 1000:(number + 1) * 1000]
+                start = entry['original_offset']
+                assert block_text.encode('utf-8') == data[start:start + entry['original_size']]
+                assert entry['lines'] == block_text.count('\n')
+                assert entry['first_line'] == text[:number * 1000].count('\n')
+            assert sum(entry['original_size'] for entry in entries) == len(data)
+
+        # Los pares de bloques independientes no forman un único flujo LZ78
+        try:
+            FileHandlerBinaryHuffman.load_compressed_file(path)
+            assert False, "Se esperaba ValueError"
+        except ValueError:
+            pass
+
+        # Archivos sin índice
+        compress_file(os.path.join(sample_data_dir, "example_page.html"), path)
+        with open(path, 'rb') as f:
+            try:
+                FileHandlerBinaryHuffman.read_block_index(f)
+                assert False, "Se esperaba ValueError"
+            except ValueError:
+                pass
+
+
+def test_parallel_decompression():
+    """La descompresión en paralelo escribe cada bloque en su lugar"""
+    text = read_sample("large_code.py")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(sample_data_dir, "large_code.py")
+        path = os.path.join(tmp_dir, "parallel.lz78")
+        target = os.path.join(tmp_dir, "large_code.py")
+        for block_chars in (3000, len(text) + 1):
+            compress_file_parallel(source, path, 1024, 'reset', block_chars=block_chars, workers=2,
+                                   literal_coding=LITERAL_CODING_CONTEXT)
+            for workers in (1, 3):
+                # El archivo de salida anterior (más largo) se reemplaza
+                with open(target, 'w') as f:
+                    f.write("x" * (len(text) * 2))
+                stats = decompress_file_parallel(path, target, workers)
+                with open(target, 'r', encoding='utf-8', newline='') as f:
+                    assert f.read() == text, (block_chars, workers)
+                assert stats['decompressed_size'] == len(text.encode('utf-8'))
+                assert stats['blocks'] == -(-len(text) // block_chars)
+
+        # Sin índice de bloques: descompresión en serie
+        compress_file(source, path, block_pairs=500)
+        stats = decompress_file_parallel(path, target, 2)
+        assert stats['workers'] == 1
+        with open(target, 'r', encoding='utf-8', newline='') as f:
+            assert f.read() == text
+
+
+def main():
+    print("=" * 100)
+    print("BENCHMARK: COMPRESIÓN POR BLOQUES EN PARALELO".center(100))
+    print("=" * 100)
+
+    cpus = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Entrada de varios MB: todos los archivos de muestra seguidos
+        source = os.path.join(tmp_dir, "input.txt")
+        with open(source, 'w', encoding='utf-8', newline='') as f:
+            for name in SAMPLE_FILES:
+                if os.path.exists(os.path.join(sample_data_dir, name)):
+                    f.write(read_sample(name))
+        size = os.path.getsize(source)
+        print(f"\nEntrada: {size:,} bytes, {cpus} CPU(s)")
+        print(f"\n{'Modo':<36}{'Archivo .lz78':>15}{'Ratio':>9}{'Tiempo':>10}{'Aceleración':>14}")
+        print("-" * 100)
+
+        path = os.path.join(tmp_dir, "output.lz78")
+        start = time.perf_counter()
+        stats = compress_file(source, path, 65536, 'lru')
+        serial_time = time.perf_counter() - start
+        print(f"{'Flujo (un diccionario)':<36}{stats['compressed_size']:>15,}"
+              f"{stats['compression_ratio']:>8.1f}%{serial_time:>9.2f}s{1.0:>13.2f}x")
+
+        worker_counts = sorted({1, 2, 4, cpus})
+        for block_chars in (1 << 18, 1 << 20):
+            for workers in worker_counts:
+                start = time.perf_counter()
+                stats = compress_file_parallel(source, path, 65536, 'lru', block_chars=block_chars,
+                                               workers=workers)
+                elapsed = time.perf_counter() - start
+                mode = f"Bloques de {block_chars >> 10} K, {workers} proceso(s)"
+                print(f"{mode:<36}{stats['compressed_size']:>15,}{stats['compression_ratio']:>8.1f}%"
+                      f"{elapsed:>9.2f}s{serial_time / elapsed:>13.2f}x")
+
+        # Descompresión: en serie con decompress_file, en paralelo con el índice de bloques
+        print(f"\n{'Descompresión (bloques de 256 K)':<36}{'':>15}{'':>9}{'Tiempo':>10}{'Aceleración':>14}")
+        print("-" * 100)
+        compress_file_parallel(source, path, 65536, 'lru', block_chars=1 << 18)
+        target = os.path.join(tmp_dir, "output.txt")
+        start = time.perf_counter()
+        decompress_file(path, target)
+        serial_time = time.perf_counter() - start
+        print(f"{'En serie':<36}{'':>24}{serial_time:>9.2f}s{1.0:>13.2f}x")
+        for workers in worker_counts:
+            start = time.perf_counter()
+            decompress_file_parallel(path, target, workers)
+            elapsed = time.perf_counter() - start
+            mode = f"{workers} proceso(s)"
+            print(f"{mode:<36}{'':>24}{elapsed:>9.2f}s{serial_time / elapsed:>13.2f}x")
+
+    print()
+    for test in (test_parallel_round_trip, test_block_index, test_parallel_decompression):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 100)
+    print("BENCHMARK COMPLETADO".center(100))
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Script de prueba y benchmark para los diccionarios preestablecidos
+Entrena un diccionario con archivos de muestra, lo guarda en un archivo
+.lz78dict y comprime archivos pequeños partiendo de él; compara el tamaño
+con y sin diccionario según su número de frases
+"""
+
+import sys
+import os
+import tempfile
+
+# Añadir src al path del proyecto
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from model.lz78_compressor import DICTIONARY_POLICIES
+from model.lz78_huffman_compressor import LZ78HuffmanCompressor
+from model.index_coding import INDEX_CODINGS
+from model.literal_coding import LITERAL_CODINGS
+from model.entropy_coding import ENTROPY_CODERS, ENTROPY_CODER_HUFFMAN, ENTROPY_CODER_RANGE, check_codings
+from model.file_handler_binary_huffman import FileHandlerBinaryHuffman, FLAG_PRESET_DICTIONARY
+from model.preset_dictionary import PresetDictionary, train_dictionary
+from model.lz78_stream import compress_file, decompress_file
+from model.lz78_parallel import compress_file_parallel, decompress_file_parallel
+
+sample_data_dir = os.path.join(os.path.dirname(__file__), 'sample_data')
+SMALL_FILES = ["config_example.json", "example_code.py", "example_page.html"]
+TRAINING_FILES = SMALL_FILES + ["large_code.py"]
+
+
+def read_sample(name):
+    """Leer un archivo de muestra sin traducir los saltos de línea"""
+    with open(os.path.join(sample_data_dir, name), 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def train_without(name, max_phrases):
+    """Entrenar con los archivos de muestra salvo el que se va a comprimir"""
+    return train_dictionary([os.path.join(sample_data_dir, sample) for sample in TRAINING_FILES
+                             if sample != name], max_phrases)
+
+
+def compress_and_save(path, text, settings, preset_dictionary):
+    """Comprimir en memoria y guardar con save_compressed_file"""
+    compressor = LZ78HuffmanCompressor(*settings, preset_dictionary=preset_dictionary)
+    compressed_data, dictionary, huffman_codes, encoded_indices = compressor.compress(text)
+    FileHandlerBinaryHuffman.save_compressed_file(
+        path, compressed_data, dictionary, huffman_codes, encoded_indices, "sample.txt",
+        *settings, preset_dictionary=preset_dictionary
+    )
+    return compressor, compressed_data
+
+
+def test_save_load_dictionary():
+    """El diccionario entrenado se guarda y se carga sin cambios"""
+    preset_dictionary = train_without("config_example.json", 1000)
+    assert len(preset_dictionary) == 1000
+    phrases = preset_dictionary.phrases()
+    assert len(set(phrases)) == len(phrases)
+    # Cada frase extiende a una anterior, así que cualquier prefijo es válido
+    for position, (parent, _) in enumerate(preset_dictionary.pairs):
+        assert parent <= position
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "samples")
+        size = preset_dictionary.save(path)
+        loaded = PresetDictionary.load(path + ".lz78dict")
+        assert os.path.getsize(path + ".lz78dict") == size
+        assert loaded.pairs == preset_dictionary.pairs
+        assert loaded.dictionary_id == preset_dictionary.dictionary_id
+
+        with open(path + ".lz78dict", 'wb') as f:
+            f.write(b'LZ7H')
+        try:
+            PresetDictionary.load(path + ".lz78dict")
+            assert False, "Se esperaba ValueError"
+        except ValueError:
+            pass
+
+    assert train_without("config_example.json", 10).dictionary_id != preset_dictionary.dictionary_id
+    try:
+        PresetDictionary([(1, 'a')])
+        assert False, "Se esperaba ValueError"
+    except ValueError:
+        pass
+
+
+def test_preset_round_trip():
+    """Con diccionario preestablecido se recupera el texto con toda configuración"""
+    text = read_sample("config_example.json")
+    preset_dictionary = train_without("config_example.json", 2048)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "sample.lz78")
+        for policy in DICTIONARY_POLICIES:
+            for max_size in (None, 64, 4096):
+                for index_coding in INDEX_CODINGS:
+                    for literal_coding in LITERAL_CODINGS:
+                        for entropy_coder in ENTROPY_CODERS:
+                            try:
+                                check_codings(entropy_coder, index_coding)
+                            except ValueError:
+                                continue
+                            settings = (max_size, policy, index_coding, literal_coding, entropy_coder)
+                            compressor, compressed_data = compress_and_save(path, text, settings,
+                                                                            preset_dictionary)
+                            header = FileHandlerBinaryHuffman.read_header(path)
+                            assert header['flags'] & FLAG_PRESET_DICTIONARY
+                            assert header['dictionary_id'] == preset_dictionary.dictionary_id
+                            loaded = FileHandlerBinaryHuffman.load_compressed_file(path, preset_dictionary)
+                            assert loaded[0] == compressed_data, settings
+                            decompressor = LZ78HuffmanCompressor(max_size, policy,
+                                                                 preset_dictionary=preset_dictionary)
+                            assert decompressor.decompress(*loaded[:4]) == text, settings
+                            sizes = FileHandlerBinaryHuffman.get_section_sizes(
+                                compressed_data, loaded[2], loaded[3], "sample.txt", index_coding,
+                                literal_coding, max_size, policy, entropy_coder, preset_dictionary
+                            )
+                            assert sum(sizes.values()) == os.path.getsize(path), settings
+
+
+def test_preset_stream_and_parallel():
+    """La compresión por flujo y por bloques paralelos también parten del diccionario"""
+    source = os.path.join(sample_data_dir, "example_page.html")
+    text = read_sample("example_page.html")
+    preset_dictionary = train_without("example_page.html", 4096)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        compressed = os.path.join(tmp_dir, "page.lz78")
+        target = os.path.join(tmp_dir, "page.html")
+        for policy in DICTIONARY_POLICIES:
+            for entropy_coder in (ENTROPY_CODER_HUFFMAN, ENTROPY_CODER_RANGE):
+                compress_file(source, compressed, 1024, policy, block_pairs=200, entropy_coder=entropy_coder,
+                              preset_dictionary=preset_dictionary)
+                decompress_file(compressed, target, preset_dictionary)
+                with open(target, 'r', encoding='utf-8', newline='') as f:
+                    assert f.read() == text, (policy, entropy_coder)
+
+                compress_file_parallel(source, compressed, 1024, policy, block_chars=1500, workers=2,
+                                       entropy_coder=entropy_coder, preset_dictionary=preset_dictionary)
+                decompress_file_parallel(compressed, target, 2, preset_dictionary)
+                with open(target, 'r', encoding='utf-8', newline='') as f:
+                    assert f.read() == text, (policy, entropy_coder)
+
+
+def test_preset_gain():
+    """El diccionario compensa las tablas Huffman que cada bloque sigue guardando en archivos pequeños"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "sample.lz78")
+        for name, min_gain in (("example_code.py", 0.15), ("config_example.json", 0.05)):
+            text = read_sample(name)
+            preset_dictionary = train_without(name, 16384)
+            for settings in ((None, 'freeze', 'symbol', 'huffman', 'huffman'),
+                             (65536, 'lru', 'symbol', 'context', 'huffman')):
+                compress_and_save(path, text, settings, None)
+                plain_size = os.path.getsize(path)
+                compressor, compressed_data = compress_and_save(path, text, settings, preset_dictionary)
+                preset_size = os.path.getsize(path)
+                assert preset_size <= plain_size * (1 - min_gain), (name, settings, plain_size, preset_size)
+
+                # Las tablas se siguen guardando: la ganancia es neta
+                loaded = FileHandlerBinaryHuffman.load_compressed_file(path, preset_dictionary)
+                sizes = FileHandlerBinaryHuffman.get_section_sizes(
+                    compressed_data, loaded[2], loaded[3], "sample.txt", settings[2], settings[3],
+                    settings[0], settings[1], settings[4], preset_dictionary
+                )
+                assert sizes['index_table'] > 0 and sizes['literal_table'] > 0, (name, settings)
+
+
+def test_missing_dictionary():
+    """Un archivo con diccionario preestablecido no se abre sin él o con otro"""
+    text = read_sample("config_example.json")
+    preset_dictionary = train_without("config_example.json", 512)
+    other = train_without("example_code.py", 512)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "sample.lz78")
+        compress_and_save(path, text, (None, 'freeze', 'symbol', 'huffman', 'huffman'), preset_dictionary)
+        target = os.path.join(tmp_dir, "sample.json")
+        for load in (lambda: FileHandlerBinaryHuffman.load_compressed_file(path),
+                     lambda: FileHandlerBinaryHuffman.load_compressed_file(path, other),
+                     lambda: decompress_file(path, target),
+                     lambda: decompress_file_parallel(path, target, 1, other)):
+            try:
+                load()
+                assert False, "Se esperaba ValueError"
+            except ValueError:
+                pass
+
+        # Un archivo sin diccionario preestablecido ignora el que se le pase
+        compress_and_save(path, text, (None, 'freeze', 'symbol', 'huffman', 'huffman'), None)
+        loaded = FileHandlerBinaryHuffman.load_compressed_file(path, preset_dictionary)
+        assert LZ78HuffmanCompressor().decompress(*loaded[:4]) == text
+
+
+def main():
+    print("=" * 100)
+    print("BENCHMARK: DICCIONARIOS PREESTABLECIDOS PARA ARCHIVOS PEQUEÑOS".center(100))
+    print("=" * 100)
+
+    phrase_counts = (0, 1024, 4096, 16384)
+    settings = [
+        ("huffman", (65536, 'lru', 'symbol', 'context', 'huffman')),
+        ("range", (65536, 'lru', 'phased', 'context', 'range')),
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "sample.lz78")
+        for label, setting in settings:
+            print(f"\nCodificador {label} (diccionario entrenado con los demás archivos de muestra)")
+            header = f"{'Archivo':<24}{'Original':>10}" + "".join(
+                f"{f'{count} frases' if count else 'Sin diccionario':>16}" for count in phrase_counts)
+            print(header)
+            print("-" * 100)
+            for name in SMALL_FILES:
+                text = read_sample(name)
+                row = f"{name:<24}{len(text.encode('utf-8')):>10,}"
+                for count in phrase_counts:
+                    preset_dictionary = train_without(name, count) if count else None
+                    compress_and_save(path, text, setting, preset_dictionary)
+                    row += f"{os.path.getsize(path):>16,}"
+                print(row)
+
+        # Peso de las tablas de códigos en los archivos pequeños
+        print(f"\n{'Secciones (huffman, 4096 frases)':<36}{'Tablas':>12}{'Datos':>12}{'Cabecera':>12}")
+        print("-" * 100)
+        for name in SMALL_FILES:
+            text = read_sample(name)
+            preset_dictionary = train_without(name, 4096)
+            compressor, compressed_data = compress_and_save(path, text, settings[0][1], preset_dictionary)
+            loaded = FileHandlerBinaryHuffman.load_compressed_file(path, preset_dictionary)
+            sizes = FileHandlerBinaryHuffman.get_section_sizes(
+                compressed_data, loaded[2], loaded[3], name, 'symbol', 'context', 65536, 'lru', 'huffman',
+                preset_dictionary
+            )
+            print(f"{name:<36}{sizes['index_table'] + sizes['literal_table']:>12,}"
+                  f"{sizes['indices'] + sizes['literals']:>12,}{sizes['header']:>12,}")
+
+    print()
+    for test in (test_save_load_dictionary, test_preset_round_trip, test_preset_stream_and_parallel,
+                 test_preset_gain, test_missing_dictionary):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 100)
+    print("BENCHMARK COMPLETADO".center(100))
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Script de prueba y benchmark para los avisos de progreso
+La interfaz comprime y descomprime en un hilo aparte, que informa del
+progreso y puede cancelarse desde el aviso de progreso; compara el tiempo
+con y sin aviso y comprueba que el resultado no cambia
+"""
+
+import sys
+import os
+import time
+
+# Añadir src al path del proyecto
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from model.lz78_compressor import LZ78Compressor, DICTIONARY_POLICIES, PROGRESS_STEP
+from model.lz78_huffman_compressor import LZ78HuffmanCompressor
+from model.preset_dictionary import train_dictionary
+
+sample_data_dir = os.path.join(os.path.dirname(__file__), 'sample_data')
+
+
+def read_sample(name):
+    """Leer un archivo de muestra sin traducir los saltos de línea"""
+    with open(os.path.join(sample_data_dir, name), 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+class Cancelled(Exception):
+    """Excepción del aviso de progreso para cancelar"""
+
+
+def sample_text():
+    """Texto de varios pasos de progreso, con caracteres de varios bytes"""
+    return (read_sample("large_code.py") + "ñandú — 日本語\n") * 3
+
+
+def test_compress_progress():
+    """El progreso de la compresión llega al final del texto y no cambia los pares"""
+    text = sample_text()
+    for policy in DICTIONARY_POLICIES:
+        expected, _ = LZ78Compressor(4096, policy).compress(text)
+        calls = []
+        pairs, _ = LZ78Compressor(4096, policy).compress(text, lambda *step: calls.append(step))
+        assert pairs == expected, policy
+        assert len(calls) == -(-len(text) // PROGRESS_STEP) > 1
+        assert calls[-1][0] == len(text.encode('utf-8'))
+        assert all(a[0] < b[0] and a[1] <= b[1] for a, b in zip(calls, calls[1:]))
+        # El último par (flush) llega después del último aviso
+        assert calls[-1][1] in (len(pairs), len(pairs) - 1)
+
+
+def test_decompress_progress():
+    """El progreso de la descompresión cuenta bytes escritos y frases decodificadas"""
+    text = sample_text()
+    preset_dictionary = train_dictionary([os.path.join(sample_data_dir, "example_code.py")], 500)
+    for preset in (None, preset_dictionary):
+        compressor = LZ78HuffmanCompressor(4096, 'lru', preset_dictionary=preset)
+        result = compressor.compress(text)
+        calls = []
+        assert compressor.decompress(*result, progress=lambda *step: calls.append(step)) == text
+        assert len(calls) == -(-len(result[0]) // PROGRESS_STEP)
+        assert calls[-1] == (len(text.encode('utf-8')), len(result[0]))
+
+
+def test_progress_cancels():
+    """Una excepción en el aviso de progreso detiene la operación"""
+    text = sample_text()
+    compressor = LZ78HuffmanCompressor(4096, 'lru')
+    result = compressor.compress(text)
+    calls = []
+
+    def cancel(*step):
+        calls.append(step)
+        raise Cancelled()
+
+    for operation in (lambda: compressor.compress(text, cancel),
+                      lambda: compressor.decompress(*result, progress=cancel)):
+        try:
+            operation()
+            assert False, "Se esperaba Cancelled"
+        except Cancelled:
+            pass
+    assert len(calls) == 2
+    # El compresor sigue sirviendo tras cancelar
+    assert compressor.compress(text)[0] == result[0]
+
+
+def main():
+    print("=" * 100)
+    print("BENCHMARK: AVISOS DE PROGRESO".center(100))
+    print("=" * 100)
+
+    text = read_sample("system_logs.txt")
+    compressor = LZ78HuffmanCompressor(65536, 'lru')
+    print(f"\nsystem_logs.txt ({len(text.encode('utf-8')):,} bytes, avisos cada {PROGRESS_STEP:,} caracteres o pares)")
+    print(f"{'Operación':<20}{'Sin aviso':>14}{'Con aviso':>14}{'Avisos':>10}")
+    print("-" * 100)
+
+    calls = []
+    times = []
+    for progress in (None, lambda *step: calls.append(step)):
+        start = time.perf_counter()
+        result = compressor.compress(text, progress)
+        times.append(time.perf_counter() - start)
+    print(f"{'Compresión':<20}{times[0]:>13.2f}s{times[1]:>13.2f}s{len(calls):>10}")
+
+    calls.clear()
+    times.clear()
+    for progress in (None, lambda *step: calls.append(step)):
+        start = time.perf_counter()
+        compressor.decompress(*result, progress=progress)
+        times.append(time.perf_counter() - start)
+    print(f"{'Descompresión':<20}{times[0]:>13.2f}s{times[1]:>13.2f}s{len(calls):>10}")
+
+    print()
+    for test in (test_compress_progress, test_decompress_progress, test_progress_cancels):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 100)
+    print("BENCHMARK COMPLETADO".center(100))
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Script de prueba y benchmark para el acceso aleatorio a archivos .lz78
+Lee rangos de bytes y de líneas del texto original y busca texto; con el
+índice de bloques solo se decodifican los bloques que los contienen, y con
+los filtros de bloque solo los que pueden contener el texto buscado
+"""
+
+import sys
+import os
+import re
+import time
+import tempfile
+
+# Añadir src al path del proyecto
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from model.lz78_random_access import read_range, read_lines, search, _candidate_blocks
+from model.lz78_parallel import compress_file_parallel
+from model.lz78_stream import compress_file, decompress_file
+from model.file_handler_binary_huffman import FileHandlerBinaryHuffman, FLAG_BLOCK_FILTERS
+from model.block_filter import BlockFilter, FILTER_NGRAM
+
+sample_data_dir = os.path.join(os.path.dirname(__file__), 'sample_data')
+SAMPLE_FILES = ["large_code.py", "test_very_large_data.txt", "system_logs.txt", "sales_dataset.csv"]
+
+
+def read_sample(name):
+    """Leer un archivo de muestra sin traducir los saltos de línea"""
+    with open(os.path.join(sample_data_dir, name), 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def compressed_files(tmp_dir, name):
+    """Comprimir un archivo de muestra con y sin índice de bloques"""
+    source = os.path.join(sample_data_dir, name)
+    indexed = os.path.join(tmp_dir, "indexed.lz78")
+    compress_file_parallel(source, indexed, 512, 'lru', block_chars=2000, workers=2)
+    chained = os.path.join(tmp_dir, "chained.lz78")
+    compress_file(source, chained, block_pairs=300)
+    return indexed, chained
+
+
+def test_read_range():
+    """Los rangos de bytes coinciden con los del archivo original"""
+    text = read_sample("example_page.html")
+    data = text.encode('utf-8')
+    size = len(data)
+    ranges = [(0, 0), (0, 1), (0, size), (1999, 2001), (2000, 4000), (size - 10, size + 100),
+              (size, size + 5), (3500, 3500), (777, 9123)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for path in compressed_files(tmp_dir, "example_page.html"):
+            for start, end in ranges:
+                assert read_range(path, start, end) == data[start:end], (path, start, end)
+
+            try:
+                read_range(path, 10, 5)
+                assert False, "Se esperaba ValueError"
+            except ValueError:
+                pass
+
+
+def test_read_lines():
+    """Los rangos de líneas coinciden con los del archivo original"""
+    text = read_sample("example_page.html")
+    lines = text.splitlines(True)
+    count = len(lines)
+    ranges = [(0, 0), (0, 1), (0, count), (5, 6), (10, 60), (count - 3, count + 10),
+              (count, count + 2), (40, 40), (1, count - 1)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for path in compressed_files(tmp_dir, "example_page.html"):
+            for first, last in ranges:
+                assert read_lines(path, first, last) == ''.join(lines[first:last]), (path, first, last)
+
+            try:
+                read_lines(path, -1, 3)
+                assert False, "Se esperaba ValueError"
+            except ValueError:
+                pass
+
+        # Bloques de una línea, de menos de una línea y sin salto final
+        source = os.path.join(tmp_dir, "lines.txt")
+        sample = "".join(f"línea {number}\n" * (number % 3) for number in range(200)) + "sin salto"
+        with open(source, 'w', encoding='utf-8', newline='') as f:
+            f.write(sample)
+        lines = sample.splitlines(True)
+        path = os.path.join(tmp_dir, "lines.lz78")
+        for block_chars in (1, 9, 10, 64):
+            compress_file_parallel(source, path, block_chars=block_chars, workers=1)
+            for first in range(0, len(lines) + 2, 7):
+                for last in (first, first + 1, first + 13):
+                    assert read_lines(path, first, last) == ''.join(lines[first:last]), (block_chars, first, last)
+
+
+def find_all(data, needle):
+    """Posiciones de todas las apariciones de needle en data"""
+    found = []
+    position = data.find(needle)
+    while position != -1:
+        found.append(position)
+        position = data.find(needle, position + 1)
+    return found
+
+
+def test_block_filter():
+    """Los filtros de bloque no dan falsos negativos"""
+    data = read_sample("example_page.html").encode('utf-8')[:3000]
+    block_filter = BlockFilter.from_text(data, 2)
+    for length in (1, 2, FILTER_NGRAM, FILTER_NGRAM + 1, 12):
+        for start in range(0, len(data) - length + 1, 7):
+            piece = data[start:start + length]
+            assert block_filter.might_contain(piece), piece
+        assert block_filter.might_start_with(data[:length])
+        assert block_filter.might_end_with(data[-length:])
+    # Con bits suficientes, lo ausente se descarta
+    block_filter = BlockFilter.from_text(data, 16)
+    assert not block_filter.might_contain("texto que no aparece".encode('utf-8'))
+
+
+def test_search():
+    """La búsqueda encuentra todas las apariciones, también entre bloques"""
+    text = read_sample("example_page.html")
+    data = text.encode('utf-8')
+    patterns = ["<div", "class=", "a", "\n", "</html>", "no aparece", data[1995:2010].decode('utf-8')]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(sample_data_dir, "example_page.html")
+        filtered = os.path.join(tmp_dir, "filtered.lz78")
+        stats = compress_file_parallel(source, filtered, block_chars=1000, workers=2, filter_bits=4)
+        assert stats['filter_size'] > 0
+        with open(filtered, 'rb') as f:
+            header = FileHandlerBinaryHuffman._read_header(f)
+            assert header['flags'] & FLAG_BLOCK_FILTERS
+            entries = FileHandlerBinaryHuffman.read_block_index(f, header['flags'])
+
+        for path in compressed_files(tmp_dir, "example_page.html") + (filtered,):
+            for pattern in patterns:
+                assert search(path, pattern) == find_all(data, pattern.encode('utf-8')), (path, pattern)
+
+            try:
+                search(path, "")
+                assert False, "Se esperaba ValueError"
+            except ValueError:
+                pass
+
+        # Los bloques con apariciones (enteras o repartidas) son candidatos
+        for pattern in patterns:
+            needle = pattern.encode('utf-8')
+            candidates = set(_candidate_blocks(entries, needle))
+            for position in find_all(data, needle):
+                for number, entry in enumerate(entries):
+                    if entry['original_offset'] < position + len(needle) \
+                            and position < entry['original_offset'] + entry['original_size']:
+                        assert number in candidates, (pattern, number)
+        assert len(_candidate_blocks(entries, "no aparece".encode('utf-8'))) < len(entries)
+
+
+def corrupt_literal(path):
+    """Cambiar un literal sin codificar de la mitad del archivo: se decodifica bien, pero es otro texto"""
+    with open(path, 'rb') as f:
+        data = bytearray(f.read())
+    # Literal sin codificar: longitud 1 seguida de una letra ASCII
+    positions = [match.start() + 1 for match in re.finditer(rb'\x01[A-Za-z]', bytes(data))]
+    position = min(positions, key=lambda position: abs(position - len(data) // 2))
+    data[position] ^= 0x20
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def test_checksum():
+    """Un texto cambiado se detecta por el CRC-32 en cada forma de decodificar el archivo"""
+    text = read_sample("example_page.html")
+    size = len(text.encode('utf-8'))
+    source = os.path.join(sample_data_dir, "example_page.html")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chained = os.path.join(tmp_dir, "chained.lz78")
+        compress_file(source, chained, block_pairs=300, literal_coding='raw')
+        indexed = os.path.join(tmp_dir, "indexed.lz78")
+        compress_file_parallel(source, indexed, block_chars=1000, workers=2, literal_coding='raw', filter_bits=4)
+        corrupt_literal(chained)
+        corrupt_literal(indexed)
+
+        # Sin índice, read_range deja de decodificar en `end`: hay que pasar del final del texto
+        target = os.path.join(tmp_dir, "output.txt")
+        reads = [lambda path: read_range(path, 0, size + 1), lambda path: read_lines(path, 0, size),
+                 lambda path: search(path, "<"), lambda path: decompress_file(path, target)]
+        for path in (chained, indexed):
+            for read in reads:
+                try:
+                    read(path)
+                    assert False, "Se esperaba ValueError"
+                except ValueError as e:
+                    assert "CRC-32" in str(e), (path, e)
+        try:
+            FileHandlerBinaryHuffman.load_compressed_file(chained)
+            assert False, "Se esperaba ValueError"
+        except ValueError as e:
+            assert "CRC-32" in str(e), e
+
+        # Con índice, los bloques que no se tocaron se siguen leyendo
+        assert read_range(indexed, 0, 100) == text.encode('utf-8')[:100]
+
+
+def main():
+    print("=" * 100)
+    print("BENCHMARK: ACCESO ALEATORIO A ARCHIVOS COMPRIMIDOS".center(100))
+    print("=" * 100)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Entrada de varios MB: todos los archivos de muestra seguidos
+        source = os.path.join(tmp_dir, "input.txt")
+        with open(source, 'w', encoding='utf-8', newline='') as f:
+            for name in SAMPLE_FILES:
+                if os.path.exists(os.path.join(sample_data_dir, name)):
+                    f.write(read_sample(name))
+        size = os.path.getsize(source)
+        with open(source, 'r', encoding='utf-8', newline='') as f:
+            line_count = f.read().count('\n')
+        print(f"\nEntrada: {size:,} bytes, {line_count:,} líneas")
+        print(f"\n{'Archivo / lectura':<48}{'Archivo .lz78':>15}{'Tiempo':>10}{'Aceleración':>14}")
+        print("-" * 100)
+
+        chained = os.path.join(tmp_dir, "chained.lz78")
+        compress_file(source, chained, 65536, 'lru')
+        files = [("Flujo (sin índice)", chained)]
+        for block_chars in (1 << 16, 1 << 18):
+            path = os.path.join(tmp_dir, f"indexed_{block_chars}.lz78")
+            compress_file_parallel(source, path, 65536, 'lru', block_chars=block_chars)
+            files.append((f"Bloques de {block_chars >> 10} K", path))
+
+        target = os.path.join(tmp_dir, "output.txt")
+        for label, path in files:
+            start = time.perf_counter()
+            decompress_file(path, target)
+            full_time = time.perf_counter() - start
+            print(f"{label + ': todo el archivo':<48}{os.path.getsize(path):>15,}"
+                  f"{full_time:>9.2f}s{1.0:>13.2f}x")
+
+            reads = [
+                ("4 KB al final", lambda: read_range(path, size - 4096, size)),
+                ("4 KB en la mitad", lambda: read_range(path, size // 2, size // 2 + 4096)),
+                ("100 líneas en la mitad", lambda: read_lines(path, line_count // 2, line_count // 2 + 100)),
+            ]
+            for name, read in reads:
+                start = time.perf_counter()
+                read()
+                elapsed = time.perf_counter() - start
+                print(f"{label + ': ' + name:<48}{'':>15}{elapsed:>9.2f}s{full_time / elapsed:>13.2f}x")
+
+        # Búsqueda: sin filtros se decodifican todos los bloques
+        print(f"\n{'Búsqueda (bloques de 64 K)':<48}{'Archivo .lz78':>15}{'Tiempo':>10}{'Bloques':>14}")
+        print("-" * 100)
+        patterns = ["ERROR", "Timeout en ", "Teclado Mecánico", "zzzq"]
+        for filter_bits in (0, 2, 4, 8):
+            path = os.path.join(tmp_dir, "search.lz78")
+            stats = compress_file_parallel(source, path, 65536, 'lru', block_chars=1 << 16,
+                                           filter_bits=filter_bits)
+            with open(path, 'rb') as f:
+                header = FileHandlerBinaryHuffman._read_header(f)
+                entries = FileHandlerBinaryHuffman.read_block_index(f, header['flags'])
+            for pattern in patterns:
+                start = time.perf_counter()
+                search(path, pattern)
+                elapsed = time.perf_counter() - start
+                decoded = len(_candidate_blocks(entries, pattern.encode('utf-8')))
+                label = f"{filter_bits} bits/secuencia: {pattern!r}" if filter_bits else f"Sin filtros: {pattern!r}"
+                print(f"{label:<48}{stats['compressed_size']:>15,}{elapsed:>9.2f}s"
+                      f"{f'{decoded}/{len(entries)}':>14}")
+
+    print()
+    for test in (test_read_range, test_read_lines, test_block_filter, test_search, test_checksum):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 100)
+    print("BENCHMARK COMPLETADO".center(100))
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Script de prueba y benchmark para los bloques almacenados
+Los bloques que no se reducen al codificarlos se guardan como texto UTF-8;
+compara el tamaño y el tiempo de compresión de textos compresibles e
+incompresibles, y comprueba que el diccionario sigue igual tras esos bloques
+"""
+
+import sys
+import os
+import io
+import time
+import random
+import zlib
+import struct
+import tempfile
+
+# Añadir src al path del proyecto
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from model.lz78_compressor import LZ78Compressor, DICTIONARY_POLICIES
+from model.lz78_huffman_compressor import LZ78HuffmanCompressor
+from model.index_coding import INDEX_CODINGS
+from model.literal_coding import LITERAL_CODINGS
+from model.entropy_coding import ENTROPY_CODERS, check_codings
+from model.file_handler_binary_huffman import FileHandlerBinaryHuffman
+from model.lz78_stream import compress_file, decompress_file
+from model.lz78_parallel import compress_file_parallel, decompress_file_parallel
+from model.lz78_random_access import read_range
+
+sample_data_dir = os.path.join(os.path.dirname(__file__), 'sample_data')
+
+
+def read_sample(name):
+    """Leer un archivo de muestra sin traducir los saltos de línea"""
+    with open(os.path.join(sample_data_dir, name), 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def random_text(length, alphabet, seed=7):
+    """Texto aleatorio (incompresible) con los caracteres de un alfabeto"""
+    generator = random.Random(seed)
+    return ''.join(generator.choice(alphabet) for _ in range(length))
+
+
+CJK = ''.join(chr(code) for code in range(0x4e00, 0x9fff))
+LATIN1 = ''.join(chr(code) for code in range(32, 256))
+
+
+def mixed_text():
+    """Código fuente con trozos de texto aleatorio en medio"""
+    code = read_sample("example_code.py")
+    return code + random_text(3000, CJK) + code + random_text(6000, LATIN1) + code
+
+
+def write_source(tmp_dir, text):
+    """Guardar un texto como archivo de entrada"""
+    source = os.path.join(tmp_dir, "input.txt")
+    with open(source, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    return source
+
+
+def read_output(path):
+    """Leer un archivo descomprimido sin traducir los saltos de línea"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def codings():
+    """Combinaciones válidas de codificación de índices, literales y codificador"""
+    for index_coding in INDEX_CODINGS:
+        for literal_coding in LITERAL_CODINGS:
+            for entropy_coder in ENTROPY_CODERS:
+                try:
+                    check_codings(entropy_coder, index_coding)
+                except ValueError:
+                    continue
+                yield index_coding, literal_coding, entropy_coder
+
+
+def test_parse_replays_pairs():
+    """Volver a analizar el texto desde el diccionario da los mismos pares"""
+    text = mixed_text()
+    for policy in DICTIONARY_POLICIES:
+        for max_size in (None, 64, 1024):
+            pairs, _ = LZ78Compressor(max_size, policy).compress(text)
+            decoder = LZ78Compressor(max_size, policy)
+            parsed = []
+            for index, char in decoder.trie.parse(text):
+                decoder.trie.add(index, char)
+                parsed.append((index, char))
+            assert parsed == pairs, (policy, max_size)
+
+
+def test_incompressible_stream():
+    """Un texto incompresible crece solo unos bytes por bloque"""
+    text = random_text(20000, CJK)
+    data_size = len(text.encode('utf-8'))
+    header_size = len(FileHandlerBinaryHuffman.MAGIC_NUMBER) + 1 + 2 + len("input.txt") + 5 + 4
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = write_source(tmp_dir, text)
+        compressed = os.path.join(tmp_dir, "random.lz78")
+        target = os.path.join(tmp_dir, "random.txt")
+        for index_coding, literal_coding, entropy_coder in codings():
+            settings = (index_coding, literal_coding, entropy_coder)
+            stats = compress_file(source, compressed, 4096, 'lru', block_pairs=2000, index_coding=index_coding,
+                                  literal_coding=literal_coding, entropy_coder=entropy_coder)
+            stored_size = data_size + header_size + 9 * stats['blocks'] + FileHandlerBinaryHuffman.END_SIZE
+            assert stats['compressed_size'] <= stored_size, settings
+            # Los modelos adaptativos de bytes aún aprovechan la estructura de UTF-8
+            if entropy_coder == 'huffman':
+                assert stats['stored_blocks'] == stats['blocks'] > 1, settings
+                assert stats['compressed_size'] == stored_size, settings
+            decompress_file(compressed, target)
+            assert read_output(target) == text, settings
+
+    # write_block dice qué tipo de bloque escribió, sin deducirlo de su tamaño
+    for block_text, expected in ((text, FileHandlerBinaryHuffman.BLOCK_STORED),
+                                 (read_sample("example_code.py"), FileHandlerBinaryHuffman.BLOCK_LZ78_HUFFMAN)):
+        pairs, _ = LZ78Compressor().compress(block_text)
+        output = io.BytesIO()
+        block_type, written = FileHandlerBinaryHuffman.write_block(output, pairs, data=block_text.encode('utf-8'))
+        assert block_type == output.getvalue()[0] == expected
+        assert written == len(output.getvalue())
+    assert FileHandlerBinaryHuffman.write_block(io.BytesIO(), []) == (None, 0)
+
+
+def test_mixed_stream_round_trip():
+    """Los bloques almacenados y codificados se mezclan sin romper el diccionario compartido"""
+    text = mixed_text()
+    data = text.encode('utf-8')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = write_source(tmp_dir, text)
+        compressed = os.path.join(tmp_dir, "mixed.lz78")
+        target = os.path.join(tmp_dir, "mixed.txt")
+        for policy in DICTIONARY_POLICIES:
+            for index_coding, literal_coding, entropy_coder in codings():
+                settings = (policy, index_coding, literal_coding, entropy_coder)
+                stats = compress_file(source, compressed, 512, policy, block_pairs=400,
+                                      index_coding=index_coding, literal_coding=literal_coding,
+                                      entropy_coder=entropy_coder)
+                assert 0 < stats['stored_blocks'] < stats['blocks'], settings
+                decompress_file(compressed, target)
+                assert read_output(target) == text, settings
+                assert read_range(compressed, 5000, 9000) == data[5000:9000], settings
+
+                # Cada lote dice de qué tipo de bloque viene: pares o el texto almacenado
+                with open(compressed, 'rb') as f:
+                    header = FileHandlerBinaryHuffman._read_header(f)
+                    batches = list(FileHandlerBinaryHuffman.iter_pairs(f, header))
+                stored = [batch for batch in batches if batch.block_type == FileHandlerBinaryHuffman.BLOCK_STORED]
+                assert len(stored) == stats['stored_blocks'], settings
+                assert all(batch.pairs is None and isinstance(batch.text, str) for batch in stored)
+                assert all(isinstance(batch.pairs, list) for batch in batches if batch not in stored)
+
+
+def test_save_and_statistics():
+    """save_compressed_file guarda el texto si codificarlo lo expande, y las estadísticas lo reflejan"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "sample.lz78")
+        for text, stored in ((random_text(3000, CJK), True), (read_sample("example_code.py"), False)):
+            for index_coding, literal_coding, entropy_coder in codings():
+                settings = (None, 'freeze', index_coding, literal_coding, entropy_coder)
+                compressor = LZ78HuffmanCompressor(*settings)
+                result = compressor.compress(text)
+                sizes = FileHandlerBinaryHuffman.save_compressed_file(path, *result, "sample.txt", *settings,
+                                                                      text=text)
+                stats = compressor.get_statistics(text, "sample.txt", *result)
+                assert os.path.getsize(path) == stats['hybrid_size'], settings
+                # Los tamaños de save_compressed_file evitan codificar el bloque otra vez
+                assert compressor.get_statistics(text, "sample.txt", *result, sizes) == stats, settings
+                assert stats['compression_ratio'] < 101, settings
+                if stats['stored_size']:
+                    assert stats['indices_size'] == stats['literals_size'] == 0
+                if entropy_coder == 'huffman':
+                    assert (stats['stored_size'] > 0) == stored, settings
+
+                loaded = FileHandlerBinaryHuffman.load_compressed_file(path)
+                assert loaded[0] == result[0], settings
+                assert LZ78HuffmanCompressor(None, 'freeze').decompress(*loaded[:4]) == text
+
+
+def test_stored_block_only():
+    """Un archivo con solo un bloque almacenado se carga, y con una versión desconocida no se abre"""
+    text = random_text(500, LATIN1)
+    pairs, _ = LZ78Compressor().compress(text)
+    output = io.BytesIO()
+    FileHandlerBinaryHuffman.write_stream_header(output, "sample.txt")
+    FileHandlerBinaryHuffman.write_stored_block(output, pairs, text.encode('utf-8'))
+    FileHandlerBinaryHuffman.write_end(output, zlib.crc32(text.encode('utf-8')))
+    file_bytes = output.getvalue()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "sample.lz78")
+        with open(path, 'wb') as f:
+            f.write(file_bytes)
+        assert LZ78Compressor().decompress(FileHandlerBinaryHuffman.load_compressed_file(path)[0], {}) == text
+
+        # Mismo archivo con una versión posterior en la cabecera
+        with open(path, 'wb') as f:
+            f.write(file_bytes[:4] + struct.pack('B', FileHandlerBinaryHuffman.VERSION + 1) + file_bytes[5:])
+        for load in (FileHandlerBinaryHuffman.load_compressed_file, FileHandlerBinaryHuffman.get_file_info):
+            try:
+                load(path)
+                assert False, "Se esperaba ValueError"
+            except ValueError:
+                pass
+
+
+def test_parallel_stored_blocks():
+    """Los bloques independientes también se almacenan y se leen por separado"""
+    text = mixed_text()
+    data = text.encode('utf-8')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = write_source(tmp_dir, text)
+        compressed = os.path.join(tmp_dir, "mixed.lz78")
+        target = os.path.join(tmp_dir, "mixed.txt")
+        for entropy_coder in ('huffman', 'range'):
+            stats = compress_file_parallel(source, compressed, 1024, 'lru', block_chars=2000, workers=2,
+                                           index_coding='phased', literal_coding='context',
+                                           entropy_coder=entropy_coder)
+            assert 0 < stats['stored_blocks'] < stats['blocks']
+            decompress_file_parallel(compressed, target, 2)
+            assert read_output(target) == text
+            for start in range(0, len(data), 3000):
+                assert read_range(compressed, start, start + 2500) == data[start:start + 2500]
+
+
+def main():
+    print("=" * 100)
+    print("BENCHMARK: BLOQUES ALMACENADOS PARA DATOS INCOMPRESIBLES".center(100))
+    print("=" * 100)
+
+    inputs = [
+        ("large_code.py", read_sample("large_code.py")),
+        ("Aleatorio ASCII", random_text(200000, LATIN1[:95])),
+        ("Aleatorio Latin-1", random_text(200000, LATIN1)),
+        ("Aleatorio CJK 5 K", random_text(5000, CJK)),
+        ("Aleatorio CJK 100 K", random_text(100000, CJK)),
+        ("Código + aleatorio", mixed_text() * 10),
+    ]
+    settings = [
+        ("huffman", ('symbol', 'huffman', 'huffman')),
+        ("range", ('phased', 'context', 'range')),
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        compressed = os.path.join(tmp_dir, "output.lz78")
+        for label, (index_coding, literal_coding, entropy_coder) in settings:
+            print(f"\nCodificador {label} (65536 frases lru; flujo con bloques de 4096 pares)")
+            print(f"{'Entrada':<22}{'Original':>10}{'Codificado':>12}{'Guardado':>12}"
+                  f"{'Flujo':>12}{'Almacenados':>14}{'Tiempo':>10}")
+            print("-" * 100)
+            for name, text in inputs:
+                source = write_source(tmp_dir, text)
+                # Un solo bloque, como save_compressed_file: siempre codificado o con el texto si no se reduce
+                compressor = LZ78HuffmanCompressor(65536, 'lru', index_coding, literal_coding, entropy_coder)
+                result = compressor.compress(text)
+                sizes = [FileHandlerBinaryHuffman.get_compressed_size(
+                    *result, "input.txt", index_coding, literal_coding, 65536, 'lru', entropy_coder, None, block_text
+                ) for block_text in (None, text)]
+
+                start = time.perf_counter()
+                stats = compress_file(source, compressed, 65536, 'lru', block_pairs=4096,
+                                      index_coding=index_coding, literal_coding=literal_coding,
+                                      entropy_coder=entropy_coder)
+                elapsed = time.perf_counter() - start
+                print(f"{name:<22}{stats['original_size']:>10,}{sizes[0]:>12,}{sizes[1]:>12,}"
+                      f"{stats['compressed_size']:>12,}{stats['stored_blocks']:>8} / {stats['blocks']:<3}"
+                      f"{elapsed:>9.2f}s")
+
+    print()
+    for test in (test_parse_replays_pairs, test_incompressible_stream, test_mixed_stream_round_trip,
+                 test_save_and_statistics, test_stored_block_only, test_parallel_stored_blocks):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 100)
+    print("BENCHMARK COMPLETADO".center(100))
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Script de prueba para la compresión por flujo (streaming) LZ78 + Huffman
+Verifica que comprimir por bloques produzca archivos .lz78 válidos y exactos
+y que la descompresión directa a disco reproduzca el archivo original
+"""
+
+import sys
+import os
+import io
+import struct
+import tempfile
+
+# Añadir src al path del proyecto
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from model.lz78_compressor import LZ78Compressor
+from model.lz78_huffman_compressor import LZ78HuffmanCompressor
+from model.lz78_stream import LZ78StreamCompressor, compress_file, decompress_file
+from model.file_handler_binary_huffman import FileHandlerBinaryHuffman
+from model.index_coding import encode_indices, INDEX_CODING_TEXT
+
+sample_data_dir = os.path.join(os.path.dirname(__file__), 'sample_data')
+SAMPLE_FILES = ["large_code.py", "config_example.json", "example_page.html"]
+
+
+def read_sample(name):
+    """Leer un archivo de muestra sin traducir los saltos de línea"""
+    with open(os.path.join(sample_data_dir, name), 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def load_and_decompress(path):
+    """Cargar un .lz78 y descomprimirlo con la configuración de su encabezado"""
+    header = FileHandlerBinaryHuffman.read_header(path)
+    loaded = FileHandlerBinaryHuffman.load_compressed_file(path)
+    decompressor = LZ78HuffmanCompressor(header['max_dictionary_size'], header['dictionary_policy'])
+    return decompressor.decompress(*loaded[:4])
+
+
+def test_feed_matches_compress():
+    """Alimentar el texto por partes produce los mismos pares que comprimirlo entero"""
+    text = read_sample("large_code.py")
+    expected, _ = LZ78Compressor().compress(text)
+
+    for chunk_size in (1, 7, 1000, len(text)):
+        compressor = LZ78Compressor()
+        compressor.reset()
+        pairs = []
+        for i in range(0, len(text), chunk_size):
+            pairs.extend(compressor.feed(text[i:i + chunk_size]))
+        pairs.extend(compressor.flush())
+        assert pairs == expected, chunk_size
+
+
+def test_stream_round_trip():
+    """Los archivos escritos por bloques se descomprimen exactamente"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in SAMPLE_FILES:
+            text = read_sample(name)
+            for max_size, policy, block_pairs in [(None, 'freeze', 1 << 16), (256, 'lru', 100), (256, 'reset', 1)]:
+                path = os.path.join(tmp_dir, name + ".lz78")
+                stats = compress_file(os.path.join(sample_data_dir, name), path,
+                                      max_size, policy, chunk_size=1000, block_pairs=block_pairs)
+                assert stats['compressed_size'] == os.path.getsize(path)
+                assert load_and_decompress(path) == text, (name, policy, block_pairs)
+
+
+def test_stream_to_buffer():
+    """El compresor incremental escribe en cualquier flujo binario"""
+    text = read_sample("example_page.html")
+    output = io.BytesIO()
+    stream = LZ78StreamCompressor(output, "example_page.html", block_pairs=64)
+    written = 0
+    for i in range(0, len(text), 500):
+        written += stream.feed(text[i:i + 500])
+    written += stream.flush()
+    assert stream.get_statistics()['blocks'] > 1
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "page.lz78")
+        with open(path, 'wb') as f:
+            f.write(output.getvalue())
+        assert load_and_decompress(path) == text
+
+
+def test_decompress_file():
+    """La descompresión directa a disco es exacta para archivos de uno o varios bloques"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in SAMPLE_FILES:
+            text = read_sample(name)
+            source = os.path.join(tmp_dir, name + ".lz78")
+            target = os.path.join(tmp_dir, name)
+
+            # Un solo bloque, guardado desde la interfaz
+            result = LZ78HuffmanCompressor().compress(text)
+            FileHandlerBinaryHuffman.save_compressed_file(source, *result, name)
+            stats = decompress_file(source, target)
+            with open(target, 'r', encoding='utf-8', newline='') as f:
+                assert f.read() == text, name
+            assert stats['decompressed_size'] == len(text.encode('utf-8'))
+            assert stats['original_filename'] == name
+
+            # Varios bloques y diccionario limitado
+            for policy in ('freeze', 'reset', 'lru'):
+                compress_file(os.path.join(sample_data_dir, name), source, 128, policy, block_pairs=50)
+                decompress_file(source, target)
+                with open(target, 'r', encoding='utf-8', newline='') as f:
+                    assert f.read() == text, (name, policy)
+
+
+def write_version_2(path, text, name):
+    """Escribir un .lz78 de la versión 2: un solo cuerpo, índices como texto decimal y tabla con cada código"""
+    pairs, _ = LZ78Compressor().compress(text)
+    huffman_codes, encoded_indices = encode_indices([index for index, _ in pairs], INDEX_CODING_TEXT)
+    name_bytes = name.encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(FileHandlerBinaryHuffman.MAGIC_NUMBER + struct.pack('B', 2))
+        f.write(struct.pack('H', len(name_bytes)) + name_bytes)
+        f.write(struct.pack('I', len(huffman_codes)))
+        for symbol, code in huffman_codes.items():
+            f.write(struct.pack('H', len(symbol.encode('utf-8'))) + symbol.encode('utf-8'))
+            f.write(struct.pack('H', len(code)) + code.encode('utf-8'))
+        f.write(struct.pack('I', len(encoded_indices)) + encoded_indices.ToBytes())
+        f.write(struct.pack('I', len(pairs)))
+        for _, char in pairs:
+            char_bytes = char.encode('utf-8')
+            f.write(struct.pack('B', len(char_bytes)) + char_bytes)
+
+
+def test_version_2_file():
+    """Los archivos de la versión 2 del formato se siguen leyendo"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in SAMPLE_FILES:
+            text = read_sample(name)
+            source = os.path.join(tmp_dir, name + ".lz78")
+            target = os.path.join(tmp_dir, name)
+            write_version_2(source, text, name)
+
+            assert load_and_decompress(source) == text, name
+            decompress_file(source, target)
+            with open(target, 'r', encoding='utf-8', newline='') as f:
+                assert f.read() == text, name
+
+            info = FileHandlerBinaryHuffman.get_file_info(source)
+            assert info['version'] == 2 and info['original_filename'] == name
+            assert info['blocks'] is None and info['checksum'] is None
+            assert info['index_coding'] == INDEX_CODING_TEXT and info['max_dictionary_size'] is None
+
+
+def main():
+    print("=" * 70)
+    print("PRUEBA DE COMPRESIÓN POR FLUJO (STREAMING)".center(70))
+    print("=" * 70)
+
+    for test in (test_feed_matches_compress, test_stream_round_trip, test_stream_to_buffer,
+                 test_decompress_file, test_version_2_file):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 70)
+    print("PRUEBAS COMPLETADAS".center(70))
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Script de prueba y benchmark para el paginador de texto
+Los visores de texto de la interfaz solo decodifican la página visible de
+un archivo proyectado en memoria; compara el tiempo de mostrar la primera
+página con el de leer el archivo completo, y comprueba que las páginas
+cubren el texto sin huecos ni solapes
+"""
+
+import sys
+import os
+import time
+import random
+import tempfile
+
+# Añadir src al path del proyecto
+project_root = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from utils.text_pager import TextPager, MAX_LINE_SCAN
+
+sample_data_dir = os.path.join(os.path.dirname(__file__), 'sample_data')
+
+
+def sample_bytes():
+    """Texto con líneas cortas, caracteres de varios bytes y líneas más largas que la búsqueda de saltos"""
+    generator = random.Random(3)
+    words = ["lz78", "huffman", "ñandú", "日本語", "😀", "\r\n", "\n"]
+    text = ''.join(generator.choice(words) + ' ' for _ in range(4000))
+    long_line = ''.join(generator.choice("aé中😀") for _ in range(3 * MAX_LINE_SCAN))
+    return (text + long_line + "\n" + text).encode('utf-8')
+
+
+def forward_pages(pager):
+    """Páginas desde el principio, con next_page"""
+    pages = [pager.page(0)]
+    while True:
+        page = pager.next_page(pages[-1][1])
+        if page is None:
+            return pages
+        pages.append(page)
+
+
+def test_pages_cover_text():
+    """Las páginas siguientes y anteriores cubren el texto sin huecos ni solapes"""
+    data = sample_bytes()
+    for page_size in (4, 100, 5000, 1 << 16):
+        pager = TextPager(data, page_size)
+        pages = forward_pages(pager)
+        assert pages[0][0] == 0 and pages[-1][1] == len(data)
+        assert all(start < end for start, end in pages), page_size
+        assert all(a[1] == b[0] for a, b in zip(pages, pages[1:])), page_size
+        assert ''.join(pager.text(*page) for page in pages) == data.decode('utf-8')
+
+        # Hacia atrás desde el final
+        page = (pages[-1][1], pages[-1][1])
+        text = []
+        while True:
+            page = pager.page_before(page[0])
+            if page is None:
+                break
+            text.append(pager.text(*page))
+        assert ''.join(reversed(text)) == data.decode('utf-8'), page_size
+
+
+def test_page_contains_offset():
+    """La página de un byte lo contiene, empieza en una línea si puede y nunca corta un carácter"""
+    data = sample_bytes()
+    pager = TextPager(data, 2000)
+    for offset in range(0, len(data), 997):
+        start, end = pager.page(offset)
+        assert start <= offset < end, offset
+        assert data[start] & 0xC0 != 0x80 and (end == len(data) or data[end] & 0xC0 != 0x80)
+        if b'\n' in data[max(0, offset - MAX_LINE_SCAN):offset]:
+            assert start == 0 or data[start - 1:start] == b'\n'
+
+
+def test_memory_mapped_file():
+    """Un archivo proyectado en memoria se pagina igual que sus bytes"""
+    data = sample_bytes()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "sample.txt")
+        with open(path, 'wb') as f:
+            f.write(data)
+        pager = TextPager.open(path, 3000)
+        assert pager.size == len(data)
+        assert forward_pages(pager) == forward_pages(TextPager(data, 3000))
+        pager.close()
+        assert pager.size == 0
+
+        empty = os.path.join(tmp_dir, "empty.txt")
+        open(empty, 'wb').close()
+        pager = TextPager.open(empty)
+        assert pager.page(0) == (0, 0) and pager.next_page(0) is None and pager.page_before(0) is None
+        pager.close()
+
+        try:
+            TextPager.open(os.path.join(tmp_dir, "missing.txt"))
+            assert False, "Se esperaba FileNotFoundError"
+        except FileNotFoundError:
+            pass
+
+
+def main():
+    print("=" * 100)
+    print("BENCHMARK: PAGINADOR DE TEXTO".center(100))
+    print("=" * 100)
+
+    print(f"\n{'Archivo':<28}{'Tamaño':>14}{'Leer completo':>16}{'Primera página':>16}{'Salto al final':>16}")
+    print("-" * 100)
+    for name in ("example_code.py", "large_code.py", "sales_dataset.csv", "system_logs.txt"):
+        path = os.path.join(sample_data_dir, name)
+        start = time.perf_counter()
+        with open(path, 'r', encoding='utf-8') as f:
+            f.read()
+        read_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pager = TextPager.open(path)
+        pager.text(*pager.page(0))
+        page_time = time.perf_counter() - start
+        start = time.perf_counter()
+        pager.text(*pager.page(pager.size - 1))
+        jump_time = time.perf_counter() - start
+        pager.close()
+        print(f"{name:<28}{os.path.getsize(path):>14,}{read_time * 1000:>14.2f}ms"
+              f"{page_time * 1000:>14.2f}ms{jump_time * 1000:>14.2f}ms")
+
+    print()
+    for test in (test_pages_cover_text, test_page_contains_offset, test_memory_mapped_file):
+        test()
+        print(f"OK: {test.__doc__}")
+
+    print("\n" + "=" * 100)
+    print("BENCHMARK COMPLETADO".center(100))
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    main()